@@ -0,0 +1,28 @@
+#!/usr/bin/env python
+"""離線延遲基準測試
+
+以固定語料（tests/fixtures/bench/corpus.json）執行完整 STT → LLM → TTS
+流程：LLM 由本地替身伺服器依腳本回應、工具回放錄製結果，輸出各階段與
+端到端的 p50/p95 延遲、首段音訊時間與 STT/TTS 即時率（JSON）。
+
+Usage:
+    # 以 Kokoro 合成語料音訊（首次執行）
+    uv run python scripts/benchmark_pipeline.py generate
+
+    # 執行並儲存基準
+    uv run python scripts/benchmark_pipeline.py run --output baseline.json
+
+    # 修改後重跑並與基準比較（有退步時結束碼為 1）
+    uv run python scripts/benchmark_pipeline.py run --baseline baseline.json
+"""
+
+import sys
+from pathlib import Path
+
+# 確保可以 import 專案模組
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from voice_assistant.bench.__main__ import main  # noqa: E402
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,72 @@
+#!/usr/bin/env python
+"""重採樣微基準測試
+
+比較 FFT 重採樣（scipy.signal.resample，WhisperSTT 先前的作法）與
+多相濾波重採樣（voice_assistant.voice.audio.resample）在常見輸入長度
+下的耗時；質數長度會讓 FFT 退化，也一併列出。
+
+Usage:
+    uv run python scripts/benchmark_resample.py
+    uv run python scripts/benchmark_resample.py --src-rate 44100 --repeat 20
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+from scipy import signal
+
+# 確保可以 import 專案模組
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from voice_assistant.voice.audio import get_filter, resample  # noqa: E402
+
+TARGET_RATE = 16000
+
+
+def _best_ms(func, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    return best * 1000
+
+
+def _next_prime(n: int) -> int:
+    while any(n % d == 0 for d in range(2, int(n**0.5) + 1)):
+        n += 1
+    return n
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="重採樣微基準測試")
+    parser.add_argument("--src-rate", type=int, default=48000, help="來源取樣率")
+    parser.add_argument("--repeat", type=int, default=10, help="每項量測次數（取最佳）")
+    args = parser.parse_args()
+
+    # 首次設計濾波器的成本（之後由快取提供）
+    start = time.perf_counter()
+    get_filter(args.src_rate, TARGET_RATE)
+    print(f"濾波器設計: {(time.perf_counter() - start) * 1000:.2f} ms（僅首次）\n")
+
+    rng = np.random.default_rng(0)
+    lengths = [int(s * args.src_rate) for s in (0.5, 2.0, 5.0, 15.0)]
+    lengths.append(_next_prime(lengths[1]))
+
+    print(f"{'樣本數':>10} {'FFT (ms)':>10} {'多相 (ms)':>10} {'加速':>8}")
+    for n in sorted(lengths):
+        audio = rng.standard_normal(n).astype(np.float32)
+        num_samples = int(n * TARGET_RATE / args.src_rate)
+        fft_ms = _best_ms(lambda: signal.resample(audio, num_samples), args.repeat)
+        poly_ms = _best_ms(
+            lambda: resample(audio, args.src_rate, TARGET_RATE), args.repeat
+        )
+        print(f"{n:>10} {fft_ms:>10.2f} {poly_ms:>10.2f} {fft_ms / poly_ms:>7.1f}x")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
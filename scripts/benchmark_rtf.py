@@ -0,0 +1,404 @@
+#!/usr/bin/env python
+"""STT/TTS 即時率（RTF）矩陣基準測試
+
+以本地語料對 WhisperSTT 與 KokoroTTS 的參數組合逐一量測：
+
+- STT：模型大小 × compute type × beam size × 執行緒數；每句的 RTF、
+  首個片段時間（time-to-first-chunk）與對參考文字的字元錯誤率（CER）
+- TTS：後端（kokoro/kokoro-onnx）× 量化（kokoro 的 none/int8）× 音色 ×
+  語速 × 執行緒數 × 文字長度；RTF、首段音訊時間，以及相對 fp32 kokoro
+  輸出的對數頻譜距離（lsd_db；kokoro 每句合成前固定亂數種子，距離只
+  反映模型差異；kokoro-onnx 的聲源亂數不受控制，距離包含聲源雜訊）
+
+每個組合另記錄量測期間的峰值 RSS（含模型載入）與相對開始時的增量，
+輸出 CSV 或 JSON，在目標機器上執行，依結果選擇部署設定。已載入的
+模型與函式庫不會歸還記憶體，比較後端的記憶體用量時每次只量測一個
+後端（--tts-backends kokoro-onnx 與 --tts-backends kokoro 分開執行，
+量化同理）；int8 第一次執行包含 fp32 模型的轉換，先執行一次讓量化
+模型快取就緒再量測。
+
+Usage:
+    uv run python scripts/benchmark_rtf.py --model-sizes tiny,base --beam-sizes 1,5
+    uv run python scripts/benchmark_rtf.py --skip-tts --threads 2,4 --format csv \\
+        --output stt_matrix.csv
+    uv run python scripts/benchmark_rtf.py --skip-stt --voices zf_001,zf_002 \\
+        --speeds 1.0,1.2 --text-chars 10,40,120
+    uv run python scripts/benchmark_rtf.py --skip-stt --tts-backends kokoro-onnx \
+        --threads 1,2,4
+    uv run python scripts/benchmark_rtf.py --skip-stt --tts-quantization none,int8
+"""
+
+import argparse
+import csv
+import gc
+import itertools
+import json
+import resource
+import sys
+import threading
+import time
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+
+# 確保可以 import 專案模組
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from voice_assistant.bench import (  # noqa: E402
+    BenchCorpus,
+    character_error_rate,
+    log_spectral_distance,
+)
+from voice_assistant.bench.runner import load_wav, percentiles  # noqa: E402
+from voice_assistant.config import get_settings  # noqa: E402
+
+DEFAULT_CORPUS = Path(__file__).parent.parent / "tests/fixtures/bench/corpus.json"
+
+# TTS 文字長度取自此段落的前 N 個字（於句尾補上句號）
+TTS_PASSAGE = (
+    "今天台北多雲時晴，氣溫介於二十三到二十九度，午後山區可能有短暫陣雨。"
+    "出門記得帶把傘，傍晚之後風勢會稍微增強。一百美金目前大約可以換三千二百"
+    "元台幣，實際匯率以銀行牌告為準。台積電今天收盤上漲百分之一點五，成交量"
+    "比昨天略為放大。如果你還有其他想知道的事情，隨時都可以問我，我會盡量用"
+    "簡短清楚的方式回答你。祝你有美好的一天，晚上早點休息。"
+)
+
+# 峰值 RSS 取樣間隔（秒）
+RSS_INTERVAL_S = 0.01
+
+
+class PeakRSS:
+    """在背景執行緒定期取樣 RSS，記錄區塊內的峰值（MB）
+
+    Linux 以外的平台沒有 /proc，改用 getrusage 的行程生命週期峰值。
+    """
+
+    def __init__(self) -> None:
+        self.start_mb = 0.0
+        self.peak_mb = 0.0
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._sample, daemon=True)
+
+    def __enter__(self) -> "PeakRSS":
+        self.start_mb = _current_rss_mb()
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self._stop.set()
+        self._thread.join()
+        self._record()
+
+    def _sample(self) -> None:
+        while not self._stop.wait(RSS_INTERVAL_S):
+            self._record()
+
+    def _record(self) -> None:
+        self.peak_mb = max(self.peak_mb, _current_rss_mb())
+
+
+def _current_rss_mb() -> float:
+    try:
+        pages = int(Path("/proc/self/statm").read_text().split()[1])
+        return pages * resource.getpagesize() / 2**20
+    except OSError:
+        # macOS 的 ru_maxrss 以 bytes 計，Linux 以 KB 計
+        maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return maxrss / (2**20 if sys.platform == "darwin" else 2**10)
+
+
+def _split(value: str, cast=str) -> list:
+    return [cast(v) for v in value.split(",") if v]
+
+
+def _tts_text(chars: int) -> str:
+    return TTS_PASSAGE[:chars].rstrip("，。") + "。"
+
+
+def _summarize(config: dict[str, Any], rows: list[dict[str, Any]], rss: PeakRSS):
+    def values(key: str) -> list[float]:
+        return [row[key] for row in rows if row.get(key) is not None]
+
+    summary = dict(config)
+    summary["items"] = len(rows)
+    summary["mean_rtf"] = round(float(np.mean(values("rtf"))), 4) if rows else None
+    first_chunk = percentiles(values("first_chunk_ms"))
+    summary["first_chunk_p50_ms"] = first_chunk.get("p50")
+    summary["first_chunk_p95_ms"] = first_chunk.get("p95")
+    cer = values("cer")
+    summary["mean_cer"] = round(float(np.mean(cer)), 4) if cer else None
+    lsd = values("lsd_db")
+    summary["mean_lsd_db"] = round(float(np.mean(lsd)), 3) if lsd else None
+    summary["peak_rss_mb"] = round(rss.peak_mb, 1)
+    summary["rss_growth_mb"] = round(rss.peak_mb - rss.start_mb, 1)
+    return summary
+
+
+def bench_stt(args: argparse.Namespace, settings) -> tuple[list, list]:
+    from voice_assistant.voice.stt.whisper import WhisperSTT
+
+    corpus = BenchCorpus.load(args.corpus)
+    clips = [
+        (utterance, load_wav(corpus.audio_path(utterance, args.root)))
+        for utterance in corpus.utterances
+    ]
+    summaries, details = [], []
+    grid = itertools.product(
+        _split(args.model_sizes),
+        _split(args.compute_types),
+        _split(args.beam_sizes, int),
+        _split(args.threads, int),
+    )
+    for model_size, compute_type, beam_size, threads in grid:
+        config = {
+            "engine": "whisper",
+            "model_size": model_size,
+            "compute_type": compute_type,
+            "beam_size": beam_size,
+            "threads": threads,
+        }
+        print(f"[STT] {config}", file=sys.stderr)
+        rows = []
+        with PeakRSS() as rss:
+            stt = WhisperSTT(
+                model_size=model_size,
+                model_path=settings.whisper_model_path,
+                device=settings.whisper_device,
+                compute_type=compute_type,
+                language=settings.whisper_language,
+                beam_size=beam_size,
+                cpu_threads=threads,
+            )
+            stt.warm_up()
+            for _ in range(args.repeat):
+                for utterance, audio in clips:
+                    samples = stt.prepare_audio(audio)
+                    duration_s = len(samples) / 16000
+                    start = time.perf_counter()
+                    # 逐一取出片段，第一個片段即首個可用的辨識結果
+                    segments, _info = stt.model.transcribe(
+                        samples,
+                        language=stt.language,
+                        beam_size=stt.beam_size,
+                        vad_filter=stt.vad_filter,
+                    )
+                    first_chunk = None
+                    texts = []
+                    for segment in segments:
+                        first_chunk = first_chunk or time.perf_counter()
+                        texts.append(segment.text)
+                    elapsed_s = time.perf_counter() - start
+                    text = "".join(texts).strip()
+                    rows.append(
+                        config
+                        | {
+                            "item": utterance.id,
+                            "audio_s": round(duration_s, 3),
+                            "latency_ms": round(elapsed_s * 1000, 3),
+                            "first_chunk_ms": round(
+                                ((first_chunk or start + elapsed_s) - start) * 1000, 3
+                            ),
+                            "rtf": round(elapsed_s / duration_s, 4),
+                            "cer": round(character_error_rate(utterance.text, text), 4),
+                            "text": text,
+                        }
+                    )
+            del stt
+            gc.collect()
+        summaries.append(_summarize(config, rows, rss))
+        details.extend(rows)
+    return summaries, details
+
+
+def _load_tts(
+    backend: str, quantization: str, settings, voice: str, speed: float, threads: int
+):
+    """建立 TTS 後端（kokoro 的執行緒數由 torch.set_num_threads 設定）"""
+    if backend == "kokoro-onnx":
+        from voice_assistant.voice.tts.kokoro_onnx import KokoroOnnxTTS
+
+        return KokoroOnnxTTS(
+            model_path=settings.tts_onnx_model_path,
+            voice=voice,
+            speed=speed,
+            cpu_threads=threads,
+        )
+    from voice_assistant.voice.tts.kokoro import KokoroTTS
+
+    return KokoroTTS(
+        model_path=settings.tts_model_path,
+        voice=voice,
+        speed=speed,
+        quantization=quantization,
+    )
+
+
+def bench_tts(args: argparse.Namespace, settings) -> tuple[list, list]:
+    backends = _split(args.tts_backends)
+    default_threads = 0
+    if "kokoro" in backends:
+        import torch
+
+        default_threads = torch.get_num_threads()
+
+    # 量化只適用 kokoro；fp32 kokoro 排在最前面，作為頻譜距離的參考
+    engines = [
+        (backend, quantization)
+        for backend in backends
+        for quantization in (
+            _split(args.tts_quantization) if backend == "kokoro" else ["none"]
+        )
+    ]
+    engines.sort(key=lambda engine: engine != ("kokoro", "none"))
+    references: dict[tuple[str, float, int], np.ndarray] = {}
+
+    summaries, details = [], []
+    texts = {chars: _tts_text(chars) for chars in _split(args.text_chars, int)}
+    grid = itertools.product(
+        engines,
+        _split(args.threads, int),
+        _split(args.voices) or [settings.tts_voice],
+        _split(args.speeds, float),
+    )
+    for (backend, quantization), threads, voice, speed in grid:
+        if backend == "kokoro":
+            torch.set_num_threads(threads or default_threads)
+            threads = torch.get_num_threads()
+        config = {
+            "engine": backend,
+            "quantization": quantization,
+            "voice": voice,
+            "speed": speed,
+            "threads": threads,
+        }
+        print(f"[TTS] {config}", file=sys.stderr)
+        rows = []
+        with PeakRSS() as rss:
+            tts = _load_tts(backend, quantization, settings, voice, speed, threads)
+            tts.warm_up()
+            for _ in range(args.repeat):
+                for chars, text in texts.items():
+                    if backend == "kokoro":
+                        # 固定聲源的隨機相位與雜訊，與參考輸出逐句可比
+                        torch.manual_seed(0)
+                    start = time.perf_counter()
+                    first_chunk = None
+                    chunks = []
+                    for _sample_rate, chunk in tts.stream_tts_sync(text):
+                        first_chunk = first_chunk or time.perf_counter()
+                        chunks.append(chunk)
+                    elapsed_s = time.perf_counter() - start
+                    audio = np.concatenate(chunks) if chunks else np.zeros(0)
+                    duration_s = len(audio) / tts.sample_rate
+                    if (backend, quantization) == ("kokoro", "none"):
+                        references.setdefault((voice, speed, chars), audio)
+                    reference = references.get((voice, speed, chars))
+                    rows.append(
+                        config
+                        | {
+                            "item": f"chars_{chars}",
+                            "text_chars": len(text),
+                            "audio_s": round(duration_s, 3),
+                            "latency_ms": round(elapsed_s * 1000, 3),
+                            "first_chunk_ms": round(
+                                ((first_chunk or start + elapsed_s) - start) * 1000,
+                                3,
+                            ),
+                            "rtf": (
+                                round(elapsed_s / duration_s, 4) if duration_s else None
+                            ),
+                            "lsd_db": (
+                                round(log_spectral_distance(reference, audio), 3)
+                                if reference is not None
+                                else None
+                            ),
+                        }
+                    )
+            del tts
+            gc.collect()
+        summaries.append(_summarize(config, rows, rss))
+        details.extend(rows)
+    return summaries, details
+
+
+def write_report(
+    summaries: list[dict[str, Any]],
+    details: list[dict[str, Any]],
+    fmt: str,
+    output: Path | None,
+) -> None:
+    if fmt == "json":
+        text = json.dumps(
+            {"summary": summaries, "items": details}, ensure_ascii=False, indent=2
+        )
+        if output:
+            output.write_text(text + "\n", encoding="utf-8")
+        else:
+            print(text)
+        return
+
+    fields = list(dict.fromkeys(key for row in summaries for key in row))
+    stream = output.open("w", newline="", encoding="utf-8") if output else sys.stdout
+    try:
+        writer = csv.DictWriter(stream, fieldnames=fields)
+        writer.writeheader()
+        writer.writerows(summaries)
+    finally:
+        if output:
+            stream.close()
+
+
+def main() -> int:
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description="STT/TTS 即時率矩陣基準測試")
+    parser.add_argument("--corpus", type=Path, default=DEFAULT_CORPUS, help="語料檔")
+    parser.add_argument("--root", type=Path, default=Path("."), help="音訊基準目錄")
+    parser.add_argument(
+        "--model-sizes", default=settings.whisper_model_size, help="Whisper 模型大小"
+    )
+    parser.add_argument(
+        "--compute-types", default="int8", help="CTranslate2 compute type"
+    )
+    parser.add_argument("--beam-sizes", default="1,5", help="beam size")
+    parser.add_argument(
+        "--threads", default="0", help="STT/TTS 執行緒數（0 為各引擎預設）"
+    )
+    parser.add_argument(
+        "--tts-backends",
+        default=settings.tts_backend,
+        help="TTS 後端（kokoro/kokoro-onnx，逗號分隔）",
+    )
+    parser.add_argument(
+        "--tts-quantization",
+        default=settings.tts_quantization,
+        help="kokoro 權重量化（none/int8，逗號分隔）",
+    )
+    parser.add_argument("--voices", default="", help="Kokoro 音色（預設依設定）")
+    parser.add_argument("--speeds", default=str(settings.tts_speed), help="語速")
+    parser.add_argument("--text-chars", default="10,40,120", help="TTS 文字長度（字）")
+    parser.add_argument("--repeat", type=int, default=1, help="每項重複次數")
+    parser.add_argument("--skip-stt", action="store_true", help="不量測 STT")
+    parser.add_argument("--skip-tts", action="store_true", help="不量測 TTS")
+    parser.add_argument("--format", choices=["csv", "json"], default="json")
+    parser.add_argument("--output", type=Path, help="輸出路徑（預設輸出到 stdout）")
+    args = parser.parse_args()
+
+    summaries, details = [], []
+    if not args.skip_stt:
+        stt_summaries, stt_details = bench_stt(args, settings)
+        summaries += stt_summaries
+        details += stt_details
+    if not args.skip_tts:
+        tts_summaries, tts_details = bench_tts(args, settings)
+        summaries += tts_summaries
+        details += tts_details
+
+    write_report(summaries, details, args.format, args.output)
+    if args.output:
+        print(f"[報告] 已寫入 {args.output}", file=sys.stderr)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,94 @@
+#!/usr/bin/env python
+"""單一 VAD 路徑微基準測試
+
+FastRTC 的停頓偵測已以 Silero VAD 切出每句語音；WhisperSTT 啟用
+vad_filter 時會對整句音訊再跑一次 Silero VAD。此腳本量測每輪對話中
+這次重複 VAD 的 CPU 時間，並與依上游語音區段裁切靜音（single_vad 模式）
+的成本比較，差值即每輪節省的 CPU 時間（不含解碼，解碼成本兩者相近）。
+
+Usage:
+    uv run python scripts/benchmark_vad.py
+    uv run python scripts/benchmark_vad.py --min-silence-ms 500 --repeat 20
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+from faster_whisper.vad import VadOptions, get_speech_timestamps
+
+# 確保可以 import 專案模組
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from voice_assistant.voice.audio import trim_to_speech  # noqa: E402
+
+SAMPLE_RATE = 16000
+# 停頓偵測區塊前後的靜音（秒）
+LEAD_SILENCE_S = 0.3
+TRAIL_SILENCE_S = 0.5
+
+
+def _best_cpu_ms(func, repeat: int) -> float:
+    # process_time 包含 ONNX Runtime 執行緒的 CPU 時間
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.process_time()
+        func()
+        best = min(best, time.process_time() - start)
+    return best * 1000
+
+
+def _utterance(speech_s: float, rng: np.random.Generator) -> np.ndarray:
+    # 以振幅調變的雜訊模擬語音，前後加上停頓偵測留下的靜音
+    t = np.arange(int(speech_s * SAMPLE_RATE)) / SAMPLE_RATE
+    envelope = 0.5 + 0.5 * np.sin(2 * np.pi * 4 * t)
+    speech = 0.3 * envelope * rng.standard_normal(len(t))
+    lead = np.zeros(int(LEAD_SILENCE_S * SAMPLE_RATE))
+    trail = np.zeros(int(TRAIL_SILENCE_S * SAMPLE_RATE))
+    return np.concatenate([lead, speech, trail]).astype(np.float32)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description="單一 VAD 路徑微基準測試")
+    parser.add_argument(
+        "--min-silence-ms", type=int, default=500, help="Whisper VAD 靜音閾值"
+    )
+    parser.add_argument("--repeat", type=int, default=10, help="每項量測次數（取最佳）")
+    args = parser.parse_args()
+
+    options = VadOptions(min_silence_duration_ms=args.min_silence_ms)
+    rng = np.random.default_rng(0)
+
+    # 首次呼叫載入 Silero 模型，不計入
+    get_speech_timestamps(_utterance(1.0, rng), options)
+
+    print(
+        f"{'語句 (s)':>9} {'Whisper VAD (ms)':>17} {'裁切 (ms)':>10} "
+        f"{'每輪節省 (ms)':>14}"
+    )
+    for speech_s in (1.0, 3.0, 6.0, 12.0):
+        samples = _utterance(speech_s, rng)
+        lead = int(LEAD_SILENCE_S * SAMPLE_RATE)
+        spans = [(lead, lead + int(speech_s * SAMPLE_RATE))]
+        vad_ms = _best_cpu_ms(
+            lambda samples=samples: get_speech_timestamps(samples, options),
+            args.repeat,
+        )
+        trim_ms = _best_cpu_ms(
+            lambda samples=samples, spans=spans: trim_to_speech(
+                samples, spans, SAMPLE_RATE // 5
+            ),
+            args.repeat,
+        )
+        duration_s = len(samples) / SAMPLE_RATE
+        print(
+            f"{duration_s:>9.1f} {vad_ms:>17.2f} {trim_ms:>10.3f} "
+            f"{vad_ms - trim_ms:>14.2f}"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,165 @@
+#!/usr/bin/env python
+"""將本地快取的 Kokoro-82M-v1.1-zh 匯出為 ONNX（TTS_BACKEND=kokoro-onnx）
+
+從 HuggingFace 快取（TTS_MODEL_PATH，先以 download_models.py 下載）讀取
+PyTorch 模型與音色，輸出 KokoroOnnxTTS 使用的模型目錄：
+
+- kokoro.onnx：模型（input_ids 長度為動態維度）
+- config.json：模型配置（音素詞彙表）與來源 repo ID
+- voices.npz：音色向量
+
+匯出後以幾句中文比較 PyTorch 與 ONNX 的合成結果：每個音素的音框數、
+音訊長度，以及對數頻譜距離（Kokoro 聲源含隨機相位，另列出 PyTorch
+自身兩次合成的距離作為雜訊基準）。
+
+Usage:
+    uv run --extra onnx python scripts/export_kokoro_onnx.py
+    uv run --extra onnx python scripts/export_kokoro_onnx.py --voices zf_001,zm_010 \\
+        --output models/kokoro-onnx
+"""
+
+import argparse
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# 確保可以 import 專案模組
+sys.path.insert(0, str(Path(__file__).parent.parent / "src"))
+
+from voice_assistant.config import get_settings  # noqa: E402
+
+CHECK_TEXTS = [
+    "你好，很高興為你服務。",
+    "台北今天多雲，氣溫大約二十三度，出門記得帶件薄外套。",
+    "一百美金大約可以換三千兩百一十五元台幣。",
+]
+
+
+def _split(value: str) -> list[str]:
+    return [v for v in value.split(",") if v]
+
+
+def export(args: argparse.Namespace) -> Path:
+    from huggingface_hub import hf_hub_download, snapshot_download
+    from kokoro.model import KModel
+
+    from voice_assistant.voice.tts.kokoro import KokoroTTS
+    from voice_assistant.voice.tts.kokoro_onnx import (
+        CONFIG_FILE,
+        MODEL_FILE,
+        VOICES_FILE,
+        export_model,
+        export_voices,
+    )
+
+    repo_id = KokoroTTS.CHINESE_REPO
+    config_path = hf_hub_download(repo_id=repo_id, filename="config.json")
+    model_file = hf_hub_download(repo_id=repo_id, filename=KModel.MODEL_NAMES[repo_id])
+    voices_dir = Path(snapshot_download(repo_id=repo_id, local_files_only=True))
+    voice_files = sorted((voices_dir / "voices").glob("*.pt"))
+    if args.voices:
+        wanted = set(_split(args.voices))
+        voice_files = [path for path in voice_files if path.stem in wanted]
+        missing = wanted - {path.stem for path in voice_files}
+        if missing:
+            raise SystemExit(f"本地快取沒有音色: {', '.join(sorted(missing))}")
+
+    output = args.output
+    output.mkdir(parents=True, exist_ok=True)
+    print(f"[匯出] {repo_id} → {output}")
+
+    # ONNX 不支援複數 STFT，以 disable_complex 改用實數實作
+    model = KModel(
+        repo_id=repo_id, config=config_path, model=model_file, disable_complex=True
+    ).eval()
+    start = time.perf_counter()
+    export_model(model, output / MODEL_FILE, opset=args.opset)
+    size_mb = (output / MODEL_FILE).stat().st_size / 2**20
+    print(f"  {MODEL_FILE}: {size_mb:.1f} MB（{time.perf_counter() - start:.1f} 秒）")
+
+    config = json.loads(Path(config_path).read_text(encoding="utf-8"))
+    config["repo_id"] = repo_id
+    (output / CONFIG_FILE).write_text(
+        json.dumps(config, ensure_ascii=False, indent=2), encoding="utf-8"
+    )
+    count = export_voices(voice_files, output / VOICES_FILE)
+    print(f"  {VOICES_FILE}: {count} 個音色")
+    return output
+
+
+def check(args: argparse.Namespace, voice: str) -> None:
+    import torch
+    from kokoro.model import KModel
+
+    from voice_assistant.bench.tts import log_spectral_distance
+    from voice_assistant.voice.tts.kokoro import KokoroTTS
+    from voice_assistant.voice.tts.kokoro_onnx import VOICES_FILE, KokoroOnnxTTS
+
+    onnx_tts = KokoroOnnxTTS(str(args.output), voice=voice)
+    # 與 KokoroTTS 相同的 PyTorch 模型（預設的複數 STFT）
+    model = KModel(repo_id=KokoroTTS.CHINESE_REPO).eval()
+    with np.load(args.output / VOICES_FILE) as voices:
+        pack = torch.from_numpy(voices[voice])
+
+    print(f"\n[比對] 音色 {voice}")
+    for text in CHECK_TEXTS:
+        phonemes = onnx_tts.g2p(text)
+        ids = [onnx_tts.vocab[p] for p in phonemes if p in onnx_tts.vocab]
+        input_ids = torch.LongTensor([[0, *ids, 0]])
+        ref_s = pack[len(phonemes) - 1]
+
+        start = time.perf_counter()
+        torch_audio, torch_duration = model.forward_with_tokens(input_ids, ref_s, 1.0)
+        torch_ms = (time.perf_counter() - start) * 1000
+        noise_audio, _ = model.forward_with_tokens(input_ids, ref_s, 1.0)
+        start = time.perf_counter()
+        onnx_audio, onnx_duration = onnx_tts.infer(phonemes)
+        onnx_ms = (time.perf_counter() - start) * 1000
+
+        torch_audio = torch_audio.numpy()
+        matched = float(np.mean(torch_duration.numpy() == onnx_duration))
+        distance = log_spectral_distance(torch_audio, onnx_audio)
+        noise_floor = log_spectral_distance(torch_audio, noise_audio.numpy())
+        print(
+            f"  {text}\n"
+            f"    音框數一致 {matched:.1%}  "
+            f"長度 {len(torch_audio)} / {len(onnx_audio)}  "
+            f"頻譜距離 {distance:.2f} dB（雜訊基準 {noise_floor:.2f} dB）  "
+            f"PyTorch {torch_ms:.0f}ms / ONNX {onnx_ms:.0f}ms"
+        )
+
+
+def main() -> int:
+    settings = get_settings()
+    parser = argparse.ArgumentParser(description="匯出 Kokoro ONNX 模型")
+    parser.add_argument(
+        "--model-path",
+        default=settings.tts_model_path,
+        help="HuggingFace 快取目錄（HF_HOME）",
+    )
+    parser.add_argument(
+        "--output", type=Path, default=Path(settings.tts_onnx_model_path)
+    )
+    parser.add_argument("--voices", default="", help="匯出的音色（預設全部）")
+    parser.add_argument("--opset", type=int, default=17, help="ONNX opset 版本")
+    parser.add_argument(
+        "--skip-check", action="store_true", help="不比對 PyTorch 與 ONNX 的輸出"
+    )
+    args = parser.parse_args()
+
+    # 只使用本地快取（必須在 import huggingface_hub 前設定）
+    os.environ["HF_HOME"] = str(Path(args.model_path).resolve())
+    os.environ["HF_HUB_OFFLINE"] = "1"
+
+    export(args)
+    if not args.skip_check:
+        check(args, (_split(args.voices) or [settings.tts_voice])[0])
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -22,6 +22,7 @@ async def test_flow() -> None:
     llm = LLMClient(
         api_key=settings.openai_api_key,
         model=settings.openai_model,
+        base_url=settings.openai_base_url,
     )
 
     # 建立 Tool Registry 並註冊工具
@@ -2,6 +2,7 @@
 
 from voice_assistant.config import Settings
 from voice_assistant.llm import (
+    ChatDelta,
     ChatMessage,
     LLMAuthenticationError,
     LLMClient,
@@ -16,6 +17,7 @@ __version__ = "0.1.0"
 
 __all__ = [
     "BaseTool",
+    "ChatDelta",
     "ChatMessage",
     "LLMAuthenticationError",
     "LLMClient",
@@ -5,10 +5,18 @@
 
 from __future__ import annotations
 
+from typing import TYPE_CHECKING
+
+from voice_assistant import tracing
 from voice_assistant.agents.graph import create_multi_agent_graph
+from voice_assistant.cancellation import CancelToken, TurnCancelledError, cancellable
 from voice_assistant.llm.client import LLMClient
+from voice_assistant.llm.streaming import DELTA_CALLBACK_KEY, TextDeltaCallback
 from voice_assistant.tools.registry import ToolRegistry
 
+if TYPE_CHECKING:
+    from langchain_core.runnables import RunnableConfig
+
 
 class MultiAgentExecutor:
     """多代理流程執行器。
@@ -30,19 +38,35 @@ class MultiAgentExecutor:
         self._tool_registry = tool_registry
         self._graph = create_multi_agent_graph(llm_client, tool_registry)
 
-    async def execute(self, user_input: str) -> str:
+    async def execute(
+        self,
+        user_input: str,
+        on_delta: TextDeltaCallback | None = None,
+        cancel_token: CancelToken | None = None,
+    ) -> str:
         """執行多代理流程。
 
         Args:
             user_input: 使用者輸入
+            on_delta: 回應文字增量回呼（可選，提供時彙整步驟改用串流）
+            cancel_token: 本輪取消權杖（可選，取消時中止所有代理與工具呼叫）
 
         Returns:
             str: 自然語言回應
+
+        Raises:
+            TurnCancelledError: 本輪已取消
         """
+        config: RunnableConfig = {"callbacks": tracing.graph_callbacks()}
+        if on_delta is not None:
+            config["configurable"] = {DELTA_CALLBACK_KEY: on_delta}
         try:
-            result = await self._graph.ainvoke(
-                {"user_input": user_input},
+            result = await cancellable(
+                cancel_token,
+                self._graph.ainvoke({"user_input": user_input}, config=config),
             )
             return result.get("final_response", "抱歉，處理過程中發生錯誤。")
+        except TurnCancelledError:
+            raise
         except Exception as e:
             return f"抱歉，處理過程中發生錯誤: {e}"
@@ -8,10 +8,12 @@ from __future__ import annotations
 import asyncio
 from typing import Any
 
+from langchain_core.runnables import RunnableConfig
 from langgraph.graph import END, START, StateGraph
 from langgraph.graph.state import CompiledStateGraph
 from langgraph.types import Send
 
+from voice_assistant import tracing
 from voice_assistant.agents.base import BaseAgent
 from voice_assistant.agents.finance import FinanceAgent
 from voice_assistant.agents.general import GeneralAgent
@@ -25,6 +27,7 @@ from voice_assistant.agents.supervisor import SupervisorAgent
 from voice_assistant.agents.travel import TravelAgent
 from voice_assistant.agents.weather import WeatherAgent
 from voice_assistant.llm.client import LLMClient
+from voice_assistant.llm.streaming import delta_callback_from_config
 from voice_assistant.tools.registry import ToolRegistry
 
 
@@ -83,10 +86,11 @@ def create_multi_agent_graph(
 
         # 執行 Agent（帶逾時）
         try:
-            result = await asyncio.wait_for(
-                agent.execute(task),
-                timeout=agent.timeout,
-            )
+            with tracing.span(f"agent.{task.agent_type.value}", "agent"):
+                result = await asyncio.wait_for(
+                    agent.execute(task),
+                    timeout=agent.timeout,
+                )
         except TimeoutError:
             result = AgentResult(
                 task_id=task.task_id,
@@ -98,10 +102,14 @@ def create_multi_agent_graph(
 
         return {"results": [result]}
 
-    async def aggregate_results(state: MultiAgentState) -> dict[str, Any]:
-        """結果彙整節點。"""
+    async def aggregate_results(
+        state: MultiAgentState,
+        config: RunnableConfig,
+    ) -> dict[str, Any]:
+        """結果彙整節點（config 帶有文字增量回呼時以串流方式彙整）。"""
         user_input = state.get("user_input", "")
         results = state.get("results", [])
+        on_delta = delta_callback_from_config(config)
 
         # 如果只有一個結果且成功，直接回傳
         if len(results) == 1 and results[0].success:
@@ -114,10 +122,14 @@ def create_multi_agent_graph(
                 final_response = data.get("recommendations", "")
             else:
                 # 其他情況由 supervisor 彙整
-                final_response = await supervisor.aggregate(user_input, results)
+                final_response = await supervisor.aggregate(
+                    user_input, results, on_delta=on_delta
+                )
         else:
             # 多個結果或有失敗，由 supervisor 彙整
-            final_response = await supervisor.aggregate(user_input, results)
+            final_response = await supervisor.aggregate(
+                user_input, results, on_delta=on_delta
+            )
 
         return {"final_response": final_response}
 
@@ -14,6 +14,8 @@ from uuid import uuid4
 from pydantic import BaseModel, Field, model_validator
 from typing_extensions import TypedDict
 
+from voice_assistant.tracing import current_turn_id
+
 
 class AgentType(str, Enum):
     """Agent 類型識別碼。
@@ -59,6 +61,7 @@ class AgentResult(BaseModel):
         data: 成功時的結果資料
         error: 失敗時的錯誤訊息
         execution_time: 執行耗時（秒）
+        turn_id: 所屬對話輪次（預設取自目前的追蹤紀錄，用於關聯延遲追蹤）
     """
 
     task_id: str
@@ -67,6 +70,7 @@ class AgentResult(BaseModel):
     data: dict | None = None
     error: str | None = None
     execution_time: float = Field(ge=0)
+    turn_id: str | None = Field(default_factory=current_turn_id)
 
     @model_validator(mode="after")
     def validate_result(self) -> AgentResult:
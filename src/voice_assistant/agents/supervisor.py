@@ -15,6 +15,7 @@ from voice_assistant.agents.state import (
 )
 from voice_assistant.llm.client import LLMClient
 from voice_assistant.llm.schemas import ChatMessage
+from voice_assistant.llm.streaming import TextDeltaCallback
 
 # 任務拆解的系統提示詞
 # ruff: noqa: E501
@@ -155,12 +156,14 @@ class SupervisorAgent:
         self,
         user_input: str,
         results: list[AgentResult],
+        on_delta: TextDeltaCallback | None = None,
     ) -> str:
         """彙整多個 Agent 結果為自然語言回應。
 
         Args:
             user_input: 原始使用者輸入（用於上下文）
             results: Agent 執行結果清單
+            on_delta: 回應文字增量回呼（可選，提供時以串流方式呼叫 LLM）
 
         Returns:
             str: 自然語言回應
@@ -186,9 +189,16 @@ class SupervisorAgent:
 
         messages = [ChatMessage(role="user", content=aggregate_request)]
 
-        response = await self.llm_client.chat(
-            messages=messages,
-            system_prompt=AGGREGATE_SYSTEM_PROMPT,
-        )
+        if on_delta is not None:
+            response = await self.llm_client.chat_with_stream(
+                messages=messages,
+                on_delta=on_delta,
+                system_prompt=AGGREGATE_SYSTEM_PROMPT,
+            )
+        else:
+            response = await self.llm_client.chat(
+                messages=messages,
+                system_prompt=AGGREGATE_SYSTEM_PROMPT,
+            )
 
         return response.content or "抱歉，無法生成回應。"
@@ -0,0 +1,46 @@
+"""Offline latency benchmark.
+
+以固定語料、本地 LLM 替身與錄製的工具結果，量測語音管線各階段延遲。
+"""
+
+from voice_assistant.bench.corpus import (
+    BenchCorpus,
+    LatencyDistribution,
+    LLMRule,
+    LLMScript,
+    ToolFixture,
+    ToolRecording,
+    Utterance,
+)
+from voice_assistant.bench.fake_openai import FakeOpenAIServer
+from voice_assistant.bench.runner import compare_reports, run_benchmark
+from voice_assistant.bench.segmentation import (
+    response_texts,
+    run_segmentation_benchmark,
+)
+from voice_assistant.bench.stt import character_error_rate, run_stt_benchmark
+from voice_assistant.bench.threads import run_concurrency_benchmark, sweep_allocations
+from voice_assistant.bench.tools import RecordedTool, create_recorded_registry
+from voice_assistant.bench.tts import log_spectral_distance
+
+__all__ = [
+    "BenchCorpus",
+    "FakeOpenAIServer",
+    "LLMRule",
+    "LLMScript",
+    "LatencyDistribution",
+    "RecordedTool",
+    "ToolFixture",
+    "ToolRecording",
+    "Utterance",
+    "character_error_rate",
+    "compare_reports",
+    "create_recorded_registry",
+    "log_spectral_distance",
+    "response_texts",
+    "run_benchmark",
+    "run_concurrency_benchmark",
+    "run_segmentation_benchmark",
+    "run_stt_benchmark",
+    "sweep_allocations",
+]
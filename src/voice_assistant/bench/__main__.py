@@ -0,0 +1,406 @@
+"""離線延遲基準測試 CLI
+
+Usage:
+    # 以 Kokoro 合成語料中尚未存在的語句音訊
+    uv run python -m voice_assistant.bench generate
+
+    # 執行基準測試並輸出 JSON 報告
+    uv run python -m voice_assistant.bench run --repeat 3 --output bench.json
+
+    # 執行並與先前儲存的基準比較（有退步時結束碼為 1）
+    uv run python -m voice_assistant.bench run --baseline baseline.json
+
+    # 比較兩份已儲存的報告
+    uv run python -m voice_assistant.bench compare baseline.json bench.json
+
+    # 比較 STT 引擎（整句與串流辨識），選擇本機最快的引擎
+    uv run python -m voice_assistant.bench stt --engines whisper,sherpa-onnx --streaming
+
+    # 比較 CPU 執行緒分配在 1/2/4 個同時會話下的吞吐量與延遲
+    uv run python -m voice_assistant.bench threads --sessions 1,2,4
+
+    # 比較斷句策略（句尾斷句 vs 首段提早輸出）的首段音訊時間
+    uv run python -m voice_assistant.bench segmentation --first-max-chars 8,12,16
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import sys
+from pathlib import Path
+from typing import Any
+
+from voice_assistant.bench.corpus import BenchCorpus
+from voice_assistant.bench.runner import compare_reports, run_benchmark, save_wav
+from voice_assistant.bench.segmentation import (
+    response_texts,
+    run_segmentation_benchmark,
+)
+from voice_assistant.bench.stt import run_stt_benchmark
+from voice_assistant.bench.threads import run_concurrency_benchmark, sweep_allocations
+from voice_assistant.config import FlowMode, get_settings
+
+DEFAULT_CORPUS = Path("tests/fixtures/bench/corpus.json")
+
+
+def _generate(args: argparse.Namespace) -> int:
+    from voice_assistant.voice.tts.kokoro import KokoroTTS
+
+    settings = get_settings()
+    corpus = BenchCorpus.load(args.corpus)
+    tts = KokoroTTS(
+        model_path=settings.tts_model_path,
+        voice=settings.tts_voice,
+        speed=settings.tts_speed,
+    )
+    for utterance in corpus.utterances:
+        path = corpus.audio_path(utterance, args.root)
+        if path.exists() and not args.force:
+            print(f"[略過] {path} 已存在")
+            continue
+        save_wav(path, tts.tts(utterance.text))
+        print(f"[生成] {path}: {utterance.text}")
+    return 0
+
+
+def _run(args: argparse.Namespace) -> int:
+    from voice_assistant.voice.stt.whisper import WhisperSTT
+    from voice_assistant.voice.tts.kokoro import KokoroTTS
+
+    settings = get_settings()
+    corpus = BenchCorpus.load(args.corpus)
+    stt = WhisperSTT(
+        model_size=settings.whisper_model_size,
+        model_path=settings.whisper_model_path,
+        device=settings.whisper_device,
+        language=settings.whisper_language,
+        min_silence_duration_ms=settings.vad_min_silence_duration_ms,
+    )
+    tts = KokoroTTS(
+        model_path=settings.tts_model_path,
+        voice=settings.tts_voice,
+        speed=settings.tts_speed,
+    )
+
+    report = run_benchmark(
+        corpus,
+        stt=stt,
+        tts=tts,
+        flow_mode=FlowMode(args.flow_mode or settings.flow_mode),
+        repeat=args.repeat,
+        warmup=args.warmup,
+        root=args.root,
+    )
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n", encoding="utf-8")
+        print(f"[報告] 已寫入 {args.output}")
+    else:
+        print(text)
+
+    _print_summary(report)
+    if args.baseline:
+        baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+        return _print_comparison(baseline, report, args.tolerance)
+    return 0
+
+
+def _stt(args: argparse.Namespace) -> int:
+    from voice_assistant.voice.stt.sherpa import SherpaOnnxSTT
+    from voice_assistant.voice.stt.streaming import StreamingTranscriber
+    from voice_assistant.voice.stt.whisper import WhisperSTT
+
+    settings = get_settings()
+    corpus = BenchCorpus.load(args.corpus)
+    engines: dict[str, Any] = {}
+    sessions: dict[str, Any] = {}
+    for name in args.engines.split(","):
+        if name == "whisper":
+            whisper = WhisperSTT(
+                model_size=settings.whisper_model_size,
+                model_path=settings.whisper_model_path,
+                device=settings.whisper_device,
+                language=settings.whisper_language,
+                beam_size=1,
+                cpu_threads=settings.whisper_cpu_threads,
+            )
+            engines[name] = whisper
+            sessions[name] = lambda whisper=whisper: StreamingTranscriber(
+                whisper,
+                decode_interval_s=settings.whisper_streaming_interval_ms / 1000,
+            )
+        elif name == "sherpa-onnx":
+            sherpa = SherpaOnnxSTT(
+                model_path=settings.sherpa_model_path,
+                language=settings.whisper_language,
+                num_threads=settings.whisper_cpu_threads,
+            )
+            engines[name] = sherpa
+            sessions[name] = sherpa.create_session
+        else:
+            print(f"[錯誤] 未知的 STT 引擎: {name}", file=sys.stderr)
+            return 2
+
+    report = run_stt_benchmark(
+        corpus,
+        engines,
+        sessions=sessions if args.streaming else None,
+        repeat=args.repeat,
+        warmup=args.warmup,
+        root=args.root,
+    )
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n", encoding="utf-8")
+        print(f"[報告] 已寫入 {args.output}")
+    else:
+        print(text)
+
+    print(f"\n[STT] 依延遲排序: {' > '.join(report['ranking'])}", file=sys.stderr)
+    for name, result in report["engines"].items():
+        line = (
+            f"  {name:<12} p50={result['latency_ms'].get('p50', 0):>9.1f}ms "
+            f"rtf={result['rtf'].get('p50', 0):>6.3f} cer={result['mean_cer']:.3f}"
+        )
+        if "finalize_ms" in result:
+            line += f" 停頓後={result['finalize_ms'].get('p50', 0):>8.1f}ms"
+        print(line, file=sys.stderr)
+    return 0
+
+
+def _threads(args: argparse.Namespace) -> int:
+    from voice_assistant.threads import apply_thread_budget, available_cpus
+    from voice_assistant.voice.stt.pool import STTWorkerPool
+    from voice_assistant.voice.stt.whisper import WhisperSTT
+    from voice_assistant.voice.tts.kokoro import KokoroTTS
+
+    settings = get_settings()
+    corpus = BenchCorpus.load(args.corpus)
+    total = args.total or settings.cpu_thread_budget or available_cpus()
+    budgets = sweep_allocations(
+        total,
+        stt_workers=[int(v) for v in args.workers.split(",")],
+        stt_shares=[float(v) for v in args.shares.split(",")],
+        tts_interop_threads=settings.tts_interop_threads,
+    )
+    # inter-op 執行緒數只能在載入模型前設定一次
+    apply_thread_budget(budgets[0])
+    tts = KokoroTTS(
+        model_path=settings.tts_model_path,
+        voice=settings.tts_voice,
+        speed=settings.tts_speed,
+    )
+    tts.warm_up()
+
+    rows = []
+    for budget in budgets:
+        apply_thread_budget(budget)
+        # CTranslate2 的執行緒數於載入模型時決定，每種分配重新載入
+        stt = STTWorkerPool(
+            WhisperSTT(
+                model_size=settings.whisper_model_size,
+                model_path=settings.whisper_model_path,
+                device=settings.whisper_device,
+                language=settings.whisper_language,
+                beam_size=1,
+                cpu_threads=budget.stt_threads,
+                num_workers=budget.stt_workers,
+            ),
+            num_workers=budget.stt_workers,
+        )
+        try:
+            stt.warm_up()
+            for sessions in (int(v) for v in args.sessions.split(",")):
+                result = run_concurrency_benchmark(
+                    corpus, stt, tts, sessions, turns=args.turns, root=args.root
+                )
+                rows.append({"budget": budget.model_dump()} | result)
+                print(
+                    f"  STT {budget.stt_workers}×{budget.stt_threads} "
+                    f"TTS {budget.tts_threads} 會話 {sessions:>2}: "
+                    f"{result['throughput_tps']:>6.2f} 輪/秒 "
+                    f"首段音訊 p50={result['first_audio_ms'].get('p50', 0):>8.1f}ms "
+                    f"p95={result['first_audio_ms'].get('p95', 0):>8.1f}ms",
+                    file=sys.stderr,
+                )
+        finally:
+            stt.close()
+
+    report = {"total_threads": total, "results": rows}
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n", encoding="utf-8")
+        print(f"[報告] 已寫入 {args.output}")
+    else:
+        print(text)
+    return 0
+
+
+def _segmentation(args: argparse.Namespace) -> int:
+    from voice_assistant.voice.schemas import SegmentationConfig
+    from voice_assistant.voice.tts.kokoro import KokoroTTS
+
+    settings = get_settings()
+    corpus = BenchCorpus.load(args.corpus)
+    tts = KokoroTTS(
+        model_path=settings.tts_model_path,
+        voice=settings.tts_voice,
+        speed=settings.tts_speed,
+    )
+    tts.warm_up()
+
+    strategies = {"sentence": SegmentationConfig(strategy="sentence")}
+    for first_max in (int(v) for v in args.first_max_chars.split(",")):
+        strategies[f"latency-{first_max}"] = SegmentationConfig(
+            strategy="latency", first_max_chars=first_max
+        )
+    report = run_segmentation_benchmark(
+        response_texts(corpus),
+        tts,
+        strategies,
+        chunk_chars=corpus.llm.chunk_chars,
+        token_interval_ms=corpus.llm.token_interval.median_ms,
+        repeat=args.repeat,
+    )
+    for name, result in report["strategies"].items():
+        first_audio = result["first_audio_ms"]
+        print(
+            f"  {name:<12} 首段音訊 p50={first_audio.get('p50', 0):>8.1f}ms "
+            f"p95={first_audio.get('p95', 0):>8.1f}ms "
+            f"首段字數 p50={result['first_segment_chars'].get('p50', 0):>5.1f}",
+            file=sys.stderr,
+        )
+
+    text = json.dumps(report, ensure_ascii=False, indent=2)
+    if args.output:
+        args.output.write_text(text + "\n", encoding="utf-8")
+        print(f"[報告] 已寫入 {args.output}")
+    else:
+        print(text)
+    return 0
+
+
+def _compare(args: argparse.Namespace) -> int:
+    baseline = json.loads(args.baseline.read_text(encoding="utf-8"))
+    current = json.loads(args.current.read_text(encoding="utf-8"))
+    return _print_comparison(baseline, current, args.tolerance)
+
+
+def _print_summary(report: dict[str, Any]) -> None:
+    print(
+        f"\n[摘要] flow_mode={report['flow_mode']} turns={report['turns']} "
+        f"辨識不符={report['transcript_mismatches']}",
+        file=sys.stderr,
+    )
+    for name, stats in report["summary"].items():
+        if stats.get("count"):
+            print(
+                f"  {name:<24} p50={stats['p50']:>10.3f} p95={stats['p95']:>10.3f}",
+                file=sys.stderr,
+            )
+
+
+def _print_comparison(
+    baseline: dict[str, Any], current: dict[str, Any], tolerance: float
+) -> int:
+    rows = compare_reports(baseline, current, tolerance=tolerance)
+    regressions = [row for row in rows if row["regression"]]
+    print(
+        f"\n[比較] 共 {len(rows)} 項指標，退步 {len(regressions)} 項", file=sys.stderr
+    )
+    for row in rows:
+        flag = "退步" if row["regression"] else "    "
+        print(
+            f"  {flag} {row['metric']:<40} {row['baseline']:>10.3f} → "
+            f"{row['current']:>10.3f} ({row['change']:+.1%})",
+            file=sys.stderr,
+        )
+    return 1 if regressions else 0
+
+
+def main(argv: list[str] | None = None) -> int:
+    parser = argparse.ArgumentParser(description="語音管線離線延遲基準測試")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    def add_corpus_args(sub: argparse.ArgumentParser) -> None:
+        sub.add_argument("--corpus", type=Path, default=DEFAULT_CORPUS)
+        sub.add_argument(
+            "--root", type=Path, default=Path("."), help="語料音訊相對路徑的基準目錄"
+        )
+
+    generate = subparsers.add_parser("generate", help="以 TTS 合成語料音訊")
+    add_corpus_args(generate)
+    generate.add_argument("--force", action="store_true", help="覆寫已存在的音訊")
+    generate.set_defaults(func=_generate)
+
+    run = subparsers.add_parser("run", help="執行基準測試")
+    add_corpus_args(run)
+    run.add_argument(
+        "--flow-mode",
+        choices=[mode.value for mode in FlowMode],
+        help="流程模式（預設依設定 FLOW_MODE）",
+    )
+    run.add_argument("--repeat", type=int, default=3, help="每句重複次數")
+    run.add_argument("--warmup", type=int, default=1, help="不計入的暖身輪數")
+    run.add_argument("--output", type=Path, help="報告輸出路徑（預設輸出到 stdout）")
+    run.add_argument("--baseline", type=Path, help="比較的基準報告")
+    run.add_argument("--tolerance", type=float, default=0.10, help="容許的相對增幅")
+    run.set_defaults(func=_run)
+
+    stt = subparsers.add_parser("stt", help="比較 STT 引擎的延遲、RTF 與 CER")
+    add_corpus_args(stt)
+    stt.add_argument(
+        "--engines",
+        default="whisper,sherpa-onnx",
+        help="逗號分隔的引擎（whisper/sherpa-onnx）",
+    )
+    stt.add_argument(
+        "--streaming", action="store_true", help="另量測串流辨識停頓後的延遲"
+    )
+    stt.add_argument("--repeat", type=int, default=3, help="每句重複次數")
+    stt.add_argument("--warmup", type=int, default=1, help="不計入的暖身輪數")
+    stt.add_argument("--output", type=Path, help="報告輸出路徑（預設輸出到 stdout）")
+    stt.set_defaults(func=_stt)
+
+    threads = subparsers.add_parser(
+        "threads", help="比較 CPU 執行緒分配在多個同時會話下的吞吐量與延遲"
+    )
+    add_corpus_args(threads)
+    threads.add_argument(
+        "--total", type=int, default=0, help="可用執行緒數（預設依設定或自動偵測）"
+    )
+    threads.add_argument("--workers", default="1,2", help="STT worker 數的候選值")
+    threads.add_argument("--shares", default="0.25,0.5,0.75", help="STT 佔比的候選值")
+    threads.add_argument("--sessions", default="1,2,4", help="同時會話數")
+    threads.add_argument("--turns", type=int, default=3, help="每個會話的輪數")
+    threads.add_argument(
+        "--output", type=Path, help="報告輸出路徑（預設輸出到 stdout）"
+    )
+    threads.set_defaults(func=_threads)
+
+    segmentation = subparsers.add_parser(
+        "segmentation", help="比較斷句策略的首段音訊時間"
+    )
+    segmentation.add_argument("--corpus", type=Path, default=DEFAULT_CORPUS)
+    segmentation.add_argument(
+        "--first-max-chars", default="12", help="latency 策略第一段字數上限的候選值"
+    )
+    segmentation.add_argument("--repeat", type=int, default=3, help="每句重複次數")
+    segmentation.add_argument(
+        "--output", type=Path, help="報告輸出路徑（預設輸出到 stdout）"
+    )
+    segmentation.set_defaults(func=_segmentation)
+
+    compare = subparsers.add_parser("compare", help="比較兩份報告")
+    compare.add_argument("baseline", type=Path)
+    compare.add_argument("current", type=Path)
+    compare.add_argument("--tolerance", type=float, default=0.10)
+    compare.set_defaults(func=_compare)
+
+    args = parser.parse_args(argv)
+    return args.func(args)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
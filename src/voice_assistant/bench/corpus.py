@@ -0,0 +1,217 @@
+"""Benchmark corpus.
+
+離線延遲基準測試的固定語料：語句音訊清單、LLM 替身的回應腳本與
+錄製的工具結果。所有延遲皆由固定種子取樣，同一份語料重跑時
+外部依賴（LLM、工具）的延遲相同，量測差異只來自管線本身。
+"""
+
+from __future__ import annotations
+
+import json
+import math
+import random
+from pathlib import Path
+from typing import Any
+
+from pydantic import BaseModel, Field
+
+from voice_assistant.tools.schemas import ToolResult
+
+
+class LatencyDistribution(BaseModel):
+    """延遲分布（對數常態，以中位數與 sigma 描述）。"""
+
+    median_ms: float = Field(default=0.0, ge=0, description="延遲中位數（毫秒）")
+    sigma: float = Field(
+        default=0.0, ge=0, description="對數常態分布的 sigma（0 為固定延遲）"
+    )
+
+    def sample(self, rng: random.Random) -> float:
+        """取樣一次延遲。
+
+        Args:
+            rng: 亂數產生器（呼叫端決定種子以維持可重現性）
+
+        Returns:
+            延遲毫秒數
+        """
+        if self.median_ms <= 0:
+            return 0.0
+        if self.sigma == 0:
+            return self.median_ms
+        return self.median_ms * math.exp(rng.gauss(0.0, self.sigma))
+
+
+class ScriptedToolCall(BaseModel):
+    """LLM 替身回覆的工具呼叫。"""
+
+    name: str
+    arguments: dict[str, Any] = Field(default_factory=dict)
+
+
+class LLMRule(BaseModel):
+    """LLM 替身的回應規則（依序比對，第一個符合者生效）。
+
+    未設定的條件不參與比對。
+    """
+
+    system_contains: str | None = Field(
+        default=None, description="system prompt 需包含的文字"
+    )
+    user_contains: str | None = Field(
+        default=None, description="最後一則使用者訊息需包含的文字"
+    )
+    after_tool: bool | None = Field(
+        default=None, description="最後一則訊息是否為工具結果"
+    )
+    with_tools: bool | None = Field(default=None, description="請求是否帶有 tools")
+    content: str | None = Field(default=None, description="回覆文字")
+    tool_calls: list[ScriptedToolCall] = Field(default_factory=list)
+
+    def matches(self, messages: list[dict[str, Any]], has_tools: bool) -> bool:
+        """判斷規則是否符合此次請求。
+
+        Args:
+            messages: OpenAI 格式的訊息列表
+            has_tools: 請求是否帶有 tools
+
+        Returns:
+            是否符合
+        """
+        system = "".join(
+            str(m.get("content") or "") for m in messages if m.get("role") == "system"
+        )
+        users = [m for m in messages if m.get("role") == "user"]
+        last_user = str(users[-1].get("content") or "") if users else ""
+        last_role = messages[-1].get("role") if messages else None
+
+        if self.system_contains is not None and self.system_contains not in system:
+            return False
+        if self.user_contains is not None and self.user_contains not in last_user:
+            return False
+        if self.after_tool is not None and self.after_tool != (last_role == "tool"):
+            return False
+        return self.with_tools is None or self.with_tools == has_tools
+
+
+class LLMScript(BaseModel):
+    """LLM 替身的回應腳本與延遲設定。"""
+
+    first_token: LatencyDistribution = Field(
+        default_factory=lambda: LatencyDistribution(median_ms=400, sigma=0.25),
+        description="請求到第一個 token 的延遲",
+    )
+    token_interval: LatencyDistribution = Field(
+        default_factory=lambda: LatencyDistribution(median_ms=30, sigma=0.2),
+        description="串流片段之間的延遲",
+    )
+    chunk_chars: int = Field(default=2, ge=1, description="每個串流片段的字數")
+    default_content: str = Field(default="好的。", description="無規則符合時的回覆")
+    rules: list[LLMRule] = Field(default_factory=list)
+
+    def respond(self, messages: list[dict[str, Any]], has_tools: bool) -> LLMRule:
+        """依規則決定回覆。
+
+        Args:
+            messages: OpenAI 格式的訊息列表
+            has_tools: 請求是否帶有 tools
+
+        Returns:
+            第一個符合的規則（皆不符合時為預設文字回覆）
+        """
+        for rule in self.rules:
+            if rule.matches(messages, has_tools):
+                return rule
+        return LLMRule(content=self.default_content)
+
+
+class ToolRecording(BaseModel):
+    """錄製的工具結果（arguments 為呼叫參數的子集即符合）。"""
+
+    arguments: dict[str, Any] = Field(default_factory=dict)
+    result: ToolResult
+
+
+class ToolFixture(BaseModel):
+    """單一工具的錄製結果與延遲。"""
+
+    name: str
+    latency: LatencyDistribution = Field(default_factory=LatencyDistribution)
+    recordings: list[ToolRecording] = Field(default_factory=list)
+
+    def replay(self, arguments: dict[str, Any]) -> ToolResult:
+        """取得符合參數的錄製結果。
+
+        Args:
+            arguments: 工具呼叫參數
+
+        Returns:
+            第一個符合的錄製結果；皆不符合時為失敗結果
+        """
+        for recording in self.recordings:
+            if all(arguments.get(k) == v for k, v in recording.arguments.items()):
+                return recording.result
+        return ToolResult.fail(f"no_recording: {self.name} 沒有符合參數的錄製結果")
+
+
+class Utterance(BaseModel):
+    """語料中的一句使用者語音。"""
+
+    id: str
+    text: str = Field(description="語句文字（合成音訊與檢查辨識結果用）")
+    audio: str = Field(description="WAV 檔名（相對於 audio_dir）")
+
+
+class BenchCorpus(BaseModel):
+    """基準測試語料。"""
+
+    seed: int = Field(default=0, description="延遲取樣的種子")
+    audio_dir: str = Field(
+        default="tests/fixtures/audio_samples",
+        description="語句音訊目錄（相對路徑以語料檔所在的專案根目錄為準）",
+    )
+    llm: LLMScript = Field(default_factory=LLMScript)
+    tools: list[ToolFixture] = Field(default_factory=list)
+    utterances: list[Utterance] = Field(default_factory=list)
+
+    @classmethod
+    def load(cls, path: str | Path) -> BenchCorpus:
+        """從 JSON 檔載入語料。
+
+        Args:
+            path: 語料 JSON 路徑
+
+        Returns:
+            BenchCorpus
+        """
+        with Path(path).open(encoding="utf-8") as f:
+            return cls.model_validate(json.load(f))
+
+    def audio_path(self, utterance: Utterance, root: str | Path = ".") -> Path:
+        """取得語句音訊的路徑。
+
+        Args:
+            utterance: 語句
+            root: 相對路徑的基準目錄
+
+        Returns:
+            WAV 檔路徑
+        """
+        return Path(root) / self.audio_dir / utterance.audio
+
+
+def seeded_rng(seed: int, *parts: Any) -> random.Random:
+    """以種子與請求內容建立亂數產生器。
+
+    並行請求的到達順序不固定，因此延遲以「內容 + 第幾次出現」決定，
+    而不是共用一個依序取樣的產生器。
+
+    Args:
+        seed: 語料種子
+        *parts: 決定取樣的內容（可 JSON 序列化）
+
+    Returns:
+        random.Random
+    """
+    key = json.dumps([seed, *parts], ensure_ascii=False, sort_keys=True, default=str)
+    return random.Random(key)
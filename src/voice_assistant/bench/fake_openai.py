@@ -0,0 +1,218 @@
+"""Fake OpenAI server.
+
+本地的 OpenAI Chat Completions 替身伺服器：依腳本回覆文字或工具呼叫，
+並以設定的延遲分布模擬首 token 與串流間隔。LLMClient 以 base_url
+指向此伺服器，走完整的 SDK 與 HTTP 路徑，量測結果包含真實的序列化與
+連線成本。
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import random
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any
+
+from voice_assistant.bench.corpus import LLMRule, LLMScript, seeded_rng
+
+logger = logging.getLogger(__name__)
+
+
+class FakeOpenAIServer:
+    """OpenAI 相容的替身伺服器（背景執行緒）。
+
+    Example:
+        with FakeOpenAIServer(corpus.llm, seed=corpus.seed) as server:
+            llm = LLMClient(api_key="bench", base_url=server.base_url)
+    """
+
+    def __init__(
+        self,
+        script: LLMScript,
+        seed: int = 0,
+        host: str = "127.0.0.1",
+        port: int = 0,
+    ) -> None:
+        """初始化伺服器（尚未開始接受連線）。
+
+        Args:
+            script: 回應腳本與延遲設定
+            seed: 延遲取樣的種子
+            host: 監聽位址
+            port: 監聽埠號（0 表示自動選擇）
+        """
+        self.script = script
+        self.seed = seed
+        self._occurrences: Counter[str] = Counter()
+        self._lock = threading.Lock()
+        self.request_count = 0
+
+        server = self
+
+        class _Handler(BaseHTTPRequestHandler):
+            def do_POST(self) -> None:
+                server._handle(self)
+
+            def log_message(self, format: str, *args: Any) -> None:
+                logger.debug(f"[FakeOpenAI] {format % args}")
+
+        self._httpd = ThreadingHTTPServer((host, port), _Handler)
+        self._httpd.daemon_threads = True
+        self._thread: threading.Thread | None = None
+
+    @property
+    def base_url(self) -> str:
+        """LLMClient 使用的 base_url。"""
+        host, port = self._httpd.server_address[:2]
+        return f"http://{host}:{port}/v1"
+
+    def start(self) -> FakeOpenAIServer:
+        """在背景執行緒開始接受連線。"""
+        self._thread = threading.Thread(
+            target=self._httpd.serve_forever, name="fake-openai", daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        """停止伺服器。"""
+        self._httpd.shutdown()
+        self._httpd.server_close()
+        if self._thread is not None:
+            self._thread.join(timeout=5)
+
+    def __enter__(self) -> FakeOpenAIServer:
+        return self.start()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.stop()
+
+    def _handle(self, handler: BaseHTTPRequestHandler) -> None:
+        if not handler.path.rstrip("/").endswith("/chat/completions"):
+            handler.send_error(404, "only /chat/completions is supported")
+            return
+
+        length = int(handler.headers.get("Content-Length") or 0)
+        request = json.loads(handler.rfile.read(length) or b"{}")
+        messages = request.get("messages", [])
+        has_tools = bool(request.get("tools"))
+        rule = self.script.respond(messages, has_tools)
+
+        # 相同內容的請求每次取樣相同的延遲（與並行請求的到達順序無關）
+        key = json.dumps(messages, ensure_ascii=False, sort_keys=True)
+        with self._lock:
+            self.request_count += 1
+            self._occurrences[key] += 1
+            occurrence = self._occurrences[key]
+        rng = seeded_rng(self.seed, key, occurrence)
+
+        model = request.get("model", "bench")
+        time.sleep(self.script.first_token.sample(rng) / 1000)
+        if request.get("stream"):
+            self._send_stream(handler, rule, model, rng)
+        else:
+            self._send_completion(handler, rule, model, rng)
+
+    def _content_chunks(self, rule: LLMRule) -> list[str]:
+        content = rule.content or ""
+        size = self.script.chunk_chars
+        return [content[i : i + size] for i in range(0, len(content), size)]
+
+    def _send_completion(
+        self,
+        handler: BaseHTTPRequestHandler,
+        rule: LLMRule,
+        model: str,
+        rng: random.Random,
+    ) -> None:
+        # 非串流回應：整段生成時間後才回傳
+        for _ in self._content_chunks(rule)[1:]:
+            time.sleep(self.script.token_interval.sample(rng) / 1000)
+
+        message: dict[str, Any] = {"role": "assistant", "content": rule.content}
+        if rule.tool_calls:
+            message["tool_calls"] = _tool_calls_payload(rule)
+        body = json.dumps(
+            {
+                "id": "chatcmpl-bench",
+                "object": "chat.completion",
+                "created": 0,
+                "model": model,
+                "choices": [
+                    {
+                        "index": 0,
+                        "message": message,
+                        "finish_reason": _finish_reason(rule),
+                    }
+                ],
+            },
+            ensure_ascii=False,
+        ).encode()
+
+        handler.send_response(200)
+        handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", str(len(body)))
+        handler.end_headers()
+        handler.wfile.write(body)
+
+    def _send_stream(
+        self,
+        handler: BaseHTTPRequestHandler,
+        rule: LLMRule,
+        model: str,
+        rng: random.Random,
+    ) -> None:
+        handler.send_response(200)
+        handler.send_header("Content-Type", "text/event-stream")
+        handler.send_header("Cache-Control", "no-cache")
+        handler.end_headers()
+
+        def send(delta: dict[str, Any], finish_reason: str | None = None) -> None:
+            chunk = {
+                "id": "chatcmpl-bench",
+                "object": "chat.completion.chunk",
+                "created": 0,
+                "model": model,
+                "choices": [
+                    {"index": 0, "delta": delta, "finish_reason": finish_reason}
+                ],
+            }
+            payload = json.dumps(chunk, ensure_ascii=False)
+            handler.wfile.write(f"data: {payload}\n\n".encode())
+            handler.wfile.flush()
+
+        send({"role": "assistant", "content": ""})
+        for i, text in enumerate(self._content_chunks(rule)):
+            if i:
+                time.sleep(self.script.token_interval.sample(rng) / 1000)
+            send({"content": text})
+        if rule.tool_calls:
+            send({"tool_calls": _tool_calls_payload(rule, with_index=True)})
+        send({}, finish_reason=_finish_reason(rule))
+        handler.wfile.write(b"data: [DONE]\n\n")
+        handler.wfile.flush()
+
+
+def _tool_calls_payload(rule: LLMRule, with_index: bool = False) -> list[dict]:
+    calls = []
+    for i, call in enumerate(rule.tool_calls):
+        payload: dict[str, Any] = {
+            "id": f"call_bench_{i}",
+            "type": "function",
+            "function": {
+                "name": call.name,
+                "arguments": json.dumps(call.arguments, ensure_ascii=False),
+            },
+        }
+        if with_index:
+            payload["index"] = i
+        calls.append(payload)
+    return calls
+
+
+def _finish_reason(rule: LLMRule) -> str:
+    return "tool_calls" if rule.tool_calls else "stop"
@@ -0,0 +1,338 @@
+"""Benchmark runner.
+
+以固定語料逐句執行完整語音管線（STT → 意圖 → 流程 → TTS），LLM 由
+本地替身伺服器回應、工具回放錄製結果，輸出各階段與端到端的延遲
+百分位數、首段音訊時間（time-to-first-audio）與 STT/TTS 即時率（RTF）。
+
+與先前儲存的基準報告比較時，超過容許幅度的指標列為退步。
+"""
+
+from __future__ import annotations
+
+import time
+import wave
+from collections.abc import Iterator
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from numpy.typing import NDArray
+
+from voice_assistant import tracing
+from voice_assistant.agents import MultiAgentExecutor
+from voice_assistant.bench.corpus import BenchCorpus
+from voice_assistant.bench.fake_openai import FakeOpenAIServer
+from voice_assistant.bench.tools import create_recorded_registry
+from voice_assistant.cancellation import CancelToken
+from voice_assistant.config import FlowMode
+from voice_assistant.flows import FlowExecutor
+from voice_assistant.intent.matcher import SwitchRoleMatcher
+from voice_assistant.intent.recognizer import IntentRecognizer
+from voice_assistant.llm.client import LLMClient
+from voice_assistant.roles.predefined.assistant import AssistantRole
+from voice_assistant.roles.predefined.coach import CoachRole
+from voice_assistant.roles.predefined.interviewer import InterviewerRole
+from voice_assistant.roles.registry import RoleRegistry
+from voice_assistant.voice.async_loop import AsyncLoopThread
+from voice_assistant.voice.pipeline import VoicePipeline
+from voice_assistant.voice.schemas import VoicePipelineConfig
+
+# 報告摘要的指標（名稱 → 追蹤標記）
+SUMMARY_MARKS = {
+    "stt_ms": tracing.MARK_STT_DONE,
+    "time_to_first_audio_ms": tracing.MARK_FIRST_TTS_CHUNK,
+    "end_to_end_ms": tracing.MARK_LAST_TTS_CHUNK,
+}
+
+# 比較基準時檢查的百分位數
+COMPARE_PERCENTILES = ("p50", "p95")
+
+
+class TimedTTS:
+    """量測合成耗時與輸出音訊長度的 TTS 包裝。
+
+    只計算產生每個音訊片段所花的時間，不含管線消費片段的時間。
+    """
+
+    def __init__(self, tts: Any) -> None:
+        """初始化包裝。
+
+        Args:
+            tts: 實作 stream_tts_sync 的 TTS
+        """
+        self._tts = tts
+        self.synthesis_s = 0.0
+        self.audio_s = 0.0
+
+    def stream_tts_sync(
+        self, text: str, cancel_token: CancelToken | None = None
+    ) -> Iterator[tuple[int, NDArray[np.float32]]]:
+        """串流合成並累計耗時與音訊長度。"""
+        chunks = iter(self._tts.stream_tts_sync(text, cancel_token=cancel_token))
+        while True:
+            start = time.perf_counter()
+            try:
+                sample_rate, chunk = next(chunks)
+            except StopIteration:
+                self.synthesis_s += time.perf_counter() - start
+                return
+            self.synthesis_s += time.perf_counter() - start
+            self.audio_s += np.asarray(chunk).size / sample_rate
+            yield sample_rate, chunk
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._tts, name)
+
+
+def load_wav(path: str | Path) -> tuple[int, NDArray[np.int16]]:
+    """載入 16-bit mono WAV（轉為 FastRTC 的 (1, N) int16 格式）。
+
+    Args:
+        path: WAV 檔路徑
+
+    Returns:
+        (sample_rate, audio_array)
+    """
+    with wave.open(str(path), "rb") as wav:
+        sample_rate = wav.getframerate()
+        frames = wav.readframes(wav.getnframes())
+    return sample_rate, np.frombuffer(frames, dtype=np.int16).reshape(1, -1)
+
+
+def save_wav(path: str | Path, audio: tuple[int, NDArray]) -> None:
+    """儲存 16-bit mono WAV。
+
+    Args:
+        path: 輸出路徑
+        audio: (sample_rate, audio_array)，float 以 [-1, 1] 轉為 int16
+    """
+    sample_rate, array = audio
+    array = np.asarray(array).reshape(-1)
+    if np.issubdtype(array.dtype, np.floating):
+        array = (np.clip(array, -1.0, 1.0) * 32767).astype(np.int16)
+    path = Path(path)
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with wave.open(str(path), "wb") as wav:
+        wav.setnchannels(1)
+        wav.setsampwidth(2)
+        wav.setframerate(sample_rate)
+        wav.writeframes(array.astype(np.int16).tobytes())
+
+
+def percentiles(values: list[float]) -> dict[str, float]:
+    """計算 p50/p95/p99。
+
+    Args:
+        values: 樣本
+
+    Returns:
+        {"count": n, "p50": ..., "p95": ..., "p99": ...}（無樣本時只有 count）
+    """
+    if not values:
+        return {"count": 0}
+    result = np.percentile(values, tracing.PERCENTILES)
+    return {"count": len(values)} | {
+        f"p{p}": round(float(v), 3)
+        for p, v in zip(tracing.PERCENTILES, result, strict=True)
+    }
+
+
+def run_benchmark(
+    corpus: BenchCorpus,
+    stt: Any,
+    tts: Any,
+    flow_mode: FlowMode = FlowMode.MULTI_AGENT,
+    config: VoicePipelineConfig | None = None,
+    repeat: int = 1,
+    warmup: int = 1,
+    root: str | Path = ".",
+) -> dict[str, Any]:
+    """執行基準測試。
+
+    Args:
+        corpus: 基準測試語料
+        stt: STT 實例（所有語句共用，模型載入不計入量測）
+        tts: TTS 實例
+        flow_mode: 流程模式
+        config: 管線配置（可選，預設使用 VoicePipelineConfig()）
+        repeat: 每句重複次數
+        warmup: 正式量測前不計入的暖身輪數
+        root: 語料音訊相對路徑的基準目錄
+
+    Returns:
+        JSON 可序列化的報告
+    """
+    config = config or VoicePipelineConfig()
+    audio = {u.id: load_wav(corpus.audio_path(u, root)) for u in corpus.utterances}
+    turns = [u for _ in range(repeat) for u in corpus.utterances]
+    if not turns:
+        raise ValueError("語料沒有任何語句")
+
+    timed_tts = TimedTTS(tts)
+    tracer = tracing.TraceRecorder(buffer_size=len(turns))
+    async_loop = AsyncLoopThread(name="bench-loop")
+
+    with FakeOpenAIServer(corpus.llm, seed=corpus.seed) as server:
+        llm_client = LLMClient(api_key="bench", model="bench", base_url=server.base_url)
+        tool_registry = create_recorded_registry(corpus.tools, seed=corpus.seed)
+        async_loop.add_shutdown_callback(llm_client.aclose)
+
+        role_registry = RoleRegistry()
+        for role in (AssistantRole(), CoachRole(), InterviewerRole()):
+            role_registry.register(role)
+
+        pipeline = VoicePipeline(
+            config=config,
+            llm_client=llm_client,
+            stt=stt,
+            tts=timed_tts,
+            tool_registry=tool_registry,
+            intent_recognizer=IntentRecognizer(
+                llm_client, matcher=SwitchRoleMatcher(role_registry)
+            ),
+            role_registry=role_registry,
+            flow_executor=(
+                FlowExecutor(llm_client, tool_registry)
+                if flow_mode == FlowMode.LANGGRAPH
+                else None
+            ),
+            multi_agent_executor=(
+                MultiAgentExecutor(llm_client, tool_registry)
+                if flow_mode == FlowMode.MULTI_AGENT
+                else None
+            ),
+            async_loop=async_loop,
+            flow_mode=flow_mode,
+        )
+
+        try:
+            # 暖身：模型首次推論、連線建立等一次性成本不計入
+            for i in range(warmup):
+                utterance = turns[i % len(turns)]
+                _run_turn(pipeline, audio[utterance.id])
+
+            pipeline.tracer = tracer
+            results = []
+            for utterance in turns:
+                stt_audio_s = audio[utterance.id][1].size / audio[utterance.id][0]
+                tts_before = (timed_tts.synthesis_s, timed_tts.audio_s)
+                transcript = _run_turn(pipeline, audio[utterance.id])
+                record = tracer.recent(1)[0]
+                synthesis_s = timed_tts.synthesis_s - tts_before[0]
+                tts_audio_s = timed_tts.audio_s - tts_before[1]
+                stt_ms = record["marks"].get(tracing.MARK_STT_DONE)
+                results.append(
+                    {
+                        "id": utterance.id,
+                        "expected": utterance.text,
+                        "transcript": transcript,
+                        "response": pipeline.state.last_assistant_text,
+                        "transcript_match": _normalize(transcript)
+                        == _normalize(utterance.text),
+                        "audio_s": round(stt_audio_s, 3),
+                        "stt_rtf": (
+                            round(stt_ms / 1000 / stt_audio_s, 4)
+                            if stt_ms is not None and stt_audio_s
+                            else None
+                        ),
+                        "tts_rtf": (
+                            round(synthesis_s / tts_audio_s, 4) if tts_audio_s else None
+                        ),
+                        "marks": record["marks"],
+                        "total_ms": record["total_ms"],
+                    }
+                )
+            llm_requests = server.request_count
+        finally:
+            pipeline.close()
+            async_loop.shutdown()
+
+    return _build_report(results, tracer, flow_mode, llm_requests)
+
+
+def _run_turn(pipeline: VoicePipeline, audio: tuple[int, NDArray[np.int16]]) -> str:
+    # 每輪從相同的初始狀態開始，回應不受先前對話影響；不設定角色，
+    # 以免角色偏好的流程模式覆蓋指定的 flow_mode
+    pipeline.reset()
+    for _ in pipeline.process_audio_with_outputs(audio):
+        pass
+    return pipeline.state.last_user_text or ""
+
+
+def _normalize(text: str) -> str:
+    return "".join(ch for ch in text if ch.isalnum()).lower()
+
+
+def _build_report(
+    results: list[dict[str, Any]],
+    tracer: tracing.TraceRecorder,
+    flow_mode: FlowMode,
+    llm_requests: int,
+) -> dict[str, Any]:
+    summary = {
+        name: percentiles([r["marks"][mark] for r in results if mark in r["marks"]])
+        for name, mark in SUMMARY_MARKS.items()
+    }
+    for name in ("stt_rtf", "tts_rtf"):
+        summary[name] = percentiles([r[name] for r in results if r[name] is not None])
+
+    return {
+        "created_at": datetime.now().isoformat(),
+        "flow_mode": flow_mode.value,
+        "turns": len(results),
+        "llm_requests": llm_requests,
+        "transcript_mismatches": sum(not r["transcript_match"] for r in results),
+        "summary": summary,
+        "stages": tracer.percentiles(),
+        "utterances": results,
+    }
+
+
+def compare_reports(
+    baseline: dict[str, Any],
+    current: dict[str, Any],
+    tolerance: float = 0.10,
+    min_delta_ms: float = 5.0,
+    min_delta_rtf: float = 0.01,
+) -> list[dict[str, Any]]:
+    """比較兩份報告的摘要與各階段百分位數。
+
+    指標皆為越低越好；超過基準 (1 + tolerance) 倍且絕對差距超過
+    最小幅度（避免極短階段的雜訊）才視為退步。
+
+    Args:
+        baseline: 基準報告
+        current: 本次報告
+        tolerance: 容許的相對增幅
+        min_delta_ms: 延遲指標的最小絕對差距（毫秒）
+        min_delta_rtf: RTF 指標的最小絕對差距
+
+    Returns:
+        每個可比較指標一筆 {"metric", "baseline", "current", "change", "regression"}
+    """
+    rows = []
+    sections = (
+        ("summary", baseline.get("summary", {}), current.get("summary", {})),
+        ("stages", baseline.get("stages", {}), current.get("stages", {})),
+    )
+    for section, base_metrics, cur_metrics in sections:
+        for name in sorted(base_metrics.keys() & cur_metrics.keys()):
+            min_delta = min_delta_rtf if name.endswith("_rtf") else min_delta_ms
+            for p in COMPARE_PERCENTILES:
+                base = base_metrics[name].get(p)
+                cur = cur_metrics[name].get(p)
+                if base is None or cur is None:
+                    continue
+                change = (cur - base) / base if base else 0.0
+                rows.append(
+                    {
+                        "metric": f"{section}.{name}.{p}",
+                        "baseline": base,
+                        "current": cur,
+                        "change": round(change, 4),
+                        "regression": cur > base * (1 + tolerance)
+                        and cur - base > min_delta,
+                    }
+                )
+    return rows
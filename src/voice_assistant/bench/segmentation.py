@@ -0,0 +1,115 @@
+"""Segmentation strategy benchmark.
+
+比較斷句策略的首段音訊時間（time-to-first-audio）：以語料 LLM 腳本的
+串流參數（每片段字數、片段間隔）模擬回應文字逐段到達，送入各策略的
+斷句器，第一段完成後實際以 TTS 合成並量測首個音訊片段的時間。
+
+首段音訊時間 = 第一段文字就緒的模擬時間 + 第一段合成到首個片段的
+實測時間（皆從第一個 token 起算，不含 LLM 首 token 延遲）。
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Iterable
+from typing import Any
+
+from voice_assistant.bench.corpus import BenchCorpus
+from voice_assistant.bench.runner import percentiles
+from voice_assistant.voice.schemas import SegmentationConfig
+from voice_assistant.voice.tts.segmenter import create_segmenter
+
+
+def response_texts(corpus: BenchCorpus) -> list[str]:
+    """取出語料 LLM 腳本中朗讀給使用者的回覆（排除 JSON 與空回覆）。
+
+    Args:
+        corpus: 基準測試語料
+
+    Returns:
+        回覆文字列表
+    """
+    contents = [rule.content for rule in corpus.llm.rules]
+    return [
+        text
+        for text in (*contents, corpus.llm.default_content)
+        if text and not text.lstrip().startswith("{")
+    ]
+
+
+def _first_segment(
+    text: str, config: SegmentationConfig, chunk_chars: int
+) -> tuple[str, int, int]:
+    """模擬串流斷句，回傳（第一段, 第一段就緒時已收到的片段數, 總段數）"""
+    segmenter = create_segmenter(config)
+    deltas = [text[i : i + chunk_chars] for i in range(0, len(text), chunk_chars)]
+    first: tuple[str, int] | None = None
+    count = 0
+    for received, delta in enumerate(deltas, start=1):
+        segments = segmenter.push(delta)
+        if segments and first is None:
+            first = (segments[0], received)
+        count += len(segments)
+    if tail := segmenter.flush():
+        count += 1
+        if first is None:
+            first = (tail, len(deltas))
+    segment, received = first or ("", len(deltas))
+    return segment, received, count
+
+
+def run_segmentation_benchmark(
+    texts: Iterable[str],
+    tts: Any,
+    strategies: dict[str, SegmentationConfig],
+    chunk_chars: int = 2,
+    token_interval_ms: float = 30.0,
+    repeat: int = 1,
+) -> dict[str, Any]:
+    """比較各斷句策略的首段音訊時間。
+
+    Args:
+        texts: 回覆文字
+        tts: 實作 stream_tts_sync() 的合成器
+        strategies: {名稱: 斷句配置}
+        chunk_chars: 每個串流片段的字數
+        token_interval_ms: 串流片段之間的間隔（毫秒）
+        repeat: 每句重複次數
+
+    Returns:
+        {"chunk_chars", "token_interval_ms", "strategies": {名稱: {
+        "first_audio_ms", "text_ready_ms", "synth_first_ms",
+        "first_segment_chars", "segments"}}}（數值為 percentiles() 格式）
+    """
+    texts = list(texts)
+    results: dict[str, Any] = {}
+    for name, config in strategies.items():
+        metrics: dict[str, list[float]] = {
+            "first_audio_ms": [],
+            "text_ready_ms": [],
+            "synth_first_ms": [],
+            "first_segment_chars": [],
+            "segments": [],
+        }
+        for _ in range(repeat):
+            for text in texts:
+                segment, received, count = _first_segment(text, config, chunk_chars)
+                # 第一個片段於時間 0 到達
+                ready_ms = (received - 1) * token_interval_ms
+                start = time.perf_counter()
+                first_chunk = None
+                for _chunk in tts.stream_tts_sync(segment):
+                    if first_chunk is None:
+                        first_chunk = time.perf_counter()
+                synth_ms = ((first_chunk or time.perf_counter()) - start) * 1000
+                metrics["first_audio_ms"].append(ready_ms + synth_ms)
+                metrics["text_ready_ms"].append(ready_ms)
+                metrics["synth_first_ms"].append(synth_ms)
+                metrics["first_segment_chars"].append(len(segment))
+                metrics["segments"].append(count)
+        results[name] = {key: percentiles(values) for key, values in metrics.items()}
+    return {
+        "chunk_chars": chunk_chars,
+        "token_interval_ms": token_interval_ms,
+        "strategies": results,
+    }
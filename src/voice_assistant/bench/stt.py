@@ -0,0 +1,177 @@
+"""STT engine benchmark.
+
+以同一份語料比較多個 STT 引擎（STTModel）：整句辨識延遲、即時率（RTF）、
+字元錯誤率（CER），以及串流引擎在使用者停頓後取得最終結果所需的時間。
+在目標機器上執行，依結果選擇該 CPU 最快且準確度可接受的引擎。
+"""
+
+from __future__ import annotations
+
+import time
+from collections.abc import Callable
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from numpy.typing import NDArray
+
+from voice_assistant.bench.corpus import BenchCorpus
+from voice_assistant.bench.runner import load_wav, percentiles
+from voice_assistant.voice.echo import normalize_text
+from voice_assistant.voice.stt.base import StreamingSTTModel, STTModel
+
+# 串流辨識時每次送入的音訊長度（毫秒），接近 FastRTC 的收音區塊
+DEFAULT_CHUNK_MS = 200
+
+
+def character_error_rate(reference: str, hypothesis: str) -> float:
+    """字元錯誤率（忽略空白、標點與大小寫）。
+
+    Args:
+        reference: 參考文字
+        hypothesis: 辨識結果
+
+    Returns:
+        編輯距離 / 參考文字長度（參考為空時，辨識結果非空即為 1.0）
+    """
+    ref = normalize_text(reference)
+    hyp = normalize_text(hypothesis)
+    if not ref:
+        return float(bool(hyp))
+    previous = list(range(len(hyp) + 1))
+    for i, r in enumerate(ref, 1):
+        current = [i]
+        for j, h in enumerate(hyp, 1):
+            current.append(
+                min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (r != h))
+            )
+        previous = current
+    return previous[-1] / len(ref)
+
+
+def run_stt_benchmark(
+    corpus: BenchCorpus,
+    engines: dict[str, STTModel],
+    sessions: dict[str, Callable[[], StreamingSTTModel]] | None = None,
+    repeat: int = 1,
+    warmup: int = 1,
+    root: str | Path = ".",
+    chunk_ms: int = DEFAULT_CHUNK_MS,
+    realtime: bool = True,
+) -> dict[str, Any]:
+    """以語料比較多個 STT 引擎。
+
+    Args:
+        corpus: 基準測試語料（utterances 的 text 作為參考文字）
+        engines: 引擎名稱 → 整句辨識的 STTModel
+        sessions: 引擎名稱 → 建立串流辨識器的函式（可選；提供時另量測
+            停頓後取得最終結果的時間）
+        repeat: 每句重複次數
+        warmup: 每個引擎不計入的暖身輪數（以第一句語料執行）
+        root: 語料音訊相對路徑的基準目錄
+        chunk_ms: 串流辨識每次送入的音訊長度（毫秒）
+        realtime: 串流辨識是否依實際時間送入音訊（False 時連續送入，
+            停頓後的時間會包含積壓的解碼）
+
+    Returns:
+        JSON 可序列化的報告；ranking 依整句辨識延遲 p50 由快到慢排列
+    """
+    sessions = sessions or {}
+    clips = [
+        (utterance, load_wav(corpus.audio_path(utterance, root)))
+        for utterance in corpus.utterances
+    ]
+
+    results: dict[str, dict[str, Any]] = {}
+    for name, stt in engines.items():
+        for _ in range(warmup if clips else 0):
+            stt.stt(clips[0][1])
+
+        make_session = sessions.get(name)
+        session = make_session() if make_session is not None else None
+        rows = []
+        try:
+            for _ in range(repeat):
+                for utterance, audio in clips:
+                    row = _measure_batch(stt, utterance.text, audio)
+                    if session is not None:
+                        row |= _measure_streaming(
+                            session, utterance.text, audio, chunk_ms, realtime
+                        )
+                    rows.append(row)
+        finally:
+            if session is not None:
+                session.close()
+        results[name] = _summarize(rows)
+
+    ranking = sorted(
+        (name for name in results if results[name]["latency_ms"].get("count")),
+        key=lambda name: results[name]["latency_ms"]["p50"],
+    )
+    return {
+        "created_at": datetime.now().isoformat(),
+        "utterances": len(clips),
+        "repeat": repeat,
+        "engines": results,
+        "ranking": ranking,
+    }
+
+
+def _measure_batch(
+    stt: STTModel, reference: str, audio: tuple[int, NDArray[np.int16]]
+) -> dict[str, Any]:
+    sample_rate, array = audio
+    duration_s = np.asarray(array).size / sample_rate
+    start = time.perf_counter()
+    text = stt.stt(audio)
+    elapsed_s = time.perf_counter() - start
+    return {
+        "text": text,
+        "latency_ms": round(elapsed_s * 1000, 3),
+        "rtf": round(elapsed_s / duration_s, 4) if duration_s else None,
+        "cer": round(character_error_rate(reference, text), 4),
+    }
+
+
+def _measure_streaming(
+    session: StreamingSTTModel,
+    reference: str,
+    audio: tuple[int, NDArray[np.int16]],
+    chunk_ms: int,
+    realtime: bool,
+) -> dict[str, Any]:
+    sample_rate, array = audio
+    array = np.asarray(array).reshape(-1)
+    step = max(sample_rate * chunk_ms // 1000, 1)
+    session.reset()
+    for end in range(step, len(array) + step, step):
+        session.push_frames((sample_rate, array[: min(end, len(array))]))
+        if realtime:
+            time.sleep(step / sample_rate)
+    # 停頓偵測觸發時的完整語句
+    start = time.perf_counter()
+    result = session.finalize((sample_rate, array))
+    return {
+        "streaming_text": result.text,
+        "finalize_ms": round((time.perf_counter() - start) * 1000, 3),
+        "streaming_cer": round(character_error_rate(reference, result.text), 4),
+    }
+
+
+def _summarize(rows: list[dict[str, Any]]) -> dict[str, Any]:
+    def values(key: str) -> list[float]:
+        return [row[key] for row in rows if row.get(key) is not None]
+
+    summary: dict[str, Any] = {
+        "latency_ms": percentiles(values("latency_ms")),
+        "rtf": percentiles(values("rtf")),
+        "mean_cer": round(float(np.mean(values("cer"))), 4) if rows else None,
+    }
+    if any("finalize_ms" in row for row in rows):
+        summary["finalize_ms"] = percentiles(values("finalize_ms"))
+        summary["mean_streaming_cer"] = round(
+            float(np.mean(values("streaming_cer"))), 4
+        )
+    summary["utterances"] = rows
+    return summary
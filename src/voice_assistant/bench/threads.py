@@ -0,0 +1,118 @@
+"""Thread allocation benchmark.
+
+以 N 個同時進行的會話重複執行「辨識 → 合成」，量測各執行緒分配下的
+吞吐量（每秒完成輪數）與每輪延遲，找出本機在預期併發數下最佳的
+STT/TTS 執行緒分配。LLM 與工具不參與（與執行緒分配無關）。
+"""
+
+from __future__ import annotations
+
+import threading
+import time
+from collections.abc import Iterable
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+from voice_assistant.bench.corpus import BenchCorpus
+from voice_assistant.bench.runner import load_wav, percentiles
+from voice_assistant.threads import ThreadBudget, plan_thread_budget
+
+
+def sweep_allocations(
+    total: int,
+    stt_workers: Iterable[int] = (1, 2),
+    stt_shares: Iterable[float] = (0.25, 0.5, 0.75),
+    tts_interop_threads: int = 1,
+) -> list[ThreadBudget]:
+    """列出要比較的執行緒分配（去除重複）。
+
+    Args:
+        total: 可用 CPU 執行緒數
+        stt_workers: STT worker 數的候選值
+        stt_shares: STT 佔比的候選值
+        tts_interop_threads: PyTorch inter-op 執行緒數
+
+    Returns:
+        不重複的 ThreadBudget 列表
+    """
+    budgets: list[ThreadBudget] = []
+    for workers in stt_workers:
+        for share in stt_shares:
+            budget = plan_thread_budget(
+                total,
+                stt_workers=workers,
+                stt_share=share,
+                tts_interop_threads=tts_interop_threads,
+            )
+            if budget not in budgets:
+                budgets.append(budget)
+    return budgets
+
+
+def run_concurrency_benchmark(
+    corpus: BenchCorpus,
+    stt: Any,
+    tts: Any,
+    sessions: int,
+    turns: int = 3,
+    root: str | Path = ".",
+) -> dict[str, Any]:
+    """以 N 個同時進行的會話量測吞吐量與延遲。
+
+    每個會話依序處理 turns 輪；每輪辨識一句語料音訊，並以該句文字
+    代替回應送入 TTS，消費完所有音訊片段才算完成。
+
+    Args:
+        corpus: 基準測試語料
+        stt: 實作 stt() 的辨識器（多會話共用，例如 STTWorkerPool）
+        tts: 實作 stream_tts_sync() 的合成器（多會話共用）
+        sessions: 同時進行的會話數
+        turns: 每個會話的輪數
+        root: 語料音訊相對路徑的基準目錄
+
+    Returns:
+        {"sessions", "turns", "throughput_tps", "stt_ms", "first_audio_ms",
+        "turn_ms"}（延遲為 percentiles() 格式）
+    """
+    clips = [
+        (utterance.text, load_wav(corpus.audio_path(utterance, root)))
+        for utterance in corpus.utterances
+    ]
+    lock = threading.Lock()
+    stt_ms: list[float] = []
+    first_audio_ms: list[float] = []
+    turn_ms: list[float] = []
+
+    def run_session(index: int) -> None:
+        for turn in range(turns):
+            text, audio = clips[(index + turn) % len(clips)]
+            start = time.perf_counter()
+            stt.stt(audio)
+            stt_done = time.perf_counter()
+            first_chunk = None
+            for _chunk in tts.stream_tts_sync(text):
+                if first_chunk is None:
+                    first_chunk = time.perf_counter()
+            end = time.perf_counter()
+            with lock:
+                stt_ms.append((stt_done - start) * 1000)
+                first_audio_ms.append(((first_chunk or end) - start) * 1000)
+                turn_ms.append((end - start) * 1000)
+
+    start = time.perf_counter()
+    if clips:
+        with ThreadPoolExecutor(
+            max_workers=sessions, thread_name_prefix="bench-session"
+        ) as executor:
+            for future in [executor.submit(run_session, i) for i in range(sessions)]:
+                future.result()
+    elapsed_s = time.perf_counter() - start
+    return {
+        "sessions": sessions,
+        "turns": len(turn_ms),
+        "throughput_tps": round(len(turn_ms) / elapsed_s, 3) if elapsed_s else 0.0,
+        "stt_ms": percentiles(stt_ms),
+        "first_audio_ms": percentiles(first_audio_ms),
+        "turn_ms": percentiles(turn_ms),
+    }
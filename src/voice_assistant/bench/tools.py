@@ -0,0 +1,94 @@
+"""Recorded tools.
+
+以錄製結果取代真實外部 API 的工具：沿用真實工具的名稱與參數定義
+（LLM 看到的 tools 與正式環境相同），執行時依參數回放錄製的結果，
+並依語料設定的延遲分布等待。
+"""
+
+from __future__ import annotations
+
+import asyncio
+from collections import Counter
+from typing import Any
+
+from voice_assistant.bench.corpus import ToolFixture, seeded_rng
+from voice_assistant.tools.base import BaseTool
+from voice_assistant.tools.exchange_rate import ExchangeRateTool
+from voice_assistant.tools.registry import ToolRegistry
+from voice_assistant.tools.schemas import ToolResult
+from voice_assistant.tools.stock_price import StockPriceTool
+from voice_assistant.tools.weather import WeatherTool
+
+
+class RecordedTool(BaseTool):
+    """回放錄製結果的工具。
+
+    Args:
+        source: 提供名稱、描述與參數定義的真實工具（不會被執行）
+        fixture: 錄製結果與延遲分布
+        seed: 延遲取樣的種子
+    """
+
+    def __init__(self, source: BaseTool, fixture: ToolFixture, seed: int = 0) -> None:
+        """初始化錄製工具。"""
+        if source.name != fixture.name:
+            raise ValueError(
+                f"錄製結果 '{fixture.name}' 與工具 '{source.name}' 名稱不符"
+            )
+        self._source = source
+        self._fixture = fixture
+        self._seed = seed
+        self._occurrences: Counter[str] = Counter()
+        self.calls: list[dict[str, Any]] = []
+
+    @property
+    def name(self) -> str:
+        """工具名稱（與真實工具相同）。"""
+        return self._source.name
+
+    @property
+    def description(self) -> str:
+        """工具描述（與真實工具相同）。"""
+        return self._source.description
+
+    @property
+    def parameters(self) -> dict[str, Any]:
+        """參數定義（與真實工具相同）。"""
+        return self._source.parameters
+
+    async def execute(self, **kwargs: Any) -> ToolResult:
+        """依參數回放錄製結果。"""
+        self.calls.append(kwargs)
+        key = repr(sorted(kwargs.items()))
+        self._occurrences[key] += 1
+        rng = seeded_rng(self._seed, self.name, key, self._occurrences[key])
+        await asyncio.sleep(self._fixture.latency.sample(rng) / 1000)
+        return self._fixture.replay(kwargs)
+
+
+def create_recorded_registry(
+    fixtures: list[ToolFixture], seed: int = 0
+) -> ToolRegistry:
+    """建立以錄製結果回放的工具註冊表。
+
+    Args:
+        fixtures: 各工具的錄製結果
+        seed: 延遲取樣的種子
+
+    Returns:
+        ToolRegistry（工具定義與正式環境相同）
+
+    Raises:
+        ValueError: 錄製結果對應不到已知工具時
+    """
+    sources: dict[str, BaseTool] = {
+        tool.name: tool
+        for tool in (WeatherTool(), ExchangeRateTool(), StockPriceTool())
+    }
+    registry = ToolRegistry()
+    for fixture in fixtures:
+        source = sources.get(fixture.name)
+        if source is None:
+            raise ValueError(f"未知的工具: {fixture.name}")
+        registry.register(RecordedTool(source, fixture, seed=seed))
+    return registry
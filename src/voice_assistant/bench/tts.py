@@ -0,0 +1,44 @@
+"""TTS output comparison.
+
+比較兩個 TTS 後端（或量化前後）對同一段文字的合成結果。Kokoro 的聲源
+含隨機相位與雜訊，同一個模型連續合成兩次的波形也不相同，因此以頻譜
+距離而非逐點誤差比較；同模型兩次合成的距離即為雜訊基準。
+"""
+
+from __future__ import annotations
+
+import numpy as np
+from numpy.typing import NDArray
+
+# STFT 參數（24kHz 下約 43ms 視窗、11ms 位移）
+N_FFT = 1024
+HOP_LENGTH = 256
+
+
+def _power_spectrogram(samples: NDArray[np.float32]) -> NDArray[np.float64]:
+    samples = np.asarray(samples, dtype=np.float64).reshape(-1)
+    if len(samples) < N_FFT:
+        samples = np.pad(samples, (0, N_FFT - len(samples)))
+    frames = np.lib.stride_tricks.sliding_window_view(samples, N_FFT)[::HOP_LENGTH]
+    return np.abs(np.fft.rfft(frames * np.hanning(N_FFT), axis=-1)) ** 2
+
+
+def log_spectral_distance(
+    reference: NDArray[np.float32], candidate: NDArray[np.float32]
+) -> float:
+    """對數頻譜距離（dB，兩者裁切為相同長度後逐音框計算再平均）。
+
+    Args:
+        reference: 參考音訊
+        candidate: 比較的音訊（取樣率需與參考相同）
+
+    Returns:
+        距離（0 表示頻譜相同；任一方為空時為 inf）
+    """
+    length = min(len(reference), len(candidate))
+    if length == 0:
+        return float("inf")
+    eps = 1e-10
+    ref_db = 10 * np.log10(_power_spectrogram(reference[:length]) + eps)
+    cand_db = 10 * np.log10(_power_spectrogram(candidate[:length]) + eps)
+    return float(np.mean(np.sqrt(np.mean((ref_db - cand_db) ** 2, axis=-1))))
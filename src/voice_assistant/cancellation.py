@@ -0,0 +1,159 @@
+"""Per-turn cancellation.
+
+使用者插話（barge-in）或新一輪語音開始時，上一輪尚未完成的工作
+（LangGraph 流程、代理、工具呼叫、LLM 串流、TTS 合成）都應立即停止，
+而不只是停止播放音訊。
+
+每輪建立一個 CancelToken：
+- 背景 loop 上的 coroutine 以 cancellable() 包裝，token 取消時直接取消該
+  asyncio task，所有 await 中的 HTTP 請求與 LLM 串流隨之中止
+- 同步程式碼（TTS 產生器）於片段之間檢查 token.cancelled
+
+目前的 token 以 ContextVar 傳遞，LangGraph 節點中的工具呼叫
+（asyncio task 會複製 context）不需額外傳參即可取得。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+from collections.abc import Callable, Coroutine
+from contextvars import ContextVar
+from typing import Any
+
+logger = logging.getLogger(__name__)
+
+
+class TurnCancelledError(Exception):
+    """本輪工作已被取消。"""
+
+
+class CancelToken:
+    """單輪對話的取消權杖（執行緒安全）。
+
+    Example:
+        token = CancelToken()
+        future = loop.submit(cancellable(token, executor.execute(text)))
+        token.cancel()  # 使用者插話
+    """
+
+    def __init__(self) -> None:
+        self._event = threading.Event()
+        self._callbacks: list[Callable[[], None]] = []
+        self._lock = threading.Lock()
+
+    @property
+    def cancelled(self) -> bool:
+        """是否已取消。"""
+        return self._event.is_set()
+
+    def cancel(self) -> bool:
+        """取消本輪工作並執行已註冊的回呼。
+
+        Returns:
+            是否為第一次取消
+        """
+        with self._lock:
+            if self._event.is_set():
+                return False
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception as e:
+                logger.warning(f"[Cancel] 取消回呼執行失敗: {e}")
+        return True
+
+    def add_callback(self, callback: Callable[[], None]) -> Callable[[], None]:
+        """註冊取消時執行的回呼（已取消時立即執行）。
+
+        Args:
+            callback: 取消時呼叫的函式（可能在任意執行緒執行）
+
+        Returns:
+            移除此回呼的函式
+        """
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return lambda: self._remove_callback(callback)
+        callback()
+        return lambda: None
+
+    def _remove_callback(self, callback: Callable[[], None]) -> None:
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+    def child(self) -> CancelToken:
+        """建立子權杖：本權杖取消時一併取消，子權杖也可單獨取消。
+
+        Returns:
+            新的 CancelToken
+        """
+        child = CancelToken()
+        remove = self.add_callback(child.cancel)
+        child.add_callback(remove)
+        return child
+
+    def raise_if_cancelled(self) -> None:
+        """已取消時拋出 TurnCancelledError。"""
+        if self.cancelled:
+            raise TurnCancelledError("本輪工作已取消")
+
+
+_current_cancel_token: ContextVar[CancelToken | None] = ContextVar(
+    "voice_assistant_cancel_token", default=None
+)
+
+
+def current_cancel_token() -> CancelToken | None:
+    """取得目前 context 的取消權杖。"""
+    return _current_cancel_token.get()
+
+
+async def cancellable(
+    token: CancelToken | None,
+    coro: Coroutine[Any, Any, Any],
+) -> Any:
+    """在可取消的 context 中執行 coroutine。
+
+    token 取消時取消目前的 asyncio task，並將 CancelledError 轉為
+    TurnCancelledError。巢狀使用同一個 token 時只有最外層負責取消。
+
+    Args:
+        token: 取消權杖（None 時直接執行）
+        coro: 要執行的 coroutine
+
+    Returns:
+        coroutine 的回傳值
+
+    Raises:
+        TurnCancelledError: token 已取消或執行中被取消
+    """
+    if token is None or _current_cancel_token.get() is token:
+        return await coro
+    if token.cancelled:
+        coro.close()
+        raise TurnCancelledError("本輪工作已取消")
+
+    loop = asyncio.get_running_loop()
+    task = asyncio.current_task()
+    remove = token.add_callback(
+        lambda: loop.call_soon_threadsafe(task.cancel) if task else None
+    )
+    context_token = _current_cancel_token.set(token)
+    try:
+        return await coro
+    except asyncio.CancelledError:
+        if not token.cancelled:
+            raise
+        if task is not None:
+            task.uncancel()
+        raise TurnCancelledError("本輪工作已取消") from None
+    finally:
+        remove()
+        _current_cancel_token.reset(context_token)
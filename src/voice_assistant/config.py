@@ -2,6 +2,7 @@
 
 from enum import Enum
 from functools import lru_cache
+from typing import Literal
 
 from pydantic_settings import BaseSettings
 
@@ -25,17 +26,70 @@ class Settings(BaseSettings):
     # OpenAI
     openai_api_key: str = "sk-test-placeholder-key"
     openai_model: str = "gpt-4o-mini"
+    openai_base_url: str | None = None  # 相容 API 端點（未設定則使用 OpenAI）
+    llm_stream_response: bool = True  # LLM 串流輸出並逐句送入 TTS
+    intent_speculative: bool = True  # 意圖辨識與主流程並行（角色切換時取消主流程）
 
     # STT (Speech-to-Text)
+    stt_backend: Literal["whisper", "sherpa-onnx"] = "whisper"
+    sherpa_model_path: str = "models/sherpa-onnx-streaming-zipformer-zh"
     whisper_model_size: str = "small"
     whisper_model_path: str = "models/whisper"  # 模型快取目錄
     whisper_device: str = "cpu"
     whisper_language: str = "zh"
+    whisper_streaming: bool = False  # 說話期間即串流辨識（停頓後只辨識剩餘音訊）
+    whisper_streaming_interval_ms: int = 500  # 串流辨識間隔
+    whisper_speculative_frames: int = 0  # 部分辨識連續幾次不變即預先執行流程（0 停用）
+    whisper_num_workers: int = 1  # 所有會話共用的 STT worker 數
+    whisper_cpu_threads: int = 0  # 每個 worker 的 CPU 執行緒數（0 依執行緒預算分配）
+    whisper_batch_size: int = 1  # 跨會話合併解碼的最大請求數（1 不合併）
+    whisper_batch_window_ms: int = 10  # 等待其他請求加入批次的毫秒數
+    whisper_single_vad: bool = False  # 沿用 FastRTC VAD 區段，略過 Whisper VAD
+    whisper_adaptive: bool = False  # 依語句長度與負載選擇模型與解碼設定
+    whisper_fast_model_size: str = "base"  # 自適應模式的快速模型
+    whisper_latency_budget_ms: int = 1500  # 自適應模式的辨識延遲預算（含排隊）
+
+    # STT 語音閘門（解碼前捨棄雜音與過短語句，解碼後移除幻覺片段）
+    stt_gate_enabled: bool = True
+    stt_gate_min_voiced_ms: int = 250  # 有聲音框總長下限
+    stt_gate_min_rms_dbfs: float = -45.0  # 音框有聲門檻
+    stt_gate_max_spectral_flatness: float = 0.5  # 超過視為非語音（白噪音約 0.56）
+    # 片段 no_speech_prob 超過上限且 avg_logprob 低於下限時捨棄
+    stt_gate_max_no_speech_prob: float = 0.8
+    stt_gate_min_avg_logprob: float = -1.0
+
+    # 回音抑制（捨棄播放期間收到、內容與助理語音相近的辨識結果）
+    echo_suppression_enabled: bool = True
+    echo_min_similarity: float = 0.6  # 辨識結果出現在已播放句子中的比例下限
+    echo_min_matched_ngrams: int = 4  # 短句需符合的 n-gram 數（與整句相同時不限）
+    echo_tail_ms: int = 800  # 播放結束後仍視為回音的時間
+
+    # CPU 執行緒預算（STT、TTS 與 VAD 分配同一組核心，避免同時推論時互相搶占）
+    cpu_thread_budget: int = 0  # 可用執行緒總數（0 依容器 CPU 配額與 affinity 偵測）
+    cpu_stt_share: float = 0.5  # 扣除 VAD 後分給 STT 的比例（其餘給 TTS）
+    tts_threads: int = (
+        0  # Kokoro intra-op 執行緒數（PyTorch 或 ONNX Runtime；0 依預算分配）
+    )
+    tts_interop_threads: int = 1  # PyTorch inter-op 執行緒數
 
     # TTS (Text-to-Speech)
+    tts_backend: Literal["kokoro", "kokoro-onnx"] = "kokoro"
     tts_model_path: str = "models"  # HuggingFace 快取目錄
+    tts_onnx_model_path: str = (
+        "models/kokoro-onnx"  # scripts/export_kokoro_onnx.py 輸出
+    )
+    tts_quantization: Literal["none", "int8"] = "none"  # kokoro 權重動態量化
     tts_voice: str = "zf_001"
     tts_speed: float = 1.0
+    tts_lookahead: int = 2  # 背景預先合成的音訊片段數（0 依序合成）
+    tts_cache_enabled: bool = True  # 快取重複出現的語句（不再重新合成）
+    tts_cache_memory_mb: float = 32.0  # 記憶體快取容量
+    tts_cache_dir: str = ""  # 磁碟快取目錄（空字串表示只使用記憶體）
+    tts_cache_disk_mb: float = 256.0  # 磁碟快取容量
+    tts_cache_dtype: Literal["float32", "int16"] = "float32"  # 磁碟樣本格式
+    # 斷句策略（latency：第一段在子句邊界提早送入 TTS，縮短首段音訊時間）
+    tts_segmentation: Literal["sentence", "latency"] = "latency"
+    tts_first_chunk_max_chars: int = 12  # 第一段的字數上限
 
     # VAD (Voice Activity Detection)
     vad_pause_threshold_ms: int = 500
@@ -47,6 +101,18 @@ class Settings(BaseSettings):
     server_host: str = "0.0.0.0"
     server_port: int = 7860
 
+    # Session（每個 WebRTC 連線獨立的對話狀態）
+    session_idle_timeout_s: float = 900.0  # 閒置回收秒數
+    session_max_sessions: int = 32  # 最大同時會話數
+
+    # Tracing（每輪延遲追蹤）
+    trace_enabled: bool = True
+    trace_jsonl_path: str | None = None  # JSONL 輸出路徑（未設定則只保留在記憶體）
+    trace_buffer_size: int = 200  # 記憶體環形緩衝保留的輪數
+
+    # Warm-up（啟動時預先執行各元件，完成前 /health/ready 回傳 503）
+    warmup_enabled: bool = True
+
     # Flow Mode
     flow_mode: FlowMode = FlowMode.MULTI_AGENT
 
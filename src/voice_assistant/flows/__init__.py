@@ -7,6 +7,8 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING
 
+from voice_assistant import tracing
+from voice_assistant.cancellation import cancellable
 from voice_assistant.flows.graphs.main_router import create_main_router_graph
 from voice_assistant.flows.state import (
     CITY_RECOMMENDATIONS,
@@ -18,9 +20,14 @@ from voice_assistant.flows.state import (
     is_weather_suitable,
 )
 from voice_assistant.flows.visualization import get_mermaid_diagram
+from voice_assistant.llm.streaming import DELTA_CALLBACK_KEY
 
 if TYPE_CHECKING:
+    from langchain_core.runnables import RunnableConfig
+
+    from voice_assistant.cancellation import CancelToken
     from voice_assistant.llm.client import LLMClient
+    from voice_assistant.llm.streaming import TextDeltaCallback
     from voice_assistant.tools.registry import ToolRegistry
 
 
@@ -45,14 +52,24 @@ class FlowExecutor:
         self.tool_registry = tool_registry
         self._graph = create_main_router_graph(llm_client, tool_registry)
 
-    async def execute(self, user_input: str) -> str:
+    async def execute(
+        self,
+        user_input: str,
+        on_delta: TextDeltaCallback | None = None,
+        cancel_token: CancelToken | None = None,
+    ) -> str:
         """執行對話流程。
 
         Args:
             user_input: 使用者輸入文字
+            on_delta: 回應文字增量回呼（可選，提供時回應節點改用串流）
+            cancel_token: 本輪取消權杖（可選，取消時中止流程與工具呼叫）
 
         Returns:
             回應文字
+
+        Raises:
+            TurnCancelledError: 本輪已取消
         """
         # 初始狀態
         initial_state: FlowState = {
@@ -60,7 +77,12 @@ class FlowExecutor:
         }
 
         # 執行流程
-        result = await self._graph.ainvoke(initial_state)
+        config: RunnableConfig = {"callbacks": tracing.graph_callbacks()}
+        if on_delta is not None:
+            config["configurable"] = {DELTA_CALLBACK_KEY: on_delta}
+        result = await cancellable(
+            cancel_token, self._graph.ainvoke(initial_state, config=config)
+        )
 
         # 回傳回應
         return result.get("response", "抱歉，我無法處理您的請求")
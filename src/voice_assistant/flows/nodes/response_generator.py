@@ -9,8 +9,11 @@ import json
 from typing import TYPE_CHECKING, Any
 
 from voice_assistant.flows.state import FlowState
+from voice_assistant.llm.streaming import delta_callback_from_config
 
 if TYPE_CHECKING:
+    from langchain_core.runnables import RunnableConfig
+
     from voice_assistant.llm.client import LLMClient
 
 
@@ -39,11 +42,18 @@ def create_response_generator_node(llm_client: LLMClient) -> Any:
     """
     from voice_assistant.llm.schemas import ChatMessage
 
-    async def generate_response(state: FlowState) -> dict[str, Any]:
+    async def generate_response(
+        state: FlowState,
+        config: RunnableConfig | None = None,
+    ) -> dict[str, Any]:
         """產生回應節點函式。
 
+        若 config 帶有文字增量回呼，會以串流方式呼叫 LLM，
+        讓語音管線在回應生成期間就開始合成語音。
+
         Args:
             state: 流程狀態
+            config: LangGraph 執行設定（可選）
 
         Returns:
             更新的狀態欄位
@@ -94,11 +104,21 @@ def create_response_generator_node(llm_client: LLMClient) -> Any:
 
         context = "\n".join(context_parts)
 
+        messages = [ChatMessage(role="user", content=context)]
+        on_delta = delta_callback_from_config(config)
+
         try:
-            response = await llm_client.chat(
-                messages=[ChatMessage(role="user", content=context)],
-                system_prompt=RESPONSE_SYSTEM_PROMPT,
-            )
+            if on_delta is not None:
+                response = await llm_client.chat_with_stream(
+                    messages=messages,
+                    on_delta=on_delta,
+                    system_prompt=RESPONSE_SYSTEM_PROMPT,
+                )
+            else:
+                response = await llm_client.chat(
+                    messages=messages,
+                    system_prompt=RESPONSE_SYSTEM_PROMPT,
+                )
 
             return {
                 "response": response.content or "抱歉，我無法產生回應",
@@ -0,0 +1,170 @@
+"""
+角色切換意圖的本地規則比對器。
+
+角色切換是明確的語句（「切換到面試官」、「換成教練模式」），
+以 RoleRegistry 的角色 id／名稱與常見切換動詞比對即可判斷，
+只有語意模糊的輸入才需要交給 LLM function calling。
+"""
+
+import logging
+import re
+import threading
+
+from pydantic import BaseModel, Field
+
+from voice_assistant.roles.registry import RoleRegistry
+
+from .schemas import Intent
+
+logger = logging.getLogger(__name__)
+
+# 切換動詞：需緊接角色名稱才視為明確切換指令
+SWITCH_VERBS: tuple[str, ...] = (
+    "切換",
+    "切到",
+    "換成",
+    "換到",
+    "換回",
+    "改成",
+    "改為",
+    "改用",
+    "轉換",
+    "轉成",
+    "轉到",
+    "變成",
+)
+
+# 否定詞：出現時交由 LLM 判斷（例如「不要切換到面試官」）
+NEGATION_WORDS: tuple[str, ...] = ("不要", "不用", "不想", "別", "不必", "先不")
+
+# 角色 id 以外的常見稱呼（名稱由 RoleRegistry 提供）
+DEFAULT_ROLE_ALIASES: dict[str, tuple[str, ...]] = {
+    "assistant": ("助手", "小助理"),
+    "coach": ("教練",),
+    "interviewer": ("面試官", "面試"),
+}
+
+# Whisper 可能輸出簡體字，先轉為繁體再比對
+_SIMPLIFIED_TO_TRADITIONAL = str.maketrans("换试练转变为别", "換試練轉變為別")
+
+# 角色名稱與切換動詞之間允許的連接字與標點
+_VERB_SUFFIX = r"(?:到|成|為|回)?[\s「『\"']*"
+
+
+class IntentMatchStats(BaseModel):
+    """本地比對統計。"""
+
+    local_switch: int = Field(0, description="本地判定為角色切換的次數")
+    local_non_switch: int = Field(0, description="本地判定為非切換的次數")
+    llm_fallback: int = Field(0, description="語意模糊、交由 LLM 判斷的次數")
+
+    @property
+    def total(self) -> int:
+        """比對總次數。"""
+        return self.local_switch + self.local_non_switch + self.llm_fallback
+
+    @property
+    def llm_calls_saved(self) -> int:
+        """省下的 LLM 呼叫次數。"""
+        return self.local_switch + self.local_non_switch
+
+    @property
+    def saved_ratio(self) -> float:
+        """省下的 LLM 呼叫比例（0~1）。"""
+        return self.llm_calls_saved / self.total if self.total else 0.0
+
+
+class SwitchRoleMatcher:
+    """
+    角色切換本地比對器。
+
+    - 切換動詞緊接單一角色名稱 → 直接判定 switch_role
+    - 文字中完全沒有角色名稱 → 直接判定非切換
+    - 其餘（有角色名稱但無切換動詞、多個角色、含否定詞）→ 回傳 None 交由 LLM
+    """
+
+    def __init__(
+        self,
+        role_registry: RoleRegistry,
+        aliases: dict[str, tuple[str, ...]] | None = None,
+    ):
+        self.role_registry = role_registry
+        self.aliases = DEFAULT_ROLE_ALIASES if aliases is None else aliases
+        self._stats = IntentMatchStats()
+        self._lock = threading.Lock()
+
+    @property
+    def stats(self) -> IntentMatchStats:
+        """目前的比對統計（複本）。"""
+        with self._lock:
+            return self._stats.model_copy()
+
+    def reset_stats(self) -> None:
+        """重設比對統計。"""
+        with self._lock:
+            self._stats = IntentMatchStats()
+
+    def _role_aliases(self) -> dict[str, str]:
+        """建立「稱呼 → 角色 id」對照表（每次讀取註冊表，角色異動即時生效）。"""
+        alias_map: dict[str, str] = {}
+        for role in self.role_registry.list_roles():
+            for alias in (role.id, role.name, *self.aliases.get(role.id, ())):
+                if alias:
+                    alias_map[alias.lower()] = role.id
+        return alias_map
+
+    def match(self, text: str) -> Intent | None:
+        """
+        以規則判斷是否為角色切換指令。
+
+        Args:
+            text: 使用者輸入文字
+
+        Returns:
+            明確時回傳 Intent（switch_role 或 unknown），模糊時回傳 None
+        """
+        normalized = text.translate(_SIMPLIFIED_TO_TRADITIONAL).lower()
+        alias_map = self._role_aliases()
+
+        # 長稱呼優先，避免「面試」搶先匹配「面試官」
+        aliases = sorted(alias_map, key=len, reverse=True)
+        mentioned = {
+            alias_map[alias] for alias in aliases if alias and alias in normalized
+        }
+
+        if not mentioned:
+            self._record("local_non_switch")
+            return Intent(
+                name="unknown",
+                description="本地比對：未提及任何角色",
+                params={},
+                score=None,
+            )
+
+        if len(mentioned) == 1 and not any(w in normalized for w in NEGATION_WORDS):
+            alias_pattern = "|".join(re.escape(alias) for alias in aliases)
+            verb_pattern = "|".join(SWITCH_VERBS)
+            found = re.search(
+                rf"(?:{verb_pattern}){_VERB_SUFFIX}({alias_pattern})", normalized
+            )
+            if found:
+                role_id = alias_map[found.group(1)]
+                self._record("local_switch")
+                return Intent(
+                    name="switch_role",
+                    description="本地比對：使用者要求切換角色",
+                    params={"role_id": role_id},
+                    score=1.0,
+                )
+
+        self._record("llm_fallback")
+        return None
+
+    def _record(self, outcome: str) -> None:
+        with self._lock:
+            setattr(self._stats, outcome, getattr(self._stats, outcome) + 1)
+            stats = self._stats.model_copy()
+        logger.debug(
+            f"[IntentMatcher] {outcome}；已省下 {stats.llm_calls_saved}/"
+            f"{stats.total} 次 LLM 呼叫"
+        )
@@ -7,20 +7,37 @@ import json
 from voice_assistant.llm.client import LLMClient
 from voice_assistant.llm.schemas import ChatMessage
 
+from .matcher import IntentMatchStats, SwitchRoleMatcher
 from .schemas import Intent
 
 
 class IntentRecognizer:
     """意圖辨識器基底類別，支援 LLM function calling。"""
 
-    def __init__(self, llm_client: LLMClient):
+    def __init__(self, llm_client: LLMClient, matcher: SwitchRoleMatcher | None = None):
+        """
+        Args:
+            llm_client: LLM 客戶端
+            matcher: 本地規則比對器（可選；提供時明確的輸入不呼叫 LLM）
+        """
         self.llm_client = llm_client
+        self.matcher = matcher
+
+    @property
+    def stats(self) -> IntentMatchStats | None:
+        """本地比對統計（未設定比對器時為 None）。"""
+        return self.matcher.stats if self.matcher is not None else None
 
     async def recognize_intent_with_llm(self, text: str) -> Intent:
         """
         使用 OpenAI Function Calling 辨識語音指令 intent。
+
+        設定本地比對器時先以規則判斷，僅語意模糊的輸入才呼叫 LLM。
         """
-        from .schemas import Intent
+        if self.matcher is not None:
+            intent = self.matcher.match(text)
+            if intent is not None:
+                return intent
 
         # 定義 function calling 規格
         tools = [
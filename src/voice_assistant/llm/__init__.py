@@ -7,14 +7,17 @@ from voice_assistant.llm.errors import (
     LLMError,
     LLMRateLimitError,
 )
-from voice_assistant.llm.schemas import ChatMessage, ToolCall
+from voice_assistant.llm.schemas import ChatDelta, ChatMessage, ToolCall
+from voice_assistant.llm.streaming import TextDeltaCallback
 
 __all__ = [
+    "ChatDelta",
     "ChatMessage",
     "LLMAuthenticationError",
     "LLMClient",
     "LLMConnectionError",
     "LLMError",
     "LLMRateLimitError",
+    "TextDeltaCallback",
     "ToolCall",
 ]
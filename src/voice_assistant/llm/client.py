@@ -2,6 +2,7 @@
 
 from __future__ import annotations
 
+from collections.abc import AsyncIterator
 from typing import Any
 
 from openai import (
@@ -11,13 +12,15 @@ from openai import (
     RateLimitError,
 )
 
+from voice_assistant import tracing
 from voice_assistant.llm.errors import (
     LLMAuthenticationError,
     LLMConnectionError,
     LLMError,
     LLMRateLimitError,
 )
-from voice_assistant.llm.schemas import ChatMessage, ToolCall
+from voice_assistant.llm.schemas import ChatDelta, ChatMessage, ToolCall
+from voice_assistant.llm.streaming import TextDeltaCallback, ToolCallAccumulator
 
 
 class LLMClient:
@@ -29,6 +32,7 @@ class LLMClient:
         model: str = "gpt-4o-mini",
         timeout: float = 30.0,
         system_prompt: str | None = None,
+        base_url: str | None = None,
     ) -> None:
         """
         初始化 LLM 客戶端。
@@ -38,11 +42,16 @@ class LLMClient:
             model: 使用的模型名稱
             timeout: API 呼叫逾時秒數
             system_prompt: 預設系統提示詞（可為 None）
+            base_url: API 端點（可選，指向相容服務或離線基準測試的替身伺服器）
         """
-        self.client = AsyncOpenAI(api_key=api_key, timeout=timeout)
+        self.client = AsyncOpenAI(api_key=api_key, timeout=timeout, base_url=base_url)
         self.model = model
         self._system_prompt = system_prompt
 
+    async def aclose(self) -> None:
+        """關閉底層 HTTP 連線池。"""
+        await self.client.close()
+
     async def chat(
         self,
         messages: list[ChatMessage],
@@ -64,6 +73,112 @@ class LLMClient:
         Raises:
             LLMError: API 呼叫失敗時
         """
+        kwargs = self._build_request(messages, tools, system_prompt)
+
+        try:
+            with tracing.span("llm.chat", "llm", model=self.model):
+                response = await self.client.chat.completions.create(**kwargs)
+        except Exception as e:
+            raise self._convert_error(e) from e
+
+        # 轉換回應
+        return self._convert_response(response)
+
+    async def stream_chat(
+        self,
+        messages: list[ChatMessage],
+        tools: list[dict[str, Any]] | None = None,
+        system_prompt: str | None = None,
+    ) -> AsyncIterator[ChatDelta]:
+        """
+        以串流方式發送對話請求。
+
+        Args:
+            messages: 對話歷史
+            tools: OpenAI Function Calling 工具定義
+            system_prompt: 系統提示詞（優先於預設 system_prompt）
+
+        Yields:
+            ChatDelta：文字增量；最後一個片段帶有組裝完成的 ChatMessage
+
+        Raises:
+            LLMError: API 呼叫失敗時（含串流中途失敗）
+        """
+        kwargs = self._build_request(messages, tools, system_prompt)
+        kwargs["stream"] = True
+
+        content_parts: list[str] = []
+        tool_calls = ToolCallAccumulator()
+        try:
+            with tracing.span("llm.stream", "llm", model=self.model):
+                stream = await self.client.chat.completions.create(**kwargs)
+                async for chunk in stream:
+                    # 最後的 usage 片段沒有 choices
+                    if not chunk.choices:
+                        continue
+                    delta = chunk.choices[0].delta
+                    for tool_call_delta in delta.tool_calls or []:
+                        tool_calls.add(tool_call_delta)
+                    if delta.content:
+                        tracing.mark(tracing.MARK_FIRST_LLM_TOKEN)
+                        content_parts.append(delta.content)
+                        yield ChatDelta(content=delta.content)
+        except Exception as e:
+            raise self._convert_error(e) from e
+
+        yield ChatDelta(
+            message=ChatMessage(
+                role="assistant",
+                content="".join(content_parts) or None,
+                tool_calls=tool_calls.build(),
+            )
+        )
+
+    async def chat_with_stream(
+        self,
+        messages: list[ChatMessage],
+        on_delta: TextDeltaCallback,
+        tools: list[dict[str, Any]] | None = None,
+        system_prompt: str | None = None,
+    ) -> ChatMessage:
+        """
+        串流對話並將文字增量轉交回呼，回傳完整回應。
+
+        Args:
+            messages: 對話歷史
+            on_delta: 文字增量回呼
+            tools: OpenAI Function Calling 工具定義
+            system_prompt: 系統提示詞（優先於預設 system_prompt）
+
+        Returns:
+            組裝完成的 ChatMessage
+
+        Raises:
+            LLMError: API 呼叫失敗時
+        """
+        message = ChatMessage(role="assistant")
+        async for delta in self.stream_chat(messages, tools, system_prompt):
+            if delta.content:
+                on_delta(delta.content)
+            if delta.message is not None:
+                message = delta.message
+        return message
+
+    def set_system_prompt(self, prompt: str | None) -> None:
+        """
+        設定預設系統提示詞。
+        Args:
+            prompt: 系統提示詞（None 則清空）
+        """
+        self._system_prompt = prompt
+
+    def _build_request(
+        self,
+        messages: list[ChatMessage],
+        tools: list[dict[str, Any]] | None,
+        system_prompt: str | None,
+    ) -> dict[str, Any]:
+        """組合 chat.completions.create 參數。"""
         # 準備訊息列表
         openai_messages: list[dict[str, Any]] = []
 
@@ -86,27 +201,18 @@ class LLMClient:
         if tools:
             kwargs["tools"] = tools
 
-        try:
-            response = await self.client.chat.completions.create(**kwargs)
-        except AuthenticationError as e:
-            raise LLMAuthenticationError(str(e)) from e
-        except APIConnectionError as e:
-            raise LLMConnectionError(str(e)) from e
-        except RateLimitError as e:
-            raise LLMRateLimitError(str(e)) from e
-        except Exception as e:
-            raise LLMError(str(e)) from e
-
-        # 轉換回應
-        return self._convert_response(response)
-
-    def set_system_prompt(self, prompt: str | None) -> None:
-        """
-        設定預設系統提示詞。
-        Args:
-            prompt: 系統提示詞（None 則清空）
-        """
-        self._system_prompt = prompt
+        return kwargs
+
+    @staticmethod
+    def _convert_error(error: Exception) -> LLMError:
+        """將 OpenAI 例外轉換為 LLMError 子類別。"""
+        if isinstance(error, AuthenticationError):
+            return LLMAuthenticationError(str(error))
+        if isinstance(error, APIConnectionError):
+            return LLMConnectionError(str(error))
+        if isinstance(error, RateLimitError):
+            return LLMRateLimitError(str(error))
+        return LLMError(str(error))
 
     def _convert_response(self, response: Any) -> ChatMessage:
         """將 OpenAI 回應轉換為 ChatMessage。"""
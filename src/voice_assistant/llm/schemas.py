@@ -33,3 +33,14 @@ class ChatMessage(BaseModel):
         if self.tool_call_id:
             result["tool_call_id"] = self.tool_call_id
         return result
+
+
+class ChatDelta(BaseModel):
+    """串流回應的增量片段。
+
+    串流過程中 content 為文字增量；最後一個片段的 message 為組裝完成的
+    完整回應（含 tool_calls）。
+    """
+
+    content: str | None = None
+    message: ChatMessage | None = None
@@ -0,0 +1,84 @@
+"""LLM 串流輔助工具。
+
+提供文字增量回呼型別、tool call 增量組裝，以及從 LangGraph config
+取出串流回呼的輔助函式。
+"""
+
+from __future__ import annotations
+
+from collections.abc import Callable, Mapping
+from typing import Any
+
+from voice_assistant.llm.schemas import ToolCall
+
+# 文字增量回呼：每收到一段 LLM 文字增量即呼叫一次
+TextDeltaCallback = Callable[[str], None]
+
+# LangGraph RunnableConfig["configurable"] 中存放回呼的鍵
+DELTA_CALLBACK_KEY = "on_delta"
+
+
+class ToolCallAccumulator:
+    """組裝串流回應中的 tool call 增量。
+
+    OpenAI 串流會將 tool call 拆成多個 delta：首個 delta 帶有 id 與
+    function name，後續 delta 依 index 逐段附加 arguments。
+    """
+
+    def __init__(self) -> None:
+        """初始化空的組裝緩衝。"""
+        self._calls: dict[int, dict[str, Any]] = {}
+
+    def add(self, tool_call_delta: Any) -> None:
+        """加入一個 tool call 增量。
+
+        Args:
+            tool_call_delta: OpenAI ChoiceDeltaToolCall 物件
+        """
+        call = self._calls.setdefault(
+            tool_call_delta.index,
+            {"id": "", "type": "function", "name": "", "arguments": ""},
+        )
+        if tool_call_delta.id:
+            call["id"] = tool_call_delta.id
+        if getattr(tool_call_delta, "type", None):
+            call["type"] = tool_call_delta.type
+        function = tool_call_delta.function
+        if function is not None:
+            if function.name:
+                call["name"] += function.name
+            if function.arguments:
+                call["arguments"] += function.arguments
+
+    def build(self) -> list[ToolCall] | None:
+        """輸出組裝完成的 tool calls。
+
+        Returns:
+            依 index 排序的 ToolCall 列表，沒有任何 tool call 時回傳 None
+        """
+        if not self._calls:
+            return None
+        return [
+            ToolCall(
+                id=call["id"],
+                type=call["type"],
+                function={"name": call["name"], "arguments": call["arguments"]},
+            )
+            for _index, call in sorted(self._calls.items())
+        ]
+
+
+def delta_callback_from_config(
+    config: Mapping[str, Any] | None,
+) -> TextDeltaCallback | None:
+    """從 LangGraph RunnableConfig 取出文字增量回呼。
+
+    Args:
+        config: 節點收到的 RunnableConfig（可為 None）
+
+    Returns:
+        文字增量回呼，未設定時回傳 None
+    """
+    if not config:
+        return None
+    return (config.get("configurable") or {}).get(DELTA_CALLBACK_KEY)
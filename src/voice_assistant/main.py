@@ -10,6 +10,7 @@ import threading
 
 # 全域變數用於 signal handler
 _stream = None
+_async_loop = None
 _shutdown_event = threading.Event()
 
 
@@ -23,6 +24,13 @@ def _signal_handler(sig: int, frame: object) -> None:
     print("\n正在關閉 AI Voice Assistant...")
     _shutdown_event.set()
 
+    # 關閉背景 event loop（釋放 LLM 與工具的 HTTP 連線池）
+    if _async_loop is not None:
+        try:
+            _async_loop.shutdown(timeout=2.0)
+        except Exception:
+            pass
+
     if _stream is not None and hasattr(_stream, "ui"):
         try:
             _stream.ui.close()
@@ -36,7 +44,7 @@ def _signal_handler(sig: int, frame: object) -> None:
 
 def main() -> None:
     """啟動 AI Voice Assistant。"""
-    global _stream
+    global _stream, _async_loop
 
     # 註冊 signal handlers
     signal.signal(signal.SIGINT, _signal_handler)
@@ -64,23 +72,31 @@ def main() -> None:
         tts_model_path.mkdir(parents=True, exist_ok=True)
         os.environ.setdefault("HF_HOME", str(tts_model_path))
 
+        from voice_assistant.voice.async_loop import AsyncLoopThread
         from voice_assistant.voice.handlers import create_voice_stream
+        from voice_assistant.warmup import READY_PATH, Readiness
 
         print("AI Voice Assistant 啟動中...")
         print(f"LLM 模型: {settings.openai_model}")
         print(f"ASR 模型: faster-whisper ({settings.whisper_model_size})")
         print(f"TTS 音色: {settings.tts_voice}")
 
-        # 建立語音串流
-        _stream = create_voice_stream(settings)
+        # 建立語音串流（模型暖身在背景進行，完成後才回報就緒）
+        _async_loop = AsyncLoopThread()
+        readiness = Readiness()
+        _stream = create_voice_stream(
+            settings, async_loop=_async_loop, readiness=readiness
+        )
 
         # 啟動 Gradio UI
         print(f"啟動 Gradio UI: http://{settings.server_host}:{settings.server_port}")
+        print(f"就緒檢查: {READY_PATH}（模型暖身完成前回傳 503）")
         print("按 Ctrl+C 可關閉程式")
         _stream.ui.launch(
             server_name=settings.server_host,
             server_port=settings.server_port,
             share=False,
+            app_kwargs={"routes": readiness.routes()},
         )
     except Exception as e:
         error_msg = str(e)
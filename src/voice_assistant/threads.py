@@ -0,0 +1,143 @@
+"""CPU 執行緒預算
+
+Whisper（CTranslate2）、Kokoro（PyTorch intra-op）預設都以全部核心建立
+執行緒池；多個會話同時辨識與合成時，執行緒總數遠超過核心數，彼此搶占
+CPU，延遲隨會話數急遽上升。
+
+啟動時依可用 CPU 數（容器的 cgroup 限制、CPU affinity）一次分配：
+
+- STT：每個 worker 的 cpu_threads × worker 數（預設佔 stt_share）
+- TTS：PyTorch intra-op 執行緒（其餘核心）與 inter-op 執行緒
+- VAD：FastRTC 與 faster-whisper 的 Silero ONNX session 固定各 1 個執行緒，
+  預留 1 個核心
+
+明確設定的執行緒數優先於自動分配。
+"""
+
+from __future__ import annotations
+
+import logging
+import math
+import os
+from pathlib import Path
+
+from pydantic import BaseModel, Field
+
+logger = logging.getLogger(__name__)
+
+# cgroup v2 的 CPU 配額（"<quota> <period>" 或 "max <period>"）
+CGROUP_CPU_MAX = Path("/sys/fs/cgroup/cpu.max")
+
+# Silero VAD 的 ONNX session（FastRTC 與 faster-whisper 皆固定 1 個執行緒）
+VAD_THREADS = 1
+
+
+class ThreadBudget(BaseModel):
+    """各元件的 CPU 執行緒分配"""
+
+    total: int = Field(ge=1, description="可用 CPU 執行緒數")
+    stt_workers: int = Field(ge=1, description="STT worker 數")
+    stt_threads: int = Field(ge=1, description="每個 STT worker 的執行緒數")
+    tts_threads: int = Field(ge=1, description="PyTorch intra-op 執行緒數")
+    tts_interop_threads: int = Field(ge=1, description="PyTorch inter-op 執行緒數")
+    vad_threads: int = Field(default=VAD_THREADS, ge=0, description="VAD 執行緒數")
+
+    @property
+    def allocated(self) -> int:
+        """同時推論時的執行緒總數"""
+        return self.stt_workers * self.stt_threads + self.tts_threads + self.vad_threads
+
+    @property
+    def oversubscribed(self) -> bool:
+        """分配的執行緒是否超過可用 CPU"""
+        return self.allocated > self.total
+
+
+def available_cpus(cgroup_cpu_max: Path = CGROUP_CPU_MAX) -> int:
+    """可用的 CPU 數（考慮容器 CPU 配額與 CPU affinity）
+
+    Args:
+        cgroup_cpu_max: cgroup v2 cpu.max 路徑
+
+    Returns:
+        至少為 1
+    """
+    try:
+        cpus = len(os.sched_getaffinity(0))
+    except AttributeError:
+        cpus = os.cpu_count() or 1
+    try:
+        quota, period = cgroup_cpu_max.read_text().split()
+        if quota != "max":
+            cpus = min(cpus, math.ceil(int(quota) / int(period)))
+    except (OSError, ValueError):
+        pass
+    return max(cpus, 1)
+
+
+def plan_thread_budget(
+    total: int,
+    stt_workers: int = 1,
+    stt_share: float = 0.5,
+    stt_threads: int = 0,
+    tts_threads: int = 0,
+    tts_interop_threads: int = 1,
+) -> ThreadBudget:
+    """依可用 CPU 分配各元件的執行緒
+
+    Args:
+        total: 可用 CPU 執行緒數
+        stt_workers: STT worker 數
+        stt_share: 扣除 VAD 後分給 STT 的比例（其餘給 TTS）
+        stt_threads: 每個 STT worker 的執行緒數（0 表示自動分配）
+        tts_threads: PyTorch intra-op 執行緒數（0 表示自動分配）
+        tts_interop_threads: PyTorch inter-op 執行緒數
+
+    Returns:
+        ThreadBudget（核心數不足時每個元件至少 1 個執行緒）
+    """
+    total = max(total, 1)
+    usable = max(total - VAD_THREADS, 1)
+    if stt_threads <= 0:
+        stt_threads = max(math.floor(usable * stt_share / stt_workers), 1)
+    if tts_threads <= 0:
+        tts_threads = max(usable - stt_workers * stt_threads, 1)
+    return ThreadBudget(
+        total=total,
+        stt_workers=stt_workers,
+        stt_threads=stt_threads,
+        tts_threads=tts_threads,
+        tts_interop_threads=max(tts_interop_threads, 1),
+    )
+
+
+def apply_thread_budget(budget: ThreadBudget, torch_threads: bool = True) -> None:
+    """套用 PyTorch 執行緒設定（STT 執行緒於建立模型時傳入）
+
+    inter-op 執行緒數只能在 PyTorch 執行任何平行工作前設定，之後無法變更。
+
+    Args:
+        budget: 執行緒分配
+        torch_threads: 是否設定 PyTorch 執行緒（TTS 不使用 PyTorch 時為 False，
+            不匯入 torch）
+    """
+    if torch_threads:
+        import torch
+
+        torch.set_num_threads(budget.tts_threads)
+        if torch.get_num_interop_threads() != budget.tts_interop_threads:
+            try:
+                torch.set_num_interop_threads(budget.tts_interop_threads)
+            except RuntimeError as e:
+                logger.warning(f"[Threads] 無法變更 PyTorch inter-op 執行緒數: {e}")
+
+    logger.info(
+        f"[Threads] 可用 {budget.total} 個 CPU：STT {budget.stt_workers}×"
+        f"{budget.stt_threads}、TTS {budget.tts_threads}"
+        f"（inter-op {budget.tts_interop_threads}）、VAD {budget.vad_threads}"
+    )
+    if budget.oversubscribed:
+        logger.warning(
+            f"[Threads] 分配 {budget.allocated} 個執行緒超過可用的 {budget.total} 個 "
+            "CPU，同時推論時會互相搶占"
+        )
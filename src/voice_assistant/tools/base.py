@@ -34,6 +34,10 @@ class BaseTool(ABC):
         """執行工具。"""
         ...
 
+    async def aclose(self) -> None:
+        """釋放工具持有的資源（如 HTTP 連線池），預設無需清理。"""
+        return None
+
     def to_openai_tool(self) -> dict[str, Any]:
         """輸出 OpenAI Function Calling 格式。"""
         return {
@@ -71,6 +71,22 @@ API_TIMEOUT = 10.0  # 秒
 class ExchangeRateTool(BaseTool):
     """匯率查詢工具 - 查詢貨幣匯率或進行金額換算。"""
 
+    def __init__(self) -> None:
+        """初始化工具（HTTP client 於首次查詢時建立並跨查詢重用）。"""
+        self._client: httpx.AsyncClient | None = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """取得共用的 HTTP client，保持連線池跨查詢重用。"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(timeout=API_TIMEOUT)
+        return self._client
+
+    async def aclose(self) -> None:
+        """關閉 HTTP 連線池。"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
     @property
     def name(self) -> str:
         """工具名稱。"""
@@ -154,26 +170,26 @@ class ExchangeRateTool(BaseTool):
         """
         url = f"{EXCHANGE_RATE_API_BASE_URL}/{base_code}"
 
-        async with httpx.AsyncClient(timeout=API_TIMEOUT) as client:
-            response = await client.get(url)
-            response.raise_for_status()
+        client = self._get_client()
+        response = await client.get(url)
+        response.raise_for_status()
 
-            try:
-                payload = response.json()
-            except ValueError as e:
-                raise ValueError("API returned non-JSON response") from e
+        try:
+            payload = response.json()
+        except ValueError as e:
+            raise ValueError("API returned non-JSON response") from e
 
-            # 驗證回應格式
-            if not isinstance(payload, dict):
-                raise ValueError("API returned unexpected payload")
+        # 驗證回應格式
+        if not isinstance(payload, dict):
+            raise ValueError("API returned unexpected payload")
 
-            if payload.get("result") != "success":
-                raise ValueError("API returned error result")
+        if payload.get("result") != "success":
+            raise ValueError("API returned error result")
 
-            if "rates" not in payload:
-                raise ValueError("API response missing rates")
+        if "rates" not in payload:
+            raise ValueError("API response missing rates")
 
-            return payload
+        return payload
 
     async def execute(
         self,
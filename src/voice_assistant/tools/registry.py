@@ -2,11 +2,21 @@
 
 from __future__ import annotations
 
+import logging
 from typing import Any
 
+from voice_assistant import tracing
+from voice_assistant.cancellation import (
+    CancelToken,
+    TurnCancelledError,
+    cancellable,
+    current_cancel_token,
+)
 from voice_assistant.tools.base import BaseTool
 from voice_assistant.tools.schemas import ToolResult
 
+logger = logging.getLogger(__name__)
+
 
 class ToolRegistry:
     """工具註冊中心。"""
@@ -59,22 +69,49 @@ class ToolRegistry:
         """
         return [tool.to_openai_tool() for tool in self._tools.values()]
 
-    async def execute(self, name: str, arguments: dict[str, Any]) -> ToolResult:
+    async def execute(
+        self,
+        name: str,
+        arguments: dict[str, Any],
+        cancel_token: CancelToken | None = None,
+    ) -> ToolResult:
         """
         執行指定工具。
 
         Args:
             name: 工具名稱
             arguments: 工具參數
+            cancel_token: 本輪取消權杖（可選，預設使用目前 context 的權杖）
 
         Returns:
             ToolResult 執行結果
+
+        Raises:
+            TurnCancelledError: 本輪已取消（不會轉為失敗結果）
         """
         tool = self.get(name)
         if not tool:
             return ToolResult.fail(f"Tool '{name}' not found")
 
-        try:
-            return await tool.execute(**arguments)
-        except Exception as e:
-            return ToolResult.fail(str(e))
+        token = cancel_token or current_cancel_token()
+        if token is not None:
+            token.raise_if_cancelled()
+
+        # Tool 區段帶有 turn id，可與 AgentResult、LLM 區段關聯
+        turn_id = tracing.current_turn_id()
+        with tracing.span(f"tool.{name}", "tool", turn_id=turn_id):
+            try:
+                result = await cancellable(token, tool.execute(**arguments))
+            except TurnCancelledError:
+                logger.info(f"[Tool] turn={turn_id} {name} 已取消")
+                raise
+            except Exception as e:
+                result = ToolResult.fail(str(e))
+
+        logger.debug(f"[Tool] turn={turn_id} {name} success={result.success}")
+        return result
+
+    async def aclose(self) -> None:
+        """關閉所有已註冊工具持有的資源。"""
+        for tool in self._tools.values():
+            await tool.aclose()
@@ -86,6 +86,22 @@ API_TIMEOUT = 5.0  # 秒
 class WeatherTool(BaseTool):
     """天氣查詢工具 - 查詢台灣主要城市的即時天氣資訊。"""
 
+    def __init__(self) -> None:
+        """初始化工具（HTTP client 於首次查詢時建立並跨查詢重用）。"""
+        self._client: httpx.AsyncClient | None = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        """取得共用的 HTTP client，保持連線池跨查詢重用。"""
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(timeout=API_TIMEOUT)
+        return self._client
+
+    async def aclose(self) -> None:
+        """關閉 HTTP 連線池。"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
     @property
     def name(self) -> str:
         """工具名稱。"""
@@ -189,19 +205,19 @@ class WeatherTool(BaseTool):
             "current": ",".join(current_params),
         }
 
-        async with httpx.AsyncClient(timeout=API_TIMEOUT) as client:
-            response = await client.get(OPEN_METEO_BASE_URL, params=params)
-            response.raise_for_status()
+        client = self._get_client()
+        response = await client.get(OPEN_METEO_BASE_URL, params=params)
+        response.raise_for_status()
 
-            try:
-                payload = response.json()
-            except ValueError as e:
-                raise ValueError("API returned non-JSON response") from e
+        try:
+            payload = response.json()
+        except ValueError as e:
+            raise ValueError("API returned non-JSON response") from e
 
-            if not isinstance(payload, dict) or "current" not in payload:
-                raise ValueError("API returned unexpected payload")
+        if not isinstance(payload, dict) or "current" not in payload:
+            raise ValueError("API returned unexpected payload")
 
-            return payload
+        return payload
 
     async def execute(self, city: str, include_details: bool = False) -> ToolResult:
         """
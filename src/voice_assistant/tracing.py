@@ -0,0 +1,338 @@
+"""Per-turn latency tracing.
+
+記錄每一輪對話從收到音訊到最後一個 TTS 片段的單調時間戳，
+涵蓋 STT、意圖辨識、LangGraph 節點、Agent、Tool、LLM 首 token 與 TTS。
+
+每輪產生一筆結構化紀錄，寫入 JSONL 檔案與記憶體環形緩衝，
+並可依階段計算 p50/p95/p99。
+
+目前的 TurnTrace 以 ContextVar 傳遞：提交到背景 loop 的 coroutine 以
+traced() 包裝後，其下所有 LangGraph 節點、Agent、Tool 與 LLM 呼叫
+（asyncio task 會複製 context）都會記錄到同一輪。
+"""
+
+from __future__ import annotations
+
+import json
+import logging
+import threading
+import time
+from collections import deque
+from collections.abc import Coroutine, Iterator
+from contextlib import contextmanager
+from contextvars import ContextVar
+from datetime import datetime
+from pathlib import Path
+from typing import Any
+from uuid import UUID, uuid4
+
+import numpy as np
+from langchain_core.callbacks import BaseCallbackHandler
+
+logger = logging.getLogger(__name__)
+
+# 管線階段標記（相對於收到音訊的毫秒數）
+MARK_AUDIO_RECEIVED = "audio_received"
+MARK_STT_DONE = "stt_done"
+MARK_INTENT_DONE = "intent_done"
+MARK_FIRST_LLM_TOKEN = "first_llm_token"
+MARK_FIRST_TTS_CHUNK = "first_tts_chunk"
+MARK_LAST_TTS_CHUNK = "last_tts_chunk"
+
+PERCENTILES = (50, 95, 99)
+
+
+class TurnTrace:
+    """單輪對話的追蹤紀錄。
+
+    Attributes:
+        turn_id: 本輪識別碼（寫入 AgentResult 與 Tool 追蹤以便關聯）
+        session_id: 會話識別碼（可選）
+    """
+
+    def __init__(self, session_id: str | None = None) -> None:
+        """開始一輪追蹤（以建立時間作為收到音訊的時間點）。
+
+        Args:
+            session_id: 會話識別碼（可選）
+        """
+        self.turn_id = uuid4().hex[:12]
+        self.session_id = session_id
+        self.started_at = datetime.now()
+        self._t0 = time.monotonic()
+        self._marks: dict[str, float] = {MARK_AUDIO_RECEIVED: 0.0}
+        self._spans: list[dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    def elapsed_ms(self) -> float:
+        """距離本輪開始的毫秒數。"""
+        return (time.monotonic() - self._t0) * 1000
+
+    def mark(self, name: str, overwrite: bool = False) -> None:
+        """記錄階段時間點。
+
+        Args:
+            name: 階段名稱
+            overwrite: 是否覆寫已存在的標記（預設只保留第一次）
+        """
+        now = self.elapsed_ms()
+        with self._lock:
+            if overwrite or name not in self._marks:
+                self._marks[name] = now
+
+    def add_span(
+        self, name: str, kind: str, start_ms: float, end_ms: float, **attrs: Any
+    ) -> None:
+        """加入已完成的區段。
+
+        Args:
+            name: 區段名稱（如 node.classifier、tool.get_weather）
+            kind: 區段類型（node/agent/tool/llm/flow）
+            start_ms: 開始時間（相對毫秒）
+            end_ms: 結束時間（相對毫秒）
+            **attrs: 附加屬性
+        """
+        span = {
+            "name": name,
+            "kind": kind,
+            "start_ms": round(start_ms, 3),
+            "end_ms": round(end_ms, 3),
+            "duration_ms": round(end_ms - start_ms, 3),
+            "attrs": attrs,
+        }
+        with self._lock:
+            self._spans.append(span)
+
+    @contextmanager
+    def span(self, name: str, kind: str, **attrs: Any) -> Iterator[None]:
+        """以 context manager 記錄區段（sync 與 async 程式碼皆可使用）。"""
+        start = self.elapsed_ms()
+        try:
+            yield
+        finally:
+            self.add_span(name, kind, start, self.elapsed_ms(), **attrs)
+
+    @property
+    def marks(self) -> dict[str, float]:
+        """已記錄的階段標記（複本）。"""
+        with self._lock:
+            return dict(self._marks)
+
+    @property
+    def spans(self) -> list[dict[str, Any]]:
+        """已記錄的區段（複本）。"""
+        with self._lock:
+            return list(self._spans)
+
+    def to_record(self) -> dict[str, Any]:
+        """輸出結構化紀錄（JSON 可序列化）。"""
+        marks = {name: round(value, 3) for name, value in self.marks.items()}
+        return {
+            "turn_id": self.turn_id,
+            "session_id": self.session_id,
+            "started_at": self.started_at.isoformat(),
+            "total_ms": round(self.elapsed_ms(), 3),
+            "marks": marks,
+            "spans": self.spans,
+        }
+
+
+_current_trace: ContextVar[TurnTrace | None] = ContextVar(
+    "voice_assistant_turn_trace", default=None
+)
+
+
+def current_trace() -> TurnTrace | None:
+    """取得目前 context 的追蹤紀錄。"""
+    return _current_trace.get()
+
+
+def current_turn_id() -> str | None:
+    """取得目前的 turn id（無追蹤時為 None）。"""
+    trace = _current_trace.get()
+    return trace.turn_id if trace is not None else None
+
+
+def mark(name: str, overwrite: bool = False) -> None:
+    """在目前的追蹤紀錄上標記階段（無追蹤時不做任何事）。"""
+    trace = _current_trace.get()
+    if trace is not None:
+        trace.mark(name, overwrite=overwrite)
+
+
+@contextmanager
+def span(name: str, kind: str, **attrs: Any) -> Iterator[None]:
+    """在目前的追蹤紀錄上記錄區段（無追蹤時不做任何事）。"""
+    trace = _current_trace.get()
+    if trace is None:
+        yield
+        return
+    with trace.span(name, kind, **attrs):
+        yield
+
+
+async def traced(
+    trace: TurnTrace | None,
+    coro: Coroutine[Any, Any, Any],
+    name: str | None = None,
+    kind: str = "flow",
+) -> Any:
+    """在指定追蹤紀錄的 context 中執行 coroutine。
+
+    用於提交到背景 loop 的工作：asyncio task 會複製 context，
+    因此其下建立的子 task（LangGraph 節點）也能取得同一個 TurnTrace。
+
+    Args:
+        trace: 追蹤紀錄（None 時直接執行）
+        coro: 要執行的 coroutine
+        name: 區段名稱（可選，提供時將整段執行記錄為區段）
+        kind: 區段類型
+
+    Returns:
+        coroutine 的回傳值
+    """
+    token = _current_trace.set(trace)
+    try:
+        if trace is None or name is None:
+            return await coro
+        with trace.span(name, kind):
+            return await coro
+    finally:
+        _current_trace.reset(token)
+
+
+class TraceCallbackHandler(BaseCallbackHandler):
+    """將 LangGraph 節點執行記錄為區段的 callback handler。"""
+
+    # 直接在事件迴圈中執行，避免 callback 被丟到 executor 執行緒
+    run_inline = True
+
+    def __init__(self, trace: TurnTrace) -> None:
+        self._trace = trace
+        self._starts: dict[UUID, tuple[str, float]] = {}
+
+    def on_chain_start(
+        self,
+        serialized: dict[str, Any] | None,
+        inputs: Any,
+        *,
+        run_id: UUID,
+        metadata: dict[str, Any] | None = None,
+        **kwargs: Any,
+    ) -> None:
+        node = (metadata or {}).get("langgraph_node")
+        # 只記錄節點本身，忽略節點內部的子 runnable
+        if node and kwargs.get("name") == node:
+            self._starts[run_id] = (node, self._trace.elapsed_ms())
+
+    def on_chain_end(self, outputs: Any, *, run_id: UUID, **kwargs: Any) -> None:
+        self._finish(run_id)
+
+    def on_chain_error(
+        self, error: BaseException, *, run_id: UUID, **kwargs: Any
+    ) -> None:
+        self._finish(run_id, error=type(error).__name__)
+
+    def _finish(self, run_id: UUID, **attrs: Any) -> None:
+        started = self._starts.pop(run_id, None)
+        if started is None:
+            return
+        node, start_ms = started
+        self._trace.add_span(
+            f"node.{node}", "node", start_ms, self._trace.elapsed_ms(), **attrs
+        )
+
+
+def graph_callbacks() -> list[BaseCallbackHandler]:
+    """取得 LangGraph 執行時要附加的 callbacks（無追蹤時為空）。"""
+    trace = _current_trace.get()
+    return [TraceCallbackHandler(trace)] if trace is not None else []
+
+
+class TraceRecorder:
+    """追蹤紀錄收集器。
+
+    每輪紀錄寫入記憶體環形緩衝，並可選擇附加寫入 JSONL 檔案。
+    """
+
+    def __init__(self, jsonl_path: str | Path | None = None, buffer_size: int = 200):
+        """初始化收集器。
+
+        Args:
+            jsonl_path: JSONL 輸出路徑（None 表示只保留在記憶體）
+            buffer_size: 環形緩衝保留的輪數
+        """
+        self._jsonl_path = Path(jsonl_path) if jsonl_path else None
+        if self._jsonl_path is not None:
+            self._jsonl_path.parent.mkdir(parents=True, exist_ok=True)
+        self._records: deque[dict[str, Any]] = deque(maxlen=buffer_size)
+        self._lock = threading.Lock()
+
+    def record(self, trace: TurnTrace) -> dict[str, Any]:
+        """收集一輪追蹤紀錄。
+
+        Args:
+            trace: 已完成的追蹤紀錄
+
+        Returns:
+            結構化紀錄
+        """
+        record = trace.to_record()
+        with self._lock:
+            self._records.append(record)
+            if self._jsonl_path is not None:
+                try:
+                    with self._jsonl_path.open("a", encoding="utf-8") as f:
+                        f.write(json.dumps(record, ensure_ascii=False) + "\n")
+                except OSError as e:
+                    logger.warning(f"[Trace] 寫入 JSONL 失敗: {e}")
+
+        marks = record["marks"]
+        summary = " ".join(
+            f"{name}={marks[name]:.0f}ms"
+            for name in (
+                MARK_STT_DONE,
+                MARK_INTENT_DONE,
+                MARK_FIRST_LLM_TOKEN,
+                MARK_FIRST_TTS_CHUNK,
+                MARK_LAST_TTS_CHUNK,
+            )
+            if name in marks
+        )
+        logger.info(f"[Trace] turn={record['turn_id']} {summary}")
+        return record
+
+    def recent(self, limit: int | None = None) -> list[dict[str, Any]]:
+        """取得最近的紀錄（由舊到新）。
+
+        Args:
+            limit: 最多回傳筆數（None 表示全部）
+        """
+        with self._lock:
+            records = list(self._records)
+        return records[-limit:] if limit else records
+
+    def percentiles(self) -> dict[str, dict[str, float]]:
+        """依階段計算 p50/p95/p99（毫秒）。
+
+        階段標記以相對時間計算，區段以耗時計算（同名區段各自計入）。
+
+        Returns:
+            {stage: {"count": n, "p50": ..., "p95": ..., "p99": ...}}
+        """
+        samples: dict[str, list[float]] = {}
+        for record in self.recent():
+            for name, value in record["marks"].items():
+                samples.setdefault(name, []).append(value)
+            for item in record["spans"]:
+                samples.setdefault(item["name"], []).append(item["duration_ms"])
+            samples.setdefault("total", []).append(record["total_ms"])
+
+        stats: dict[str, dict[str, float]] = {}
+        for name, values in samples.items():
+            result = np.percentile(values, PERCENTILES)
+            stats[name] = {"count": len(values)} | {
+                f"p{p}": round(float(v), 3)
+                for p, v in zip(PERCENTILES, result, strict=True)
+            }
+        return stats
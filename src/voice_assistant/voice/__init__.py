@@ -3,6 +3,7 @@
 提供 FastRTC 語音串流整合，包含 ASR、TTS 與對話處理。
 """
 
+from voice_assistant.voice.async_loop import AsyncLoopThread
 from voice_assistant.voice.handlers.reply_on_pause import create_voice_stream
 from voice_assistant.voice.pipeline import VoicePipeline
 from voice_assistant.voice.schemas import (
@@ -10,9 +11,12 @@ from voice_assistant.voice.schemas import (
     VoicePipelineConfig,
     VoiceState,
 )
+from voice_assistant.voice.session import SessionManager
 
 __all__ = [
+    "AsyncLoopThread",
     "ConversationState",
+    "SessionManager",
     "VoicePipeline",
     "VoicePipelineConfig",
     "VoiceState",
@@ -0,0 +1,134 @@
+"""背景 asyncio event loop 執行緒
+
+語音管線在 FastRTC 的同步執行緒中運作，但意圖辨識、流程、代理、工具與 LLM
+皆為 async。所有 async 工作都提交到同一個長駐 event loop，讓 AsyncOpenAI 與
+工具的 HTTP 連線池可跨輪次重用，並避免在執行中的 loop 上阻塞等待造成死結。
+"""
+
+import asyncio
+import logging
+import threading
+from collections.abc import Awaitable, Callable, Coroutine
+from concurrent.futures import Future
+from typing import Any, TypeVar
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+# 關閉時在 loop 上執行的清理函式（例如 LLMClient.aclose）
+ShutdownCallback = Callable[[], Awaitable[None]]
+
+
+class AsyncLoopThread:
+    """長駐背景 event loop
+
+    Example:
+        loop = AsyncLoopThread()
+        loop.add_shutdown_callback(llm_client.aclose)
+        result = loop.run(llm_client.chat(messages))
+        loop.shutdown()
+    """
+
+    def __init__(self, name: str = "voice-async-loop") -> None:
+        """建立並啟動背景 event loop 執行緒
+
+        Args:
+            name: 執行緒名稱
+        """
+        self._loop = asyncio.new_event_loop()
+        self._shutdown_callbacks: list[ShutdownCallback] = []
+        self._closed = False
+        self._lock = threading.Lock()
+        self._thread = threading.Thread(
+            target=self._run_forever, name=name, daemon=True
+        )
+        self._thread.start()
+
+    def _run_forever(self) -> None:
+        asyncio.set_event_loop(self._loop)
+        self._loop.run_forever()
+
+    @property
+    def is_running(self) -> bool:
+        """loop 是否仍可接受工作"""
+        return not self._closed and self._thread.is_alive()
+
+    def add_shutdown_callback(self, callback: ShutdownCallback) -> None:
+        """註冊關閉時執行的清理函式
+
+        Args:
+            callback: async 清理函式，於 loop 停止前依註冊的相反順序執行
+        """
+        self._shutdown_callbacks.append(callback)
+
+    def submit(self, coro: Coroutine[Any, Any, T]) -> Future[T]:
+        """提交 coroutine 到背景 loop，立即回傳 Future
+
+        Args:
+            coro: 要執行的 coroutine
+
+        Returns:
+            concurrent.futures.Future
+
+        Raises:
+            RuntimeError: loop 已關閉，或從 loop 執行緒本身呼叫（會造成死結）
+        """
+        if not self.is_running:
+            coro.close()
+            raise RuntimeError("AsyncLoopThread 已關閉")
+        if threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError("不可在背景 loop 執行緒中同步等待 coroutine")
+        return asyncio.run_coroutine_threadsafe(coro, self._loop)
+
+    def run(self, coro: Coroutine[Any, Any, T], timeout: float | None = None) -> T:
+        """在背景 loop 執行 coroutine 並阻塞等待結果
+
+        Args:
+            coro: 要執行的 coroutine
+            timeout: 等待秒數上限（None 表示不限）
+
+        Returns:
+            coroutine 的回傳值
+        """
+        return self.submit(coro).result(timeout=timeout)
+
+    def shutdown(self, timeout: float = 5.0) -> None:
+        """執行清理函式、取消未完成工作並停止 loop
+
+        可重複呼叫；第二次以後不做任何事。
+
+        Args:
+            timeout: 等待清理與執行緒結束的秒數上限
+        """
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+
+        if self._thread.is_alive():
+            future = asyncio.run_coroutine_threadsafe(self._drain(), self._loop)
+            try:
+                future.result(timeout=timeout)
+            except Exception as e:
+                logger.warning(f"[AsyncLoop] 關閉清理失敗: {e}")
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join(timeout=timeout)
+
+        if not self._loop.is_running():
+            self._loop.close()
+        logger.info("[AsyncLoop] 背景 event loop 已關閉")
+
+    async def _drain(self) -> None:
+        for callback in reversed(self._shutdown_callbacks):
+            try:
+                await callback()
+            except Exception as e:
+                logger.warning(f"[AsyncLoop] 清理函式執行失敗: {e}")
+
+        current = asyncio.current_task()
+        pending = [task for task in asyncio.all_tasks() if task is not current]
+        for task in pending:
+            task.cancel()
+        await asyncio.gather(*pending, return_exceptions=True)
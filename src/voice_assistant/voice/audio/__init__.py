@@ -0,0 +1,22 @@
+"""音訊處理模組"""
+
+from voice_assistant.voice.audio.convert import prepare_samples, to_mono_float32
+from voice_assistant.voice.audio.resample import (
+    PolyphaseFilter,
+    Resampler,
+    get_filter,
+    resample,
+)
+from voice_assistant.voice.audio.trim import SpeechSpan, speech_bounds, trim_to_speech
+
+__all__ = [
+    "PolyphaseFilter",
+    "Resampler",
+    "SpeechSpan",
+    "get_filter",
+    "prepare_samples",
+    "resample",
+    "speech_bounds",
+    "to_mono_float32",
+    "trim_to_speech",
+]
@@ -0,0 +1,61 @@
+"""模型輸入格式轉換
+
+FastRTC 傳入的音訊可能是 int16 或 float32、一維或 (1, N) / (N, 1) 的
+多維陣列；各 STT 引擎都需要單聲道 float32 並重採樣到模型取樣率。
+"""
+
+import numpy as np
+from numpy.typing import NDArray
+
+from voice_assistant.voice.audio.resample import resample
+
+
+def to_mono_float32(audio_array: NDArray) -> NDArray[np.float32]:
+    """轉為單聲道 [-1, 1] float32 一維陣列
+
+    Args:
+        audio_array: int16 或浮點數音訊（一維或二維）
+
+    Returns:
+        float32 一維陣列
+    """
+    # 確保音訊為 1D (FastRTC 可能傳入多維陣列)
+    if audio_array.ndim > 1:
+        # 處理多維陣列：取第一個聲道避免 interleaving 破壞音訊
+        # shape (samples, channels) -> 取 [:, 0]
+        # shape (channels, samples) -> 取 [0, :]
+        if audio_array.shape[0] > audio_array.shape[1]:
+            # (samples, channels) 格式
+            audio_array = audio_array[:, 0]
+        else:
+            # (channels, samples) 格式
+            audio_array = audio_array[0, :]
+
+    # 正規化為 float32
+    if audio_array.dtype == np.int16:
+        return audio_array.astype(np.float32) / 32768.0
+    return audio_array.astype(np.float32, copy=False)
+
+
+def prepare_samples(
+    audio: tuple[int, NDArray[np.int16 | np.float32]], target_rate: int
+) -> NDArray[np.float32]:
+    """將 (sample_rate, audio_array) 轉為模型輸入格式
+
+    Args:
+        audio: (sample_rate, audio_array) tuple
+        target_rate: 模型取樣率
+
+    Returns:
+        target_rate 的 float32 一維陣列
+    """
+    sample_rate, audio_array = audio
+
+    if len(audio_array) == 0:
+        return np.zeros(0, dtype=np.float32)
+
+    samples = to_mono_float32(audio_array)
+    # 以快取濾波器組的多相濾波重採樣
+    if sample_rate != target_rate:
+        samples = resample(samples, sample_rate, target_rate)
+    return samples
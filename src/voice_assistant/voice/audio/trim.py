@@ -0,0 +1,55 @@
+"""依 VAD 語音區段裁切前後靜音
+
+FastRTC 的 Silero VAD 在偵測停頓時已算出每個區塊的語音區段；直接以這些
+區段裁掉句首與句尾的靜音，STT 不必再跑一次 Whisper 內建的 VAD。
+"""
+
+import numpy as np
+from numpy.typing import NDArray
+
+# 語音區段：(起始樣本, 結束樣本)，以輸入音訊的取樣率計
+SpeechSpan = tuple[int, int]
+
+
+def speech_bounds(
+    spans: list[SpeechSpan], length: int, pad: int = 0
+) -> tuple[int, int] | None:
+    """計算涵蓋所有語音區段的範圍
+
+    Args:
+        spans: 語音區段
+        length: 音訊樣本數
+        pad: 前後各保留的樣本數
+
+    Returns:
+        (start, end)；沒有落在音訊範圍內的語音區段時為 None
+    """
+    if not spans:
+        return None
+    bounds = np.clip(np.asarray(spans, dtype=np.int64).reshape(-1, 2), 0, length)
+    valid = bounds[:, 1] > bounds[:, 0]
+    if not valid.any():
+        return None
+    start = int(bounds[valid, 0].min()) - pad
+    end = int(bounds[valid, 1].max()) + pad
+    return max(start, 0), min(end, length)
+
+
+def trim_to_speech(
+    audio: NDArray, spans: list[SpeechSpan], pad: int = 0
+) -> NDArray | None:
+    """裁掉第一個語音區段之前與最後一個語音區段之後的靜音
+
+    Args:
+        audio: 一維音訊，或 FastRTC 的 (1, N) / (N, 1) 陣列
+        spans: 語音區段（樣本索引對應攤平後的音訊）
+        pad: 前後各保留的樣本數
+
+    Returns:
+        裁切後的一維音訊（view，不複製）；沒有語音區段時為 None
+    """
+    samples = np.asarray(audio).reshape(-1)
+    bounds = speech_bounds(spans, len(samples), pad)
+    if bounds is None:
+        return None
+    return samples[bounds[0] : bounds[1]]
@@ -0,0 +1,271 @@
+"""助理自身語音的回音偵測
+
+喇叭聲音漏進麥克風時，Silero VAD 會把助理正在播放的 Kokoro 語音當成
+使用者說話，辨識結果再觸發一輪完整的 STT 與 LLM，甚至形成回授迴圈。
+
+EchoDetector 以兩個條件判斷回音：
+
+- 時間：語句的收音期間與 TTS 播放期間（含尾端殘響）重疊
+- 內容：辨識結果的字元 n-gram 大多出現在最近播放過的句子中
+  （以 n-gram 反向索引查詢，不需逐句比對）；短句重複助理用詞的機會
+  高，需符合足夠的 n-gram 數或與整句相同
+
+兩者皆成立時視為回音，管線在呼叫 LLM 前捨棄。使用者插話時播放中斷，
+預估的播放期間隨之結束。
+"""
+
+import threading
+import time
+from collections import Counter, deque
+
+from pydantic import BaseModel, Field
+
+from voice_assistant.voice.schemas import EchoConfig
+
+
+def normalize_text(text: str) -> str:
+    """比對用：忽略空白、標點與大小寫差異"""
+    return "".join(ch for ch in text if ch.isalnum()).lower()
+
+
+def char_ngrams(text: str, n: int) -> set[str]:
+    """正規化後的字元 n-gram（不足 n 字時為整段文字）
+
+    Args:
+        text: 文字
+        n: n-gram 長度
+
+    Returns:
+        n-gram 集合
+    """
+    normalized = normalize_text(text)
+    if len(normalized) <= n:
+        return {normalized} if normalized else set()
+    return {normalized[i : i + n] for i in range(len(normalized) - n + 1)}
+
+
+class NGramIndex:
+    """最近文字的 n-gram 反向索引（只保留最近 max_docs 段）"""
+
+    def __init__(self, n: int = 2, max_docs: int = 16):
+        """初始化索引
+
+        Args:
+            n: n-gram 長度（中文以字元二元組為佳）
+            max_docs: 保留的文字段數
+        """
+        self.n = n
+        self.max_docs = max_docs
+        self._docs: deque[tuple[int, set[str], str]] = deque()
+        self._postings: dict[str, set[int]] = {}
+        self._next_id = 0
+
+    def add(self, text: str) -> None:
+        """加入一段文字，超過上限時移除最舊的一段
+
+        Args:
+            text: 文字
+        """
+        grams = char_ngrams(text, self.n)
+        if not grams:
+            return
+        doc_id = self._next_id
+        self._next_id += 1
+        self._docs.append((doc_id, grams, normalize_text(text)))
+        for gram in grams:
+            self._postings.setdefault(gram, set()).add(doc_id)
+        while len(self._docs) > self.max_docs:
+            old_id, old_grams, _ = self._docs.popleft()
+            for gram in old_grams:
+                postings = self._postings[gram]
+                postings.discard(old_id)
+                if not postings:
+                    del self._postings[gram]
+
+    def containment(self, text: str) -> float:
+        """text 的 n-gram 出現在單一段已索引文字中的最大比例
+
+        Args:
+            text: 查詢文字（辨識結果）
+
+        Returns:
+            0.0–1.0；1.0 表示 text 完全包含於某段已索引的文字
+        """
+        grams = char_ngrams(text, self.n)
+        if not grams:
+            return 0.0
+        return self.best_match(text)[0] / len(grams)
+
+    def best_match(self, text: str) -> tuple[int, bool]:
+        """text 在單一段已索引文字中符合的最多 n-gram 數
+
+        Args:
+            text: 查詢文字（辨識結果）
+
+        Returns:
+            (符合的 n-gram 數, 是否與某段已索引的文字完全相同)
+        """
+        hits: Counter[int] = Counter()
+        for gram in char_ngrams(text, self.n):
+            hits.update(self._postings.get(gram, ()))
+        normalized = normalize_text(text)
+        exact = bool(normalized) and any(doc == normalized for _, _, doc in self._docs)
+        return max(hits.values(), default=0), exact
+
+    def clear(self) -> None:
+        """清除索引"""
+        self._docs.clear()
+        self._postings.clear()
+
+
+class EchoStats(BaseModel):
+    """回音偵測統計"""
+
+    checked: int = Field(0, description="檢查的語句數")
+    in_playback: int = Field(0, description="與播放期間重疊的語句數")
+    echoes: int = Field(0, description="判定為回音而捨棄的語句數")
+
+
+class EchoDetector:
+    """單一會話的回音偵測器（執行緒安全）
+
+    Example:
+        detector = EchoDetector(EchoConfig())
+        detector.add_spoken("台北今天多雲。")
+        detector.on_playback(1.2)          # 每送出一段 TTS 音訊
+        detector.is_echo("台北今天多雲", audio_duration_s=1.5)  # True
+    """
+
+    def __init__(self, config: EchoConfig | None = None):
+        """初始化偵測器
+
+        Args:
+            config: 回音偵測配置（預設使用 EchoConfig()）
+        """
+        self.config = config or EchoConfig()
+        self._index = NGramIndex(self.config.ngram, self.config.max_sentences)
+        self._lock = threading.Lock()
+        self._playback_start: float | None = None
+        self._playback_end = 0.0
+        self._stats = EchoStats()
+
+    def add_spoken(self, text: str) -> None:
+        """記錄即將播放的文字
+
+        Args:
+            text: 送入 TTS 的文字
+        """
+        with self._lock:
+            self._index.add(text)
+
+    def on_playback(self, duration_s: float, now: float | None = None) -> None:
+        """記錄送出一段 TTS 音訊，延長預估的播放期間
+
+        音訊依序播放，每段接在前一段預估的播放結束之後。
+
+        Args:
+            duration_s: 音訊長度（秒）
+            now: 目前時間（time.monotonic()，測試用）
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            if self._playback_start is None or now > self._playback_end + (
+                self.config.tail_ms / 1000
+            ):
+                self._playback_start = now
+            self._playback_end = max(self._playback_end, now) + duration_s
+
+    def stop_playback(self, now: float | None = None) -> None:
+        """播放被中斷（使用者插話），預估的播放期間結束於現在
+
+        Args:
+            now: 目前時間（time.monotonic()，測試用）
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            self._playback_end = min(self._playback_end, now)
+
+    def overlaps_playback(
+        self, audio_duration_s: float, now: float | None = None
+    ) -> bool:
+        """剛收到的語句是否在播放期間（含尾端殘響）收音
+
+        Args:
+            audio_duration_s: 語句音訊長度（秒，收音結束於現在）
+            now: 目前時間（time.monotonic()，測試用）
+
+        Returns:
+            是否重疊
+        """
+        now = time.monotonic() if now is None else now
+        with self._lock:
+            if self._playback_start is None:
+                return False
+            started = now - audio_duration_s
+            return (
+                started <= self._playback_end + self.config.tail_ms / 1000
+                and now >= self._playback_start
+            )
+
+    def is_echo(
+        self,
+        transcript: str,
+        audio_duration_s: float,
+        reference: str | None = None,
+        now: float | None = None,
+    ) -> bool:
+        """判斷辨識結果是否為助理自身語音的回音
+
+        n-gram 包含比例達 min_similarity 且符合至少 min_matched_ngrams 個
+        n-gram 時視為回音；與某句完全相同時不論長短皆為回音。
+
+        Args:
+            transcript: 辨識結果
+            audio_duration_s: 語句音訊長度（秒）
+            reference: 額外比對的文字（例如上一輪完整回應，不加入索引）
+            now: 目前時間（time.monotonic()，測試用）
+
+        Returns:
+            是否為回音
+        """
+        overlaps = self.overlaps_playback(audio_duration_s, now)
+        echo = False
+        if overlaps:
+            echo = self._matches_spoken(transcript, reference)
+        with self._lock:
+            self._stats.checked += 1
+            self._stats.in_playback += overlaps
+            self._stats.echoes += echo
+        return echo
+
+    def _matches_spoken(self, transcript: str, reference: str | None) -> bool:
+        grams = char_ngrams(transcript, self.config.ngram)
+        if not grams:
+            return False
+        with self._lock:
+            matched, exact = self._index.best_match(transcript)
+        if reference:
+            matched = max(
+                matched, len(grams & char_ngrams(reference, self.config.ngram))
+            )
+            exact = exact or normalize_text(transcript) == normalize_text(reference)
+        return exact or (
+            matched / len(grams) >= self.config.min_similarity
+            and matched >= self.config.min_matched_ngrams
+        )
+
+    def reset(self) -> None:
+        """清除播放期間與已索引的文字"""
+        with self._lock:
+            self._index.clear()
+            self._playback_start = None
+            self._playback_end = 0.0
+
+    def stats(self) -> EchoStats:
+        """取得回音偵測統計
+
+        Returns:
+            EchoStats（複本）
+        """
+        with self._lock:
+            return self._stats.model_copy()
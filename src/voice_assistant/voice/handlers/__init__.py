@@ -1,5 +1,8 @@
 """FastRTC 處理器模組"""
 
-from voice_assistant.voice.handlers.reply_on_pause import create_voice_stream
+from voice_assistant.voice.handlers.reply_on_pause import (
+    InterruptibleReplyOnPause,
+    create_voice_stream,
+)
 
-__all__ = ["create_voice_stream"]
+__all__ = ["InterruptibleReplyOnPause", "create_voice_stream"]
@@ -4,39 +4,263 @@
 """
 
 import logging
+from collections.abc import Callable, Iterator
+from typing import Any
 
 import gradio as gr
 import numpy as np
-from fastrtc import AlgoOptions, ReplyOnPause, SileroVadOptions, Stream, WebRTC
+from fastrtc import (
+    AlgoOptions,
+    ReplyOnPause,
+    SileroVadOptions,
+    Stream,
+    WebRTC,
+    get_current_context,
+)
+from fastrtc.utils import current_context
+from numpy.typing import NDArray
 
-from voice_assistant.config import Settings
+from voice_assistant.agents import MultiAgentExecutor
+from voice_assistant.config import FlowMode, Settings
+from voice_assistant.flows import FlowExecutor
 from voice_assistant.llm.client import LLMClient
 from voice_assistant.roles.predefined.assistant import AssistantRole
 from voice_assistant.roles.predefined.coach import CoachRole
 from voice_assistant.roles.predefined.interviewer import InterviewerRole
 from voice_assistant.roles.registry import RoleRegistry
+from voice_assistant.threads import (
+    apply_thread_budget,
+    available_cpus,
+    plan_thread_budget,
+)
 from voice_assistant.tools import (
     ExchangeRateTool,
     StockPriceTool,
     ToolRegistry,
     WeatherTool,
 )
+from voice_assistant.tracing import TraceRecorder
+from voice_assistant.voice.async_loop import AsyncLoopThread
+from voice_assistant.voice.audio import SpeechSpan
 from voice_assistant.voice.pipeline import VoicePipeline
 from voice_assistant.voice.schemas import VoicePipelineConfig
+from voice_assistant.voice.session import SessionManager
+from voice_assistant.voice.stt.adaptive import AdaptiveWhisperSTT, default_profiles
+from voice_assistant.voice.stt.gate import SpeechGate
+from voice_assistant.voice.stt.pool import STTWorkerPool
+from voice_assistant.voice.stt.sherpa import SherpaOnnxSTT
+from voice_assistant.voice.stt.whisper import SAMPLE_RATE, WhisperSTT
+from voice_assistant.voice.tts.kokoro_base import create_kokoro_tts
+from voice_assistant.voice.tts.lookahead import PlaybackMonitor
 from voice_assistant.voice.ui import (
     additional_outputs_handler,
     audio_input_handler,
     create_additional_outputs,
 )
+from voice_assistant.warmup import (
+    Readiness,
+    WarmupReport,
+    start_warmup,
+    warm_up_flows,
+)
 
 logger = logging.getLogger(__name__)
 
+# 尚未建立 WebRTC 連線時（例如僅使用音訊上傳），以 Gradio 瀏覽器會話區分使用者
+_UPLOAD_SESSION_PREFIX = "upload-"
+
+# FastRTC Silero VAD 回傳的區段以 16kHz 樣本索引表示
+_VAD_SAMPLE_RATE = 16000
+
+
+def _resolve_session_id(webrtc_id: str | None, request: gr.Request | None) -> str:
+    """取得 UI 事件對應的會話 ID
+
+    Args:
+        webrtc_id: WebRTC 元件值（連線 ID，未連線時為空）
+        request: Gradio 請求（用於取得瀏覽器會話）
+
+    Returns:
+        會話 ID
+    """
+    if webrtc_id:
+        return webrtc_id
+    session_hash = request.session_hash if request is not None else None
+    return f"{_UPLOAD_SESSION_PREFIX}{session_hash or 'default'}"
+
+
+class _SpanRecordingVAD:
+    """記下最近一次 VAD 偵測到的語音區段的 VAD 模型包裝"""
+
+    def __init__(self, model: Any):
+        self.model = model
+        self.last_chunks: list[dict[str, int]] = []
+
+    def vad(self, audio: tuple[int, NDArray], options: Any) -> tuple[float, list]:
+        duration, chunks = self.model.vad(audio, options)
+        self.last_chunks = list(chunks)
+        return duration, chunks
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self.model, name)
+
 
-def create_voice_stream(settings: Settings) -> Stream:
+class InterruptibleReplyOnPause(ReplyOnPause):
+    """使用者插話時一併取消回覆工作的 ReplyOnPause
+
+    FastRTC 在偵測到新的語句時只會關閉回覆 generator；generator 正在另一個
+    執行緒中等待 LLM 或合成語音時 close() 會失敗，上一輪的流程、工具與 LLM
+    呼叫仍會在背景繼續。此處理器在關閉前先以連線 ID 呼叫 on_interrupt，
+    讓該會話立即取消本輪工作。
+
+    提供 on_speech 時，使用者說話期間每次累積新的語音都會轉送給該會話，
+    讓串流辨識在停頓前就開始。
+
+    提供 on_speech_spans 時，停頓偵測期間 VAD 找到的語音區段會換算為本句
+    音訊的樣本索引，在回覆開始前交給該會話，STT 可直接依此裁切靜音而
+    不必再跑一次 VAD。
+    """
+
+    def __init__(
+        self,
+        fn: Callable[..., Any],
+        *args: Any,
+        on_interrupt: Callable[[str], None] | None = None,
+        on_speech: Callable[[str, tuple[int, NDArray]], None] | None = None,
+        on_speech_spans: Callable[[str, int, list[SpeechSpan]], None] | None = None,
+        **kwargs: Any,
+    ):
+        """初始化處理器
+
+        Args:
+            fn: 回覆 generator 函式
+            *args: 傳給 ReplyOnPause 的位置參數
+            on_interrupt: 插話時呼叫的函式（參數為 WebRTC 連線 ID）
+            on_speech: 說話期間收到新語音時呼叫的函式
+                （參數為 WebRTC 連線 ID 與本句至今的完整音訊）
+            on_speech_spans: 回覆開始前呼叫的函式（參數為 WebRTC 連線 ID、
+                取樣率與本句音訊中的語音區段）
+            **kwargs: 傳給 ReplyOnPause 的關鍵字參數
+        """
+        super().__init__(fn, *args, **kwargs)
+        self.on_interrupt = on_interrupt
+        self.on_speech = on_speech
+        self.on_speech_spans = on_speech_spans
+        self._webrtc_id: str | None = None
+        self._forwarded_stream: NDArray | None = None
+        self._speech_spans: list[SpeechSpan] = []
+        # 每個連線各自包裝一層，記錄的區段不會與其他連線混用
+        if on_speech_spans is not None:
+            model = self.model
+            if isinstance(model, _SpanRecordingVAD):
+                model = model.model
+            self.model = _SpanRecordingVAD(model)
+
+    def copy(self) -> "InterruptibleReplyOnPause":
+        """每個連線各自複製一份處理器（保留回呼設定）"""
+        return InterruptibleReplyOnPause(
+            self.fn,
+            self.startup_fn,
+            self.algo_options,
+            self.model_options,
+            self.can_interrupt,
+            self.expected_layout,
+            self.output_sample_rate,
+            self.output_frame_size,
+            self.input_sample_rate,
+            self.model,
+            self.needs_args,
+            on_interrupt=self.on_interrupt,
+            on_speech=self.on_speech,
+            on_speech_spans=self.on_speech_spans,
+        )
+
+    def _connection_id(self) -> str | None:
+        # FastRTC 在收音與輸出的執行緒都會帶入連線 context，記下供之後使用
+        context = current_context.get()
+        if context is not None:
+            self._webrtc_id = context.webrtc_id
+        return self._webrtc_id
+
+    def receive(self, frame: tuple[int, np.ndarray]) -> None:
+        super().receive(frame)
+        if self.on_speech is None or not self.state.started_talking:
+            return
+        # 只在累積的語音有變動時轉送（FastRTC 每個 VAD 區塊才更新一次）
+        stream = self.state.stream
+        if stream is None or stream is self._forwarded_stream:
+            return
+        self._forwarded_stream = stream
+        webrtc_id = self._connection_id()
+        if webrtc_id is None:
+            return
+        try:
+            self.on_speech(webrtc_id, (self.state.sampling_rate, stream))
+        except Exception as e:
+            logger.warning(f"[Handler] 轉送語音失敗: {e}")
+
+    def determine_pause(
+        self, audio: np.ndarray, sampling_rate: int, state: Any
+    ) -> bool:
+        if not isinstance(self.model, _SpanRecordingVAD):
+            return super().determine_pause(audio, sampling_rate, state)
+
+        offset = 0 if state.stream is None else len(state.stream)
+        self.model.last_chunks = []
+        pause = super().determine_pause(audio, sampling_rate, state)
+        # 只有併入本句音訊的區塊才記錄其語音區段（換算為本句的樣本索引）
+        if state.stream is not None and len(state.stream) > offset:
+            scale = sampling_rate / _VAD_SAMPLE_RATE
+            self._speech_spans.extend(
+                (
+                    offset + int(chunk["start"] * scale),
+                    offset + int(chunk["end"] * scale),
+                )
+                for chunk in self.model.last_chunks
+            )
+        return pause
+
+    def emit(self):
+        # 建立回覆 generator 時記下連線 ID，並交出本句的語音區段
+        if self.generator is None and self.event.is_set():
+            webrtc_id = self._connection_id()
+            spans, self._speech_spans = self._speech_spans, []
+            if self.on_speech_spans is not None and webrtc_id is not None:
+                try:
+                    self.on_speech_spans(webrtc_id, self.state.sampling_rate, spans)
+                except Exception as e:
+                    logger.warning(f"[Handler] 轉送語音區段失敗: {e}")
+        return super().emit()
+
+    def reset(self) -> None:
+        super().reset()
+        self._speech_spans = []
+
+    def _close_generator(self) -> None:
+        if (
+            self.generator is not None
+            and self._webrtc_id is not None
+            and self.on_interrupt is not None
+        ):
+            try:
+                self.on_interrupt(self._webrtc_id)
+            except Exception as e:
+                logger.warning(f"[Handler] 取消本輪工作失敗: {e}")
+        super()._close_generator()
+
+
+def create_voice_stream(
+    settings: Settings,
+    async_loop: AsyncLoopThread | None = None,
+    readiness: Readiness | None = None,
+) -> Stream:
     """建立 FastRTC 語音串流
 
     Args:
         settings: 應用程式設定
+        async_loop: 共用背景 event loop（可選，預設自動建立；
+            由呼叫端負責在關閉時呼叫 shutdown）
+        readiness: 就緒狀態（可選，背景暖身完成後標記為就緒）
 
     Returns:
         配置好的 FastRTC Stream（已設定自定義 UI 與事件綁定）
@@ -45,26 +269,71 @@ def create_voice_stream(settings: Settings) -> Stream:
     llm_client = LLMClient(
         api_key=settings.openai_api_key,
         model=settings.openai_model,
+        base_url=settings.openai_base_url,
+    )
+
+    # CPU 執行緒預算：在載入任何模型前決定 STT 與 TTS 的執行緒數
+    thread_budget = plan_thread_budget(
+        settings.cpu_thread_budget or available_cpus(),
+        stt_workers=settings.whisper_num_workers,
+        stt_share=settings.cpu_stt_share,
+        stt_threads=settings.whisper_cpu_threads,
+        tts_threads=settings.tts_threads,
+        tts_interop_threads=settings.tts_interop_threads,
     )
+    # kokoro-onnx 的執行緒由 ONNX Runtime session 設定，不需匯入 PyTorch
+    apply_thread_budget(thread_budget, torch_threads=settings.tts_backend == "kokoro")
 
     # 建立語音管線配置（使用正確 config 類別）
     from voice_assistant.voice.schemas import (
+        EchoConfig,
+        GateConfig,
+        SegmentationConfig,
         STTConfig,
+        TTSCacheConfig,
         TTSConfig,
         VADConfig,
     )
 
     config = VoicePipelineConfig(
         stt=STTConfig(
+            backend=settings.stt_backend,
+            sherpa_model_path=settings.sherpa_model_path,
             model_size=settings.whisper_model_size,
             model_path=settings.whisper_model_path,
             language=settings.whisper_language,
             device=settings.whisper_device,
+            streaming=settings.whisper_streaming,
+            streaming_interval_ms=settings.whisper_streaming_interval_ms,
+            num_workers=settings.whisper_num_workers,
+            cpu_threads=thread_budget.stt_threads,
+            batch_size=settings.whisper_batch_size,
+            batch_window_ms=settings.whisper_batch_window_ms,
+            single_vad=settings.whisper_single_vad,
+            adaptive=settings.whisper_adaptive,
+            fast_model_size=settings.whisper_fast_model_size,
+            latency_budget_ms=settings.whisper_latency_budget_ms,
         ),
         tts=TTSConfig(
+            backend=settings.tts_backend,
             model_path=settings.tts_model_path,
+            onnx_model_path=settings.tts_onnx_model_path,
+            quantization=settings.tts_quantization,
+            cpu_threads=thread_budget.tts_threads,
             voice=settings.tts_voice,
             speed=settings.tts_speed,
+            lookahead=settings.tts_lookahead,
+            cache=TTSCacheConfig(
+                enabled=settings.tts_cache_enabled,
+                memory_mb=settings.tts_cache_memory_mb,
+                disk_path=settings.tts_cache_dir or None,
+                disk_mb=settings.tts_cache_disk_mb,
+                disk_dtype=settings.tts_cache_dtype,
+            ),
+            segmentation=SegmentationConfig(
+                strategy=settings.tts_segmentation,
+                first_max_chars=settings.tts_first_chunk_max_chars,
+            ),
         ),
         vad=VADConfig(
             pause_threshold_ms=settings.vad_pause_threshold_ms,
@@ -72,7 +341,24 @@ def create_voice_stream(settings: Settings) -> Stream:
             speech_threshold=settings.vad_speech_threshold,
             min_silence_duration_ms=settings.vad_min_silence_duration_ms,
         ),
+        gate=GateConfig(
+            enabled=settings.stt_gate_enabled,
+            min_voiced_ms=settings.stt_gate_min_voiced_ms,
+            min_rms_dbfs=settings.stt_gate_min_rms_dbfs,
+            max_spectral_flatness=settings.stt_gate_max_spectral_flatness,
+            max_no_speech_prob=settings.stt_gate_max_no_speech_prob,
+            min_avg_logprob=settings.stt_gate_min_avg_logprob,
+        ),
+        echo=EchoConfig(
+            enabled=settings.echo_suppression_enabled,
+            min_similarity=settings.echo_min_similarity,
+            min_matched_ngrams=settings.echo_min_matched_ngrams,
+            tail_ms=settings.echo_tail_ms,
+        ),
         can_interrupt=True,
+        stream_response=settings.llm_stream_response,
+        speculative_intent=settings.intent_speculative,
+        speculative_partial_frames=settings.whisper_speculative_frames,
         server_host=settings.server_host,
         server_port=settings.server_port,
     )
@@ -103,29 +389,153 @@ def create_voice_stream(settings: Settings) -> Stream:
     default_role_id = next(iter(available_roles)) if available_roles else ""
 
     # 初始化意圖辨識器
+    from voice_assistant.intent.matcher import SwitchRoleMatcher
     from voice_assistant.intent.recognizer import IntentRecognizer
 
-    intent_recognizer = IntentRecognizer(llm_client)
+    # 明確的切換指令／一般對話由本地規則判斷，僅模糊輸入才呼叫 LLM
+    intent_recognizer = IntentRecognizer(
+        llm_client, matcher=SwitchRoleMatcher(role_registry)
+    )
+
+    # 所有會話共用同一個背景 loop，LLM 與工具的連線池得以跨輪次重用
+    async_loop = async_loop or AsyncLoopThread()
+    async_loop.add_shutdown_callback(llm_client.aclose)
+    async_loop.add_shutdown_callback(tool_registry.aclose)
+
+    # 語音閘門由所有會話與辨識器共用，統計整個服務捨棄的語句
+    speech_gate = SpeechGate(config.gate) if config.gate.enabled else None
+
+    # 重量級元件只建立一次，由所有會話共用；辨識請求經由共用的 worker pool
+    whisper_kwargs = {
+        "model_path": config.stt.model_path,
+        "device": config.stt.device,
+        "language": config.stt.language,
+        "vad_filter": config.stt.vad_filter,
+        "min_silence_duration_ms": config.vad.min_silence_duration_ms,
+        "cpu_threads": config.stt.cpu_threads,
+        "num_workers": config.stt.num_workers,
+        "gate": speech_gate,
+    }
+    recognizer: WhisperSTT | AdaptiveWhisperSTT | SherpaOnnxSTT
+    if config.stt.backend == "sherpa-onnx":
+        recognizer = SherpaOnnxSTT(
+            model_path=config.stt.sherpa_model_path,
+            language=config.stt.language,
+            num_threads=config.stt.cpu_threads,
+        )
+    elif config.stt.adaptive:
+        # 自適應模式：預載快速與主模型，依語句長度與 pool 佇列深度逐句選擇
+        recognizer = AdaptiveWhisperSTT(
+            default_profiles(config.stt),
+            latency_budget_ms=config.stt.latency_budget_ms,
+            **whisper_kwargs,
+        )
+    else:
+        recognizer = WhisperSTT(
+            model_size=config.stt.model_size,
+            beam_size=config.stt.beam_size,
+            **whisper_kwargs,
+        )
+    stt = STTWorkerPool(
+        recognizer,
+        num_workers=config.stt.num_workers,
+        max_batch_size=config.stt.batch_size,
+        batch_window_ms=config.stt.batch_window_ms,
+    )
+    # 語句快取由所有會話共用：歡迎詞、切換確認與錯誤提示只需合成一次；
+    # 跨句的 lookahead 由 VoicePipeline 處理，句內不再重複預先合成。
+    # 只有 kokoro 後端才匯入 PyTorch
+    tts = create_kokoro_tts(config.tts)
+    # 斷音統計涵蓋所有會話的回應音訊
+    playback_monitor = PlaybackMonitor()
+    flow_executor = (
+        FlowExecutor(llm_client, tool_registry)
+        if settings.flow_mode == FlowMode.LANGGRAPH
+        else None
+    )
+    multi_agent_executor = (
+        MultiAgentExecutor(llm_client, tool_registry)
+        if settings.flow_mode == FlowMode.MULTI_AGENT
+        else None
+    )
+
+    # 延遲追蹤：所有會話寫入同一個收集器
+    tracer = (
+        TraceRecorder(
+            jsonl_path=settings.trace_jsonl_path,
+            buffer_size=settings.trace_buffer_size,
+        )
+        if settings.trace_enabled
+        else None
+    )
 
-    # 初始化語音管線（使用正確的 007 + 008 整合版本）
-    pipeline = VoicePipeline(
-        config=config,
-        llm_client=llm_client,
-        tool_registry=tool_registry,
-        intent_recognizer=intent_recognizer,
-        role_registry=role_registry,
+    # 每個會話擁有獨立的對話狀態與角色
+    def create_session_pipeline() -> VoicePipeline:
+        pipeline = VoicePipeline(
+            config=config,
+            llm_client=llm_client,
+            stt=stt,
+            tts=tts,
+            tool_registry=tool_registry,
+            intent_recognizer=intent_recognizer,
+            role_registry=role_registry,
+            flow_executor=flow_executor,
+            multi_agent_executor=multi_agent_executor,
+            async_loop=async_loop,
+            tracer=tracer,
+            speech_gate=speech_gate,
+            playback_monitor=playback_monitor,
+            # 串流架構的引擎每個會話各自遞增解碼，不經由共用 pool
+            streaming_stt=(
+                recognizer.create_session()
+                if isinstance(recognizer, SherpaOnnxSTT) and config.stt.streaming
+                else None
+            ),
+        )
+        # 新會話先設置預設角色
+        if default_role_id:
+            pipeline.switch_role(role_registry.get(default_role_id))
+        return pipeline
+
+    sessions = SessionManager(
+        create_session_pipeline,
+        idle_timeout_s=settings.session_idle_timeout_s,
+        max_sessions=settings.session_max_sessions,
     )
-    # 啟動階段先設置預設角色
-    if default_role_id:
-        pipeline.switch_role(role_registry.get(default_role_id))
+
+    # FastRTC 處理器：依目前連線 ID 取得該會話的管線
+    def handle_audio(audio: tuple[int, np.ndarray]) -> Iterator:
+        webrtc_id = get_current_context().webrtc_id
+        yield from sessions.get(webrtc_id).process_audio_with_outputs(audio)
+
+    # 使用者插話：取消該會話上一輪仍在進行的流程、工具與 TTS
+    def cancel_session_turn(webrtc_id: str) -> None:
+        if webrtc_id in sessions:
+            sessions.get(webrtc_id).on_interrupt()
+
+    # 說話期間：將累積的語音交給該會話的串流辨識器
+    def feed_session_audio(webrtc_id: str, audio: tuple[int, NDArray]) -> None:
+        sessions.get(webrtc_id).feed_audio(audio)
+
+    # 停頓偵測完成：將 VAD 已找到的語音區段交給該會話，STT 不必再跑 VAD
+    def set_session_speech_spans(
+        webrtc_id: str, sample_rate: int, spans: list[SpeechSpan]
+    ) -> None:
+        sessions.get(webrtc_id).set_speech_spans(sample_rate, spans)
 
     # 回調 glue：角色切換
-    def on_role_change(role_id: str, current_chatbot: list, current_status: str):
+    def on_role_change(
+        role_id: str,
+        webrtc_id: str | None,
+        current_chatbot: list,
+        current_status: str,
+        request: gr.Request,
+    ):
         # 防禦式：確保 current_chatbot 和 current_status 有預設值
         current_chatbot = current_chatbot or []
         current_status = current_status or "🟢 待命"
         role = role_registry.get(role_id)
-        pipeline.switch_role(role)
+        sessions.get(_resolve_session_id(webrtc_id, request)).switch_role(role)
         welcome = (
             role.get_welcome_message() if hasattr(role, "get_welcome_message") else None
         )
@@ -159,8 +569,8 @@ def create_voice_stream(settings: Settings) -> Stream:
 
     # 建立 FastRTC Stream（使用 process_audio_with_outputs 以支援 AdditionalOutputs）
     stream = Stream(
-        handler=ReplyOnPause(
-            pipeline.process_audio_with_outputs,
+        handler=InterruptibleReplyOnPause(
+            handle_audio,
             algo_options=AlgoOptions(
                 audio_chunk_duration=config.vad.pause_threshold_ms / 1000,
                 started_talking_threshold=0.2,
@@ -173,6 +583,13 @@ def create_voice_stream(settings: Settings) -> Stream:
             ),
             can_interrupt=config.can_interrupt,
             output_sample_rate=config.tts.sample_rate,
+            on_interrupt=cancel_session_turn,
+            on_speech=feed_session_audio if config.stt.streaming else None,
+            on_speech_spans=(
+                set_session_speech_spans
+                if config.stt.single_vad and not config.stt.streaming
+                else None
+            ),
         ),
         modality="audio",
         mode="send-receive",
@@ -180,31 +597,41 @@ def create_voice_stream(settings: Settings) -> Stream:
         additional_outputs_handler=additional_outputs_handler,
     )
 
-    # 建立清除對話的函式（閉包，捕獲 pipeline 參考）
-    def clear_conversation() -> tuple[list[dict[str, str]], str]:
+    # 建立清除對話的函式（閉包，捕獲 sessions 參考）
+    def clear_conversation(
+        webrtc_id: str | None, request: gr.Request
+    ) -> tuple[list[dict[str, str]], str]:
         """清除對話歷史
 
-        同時清除 UI 顯示和 pipeline 內部狀態。
+        同時清除 UI 顯示和該會話 pipeline 的內部狀態。
+
+        Args:
+            webrtc_id: WebRTC 連線 ID（未連線時為空）
+            request: Gradio 請求
 
         Returns:
             (empty_chatbot, reset_status)
         """
-        pipeline.state.history.clear()
+        sessions.get(_resolve_session_id(webrtc_id, request)).state.history.clear()
         logger.info("[Handler] 對話歷史已清除")
         return [], "🟢 待命"
 
-    # 建立處理上傳音訊的函式（閉包，捕獲 pipeline 參考）
+    # 建立處理上傳音訊的函式（閉包，捕獲 sessions 參考）
     def process_uploaded_audio(
         audio: tuple[int, np.ndarray] | None,
+        webrtc_id: str | None,
         current_chatbot: list[dict[str, str]],
         current_status: str,
+        request: gr.Request,
     ) -> tuple[list[dict[str, str]], str, None]:
         """處理上傳的音訊檔案
 
         Args:
             audio: (sample_rate, audio_array) 或 None
+            webrtc_id: WebRTC 連線 ID（未連線時為空）
             current_chatbot: 目前的對話記錄
             current_status: 目前的狀態文字
+            request: Gradio 請求
 
         Returns:
             (updated_chatbot, updated_status, cleared_audio_input)
@@ -212,8 +639,8 @@ def create_voice_stream(settings: Settings) -> Stream:
         if audio is None:
             return current_chatbot, current_status, None
 
-        # 轉換音訊格式
-        processed_audio = audio_input_handler(audio)
+        # 轉換音訊格式（直接重採樣為 Whisper 的 16kHz，STT 不必再處理）
+        processed_audio = audio_input_handler(audio, target_sample_rate=SAMPLE_RATE)
         if processed_audio is None:
             return current_chatbot, current_status, None
 
@@ -224,6 +651,7 @@ def create_voice_stream(settings: Settings) -> Stream:
         final_chatbot = current_chatbot
         final_status = current_status
 
+        pipeline = sessions.get(_resolve_session_id(webrtc_id, request))
         try:
             for output in pipeline.process_audio_with_outputs(processed_audio):
                 # 檢查是否為 AdditionalOutputs
@@ -276,12 +704,6 @@ def create_voice_stream(settings: Settings) -> Stream:
                     label="選擇角色",
                     interactive=True,
                 )
-                # 正確綁定 chatbot/state 做到 UI 更新
-                dropdown.change(
-                    fn=on_role_change,
-                    inputs=[dropdown, chatbot, status_display],
-                    outputs=[chatbot, status_display],
-                )
 
                 # WebRTC 串流元件（放在右側上方，關閉全螢幕模式）
                 webrtc = WebRTC(
@@ -306,6 +728,13 @@ def create_voice_stream(settings: Settings) -> Stream:
                     )
                     submit_btn = gr.Button("🎯 處理音訊", variant="primary")
 
+        # 正確綁定 chatbot/state 做到 UI 更新（WebRTC 值即連線 ID）
+        dropdown.change(
+            fn=on_role_change,
+            inputs=[dropdown, webrtc, chatbot, status_display],
+            outputs=[chatbot, status_display],
+        )
+
         # 綁定 WebRTC 串流事件
         webrtc.stream(
             fn=stream.event_handler,
@@ -326,18 +755,32 @@ def create_voice_stream(settings: Settings) -> Stream:
         # 綁定音訊上傳處理事件
         submit_btn.click(
             fn=process_uploaded_audio,
-            inputs=[audio_input, chatbot, status_display],
+            inputs=[audio_input, webrtc, chatbot, status_display],
             outputs=[chatbot, status_display, audio_input],
         )
 
         # 綁定清除對話事件
         clear_btn.click(
             fn=clear_conversation,
-            inputs=[],
+            inputs=[webrtc],
             outputs=[chatbot, status_display],
         )
 
     # 替換 Stream 的預設 UI
     stream.ui = custom_ui
 
+    # 背景暖身：第一輪對話不必承擔各元件的延遲初始化
+    readiness = readiness or Readiness()
+    if settings.warmup_enabled:
+        start_warmup(
+            {
+                "stt": stt.warm_up,
+                "tts": tts.warm_up,
+                "flows": lambda: warm_up_flows(settings.flow_mode),
+            },
+            readiness,
+        )
+    else:
+        readiness.set_report(WarmupReport())
+
     return stream
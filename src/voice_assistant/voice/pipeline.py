@@ -3,28 +3,48 @@
 整合 STT、LLM、TTS 實現完整語音對話流程，支援角色切換。
 """
 
-import asyncio
 import json
 import logging
-from collections.abc import Iterator
+import queue
+import threading
+from collections import deque
+from collections.abc import Awaitable, Callable, Iterator
 from typing import TYPE_CHECKING
 
 import numpy as np
 from fastrtc import AdditionalOutputs
 from numpy.typing import NDArray
 
+from voice_assistant import tracing
 from voice_assistant.agents import MultiAgentExecutor
+from voice_assistant.cancellation import CancelToken, TurnCancelledError, cancellable
 from voice_assistant.config import FlowMode, get_settings
 from voice_assistant.flows import FlowExecutor
 from voice_assistant.llm.schemas import ChatMessage
+from voice_assistant.llm.streaming import TextDeltaCallback
 from voice_assistant.tools.registry import ToolRegistry
+from voice_assistant.voice.async_loop import AsyncLoopThread
+from voice_assistant.voice.audio import SpeechSpan, trim_to_speech
+from voice_assistant.voice.echo import EchoDetector
 from voice_assistant.voice.schemas import (
     ConversationState,
+    TranscribedText,
     VoicePipelineConfig,
     VoiceState,
 )
+from voice_assistant.voice.stt.base import StreamingSTTModel, STTModel
+from voice_assistant.voice.stt.gate import SpeechGate
+from voice_assistant.voice.stt.sherpa import SherpaOnnxSTT
+from voice_assistant.voice.stt.streaming import StreamingTranscriber
 from voice_assistant.voice.stt.whisper import WhisperSTT
-from voice_assistant.voice.tts.kokoro import KokoroTTS
+from voice_assistant.voice.tts.kokoro_base import KokoroBaseTTS, create_kokoro_tts
+from voice_assistant.voice.tts.lookahead import PlaybackMonitor, lookahead_stream
+from voice_assistant.voice.tts.segmenter import (
+    SentenceSegmenter,
+    TextSegmenter,
+    create_segmenter,
+    split_text,
+)
 
 # 設定 logging
 logging.basicConfig(level=logging.INFO)
@@ -33,6 +53,9 @@ logger = logging.getLogger(__name__)
 # Log 敏感資料最大長度（避免洩露 PII）
 _LOG_MAX_TEXT_LEN = 50
 
+# 依上游 VAD 區段裁切靜音時，語音前後保留的毫秒數（避免切掉字首字尾）
+_SPEECH_PAD_MS = 200
+
 
 def _truncate_for_log(text: str, max_len: int = _LOG_MAX_TEXT_LEN) -> str:
     """截斷文字用於 log，避免敏感資料外洩"""
@@ -41,20 +64,114 @@ def _truncate_for_log(text: str, max_len: int = _LOG_MAX_TEXT_LEN) -> str:
     return text[:max_len] + "..."
 
 
-def _run_async_safely(coro):
-    """安全地執行 async coroutine，處理 nested event loop 情況
+def _normalize_transcript(text: str) -> str:
+    """比對辨識結果用：忽略空白、標點與大小寫差異"""
+    return "".join(ch for ch in text if ch.isalnum()).lower()
+
+
+# 回應處理函式：(user_text, on_delta, cancel_token) -> 完整回應文字
+ResponseProcessor = Callable[
+    [str, TextDeltaCallback | None, CancelToken | None], Awaitable[str]
+]
+
+# 串流結束標記
+_STREAM_END = object()
+
 
-    在 Gradio/FastRTC 環境中可能已有 event loop 執行中，
-    此函式會偵測並使用適當的方式執行 coroutine。
+class _ResponseStream:
+    """串流回應
+
+    在背景執行回應流程，將 LLM 文字增量即時切成句子（或依斷句策略
+    切成更短的段落），讓 TTS 在模型仍在生成時就開始合成第一段。
+
+    建立後流程即開始執行；在呼叫 sentences() 之前增量只會緩衝，
+    因此可與意圖辨識並行，待確認不是角色切換後才開始播放。
     """
-    try:
-        loop = asyncio.get_running_loop()
-        # 已有執行中的 loop，使用 run_coroutine_threadsafe 正確整合
-        future = asyncio.run_coroutine_threadsafe(coro, loop)
-        return future.result()
-    except RuntimeError:
-        # 沒有執行中的 loop，直接使用 asyncio.run()
-        return asyncio.run(coro)
+
+    def __init__(
+        self,
+        loop: AsyncLoopThread,
+        process: ResponseProcessor,
+        user_text: str,
+        stream: bool = True,
+        trace: tracing.TurnTrace | None = None,
+        cancel_token: CancelToken | None = None,
+        segmenter: TextSegmenter | None = None,
+    ) -> None:
+        self._deltas: queue.Queue = queue.Queue()
+        self._segmenter = segmenter or SentenceSegmenter()
+        self._streamed: list[str] = []
+        self._stream = stream
+        # on_delta 在背景 loop 上被呼叫，queue.Queue 可安全跨執行緒傳遞
+        on_delta = self._deltas.put if stream else None
+        # 子權杖：可單獨取消本流程（角色切換），整輪取消時也一併取消
+        self._cancel_token = cancel_token.child() if cancel_token else CancelToken()
+        self._future = loop.submit(self._run(process, user_text, on_delta, trace))
+        self._future.add_done_callback(lambda _f: self._deltas.put(_STREAM_END))
+        self.text = ""
+
+    async def _run(
+        self,
+        process: ResponseProcessor,
+        user_text: str,
+        on_delta: TextDeltaCallback | None,
+        trace: tracing.TurnTrace | None,
+    ) -> str:
+        # 在 loop 上才建立流程 coroutine：開始前即被取消時不留下未執行的 coroutine
+        self._cancel_token.raise_if_cancelled()
+        return await cancellable(
+            self._cancel_token,
+            tracing.traced(
+                trace,
+                process(user_text, on_delta, self._cancel_token),
+                name="flow",
+            ),
+        )
+
+    def cancel(self) -> None:
+        """取消仍在執行的回應流程"""
+        if not self._future.done() and self._cancel_token.cancel():
+            logger.info("[Pipeline] 已取消預先啟動的回應流程")
+
+    @property
+    def streamed_text(self) -> str:
+        """目前已收到的串流文字"""
+        return "".join(self._streamed)
+
+    def sentences(self) -> Iterator[str]:
+        """逐段產出回應文字
+
+        串流結束後以流程回傳的完整回應補齊未串流的部分
+        （例如未經 LLM 的直接回應或降級回應）。
+
+        Yields:
+            可送入 TTS 的段落（依斷句策略為完整句子或子句）
+
+        Raises:
+            TurnCancelledError: 本輪已取消
+            Exception: 回應流程執行失敗時
+        """
+        segmenter = self._segmenter
+        if not self._stream:
+            # 非串流模式：取得完整回應後再斷句
+            self.text = self._future.result()
+            yield from split_text(self.text, segmenter)
+            return
+
+        while (delta := self._deltas.get()) is not _STREAM_END:
+            self._streamed.append(delta)
+            yield from segmenter.push(delta)
+
+        self.text = self._future.result()
+        streamed = self.streamed_text
+        if self.text.startswith(streamed):
+            yield from segmenter.push(self.text[len(streamed) :])
+        else:
+            logger.warning("[Pipeline] 最終回應與串流內容不一致，僅播放已串流部分")
+            self.text = streamed
+
+        if tail := segmenter.flush():
+            yield tail
 
 
 if TYPE_CHECKING:
@@ -83,29 +200,65 @@ class VoicePipeline:
         self,
         config: VoicePipelineConfig,
         llm_client: "LLMClient",
-        stt: WhisperSTT | None = None,
-        tts: KokoroTTS | None = None,
+        stt: STTModel | None = None,
+        tts: KokoroBaseTTS | None = None,
         tool_registry: ToolRegistry | None = None,
         intent_recognizer=None,
         role_registry=None,
         state: ConversationState | None = None,
+        flow_executor: FlowExecutor | None = None,
+        multi_agent_executor: MultiAgentExecutor | None = None,
+        async_loop: AsyncLoopThread | None = None,
+        tracer: tracing.TraceRecorder | None = None,
+        streaming_stt: StreamingSTTModel | None = None,
+        flow_mode: FlowMode | None = None,
+        speech_gate: SpeechGate | None = None,
+        echo_detector: EchoDetector | None = None,
+        playback_monitor: PlaybackMonitor | None = None,
     ):
         """初始化語音管線
 
         Args:
             config: 管線配置
             llm_client: LLM 客戶端（來自 000 規格）
-            stt: STT 實例（可選，預設自動建立）
+            stt: STT 實例（可選，預設自動建立 WhisperSTT）
             tts: TTS 實例（可選，預設自動建立）
             tool_registry: 工具註冊表（可選，預設使用空註冊表）
             intent_recognizer: 意圖辨識器（008 角色切換）
             role_registry: 角色註冊表（008 角色切換）
             state: 對話狀態（可選，預設自動建立）
+            flow_executor: LangGraph 執行器（可選，多會話共用時注入）
+            multi_agent_executor: 多代理執行器（可選，多會話共用時注入）
+            async_loop: 背景 event loop（可選，預設自動建立並由管線擁有）
+            tracer: 延遲追蹤收集器（可選，提供時每輪輸出追蹤紀錄）
+            streaming_stt: 串流辨識器（可選，預設依 config.stt.streaming 建立）
+            flow_mode: 全域流程模式（可選，預設依設定 FLOW_MODE）
+            speech_gate: 語音閘門（可選，多會話共用時注入；
+                預設依 config.gate.enabled 建立）
+            echo_detector: 回音偵測器（可選，預設依 config.echo.enabled 建立）
+            playback_monitor: 播放斷音統計（可選，多會話共用時注入）
         """
         self.config = config
         self.llm_client = llm_client
         self.state = state if state is not None else ConversationState()
 
+        # 所有 async 工作（意圖、流程、代理、工具、LLM）皆提交到同一個長駐 loop
+        self._owns_async_loop = async_loop is None
+        self.async_loop = async_loop or AsyncLoopThread()
+        self.tracer = tracer
+
+        # 目前這一輪的取消權杖（新一輪開始或使用者插話時取消）
+        self._turn_token: CancelToken | None = None
+
+        # 預測執行：部分辨識結果穩定時預先啟動的回應流程
+        # （部分辨識回呼在辨識執行緒中呼叫，以 lock 保護）
+        self._speculation_lock = threading.Lock()
+        self._speculation: tuple[str, _ResponseStream, CancelToken] | None = None
+        self._partial_text = ""
+        self._partial_repeats = 0
+        # 目前語句至今的音訊（預測前以語音閘門檢查）
+        self._utterance_audio: tuple[int, NDArray[np.int16 | np.float32]] | None = None
+
         # 008: 角色切換支援
         self.intent_recognizer = intent_recognizer
         self.role_registry = role_registry
@@ -115,23 +268,35 @@ class VoicePipeline:
 
         # 取得流程模式設定
         settings = get_settings()
-        self.flow_mode = settings.flow_mode
+        self.flow_mode = flow_mode or settings.flow_mode
         logger.info(f"[Pipeline] 流程模式: {self.flow_mode.value}")
 
         # 初始化 FlowExecutor（LangGraph 流程）
         self.flow_executor: FlowExecutor | None = None
         if self.flow_mode == FlowMode.LANGGRAPH:
-            self.flow_executor = FlowExecutor(llm_client, self.tool_registry)
+            self.flow_executor = flow_executor or FlowExecutor(
+                llm_client, self.tool_registry
+            )
             logger.info("[Pipeline] LangGraph 流程已啟用")
 
         # 初始化 MultiAgentExecutor（多代理協作）
         self.multi_agent_executor: MultiAgentExecutor | None = None
         if self.flow_mode == FlowMode.MULTI_AGENT:
-            self.multi_agent_executor = MultiAgentExecutor(
+            self.multi_agent_executor = multi_agent_executor or MultiAgentExecutor(
                 llm_client, self.tool_registry
             )
             logger.info("[Pipeline] Multi-Agent 流程已啟用")
 
+        # 語音閘門：解碼前捨棄雜音與過短的語句
+        self.speech_gate = speech_gate
+        if self.speech_gate is None and config.gate.enabled:
+            self.speech_gate = SpeechGate(config.gate)
+
+        # 回音偵測：捨棄播放期間收到、內容與助理語音相近的辨識結果
+        self.echo_detector = echo_detector
+        if self.echo_detector is None and config.echo.enabled:
+            self.echo_detector = EchoDetector(config.echo)
+
         # 初始化 STT
         self.stt = stt or WhisperSTT(
             model_size=config.stt.model_size,
@@ -141,14 +306,34 @@ class VoicePipeline:
             beam_size=config.stt.beam_size,
             vad_filter=config.stt.vad_filter,
             min_silence_duration_ms=config.vad.min_silence_duration_ms,
+            cpu_threads=config.stt.cpu_threads,
+            gate=self.speech_gate,
         )
 
-        # 初始化 TTS（model_path 為 HF_HOME 快取目錄）
-        self.tts = tts or KokoroTTS(
-            model_path=config.tts.model_path,
-            voice=config.tts.voice,
-            speed=config.tts.speed,
-        )
+        # 串流辨識：每個會話各自一個（說話期間的辨識狀態屬於該會話）
+        self.streaming_stt = streaming_stt
+        if self.streaming_stt is None and config.stt.streaming:
+            if isinstance(self.stt, SherpaOnnxSTT):
+                # 串流架構的模型直接遞增解碼
+                self.streaming_stt = self.stt.create_session()
+            elif not getattr(self.stt, "supports_words", True):
+                logger.warning("[Pipeline] STT 不提供逐字時間戳，停用串流辨識")
+            else:
+                self.streaming_stt = StreamingTranscriber(
+                    self.stt,
+                    decode_interval_s=config.stt.streaming_interval_ms / 1000,
+                )
+        if self.streaming_stt is not None and config.speculative_partial_frames > 0:
+            self.streaming_stt.on_partial = self._on_partial
+
+        # 上游 VAD 為下一句找到的語音區段：(取樣率, 區段)
+        self._speech_spans: tuple[int, list[SpeechSpan]] | None = None
+
+        # 初始化 TTS（依 config.tts.backend；跨句的 lookahead 由 _process_turn
+        # 處理，句內不再重複預先合成）
+        self.tts = tts or create_kokoro_tts(config.tts)
+        # 回應音訊的斷音統計（合成跟不上播放的次數與時間）
+        self.playback = playback_monitor or PlaybackMonitor()
 
     def switch_role(self, role):
         """切換當前角色
@@ -192,6 +377,8 @@ class VoicePipeline:
         llm_response: ChatMessage,
         tools: list[dict],
         system_prompt: str | None = None,
+        on_delta: TextDeltaCallback | None = None,
+        cancel_token: CancelToken | None = None,
     ) -> str:
         """處理 LLM 的 Tool Calls 回應
 
@@ -200,6 +387,8 @@ class VoicePipeline:
             llm_response: LLM 回應（可能包含 tool_calls）
             tools: 工具定義列表
             system_prompt: 系統提示詞
+            on_delta: 文字增量回呼（可選，提供時最終回應改用串流）
+            cancel_token: 本輪取消權杖（可選）
 
         Returns:
             最終的文字回應
@@ -235,7 +424,9 @@ class VoicePipeline:
             logger.info(f"[Pipeline] 執行工具 {tool_name}")
 
             # 執行工具
-            result = await self.tool_registry.execute(tool_name, arguments)
+            result = await self.tool_registry.execute(
+                tool_name, arguments, cancel_token=cancel_token
+            )
             logger.info("[Pipeline] 工具執行完成")
 
             # 加入 tool 結果訊息
@@ -247,19 +438,35 @@ class VoicePipeline:
             messages.append(tool_message)
 
         # 再次呼叫 LLM 產生最終回應
-        final_response = await self.llm_client.chat(
-            messages,
-            tools=tools,
-            system_prompt=system_prompt or self._get_current_system_prompt(),
-        )
+        final_system_prompt = system_prompt or self._get_current_system_prompt()
+        if on_delta is not None:
+            final_response = await self.llm_client.chat_with_stream(
+                messages,
+                on_delta,
+                tools=tools,
+                system_prompt=final_system_prompt,
+            )
+        else:
+            final_response = await self.llm_client.chat(
+                messages,
+                tools=tools,
+                system_prompt=final_system_prompt,
+            )
 
         return final_response.content or ""
 
-    async def _process_with_flow(self, user_text: str) -> str:
+    async def _process_with_flow(
+        self,
+        user_text: str,
+        on_delta: TextDeltaCallback | None = None,
+        cancel_token: CancelToken | None = None,
+    ) -> str:
         """使用 LangGraph 流程處理使用者輸入
 
         Args:
             user_text: 使用者輸入文字
+            on_delta: 回應文字增量回呼（可選）
+            cancel_token: 本輪取消權杖（可選）
 
         Returns:
             回應文字
@@ -268,13 +475,22 @@ class VoicePipeline:
             raise RuntimeError("FlowExecutor 未初始化")
 
         logger.info("[Pipeline] 使用 LangGraph 流程處理")
-        return await self.flow_executor.execute(user_text)
+        return await self.flow_executor.execute(
+            user_text, on_delta=on_delta, cancel_token=cancel_token
+        )
 
-    async def _process_with_multi_agent(self, user_text: str) -> str:
+    async def _process_with_multi_agent(
+        self,
+        user_text: str,
+        on_delta: TextDeltaCallback | None = None,
+        cancel_token: CancelToken | None = None,
+    ) -> str:
         """使用 Multi-Agent 流程處理使用者輸入
 
         Args:
             user_text: 使用者輸入文字
+            on_delta: 回應文字增量回呼（可選）
+            cancel_token: 本輪取消權杖（可選）
 
         Returns:
             回應文字
@@ -283,13 +499,22 @@ class VoicePipeline:
             raise RuntimeError("MultiAgentExecutor 未初始化")
 
         logger.info("[Pipeline] 使用 Multi-Agent 流程處理")
-        return await self.multi_agent_executor.execute(user_text)
+        return await self.multi_agent_executor.execute(
+            user_text, on_delta=on_delta, cancel_token=cancel_token
+        )
 
-    async def _process_with_legacy(self, user_text: str) -> str:
+    async def _process_with_legacy(
+        self,
+        user_text: str,
+        on_delta: TextDeltaCallback | None = None,
+        cancel_token: CancelToken | None = None,
+    ) -> str:
         """使用舊版 Tool Calling 處理使用者輸入（降級模式）
 
         Args:
             user_text: 使用者輸入文字
+            on_delta: 回應文字增量回呼（可選）
+            cancel_token: 本輪取消權杖（可選）
 
         Returns:
             回應文字
@@ -309,9 +534,50 @@ class VoicePipeline:
 
         # 處理 Tool Calls（如果有）
         return await self._process_tool_calls(
-            messages, llm_response, tools, system_prompt
+            messages,
+            llm_response,
+            tools,
+            system_prompt,
+            on_delta=on_delta,
+            cancel_token=cancel_token,
         )
 
+    def _resolve_flow_mode(self) -> FlowMode:
+        """決定有效的流程模式（角色專屬 > 全域設定）
+
+        Returns:
+            本輪使用的流程模式
+        """
+        if self.role_registry and self.state.current_role_id:
+            current_role = self.role_registry.get(self.state.current_role_id)
+            if (
+                current_role
+                and hasattr(current_role, "preferred_flow_mode")
+                and current_role.preferred_flow_mode
+            ):
+                flow_mode = FlowMode(current_role.preferred_flow_mode)
+                logger.info(f"[Pipeline] 使用角色專屬流程模式: {flow_mode.value}")
+                return flow_mode
+
+        logger.info(f"[Pipeline] 使用全域流程模式: {self.flow_mode.value}")
+        return self.flow_mode
+
+    def _get_processor(self, flow_mode: FlowMode) -> ResponseProcessor:
+        """依流程模式取得回應處理函式
+
+        Args:
+            flow_mode: 有效的流程模式
+
+        Returns:
+            對應的 _process_with_* 方法
+        """
+        if flow_mode == FlowMode.MULTI_AGENT:
+            return self._process_with_multi_agent
+        if flow_mode == FlowMode.LANGGRAPH:
+            return self._process_with_flow
+        # FlowMode.TOOLS - 使用純 Tool Calling
+        return self._process_with_legacy
+
     def process_audio_with_outputs(
         self,
         audio: tuple[int, NDArray[np.float32]],
@@ -328,6 +594,48 @@ class VoicePipeline:
             - AdditionalOutputs(history, status): UI 更新
             - (sample_rate, audio_chunk): 助理語音回應
         """
+        # 新一輪開始：取消上一輪仍在進行的流程、工具與 TTS
+        self.cancel_turn()
+        cancel_token = CancelToken()
+        self._turn_token = cancel_token
+
+        trace = tracing.TurnTrace()
+        turn = self._process_turn(audio, trace, cancel_token)
+        try:
+            for output in turn:
+                if isinstance(output, tuple):
+                    trace.mark(tracing.MARK_FIRST_TTS_CHUNK)
+                    trace.mark(tracing.MARK_LAST_TTS_CHUNK, overwrite=True)
+                    if self.echo_detector is not None:
+                        chunk_rate, chunk = output
+                        self.echo_detector.on_playback(
+                            np.asarray(chunk).size / chunk_rate
+                        )
+                yield output
+        finally:
+            # 被中斷（generator.close()）時不留下仍在背景執行的工作，
+            # 並輸出已記錄的部分
+            cancel_token.cancel()
+            turn.close()
+            if self.tracer is not None:
+                self.tracer.record(trace)
+
+    def _process_turn(
+        self,
+        audio: tuple[int, NDArray[np.float32]],
+        trace: tracing.TurnTrace,
+        cancel_token: CancelToken,
+    ) -> Iterator[tuple[int, NDArray[np.float32]] | AdditionalOutputs]:
+        """處理單輪對話（process_audio_with_outputs 的實作）
+
+        Args:
+            audio: (sample_rate, audio_array) 使用者語音
+            trace: 本輪追蹤紀錄
+            cancel_token: 本輪取消權杖
+
+        Yields:
+            與 process_audio_with_outputs 相同
+        """
         # 更新狀態為處理中
         self.state.transition_to(VoiceState.PROCESSING)
         sample_rate, audio_array = audio
@@ -345,7 +653,24 @@ class VoicePipeline:
         try:
             # 1. 語音轉文字
             logger.info("[Pipeline] 開始 STT 辨識...")
-            user_text = self.stt.stt(audio)
+            if self.speech_gate is not None and not self.speech_gate.admit(audio):
+                # 雜音或過短的語句不解碼，也不進入 LLM
+                user_text = ""
+                self._speech_spans = None
+                if self.streaming_stt is not None:
+                    self.streaming_stt.reset()
+            elif self.streaming_stt is not None:
+                # 說話期間已確定的前綴不需重新辨識
+                user_text = self.streaming_stt.finalize(audio).text
+            else:
+                user_text = self._transcribe(audio)
+            trace.mark(tracing.MARK_STT_DONE)
+            if user_text.strip() and self._is_echo(user_text, audio):
+                # 助理自身語音的回音，視同無有效輸入
+                user_text = ""
+            # 說話期間已依穩定的部分辨識結果預先啟動的流程（最終結果相同才沿用）
+            response_stream = self._take_speculation(user_text, cancel_token)
+            cancel_token.raise_if_cancelled()
             logger.debug(f"[Pipeline] STT 結果: '{_truncate_for_log(user_text)}'")
 
             if not user_text.strip():
@@ -358,15 +683,49 @@ class VoicePipeline:
                 )
                 return
 
+            process = self._get_processor(self._resolve_flow_mode())
+            detect_intent = (
+                self.intent_recognizer is not None and self.role_registry is not None
+            )
+
+            # 預測執行：意圖辨識與主流程並行，一般對話不再多等一次 LLM 往返
+            if (
+                response_stream is None
+                and detect_intent
+                and self.config.speculative_intent
+            ):
+                response_stream = _ResponseStream(
+                    self.async_loop,
+                    process,
+                    user_text,
+                    stream=self.config.stream_response,
+                    trace=trace,
+                    cancel_token=cancel_token,
+                    segmenter=create_segmenter(self.config.tts.segmentation),
+                )
+
             # --------- 008: INTENT 辨識（角色切換） ---------
-            if self.intent_recognizer is not None and self.role_registry is not None:
+            if detect_intent:
                 try:
-                    intent = _run_async_safely(
-                        self.intent_recognizer.recognize_intent_with_llm(user_text)
+                    intent = self.async_loop.run(
+                        cancellable(
+                            cancel_token,
+                            tracing.traced(
+                                trace,
+                                self.intent_recognizer.recognize_intent_with_llm(
+                                    user_text
+                                ),
+                                name="intent",
+                                kind="intent",
+                            ),
+                        )
                     )
+                except TurnCancelledError:
+                    raise
                 except Exception as e:
                     logger.error(f"[Pipeline] 辨識意圖失敗：{e}")
                     intent = None
+                trace.mark(tracing.MARK_INTENT_DONE)
 
                 logger.debug(
                     f"[Intent] 輸入: user_text='{_truncate_for_log(user_text)}' "
@@ -380,6 +739,8 @@ class VoicePipeline:
                     and hasattr(intent, "params")
                 ):
                     logger.info("[Pipeline] 偵測到角色切換指令")
+                    if response_stream is not None:
+                        response_stream.cancel()
                     role_id = intent.params.get("role_id")
 
                     # 允許用 display_name（如「助理」）自動映射 ID
@@ -433,7 +794,13 @@ class VoicePipeline:
                         status_txt = f"⚠️ {tts_txt}"
 
                     # 播放 TTS 確認訊息（使用無分隔符版本）
-                    for audio_chunk in self.tts.stream_tts_sync(tts_txt):
+                    spoken = False
+                    for audio_chunk in self.tts.stream_tts_sync(
+                        tts_txt, cancel_token=cancel_token
+                    ):
+                        if not spoken and self.echo_detector is not None:
+                            self.echo_detector.add_spoken(tts_txt)
+                        spoken = True
                         yield audio_chunk
 
                     self.state.last_assistant_text = display_txt
@@ -459,71 +826,89 @@ class VoicePipeline:
                 self.state.get_ui_state().status_text,
             )
 
-            # 2. 根據 flow_mode 處理輸入
+            # 2. 根據 flow_mode 處理輸入（預測執行時流程已在背景進行）
             logger.debug(f"[Pipeline] 處理輸入: '{_truncate_for_log(user_text)}'")
+            if response_stream is None:
+                response_stream = _ResponseStream(
+                    self.async_loop,
+                    process,
+                    user_text,
+                    stream=self.config.stream_response,
+                    trace=trace,
+                    cancel_token=cancel_token,
+                    segmenter=create_segmenter(self.config.tts.segmentation),
+                )
+            # 串流模式：LLM 生成期間逐句送入 TTS
+            sentences = response_stream.sentences()
 
-            # 決定有效的流程模式（角色專屬 > 全域設定）
-            effective_flow_mode = self.flow_mode  # 預設使用全域設定
-            if self.role_registry and self.state.current_role_id:
-                current_role = self.role_registry.get(self.state.current_role_id)
-                if (
-                    current_role
-                    and hasattr(current_role, "preferred_flow_mode")
-                    and current_role.preferred_flow_mode
-                ):
-                    effective_flow_mode = FlowMode(current_role.preferred_flow_mode)
-                    logger.info(
-                        f"[Pipeline] 使用角色專屬流程模式: {effective_flow_mode.value}"
-                    )
-                else:
-                    logger.info(
-                        f"[Pipeline] 使用全域流程模式: {effective_flow_mode.value}"
-                    )
-            else:
-                logger.info(f"[Pipeline] 使用全域流程模式: {effective_flow_mode.value}")
-
-            if effective_flow_mode == FlowMode.MULTI_AGENT:
-                # 使用 Multi-Agent 流程
-                response = _run_async_safely(self._process_with_multi_agent(user_text))
-            elif effective_flow_mode == FlowMode.LANGGRAPH:
-                # 使用 LangGraph 流程
-                response = _run_async_safely(self._process_with_flow(user_text))
-            else:
-                # FlowMode.TOOLS - 使用純 Tool Calling
-                response = _run_async_safely(self._process_with_legacy(user_text))
+            # 3. TTS 串流輸出（逐句合成；啟用 lookahead 時送出前一句的同時
+            #    在背景合成後續句子）
+            logger.info("[Pipeline] 開始 TTS 串流...")
+            chunk_count = 0
+            sentence_count = 0
+            interrupted = False
+
+            # 各句第一段音訊與句子（依序）：送出該段音訊時才記錄為已播放的
+            # 文字，預先合成但因插話未播放的句子不會被當成回音比對對象
+            first_chunks: deque[tuple[NDArray[np.float32], str]] = deque()
+
+            def synthesize(
+                sentence: str, token: CancelToken | None
+            ) -> Iterator[tuple[int, NDArray[np.float32]]]:
+                nonlocal sentence_count
+                sentence_count += 1
+                first = True
+                for chunk in self.tts.stream_tts_sync(sentence, cancel_token=token):
+                    if first and self.echo_detector is not None:
+                        first_chunks.append((chunk[1], sentence))
+                    first = False
+                    yield chunk
+
+            audio_stream = self.playback.track(
+                lookahead_stream(
+                    sentences,
+                    synthesize,
+                    self.config.tts.lookahead,
+                    cancel_token,
+                )
+            )
+            try:
+                for audio_chunk in audio_stream:
+                    if self._is_interrupted(cancel_token):
+                        break
+                    if chunk_count == 0:
+                        # 第一段音訊就緒，更新狀態為回應中
+                        self.state.transition_to(VoiceState.SPEAKING)
+                        yield AdditionalOutputs(
+                            self.state.get_gradio_messages(),
+                            self.state.get_ui_state().status_text,
+                        )
+                    if first_chunks and audio_chunk[1] is first_chunks[0][0]:
+                        self.echo_detector.add_spoken(first_chunks.popleft()[1])
+                    chunk_count += 1
+                    yield audio_chunk
+                if self._is_interrupted(cancel_token):
+                    logger.info("[Pipeline] TTS 被中斷，停止輸出")
+                    interrupted = True
+            except TurnCancelledError:
+                # 回應流程已被取消（使用者插話）
+                logger.info("[Pipeline] 回應流程已取消，停止輸出")
+                interrupted = True
+            finally:
+                # 停止背景預先合成
+                audio_stream.close()
+
+            # 中斷時流程可能尚未完成，以已串流內容為準
+            response = response_stream.text or response_stream.streamed_text
 
             logger.debug(f"[Pipeline] 回應: '{_truncate_for_log(response)}'")
 
             # T014: LLM 回應後更新 history
             self.state.last_assistant_text = response
-            self.state.history.add_assistant_message(response)
-
-            # 3. 更新狀態為回應中
-            self.state.transition_to(VoiceState.SPEAKING)
+            if response.strip():
+                self.state.history.add_assistant_message(response)
             self.state.turn_count += 1
 
-            # 發送 UI 更新：助理回應已加入
-            yield AdditionalOutputs(
-                self.state.get_gradio_messages(),
-                self.state.get_ui_state().status_text,
-            )
-
-            # 4. TTS 串流輸出
-            logger.info("[Pipeline] 開始 TTS 串流...")
-            chunk_count = 0
-            interrupted = False
-            for audio_chunk in self.tts.stream_tts_sync(response):
-                # 檢查是否被中斷（僅當 can_interrupt 啟用時）
-                if (
-                    self.config.can_interrupt
-                    and self.state.state == VoiceState.INTERRUPTED
-                ):
-                    logger.info("[Pipeline] TTS 被中斷，停止輸出")
-                    interrupted = True
-                    break
-                chunk_count += 1
-                yield audio_chunk
-
             if interrupted:
                 logger.info(f"[Pipeline] TTS 中斷於第 {chunk_count} 個音訊片段")
                 yield AdditionalOutputs(
@@ -531,7 +916,10 @@ class VoicePipeline:
                     "⏸️ 已中斷",
                 )
             else:
-                logger.info(f"[Pipeline] TTS 完成，共 {chunk_count} 個音訊片段")
+                logger.info(
+                    f"[Pipeline] TTS 完成，共 {sentence_count} 句、"
+                    f"{chunk_count} 個音訊片段"
+                )
 
             # 5. 回應完成，回到待命
             self.state.transition_to(VoiceState.IDLE)
@@ -540,6 +928,15 @@ class VoicePipeline:
                 self.state.get_ui_state().status_text,
             )
 
+        except TurnCancelledError:
+            # 本輪在產生回應前即被取消，不播放任何內容
+            logger.info("[Pipeline] 本輪已取消，結束處理")
+            self.state.transition_to(VoiceState.IDLE)
+            yield AdditionalOutputs(
+                self.state.get_gradio_messages(),
+                self.state.get_ui_state().status_text,
+            )
+
         except Exception as e:
             # 錯誤處理：播放錯誤提示
             logger.error(f"[Pipeline] 處理錯誤: {e}", exc_info=True)
@@ -552,7 +949,12 @@ class VoicePipeline:
             )
 
             try:
-                for audio_chunk in self.tts.stream_tts_sync(error_message):
+                # 錯誤提示同樣可被插話中斷
+                for audio_chunk in self.tts.stream_tts_sync(
+                    error_message, cancel_token=cancel_token
+                ):
+                    if self._is_interrupted(cancel_token):
+                        break
                     yield audio_chunk
             except Exception as tts_error:
                 logger.error(f"[Pipeline] 錯誤訊息 TTS 失敗: {tts_error}")
@@ -563,14 +965,222 @@ class VoicePipeline:
                     self.state.get_ui_state().status_text,
                 )
 
+    def feed_audio(self, audio: tuple[int, NDArray[np.int16 | np.float32]]) -> None:
+        """接收使用者說話期間累積的音訊（串流辨識用）
+
+        由 FastRTC 收音執行緒呼叫，不會阻塞。
+
+        Args:
+            audio: (sample_rate, audio_array) 本句開始至今的完整音訊
+        """
+        if self.streaming_stt is not None:
+            self._utterance_audio = audio
+            self.streaming_stt.push_frames(audio)
+
+    def set_speech_spans(self, sample_rate: int, spans: list[SpeechSpan]) -> None:
+        """接收上游 VAD 為下一句音訊找到的語音區段
+
+        啟用 config.stt.single_vad 時，下一次辨識依這些區段裁掉前後靜音，
+        並略過 Whisper 內建的 VAD。
+
+        Args:
+            sample_rate: 區段樣本索引對應的取樣率
+            spans: 語音區段（下一句音訊中的樣本索引）
+        """
+        self._speech_spans = (sample_rate, spans)
+
+    def _is_echo(
+        self, user_text: str, audio: tuple[int, NDArray[np.int16 | np.float32]]
+    ) -> bool:
+        """判斷辨識結果是否為助理自身語音的回音
+
+        Args:
+            user_text: 辨識結果
+            audio: (sample_rate, audio_array) 本句音訊（收音結束於現在）
+
+        Returns:
+            是否為回音（未啟用回音偵測時為 False）
+        """
+        if self.echo_detector is None:
+            return False
+        sample_rate, audio_array = audio
+        if not self.echo_detector.is_echo(
+            user_text,
+            np.asarray(audio_array).size / sample_rate,
+            reference=self.state.last_assistant_text,
+        ):
+            return False
+        logger.info(
+            f"[Pipeline] 判定為助理語音的回音，捨棄: '{_truncate_for_log(user_text)}'"
+        )
+        return True
+
+    def _transcribe(self, audio: tuple[int, NDArray[np.int16 | np.float32]]) -> str:
+        """辨識一整句音訊；已有上游 VAD 區段時直接裁切，不再跑 Whisper VAD
+
+        Args:
+            audio: (sample_rate, audio_array) tuple
+
+        Returns:
+            辨識出的文字
+        """
+        speech_spans, self._speech_spans = self._speech_spans, None
+        sample_rate, audio_array = audio
+        if (
+            self.config.stt.single_vad
+            and speech_spans is not None
+            and speech_spans[0] == sample_rate
+        ):
+            pad = sample_rate * _SPEECH_PAD_MS // 1000
+            trimmed = trim_to_speech(audio_array, speech_spans[1], pad)
+            if trimmed is not None:
+                logger.debug(
+                    f"[Pipeline] 依上游 VAD 區段裁切: "
+                    f"{np.asarray(audio_array).size} → {trimmed.size} 樣本"
+                )
+                samples = self.stt.prepare_audio((sample_rate, trimmed))
+                return self.stt.transcribe_samples(samples, vad_filter=False)
+        return self.stt.stt(audio)
+
+    def _on_partial(self, partial: TranscribedText) -> None:
+        """部分辨識結果回呼：結果連續多次不變時預先啟動回應流程
+
+        使用者仍在說話時呼叫（辨識執行緒）。流程輸出只會緩衝，
+        停頓後由 _take_speculation() 依最終辨識結果決定沿用或捨棄。
+
+        Args:
+            partial: 目前語句的部分辨識結果
+        """
+        normalized = _normalize_transcript(partial.text)
+        with self._speculation_lock:
+            if normalized == self._partial_text:
+                self._partial_repeats += 1
+            else:
+                self._partial_text = normalized
+                self._partial_repeats = 1
+                # 使用者仍在說話且內容已改變，先前的預測不再適用
+                self._discard_speculation_locked()
+
+            if (
+                not normalized
+                or self._speculation is not None
+                or self._partial_repeats < self.config.speculative_partial_frames
+                or not self._speculation_allowed(partial)
+            ):
+                return
+
+            # 預測流程有自己的權杖；被本輪沿用後改由本輪權杖一併取消
+            token = CancelToken()
+            stream = _ResponseStream(
+                self.async_loop,
+                self._get_processor(self._resolve_flow_mode()),
+                partial.text,
+                stream=self.config.stream_response,
+                cancel_token=token,
+                segmenter=create_segmenter(self.config.tts.segmentation),
+            )
+            self._speculation = (normalized, stream, token)
+        logger.info(
+            f"[Pipeline] 部分辨識已穩定，預先啟動回應流程: "
+            f"'{_truncate_for_log(partial.text)}'"
+        )
+
+    def _speculation_allowed(self, partial: TranscribedText) -> bool:
+        """部分辨識結果是否可預先啟動流程
+
+        最終結果在進入 LLM 前會經過語音閘門與回音檢查，預測流程也需先
+        通過：播放期間（含殘響）收音的語句可能是助理自身語音，等最終
+        結果經回音檢查後再處理；雜音或過短的語句不預先啟動。
+
+        Args:
+            partial: 目前語句的部分辨識結果
+
+        Returns:
+            是否可預先啟動
+        """
+        if self.echo_detector is not None and self.echo_detector.overlaps_playback(
+            partial.duration_ms / 1000
+        ):
+            return False
+        audio = self._utterance_audio
+        return (
+            self.speech_gate is None
+            or audio is None
+            or self.speech_gate.check_audio(audio) is None
+        )
+
+    def _take_speculation(
+        self, user_text: str, cancel_token: CancelToken
+    ) -> _ResponseStream | None:
+        """取出預先啟動的回應流程（最終辨識結果不同時捨棄）
+
+        Args:
+            user_text: 最終辨識結果
+            cancel_token: 本輪取消權杖（沿用時接管預測流程的取消）
+
+        Returns:
+            可沿用的回應流程；沒有或不一致時為 None
+        """
+        with self._speculation_lock:
+            speculation, self._speculation = self._speculation, None
+            self._partial_text = ""
+            self._partial_repeats = 0
+            self._utterance_audio = None
+        if speculation is None:
+            return None
+
+        speculated_text, stream, token = speculation
+        if speculated_text != _normalize_transcript(user_text):
+            logger.info("[Pipeline] 最終辨識結果與預測不同，捨棄預先啟動的流程")
+            token.cancel()
+            return None
+
+        logger.info("[Pipeline] 最終辨識結果與預測相同，沿用預先啟動的流程")
+        cancel_token.add_callback(token.cancel)
+        return stream
+
+    def _discard_speculation_locked(self) -> None:
+        if self._speculation is not None:
+            self._speculation[2].cancel()
+            self._speculation = None
+
+    def _is_interrupted(self, cancel_token: CancelToken) -> bool:
+        """本輪是否已被取消或中斷（中斷狀態僅在 can_interrupt 啟用時生效）"""
+        return cancel_token.cancelled or (
+            self.config.can_interrupt and self.state.state == VoiceState.INTERRUPTED
+        )
+
+    def cancel_turn(self) -> bool:
+        """取消目前這一輪仍在進行的工作
+
+        流程、代理、工具呼叫與 LLM 串流會在背景 loop 上立即中止，
+        TTS 則在下一個音訊片段前停止。
+
+        Returns:
+            是否有取消進行中的工作
+        """
+        token = self._turn_token
+        if token is None or not token.cancel():
+            return False
+        logger.info("[Pipeline] 已取消本輪進行中的工作")
+        if self.echo_detector is not None:
+            # 本輪不再送出音訊，尚未播放的部分不會播放
+            self.echo_detector.stop_playback()
+        return True
+
     def on_interrupt(self) -> None:
         """處理使用者中斷
 
         當使用者在助理回應時開始說話，由 FastRTC 呼叫。
+        除了停止播放，也取消本輪仍在執行的流程與工具呼叫。
         """
         if self.state.state == VoiceState.SPEAKING:
             self.state.transition_to(VoiceState.INTERRUPTED)
             # FastRTC 會自動停止播放
+        if self.echo_detector is not None:
+            # 播放中斷後收到的語句是使用者插話，不再視為回音
+            self.echo_detector.stop_playback()
+        self.cancel_turn()
 
     def get_state(self) -> ConversationState:
         """取得目前對話狀態"""
@@ -579,3 +1189,17 @@ class VoicePipeline:
     def reset(self) -> None:
         """重置對話狀態"""
         self.state = ConversationState()
+
+    def close(self) -> None:
+        """釋放管線資源
+
+        僅關閉管線自行建立的背景 loop；外部注入（多會話共用）的 loop
+        由建立者負責關閉。
+        """
+        self.cancel_turn()
+        with self._speculation_lock:
+            self._discard_speculation_locked()
+        if self.streaming_stt is not None:
+            self.streaming_stt.close()
+        if self._owns_async_loop:
+            self.async_loop.shutdown()
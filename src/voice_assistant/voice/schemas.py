@@ -59,18 +59,93 @@ class TranscribedText(BaseModel):
     )
     duration_ms: int = Field(default=0, description="音訊時長 (毫秒)")
     is_partial: bool = Field(default=False, description="是否為部分辨識結果（串流用）")
+    committed_text: str = Field(
+        default="", description="已確定不再變動的前綴（串流用，為 text 的前綴）"
+    )
+
+
+class TranscribedWord(BaseModel):
+    """帶時間戳的辨識字詞（串流辨識用）"""
+
+    text: str = Field(description="字詞內容")
+    start_s: float = Field(description="開始時間（秒，相對於辨識視窗）")
+    end_s: float = Field(description="結束時間（秒，相對於辨識視窗）")
+
+
+class TTSCacheConfig(BaseModel):
+    """語句層級的 TTS 音訊快取配置"""
+
+    enabled: bool = Field(default=False, description="啟用 TTS 音訊快取")
+    memory_mb: float = Field(default=32.0, ge=0, description="記憶體 LRU 的容量（MB）")
+    disk_path: str | None = Field(
+        default=None, description="磁碟快取目錄（None 表示只使用記憶體）"
+    )
+    disk_mb: float = Field(default=256.0, ge=0, description="磁碟快取的容量（MB）")
+    disk_dtype: Literal["float32", "int16"] = Field(
+        default="float32", description="磁碟快取的樣本格式（int16 佔用一半空間）"
+    )
+    max_chars: int = Field(
+        default=80, ge=1, description="只快取不超過此字數的語句（長句多半不會重複）"
+    )
+    revision: str = Field(
+        default="",
+        description="額外的版本標記（模型 revision 已自動併入快取鍵；"
+        "例如更換 G2P 版本時變更）",
+    )
+
+
+class SegmentationConfig(BaseModel):
+    """回應文字送入 TTS 的斷句策略配置"""
+
+    strategy: Literal["sentence", "latency"] = Field(
+        default="sentence",
+        description="sentence：只在句尾標點斷句；latency：第一段提早在子句邊界輸出，"
+        "之後逐段加長",
+    )
+    first_min_chars: int = Field(
+        default=4, ge=1, description="第一段在子句邊界輸出所需的最少字數"
+    )
+    first_max_chars: int = Field(
+        default=12, ge=1, description="第一段的字數上限（沒有子句邊界時強制切分）"
+    )
+    growth: float = Field(default=2.0, ge=1.0, description="之後每段字數上限的成長倍率")
+    max_chars: int = Field(default=80, ge=1, description="每段字數上限的最大值")
 
 
 class TTSConfig(BaseModel):
     """TTS 配置"""
 
+    backend: Literal["kokoro", "kokoro-onnx"] = Field(
+        default="kokoro",
+        description="合成引擎（kokoro：PyTorch KPipeline；kokoro-onnx：ONNX Runtime）",
+    )
     model_path: str = Field(default="models", description="模型快取目錄（HF_HOME）")
+    onnx_model_path: str = Field(
+        default="models/kokoro-onnx",
+        description="kokoro-onnx 模型目錄（kokoro.onnx、config.json、voices.npz）",
+    )
+    cpu_threads: int = Field(
+        default=0,
+        ge=0,
+        description="kokoro-onnx 的 intra-op 執行緒數（0 由 ONNX Runtime 決定）",
+    )
+    quantization: Literal["none", "int8"] = Field(
+        default="none",
+        description="kokoro 的權重量化（int8：Linear/LSTM 動態量化，首次轉換後快取）",
+    )
     voice: str = Field(
         default="zf_001", description="音色 ID (zf_* 中文女聲, zm_* 中文男聲)"
     )
     speed: float = Field(default=1.0, ge=0.5, le=2.0, description="語速倍率 (0.5-2.0)")
     language: str = Field(default="z", description="語言代碼 (z=中文)")
     sample_rate: int = Field(default=24000, description="輸出取樣率 (Hz)")
+    lookahead: int = Field(
+        default=0,
+        ge=0,
+        description="背景預先合成的音訊片段數（0 表示送出前一句後才合成下一句）",
+    )
+    cache: TTSCacheConfig = Field(default_factory=TTSCacheConfig)
+    segmentation: SegmentationConfig = Field(default_factory=SegmentationConfig)
 
 
 class VoiceState(str, Enum):
@@ -208,15 +283,80 @@ class ConversationState(BaseModel):
         return self.history.to_gradio_format()
 
 
+class STTProfile(BaseModel):
+    """自適應 STT 的一組模型與解碼設定"""
+
+    name: str = Field(description="Profile 名稱（記錄於統計）")
+    model_size: str = Field(description="Whisper 模型大小")
+    beam_size: int = Field(default=1, ge=1, description="Beam search 大小")
+    temperature: float | list[float] = Field(
+        default=0.0, description="取樣溫度；串列表示解碼失敗時依序提高溫度重試"
+    )
+    without_timestamps: bool = Field(
+        default=True, description="不預測時間戳記 token（較快）"
+    )
+    min_duration_s: float = Field(
+        default=0.0, ge=0, description="只用於至少此長度的語句（秒）"
+    )
+    rtf: float = Field(
+        default=0.1,
+        gt=0,
+        description="預估即時率（解碼秒數 / 音訊秒數），執行期間依實測更新",
+    )
+
+
 class STTConfig(BaseModel):
     """ASR 配置"""
 
+    backend: Literal["whisper", "sherpa-onnx"] = Field(
+        default="whisper", description="STT 引擎"
+    )
+    sherpa_model_path: str = Field(
+        default="models/sherpa-onnx-streaming-zipformer-zh",
+        description="sherpa-onnx 串流模型目錄（tokens.txt 與 encoder/decoder/joiner）",
+    )
     model_size: str = Field(default="small", description="Whisper 模型大小")
     model_path: str = Field(default="models/whisper", description="模型快取目錄")
     device: str = Field(default="cpu", description="運算裝置")
     language: str = Field(default="zh", description="目標語言")
     beam_size: int = Field(default=1, description="Beam search 大小")
     vad_filter: bool = Field(default=True, description="啟用 VAD 過濾")
+    streaming: bool = Field(
+        default=False, description="說話期間即串流辨識，停頓後只辨識剩餘音訊"
+    )
+    streaming_interval_ms: int = Field(
+        default=500, description="串流辨識間隔（新增音訊毫秒數）"
+    )
+    num_workers: int = Field(
+        default=1, ge=1, description="共用 STT worker 數（可同時推論的請求數）"
+    )
+    cpu_threads: int = Field(
+        default=0, ge=0, description="每個 worker 的 CPU 執行緒數（0 為自動）"
+    )
+    batch_size: int = Field(
+        default=1, ge=1, description="跨會話合併解碼的最大請求數（1 不合併）"
+    )
+    batch_window_ms: int = Field(
+        default=10, ge=0, description="等待其他請求加入批次的毫秒數"
+    )
+    adaptive: bool = Field(
+        default=False,
+        description="依語句長度、佇列深度與延遲預算選擇模型與解碼設定",
+    )
+    fast_model_size: str = Field(
+        default="base", description="自適應模式下短語句與高負載時使用的模型"
+    )
+    latency_budget_ms: int = Field(
+        default=1500, ge=1, description="自適應模式的單次辨識延遲預算（含排隊）"
+    )
+    long_utterance_s: float = Field(
+        default=2.0, ge=0, description="自適應模式下可使用較大模型的最短語句（秒）"
+    )
+    single_vad: bool = Field(
+        default=False,
+        description="以 FastRTC VAD 的語音區段裁切靜音並略過 Whisper VAD"
+        "（不適用串流辨識）",
+    )
 
 
 class VADConfig(BaseModel):
@@ -230,12 +370,78 @@ class VADConfig(BaseModel):
     )
 
 
+class GateConfig(BaseModel):
+    """STT 前後語音閘門配置"""
+
+    enabled: bool = Field(default=False, description="啟用語音閘門")
+    min_voiced_ms: int = Field(
+        default=250, ge=0, description="有聲音框總長下限（毫秒），過短視為雜音"
+    )
+    min_rms_dbfs: float = Field(
+        default=-45.0, description="音框 RMS 超過此值（dBFS）才視為有聲"
+    )
+    max_spectral_flatness: float = Field(
+        default=0.5,
+        ge=0.0,
+        le=1.0,
+        description="頻譜平坦度上限（白噪音約 0.56，超過視為非語音）",
+    )
+    max_no_speech_prob: float = Field(
+        default=0.8,
+        ge=0.0,
+        le=1.0,
+        description="片段 no_speech_prob 上限（超過且 avg_logprob 過低時捨棄）",
+    )
+    min_avg_logprob: float = Field(
+        default=-1.0,
+        description="片段 avg_logprob 下限（與 Whisper 的 log_prob_threshold 相同）",
+    )
+
+
+class EchoConfig(BaseModel):
+    """助理自身語音的回音偵測配置"""
+
+    enabled: bool = Field(default=False, description="啟用回音偵測")
+    min_similarity: float = Field(
+        default=0.6,
+        ge=0.0,
+        le=1.0,
+        description="辨識結果 n-gram 出現在已播放句子中的比例下限（超過視為回音）",
+    )
+    min_matched_ngrams: int = Field(
+        default=4,
+        ge=1,
+        description="視為回音至少需符合的 n-gram 數（與整句相同時不限）",
+    )
+    tail_ms: int = Field(
+        default=800, ge=0, description="播放結束後仍視為回音的時間（殘響與緩衝）"
+    )
+    ngram: int = Field(default=2, ge=1, description="比對用字元 n-gram 長度")
+    max_sentences: int = Field(default=16, ge=1, description="索引保留的句子數")
+
+
 class VoicePipelineConfig(BaseModel):
     """語音管線配置"""
 
     stt: STTConfig = Field(default_factory=STTConfig)
     tts: TTSConfig = Field(default_factory=TTSConfig)
     vad: VADConfig = Field(default_factory=VADConfig)
+    gate: GateConfig = Field(default_factory=GateConfig)
+    echo: EchoConfig = Field(default_factory=EchoConfig)
     can_interrupt: bool = Field(default=True, description="允許使用者中斷")
+    stream_response: bool = Field(
+        default=True, description="LLM 串流輸出並逐句送入 TTS（降低首句延遲）"
+    )
+    speculative_intent: bool = Field(
+        default=True,
+        description="意圖辨識與主流程並行執行，角色切換時取消主流程",
+    )
+    speculative_partial_frames: int = Field(
+        default=0,
+        ge=0,
+        description=(
+            "部分辨識結果連續幾次不變即預先啟動回應流程（需啟用串流辨識，0 為停用）"
+        ),
+    )
     server_host: str = Field(default="0.0.0.0", description="伺服器主機")
     server_port: int = Field(default=7860, description="伺服器埠號")
@@ -0,0 +1,145 @@
+"""語音會話管理
+
+以 WebRTC 連線 ID 為鍵，為每位使用者維護獨立的 VoicePipeline 與對話狀態，
+重量級元件（STT、TTS、LangGraph 執行器）則由所有會話共用。
+"""
+
+import logging
+import threading
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+
+from voice_assistant.voice.pipeline import VoicePipeline
+from voice_assistant.voice.schemas import VoiceState
+
+logger = logging.getLogger(__name__)
+
+PipelineFactory = Callable[[], VoicePipeline]
+
+
+class SessionManager:
+    """會話管理器
+
+    每個會話擁有自己的 ConversationState（歷史、角色、語音狀態），
+    閒置超過 idle_timeout_s 的會話會被回收；會話數達上限時回收最久未使用者，
+    確保大量連線下記憶體用量有界。
+
+    FastRTC 會在 executor 執行緒中呼叫處理器，所有操作皆以鎖保護。
+    """
+
+    def __init__(
+        self,
+        factory: PipelineFactory,
+        idle_timeout_s: float = 900.0,
+        max_sessions: int = 32,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """初始化會話管理器
+
+        Args:
+            factory: 建立新會話 VoicePipeline 的函式（應注入共用的 STT/TTS/執行器）
+            idle_timeout_s: 閒置回收秒數
+            max_sessions: 最大同時會話數
+            clock: 時間來源（測試用）
+        """
+        if max_sessions < 1:
+            raise ValueError("max_sessions 必須至少為 1")
+
+        self._factory = factory
+        self._idle_timeout_s = idle_timeout_s
+        self._max_sessions = max_sessions
+        self._clock = clock
+        self._sessions: OrderedDict[str, VoicePipeline] = OrderedDict()
+        self._last_seen: dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        with self._lock:
+            return len(self._sessions)
+
+    def __contains__(self, session_id: object) -> bool:
+        with self._lock:
+            return session_id in self._sessions
+
+    def get(self, session_id: str) -> VoicePipeline:
+        """取得（或建立）會話的語音管線
+
+        Args:
+            session_id: 會話 ID（WebRTC 連線 ID）
+
+        Returns:
+            該會話專屬的 VoicePipeline
+        """
+        with self._lock:
+            now = self._clock()
+            self._evict_idle_locked(now)
+
+            pipeline = self._sessions.get(session_id)
+            if pipeline is None:
+                self._evict_overflow_locked()
+                pipeline = self._factory()
+                self._sessions[session_id] = pipeline
+                logger.info(
+                    f"[Session] 建立會話 {session_id}（共 {len(self._sessions)} 個）"
+                )
+            else:
+                self._sessions.move_to_end(session_id)
+
+            self._last_seen[session_id] = now
+            return pipeline
+
+    def remove(self, session_id: str) -> bool:
+        """移除會話
+
+        Args:
+            session_id: 會話 ID
+
+        Returns:
+            是否有移除會話
+        """
+        with self._lock:
+            return self._remove_locked(session_id)
+
+    def evict_idle(self) -> int:
+        """回收所有閒置逾時的會話
+
+        Returns:
+            回收的會話數
+        """
+        with self._lock:
+            return self._evict_idle_locked(self._clock())
+
+    def _remove_locked(self, session_id: str) -> bool:
+        pipeline = self._sessions.pop(session_id, None)
+        self._last_seen.pop(session_id, None)
+        if pipeline is None:
+            return False
+        pipeline.close()
+        logger.info(f"[Session] 移除會話 {session_id}")
+        return True
+
+    def _evict_idle_locked(self, now: float) -> int:
+        # OrderedDict 依最近使用排序，從最舊的開始檢查即可提早結束
+        expired = []
+        for session_id in self._sessions:
+            if now - self._last_seen[session_id] < self._idle_timeout_s:
+                break
+            expired.append(session_id)
+        for session_id in expired:
+            self._remove_locked(session_id)
+        return len(expired)
+
+    def _evict_overflow_locked(self) -> None:
+        while len(self._sessions) >= self._max_sessions:
+            # 優先回收非對話中的會話，全部忙碌時才回收最久未使用者
+            victim = next(
+                (
+                    session_id
+                    for session_id, pipeline in self._sessions.items()
+                    if pipeline.state.state == VoiceState.IDLE
+                ),
+                next(iter(self._sessions)),
+            )
+            logger.warning(f"[Session] 會話數已達上限，回收 {victim}")
+            self._remove_locked(victim)
@@ -1,6 +1,34 @@
 """語音轉文字（STT）模組"""
 
-from voice_assistant.voice.stt.base import STTModel
+from voice_assistant.voice.stt.adaptive import (
+    AdaptiveSTTPolicy,
+    AdaptiveSTTStats,
+    AdaptiveWhisperSTT,
+    STTDecision,
+    default_profiles,
+)
+from voice_assistant.voice.stt.base import PartialCallback, StreamingSTTModel, STTModel
+from voice_assistant.voice.stt.gate import SpeechGate, SpeechGateStats
+from voice_assistant.voice.stt.pool import STTPoolStats, STTWorkerPool
+from voice_assistant.voice.stt.sherpa import SherpaOnnxSTT, SherpaStreamingSession
+from voice_assistant.voice.stt.streaming import StreamingTranscriber
 from voice_assistant.voice.stt.whisper import WhisperSTT
 
-__all__ = ["STTModel", "WhisperSTT"]
+__all__ = [
+    "AdaptiveSTTPolicy",
+    "AdaptiveSTTStats",
+    "AdaptiveWhisperSTT",
+    "PartialCallback",
+    "STTDecision",
+    "STTModel",
+    "STTPoolStats",
+    "STTWorkerPool",
+    "SherpaOnnxSTT",
+    "SherpaStreamingSession",
+    "SpeechGate",
+    "SpeechGateStats",
+    "StreamingSTTModel",
+    "StreamingTranscriber",
+    "WhisperSTT",
+    "default_profiles",
+]
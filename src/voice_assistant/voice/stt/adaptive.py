@@ -0,0 +1,393 @@
+"""自適應 STT：依語句長度與負載選擇模型與解碼設定
+
+短指令（「台北天氣」）用小模型、greedy 解碼就能辨識正確，長問句才值得
+使用較大的模型與 beam search。AdaptiveWhisperSTT 預先載入各 profile 需要
+的模型，每次辨識依下列條件選擇 profile：
+
+- 語句長度：profile 只用於長度至少 min_duration_s 的語句
+- 目前的 STT 佇列深度與延遲預算：預估延遲（排在前面的請求 + 本句）
+  超過預算的 profile 不使用；全部超過時使用最快的 profile
+
+各 profile 的即時率（RTF）以實際解碼時間持續更新，負載升高時自動改用
+較快的設定以守住延遲，而不是讓排隊時間無限增加。每次選擇的 profile
+記錄在統計中。
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from collections.abc import Callable
+from typing import Any
+
+import numpy as np
+from numpy.typing import NDArray
+from pydantic import BaseModel, Field
+
+from voice_assistant.voice.schemas import STTConfig, STTProfile, TranscribedWord
+from voice_assistant.voice.stt.whisper import SAMPLE_RATE, WhisperSTT
+
+logger = logging.getLogger(__name__)
+
+# 實測 RTF 的指數移動平均權重
+_RTF_SMOOTHING = 0.2
+
+# 統計保留的最近決策筆數
+_RECENT_DECISIONS = 100
+
+# faster-whisper 預設的溫度回退序列
+_TEMPERATURE_FALLBACK = [0.0, 0.2, 0.4, 0.6, 0.8, 1.0]
+
+
+def default_profiles(config: STTConfig) -> list[STTProfile]:
+    """依 STT 配置建立預設 profiles（由快到慢）
+
+    Args:
+        config: STT 配置
+
+    Returns:
+        fast（快速模型、greedy）、balanced（主模型、greedy）、
+        accurate（主模型、beam search 與溫度回退）
+    """
+    return [
+        STTProfile(
+            name="fast",
+            model_size=config.fast_model_size,
+            beam_size=1,
+            temperature=0.0,
+            without_timestamps=True,
+            rtf=0.05,
+        ),
+        STTProfile(
+            name="balanced",
+            model_size=config.model_size,
+            beam_size=1,
+            temperature=0.0,
+            without_timestamps=True,
+            min_duration_s=config.long_utterance_s,
+            rtf=0.15,
+        ),
+        STTProfile(
+            name="accurate",
+            model_size=config.model_size,
+            beam_size=5,
+            temperature=_TEMPERATURE_FALLBACK,
+            without_timestamps=False,
+            min_duration_s=config.long_utterance_s,
+            rtf=0.3,
+        ),
+    ]
+
+
+class STTDecision(BaseModel):
+    """單次辨識的 profile 選擇紀錄"""
+
+    profile: str = Field(description="使用的 profile")
+    audio_s: float = Field(description="音訊總長度（秒）")
+    batch_size: int = Field(default=1, description="同批解碼的語句數")
+    load: float = Field(description="選擇時每個 worker 的排隊請求數")
+    estimated_ms: float = Field(description="預估延遲（含排隊，毫秒）")
+    decode_ms: float = Field(description="實際解碼耗時（毫秒）")
+
+
+class AdaptiveSTTStats(BaseModel):
+    """各 profile 的使用統計"""
+
+    requests: dict[str, int] = Field(
+        default_factory=dict, description="profile → 辨識次數"
+    )
+    decode_ms: dict[str, float] = Field(
+        default_factory=dict, description="profile → 總解碼毫秒數"
+    )
+    rtf: dict[str, float] = Field(
+        default_factory=dict, description="profile → 目前的預估即時率"
+    )
+    over_budget: int = Field(0, description="解碼耗時超過延遲預算的次數")
+    recent: list[STTDecision] = Field(
+        default_factory=list, description="最近的選擇紀錄（由舊到新）"
+    )
+
+
+class AdaptiveSTTPolicy:
+    """依語句長度、負載與延遲預算選擇 profile（執行緒安全）"""
+
+    def __init__(self, profiles: list[STTProfile], latency_budget_ms: float):
+        """初始化選擇策略
+
+        Args:
+            profiles: 由快到慢排列的 profiles
+            latency_budget_ms: 單次辨識的延遲預算（含排隊）
+        """
+        if not profiles:
+            raise ValueError("至少需要一個 STT profile")
+        self.profiles = list(profiles)
+        self.latency_budget_ms = latency_budget_ms
+        self._rtf = {profile.name: profile.rtf for profile in profiles}
+        self._lock = threading.Lock()
+
+    def estimate_ms(self, profile: STTProfile, audio_s: float, load: float) -> float:
+        """預估延遲：排在前面的請求假設與本句等長
+
+        Args:
+            profile: 候選 profile
+            audio_s: 本次解碼的音訊長度（秒）
+            load: 每個 worker 的排隊請求數
+
+        Returns:
+            預估延遲（毫秒）
+        """
+        with self._lock:
+            rtf = self._rtf[profile.name]
+        return (1 + load) * audio_s * rtf * 1000
+
+    def select(
+        self, duration_s: float, load: float, audio_s: float | None = None
+    ) -> tuple[STTProfile, float]:
+        """選擇預估延遲在預算內、最慢（最準確）的 profile
+
+        Args:
+            duration_s: 語句長度（秒，決定可用的 profiles）
+            load: 每個 worker 的排隊請求數
+            audio_s: 本次解碼的音訊總長度（批次時為各句總和，預設同 duration_s）
+
+        Returns:
+            (profile, 預估延遲毫秒數)；沒有 profile 在預算內時為最快的 profile
+        """
+        audio_s = duration_s if audio_s is None else audio_s
+        for profile in reversed(self.profiles):
+            if duration_s < profile.min_duration_s:
+                continue
+            estimated_ms = self.estimate_ms(profile, audio_s, load)
+            if estimated_ms <= self.latency_budget_ms:
+                return profile, estimated_ms
+        fastest = self.profiles[0]
+        return fastest, self.estimate_ms(fastest, audio_s, load)
+
+    def observe(self, profile: STTProfile, audio_s: float, decode_ms: float) -> None:
+        """以實際解碼耗時更新 profile 的即時率
+
+        Args:
+            profile: 使用的 profile
+            audio_s: 解碼的音訊長度（秒）
+            decode_ms: 解碼耗時（毫秒）
+        """
+        if audio_s <= 0:
+            return
+        observed = decode_ms / 1000 / audio_s
+        with self._lock:
+            rtf = self._rtf[profile.name]
+            self._rtf[profile.name] = rtf + _RTF_SMOOTHING * (observed - rtf)
+
+    def rtf(self) -> dict[str, float]:
+        """各 profile 目前的預估即時率"""
+        with self._lock:
+            return dict(self._rtf)
+
+
+class AdaptiveWhisperSTT:
+    """依語句長度與負載逐次選擇 profile 的 Whisper 辨識器
+
+    提供與 WhisperSTT 相同的辨識介面；交給 STTWorkerPool 時，load 自動
+    設為該 pool 每個 worker 的排隊請求數。
+
+    Example:
+        stt = AdaptiveWhisperSTT(default_profiles(config.stt), latency_budget_ms=1500)
+        pool = STTWorkerPool(stt, num_workers=2)
+        stt.stats().requests  # {"fast": 12, "accurate": 3}
+    """
+
+    def __init__(
+        self,
+        profiles: list[STTProfile],
+        latency_budget_ms: float = 1500,
+        load: Callable[[], float] | None = None,
+        **whisper_kwargs: Any,
+    ):
+        """預先載入各 profile 需要的模型（相同大小的模型只載入一次）
+
+        Args:
+            profiles: 由快到慢排列的 profiles
+            latency_budget_ms: 單次辨識的延遲預算（含排隊）
+            load: 回傳每個 worker 排隊請求數的函式（預設視為無負載）
+            **whisper_kwargs: 傳給 WhisperSTT 的其他參數（device、language 等）
+        """
+        self.policy = AdaptiveSTTPolicy(profiles, latency_budget_ms)
+        self.load = load or (lambda: 0.0)
+
+        models: dict[str, WhisperSTT] = {}
+        self._recognizers: dict[str, WhisperSTT] = {}
+        for profile in profiles:
+            model = models.get(profile.model_size)
+            if model is None:
+                model = models[profile.model_size] = WhisperSTT(
+                    model_size=profile.model_size, **whisper_kwargs
+                )
+            self._recognizers[profile.name] = model.with_options(
+                beam_size=profile.beam_size,
+                temperature=profile.temperature,
+                without_timestamps=profile.without_timestamps,
+            )
+        self._models = list(models.values())
+
+        self._lock = threading.Lock()
+        self._stats = AdaptiveSTTStats()
+        self._recent: deque[STTDecision] = deque(maxlen=_RECENT_DECISIONS)
+
+    @property
+    def language(self) -> str:
+        """辨識語言"""
+        return self._models[0].language
+
+    def prepare_audio(
+        self, audio: tuple[int, NDArray[np.int16 | np.float32]]
+    ) -> NDArray[np.float32]:
+        """將音訊轉為 Whisper 輸入格式
+
+        Args:
+            audio: (sample_rate, audio_array) tuple
+
+        Returns:
+            16kHz float32 一維陣列
+        """
+        return self._models[0].prepare_audio(audio)
+
+    def stt(self, audio: tuple[int, NDArray[np.int16 | np.float32]]) -> str:
+        """將音訊轉換為文字（STTModel Protocol）
+
+        Args:
+            audio: (sample_rate, audio_array) tuple
+
+        Returns:
+            辨識出的文字
+        """
+        samples = self.prepare_audio(audio)
+        if len(samples) == 0:
+            return ""
+        return self.transcribe_samples(samples)
+
+    def transcribe_samples(
+        self,
+        samples: NDArray[np.float32],
+        initial_prompt: str | None = None,
+        vad_filter: bool | None = None,
+    ) -> str:
+        """以選擇的 profile 辨識音訊
+
+        Args:
+            samples: 16kHz float32 一維陣列
+            initial_prompt: 前文提示
+            vad_filter: 覆寫是否啟用 Whisper VAD
+
+        Returns:
+            辨識出的文字
+        """
+        return self._run(
+            [samples],
+            lambda stt: stt.transcribe_samples(samples, initial_prompt, vad_filter),
+        )
+
+    def transcribe_words(
+        self, samples: NDArray[np.float32], initial_prompt: str | None = None
+    ) -> list[TranscribedWord]:
+        """以選擇的 profile 辨識音訊並回傳逐字時間戳
+
+        Args:
+            samples: 16kHz float32 一維陣列
+            initial_prompt: 前文提示
+
+        Returns:
+            依時間排序的辨識字詞
+        """
+        return self._run(
+            [samples], lambda stt: stt.transcribe_words(samples, initial_prompt)
+        )
+
+    def transcribe_batch(
+        self,
+        batch: list[NDArray[np.float32]],
+        initial_prompt: str | None = None,
+        vad_filter: bool | None = None,
+    ) -> list[str]:
+        """以單一 profile 批次辨識多段音訊
+
+        Args:
+            batch: 多段 16kHz float32 一維陣列
+            initial_prompt: 所有音訊共用的前文提示
+            vad_filter: 覆寫是否啟用 Whisper VAD
+
+        Returns:
+            與 batch 順序相同的辨識文字
+        """
+        return self._run(
+            batch, lambda stt: stt.transcribe_batch(batch, initial_prompt, vad_filter)
+        )
+
+    def transcribe_words_batch(
+        self, batch: list[NDArray[np.float32]], initial_prompt: str | None = None
+    ) -> list[list[TranscribedWord]]:
+        """以單一 profile 批次辨識多段音訊並回傳逐字時間戳
+
+        Args:
+            batch: 多段 16kHz float32 一維陣列
+            initial_prompt: 所有音訊共用的前文提示
+
+        Returns:
+            與 batch 順序相同的辨識字詞
+        """
+        return self._run(
+            batch, lambda stt: stt.transcribe_words_batch(batch, initial_prompt)
+        )
+
+    def warm_up(self) -> None:
+        """每個預載的模型各暖身一次"""
+        for model in self._models:
+            model.warm_up()
+
+    def stats(self) -> AdaptiveSTTStats:
+        """取得各 profile 的使用統計
+
+        Returns:
+            AdaptiveSTTStats（複本）
+        """
+        with self._lock:
+            stats = self._stats.model_copy(deep=True)
+            stats.recent = list(self._recent)
+        stats.rtf = self.policy.rtf()
+        return stats
+
+    def _run(
+        self, batch: list[NDArray[np.float32]], decode: Callable[[WhisperSTT], Any]
+    ):
+        # 批次以最長的語句決定可用的 profile，以總長度預估解碼時間
+        lengths = [len(samples) / SAMPLE_RATE for samples in batch]
+        audio_s = sum(lengths)
+        load = self.load()
+        profile, estimated_ms = self.policy.select(max(lengths), load, audio_s)
+
+        start = time.perf_counter()
+        result = decode(self._recognizers[profile.name])
+        decode_ms = (time.perf_counter() - start) * 1000
+        self.policy.observe(profile, audio_s, decode_ms)
+
+        decision = STTDecision(
+            profile=profile.name,
+            audio_s=round(audio_s, 3),
+            batch_size=len(batch),
+            load=load,
+            estimated_ms=round(estimated_ms, 1),
+            decode_ms=round(decode_ms, 1),
+        )
+        with self._lock:
+            stats = self._stats
+            stats.requests[profile.name] = stats.requests.get(profile.name, 0) + 1
+            stats.decode_ms[profile.name] = (
+                stats.decode_ms.get(profile.name, 0.0) + decode_ms
+            )
+            if decode_ms > self.policy.latency_budget_ms:
+                stats.over_budget += 1
+            self._recent.append(decision)
+        logger.info(
+            f"[STT] profile={profile.name} 音訊 {audio_s:.1f}s 負載 {load:.1f} "
+            f"預估 {estimated_ms:.0f}ms 實際 {decode_ms:.0f}ms"
+        )
+        return result
@@ -1,19 +1,30 @@
 """STT Protocol 定義
 
-定義 FastRTC STTModel Protocol，所有 STT 實作必須符合此介面。
+定義 STTModel 與 StreamingSTTModel Protocol，所有 STT 引擎必須符合此介面：
+
+- STTModel：整句辨識，由所有會話共用（stt() 與 FastRTC STTModel 相容）
+- StreamingSTTModel：單一會話的串流辨識，說話期間持續送入音訊，
+  停頓後取得最終結果
 """
 
+from collections.abc import Callable
 from typing import Protocol, runtime_checkable
 
 import numpy as np
 from numpy.typing import NDArray
 
+from voice_assistant.voice.schemas import TranscribedText
+
+# 部分辨識結果回呼（在辨識執行緒中呼叫）
+PartialCallback = Callable[[TranscribedText], None]
+
 
 @runtime_checkable
 class STTModel(Protocol):
-    """FastRTC STTModel Protocol
+    """STT Model Protocol
 
-    所有 STT 實作必須符合此介面，以便與 FastRTC ReplyOnPause 整合。
+    所有 STT 實作必須符合此介面，以便與 FastRTC ReplyOnPause 及
+    VoicePipeline 整合。
     """
 
     def stt(self, audio: tuple[int, NDArray[np.int16 | np.float32]]) -> str:
@@ -28,3 +39,83 @@ class STTModel(Protocol):
             辨識出的文字內容
         """
         ...
+
+    def prepare_audio(
+        self, audio: tuple[int, NDArray[np.int16 | np.float32]]
+    ) -> NDArray[np.float32]:
+        """將音訊轉為模型輸入格式（模型取樣率的單聲道 float32）
+
+        Args:
+            audio: (sample_rate, audio_array) tuple
+
+        Returns:
+            float32 一維陣列
+        """
+        ...
+
+    def transcribe_samples(
+        self,
+        samples: NDArray[np.float32],
+        initial_prompt: str | None = None,
+        vad_filter: bool | None = None,
+    ) -> str:
+        """辨識已轉換格式的音訊
+
+        Args:
+            samples: prepare_audio() 的輸出
+            initial_prompt: 前文提示（引擎不支援時忽略）
+            vad_filter: 覆寫是否啟用引擎內建 VAD（引擎不支援時忽略）
+
+        Returns:
+            辨識出的文字
+        """
+        ...
+
+    def warm_up(self) -> None:
+        """以合成音訊執行一次推論，預先完成延遲初始化"""
+        ...
+
+
+@runtime_checkable
+class StreamingSTTModel(Protocol):
+    """串流 STT Protocol
+
+    每個會話一個實例；push_frames() 由收音執行緒呼叫，不得阻塞。
+    """
+
+    on_partial: PartialCallback | None
+
+    @property
+    def partial(self) -> TranscribedText | None:
+        """目前語句最新的部分辨識結果"""
+        ...
+
+    def push_frames(self, audio: tuple[int, NDArray[np.int16 | np.float32]]) -> None:
+        """收到目前語句累積的音訊（非阻塞）
+
+        Args:
+            audio: (sample_rate, audio_array) 本句開始至今的完整音訊
+        """
+        ...
+
+    def finalize(
+        self, audio: tuple[int, NDArray[np.int16 | np.float32]] | None = None
+    ) -> TranscribedText:
+        """語句結束：辨識剩餘音訊並回傳完整結果
+
+        Args:
+            audio: (sample_rate, audio_array) 完整語句（可選，預設使用最後一次
+                push_frames 的音訊）
+
+        Returns:
+            最終辨識結果（is_partial=False）
+        """
+        ...
+
+    def reset(self) -> None:
+        """捨棄目前語句的辨識狀態"""
+        ...
+
+    def close(self) -> None:
+        """釋放資源"""
+        ...
@@ -0,0 +1,221 @@
+"""STT 前後的語音閘門
+
+Silero VAD 每次觸發都會執行一次完整的 Whisper 解碼，辨識結果非空時還會
+進行一輪 LLM 對話；咳嗽、關門聲與零碎的聲響也會觸發。SpeechGate 分兩段
+過濾：
+
+- 解碼前：以 20ms 音框一次計算 RMS 與頻譜平坦度（向量化），有聲音框
+  總長過短、音量過低或頻譜接近白噪音（平坦度高）的語句直接捨棄
+- 解碼後：移除 no_speech_prob 高且 avg_logprob 低的幻覺片段（例如靜音
+  被辨識成「謝謝觀看」；與 Whisper 相同，logprob 夠高的片段即使
+  no_speech_prob 高也保留），全部移除時本輪不會呼叫 LLM
+
+同一個閘門由所有會話與 Whisper 辨識器共用，統計各原因捨棄的語句數。
+"""
+
+import logging
+import threading
+from collections.abc import Iterable
+
+import numpy as np
+from faster_whisper.transcribe import Segment
+from numpy.typing import NDArray
+from pydantic import BaseModel, Field
+
+from voice_assistant.voice.schemas import GateConfig
+
+logger = logging.getLogger(__name__)
+
+# 分析音框長度（毫秒）
+_FRAME_MS = 20
+
+# 捨棄原因
+DROP_TOO_QUIET = "too_quiet"
+DROP_TOO_SHORT = "too_short"
+DROP_NOISE = "noise"
+DROP_NO_SPEECH = "no_speech"
+
+
+class AudioFeatures(BaseModel):
+    """語句的聲學特徵"""
+
+    voiced_ms: float = Field(description="有聲音框總長（毫秒）")
+    rms_dbfs: float = Field(description="有聲音框的 RMS 音量（dBFS）")
+    flatness: float = Field(description="有聲音框頻譜平坦度的中位數（0–1）")
+
+
+class SpeechGateStats(BaseModel):
+    """閘門統計"""
+
+    checked: int = Field(0, description="解碼前檢查的語句數")
+    passed: int = Field(0, description="通過解碼前檢查的語句數")
+    dropped: dict[str, int] = Field(
+        default_factory=dict, description="捨棄原因 → 語句數（含解碼後整句捨棄）"
+    )
+    dropped_segments: int = Field(0, description="解碼後移除的辨識片段數")
+
+    @property
+    def dropped_total(self) -> int:
+        """捨棄的語句總數"""
+        return sum(self.dropped.values())
+
+
+def analyze_audio(
+    samples: NDArray, sample_rate: int, voiced_dbfs: float
+) -> AudioFeatures:
+    """計算語句的有聲長度、音量與頻譜平坦度
+
+    Args:
+        samples: 一維音訊（int16 或 [-1, 1] 浮點數）
+        sample_rate: 取樣率
+        voiced_dbfs: 音框 RMS 超過此值才視為有聲
+
+    Returns:
+        AudioFeatures（沒有有聲音框時音量為 -inf、平坦度為 1）
+    """
+    samples = np.asarray(samples).reshape(-1)
+    if samples.dtype == np.int16:
+        samples = samples.astype(np.float32) / 32768.0
+    else:
+        samples = samples.astype(np.float32, copy=False)
+
+    frame = max(sample_rate * _FRAME_MS // 1000, 1)
+    count = len(samples) // frame
+    frames = samples[: count * frame].reshape(count, frame)
+    energy = np.mean(frames**2, axis=1)
+    dbfs = 10 * np.log10(energy + 1e-12)
+    voiced = dbfs > voiced_dbfs
+    if not voiced.any():
+        return AudioFeatures(voiced_ms=0.0, rms_dbfs=float("-inf"), flatness=1.0)
+
+    voiced_frames = frames[voiced]
+    power = np.abs(np.fft.rfft(voiced_frames * np.hanning(frame), axis=1)) ** 2
+    power += 1e-12
+    # 頻譜平坦度：幾何平均 / 算術平均（白噪音約 0.56，語音通常低於 0.3）
+    flatness = np.exp(np.mean(np.log(power), axis=1)) / np.mean(power, axis=1)
+    return AudioFeatures(
+        voiced_ms=float(voiced.sum() * _FRAME_MS),
+        rms_dbfs=float(10 * np.log10(np.mean(energy[voiced]) + 1e-12)),
+        flatness=float(np.median(flatness)),
+    )
+
+
+class SpeechGate:
+    """STT 前後的語音閘門（執行緒安全，可由多個會話共用）
+
+    Example:
+        gate = SpeechGate(GateConfig(enabled=True))
+        if gate.admit((48000, audio)):
+            text = stt.stt((48000, audio))
+        gate.stats().dropped  # {"noise": 3, "too_short": 5}
+    """
+
+    def __init__(self, config: GateConfig | None = None):
+        """初始化閘門
+
+        Args:
+            config: 閘門門檻（預設使用 GateConfig()）
+        """
+        self.config = config or GateConfig()
+        self._lock = threading.Lock()
+        self._stats = SpeechGateStats()
+
+    def check_audio(self, audio: tuple[int, NDArray]) -> str | None:
+        """檢查語句是否值得解碼（不更新統計）
+
+        Args:
+            audio: (sample_rate, audio_array) tuple
+
+        Returns:
+            捨棄原因；通過時為 None
+        """
+        sample_rate, array = audio
+        config = self.config
+        features = analyze_audio(array, sample_rate, config.min_rms_dbfs)
+        if features.voiced_ms == 0:
+            return DROP_TOO_QUIET
+        if features.voiced_ms < config.min_voiced_ms:
+            return DROP_TOO_SHORT
+        if features.flatness > config.max_spectral_flatness:
+            return DROP_NOISE
+        return None
+
+    def admit(self, audio: tuple[int, NDArray]) -> bool:
+        """解碼前檢查並記錄統計
+
+        Args:
+            audio: (sample_rate, audio_array) tuple
+
+        Returns:
+            是否送去解碼
+        """
+        reason = self.check_audio(audio)
+        with self._lock:
+            self._stats.checked += 1
+            if reason is None:
+                self._stats.passed += 1
+            else:
+                self._count_drop_locked(reason)
+        return reason is None
+
+    def segment_drop_reason(self, segment: Segment) -> str | None:
+        """判斷辨識片段是否為幻覺
+
+        與 Whisper 的靜音判斷相同：no_speech_prob 高且 avg_logprob 低才
+        捨棄，模型對內容有信心的片段保留。
+
+        Args:
+            segment: Whisper 辨識片段
+
+        Returns:
+            捨棄原因；保留時為 None
+        """
+        if (
+            segment.no_speech_prob > self.config.max_no_speech_prob
+            and segment.avg_logprob < self.config.min_avg_logprob
+        ):
+            return DROP_NO_SPEECH
+        return None
+
+    def filter_segments(
+        self, segments: Iterable[Segment], count: bool = True
+    ) -> list[Segment]:
+        """移除幻覺片段
+
+        Args:
+            segments: Whisper 辨識片段
+            count: 是否記錄統計（串流辨識的中間結果不記錄）
+
+        Returns:
+            保留的片段
+        """
+        kept: list[Segment] = []
+        reasons: list[str] = []
+        for segment in segments:
+            reason = self.segment_drop_reason(segment)
+            if reason is None:
+                kept.append(segment)
+            else:
+                reasons.append(reason)
+        if count and reasons:
+            with self._lock:
+                self._stats.dropped_segments += len(reasons)
+                # 整句都被移除時，本輪不會進入 LLM，記為一次捨棄的語句
+                if not kept:
+                    self._count_drop_locked(reasons[0])
+        return kept
+
+    def stats(self) -> SpeechGateStats:
+        """取得閘門統計
+
+        Returns:
+            SpeechGateStats（複本）
+        """
+        with self._lock:
+            return self._stats.model_copy(deep=True)
+
+    def _count_drop_locked(self, reason: str) -> None:
+        self._stats.dropped[reason] = self._stats.dropped.get(reason, 0) + 1
+        logger.info(
+            f"[STT] 語音閘門捨棄語句: {reason}（累計 {self._stats.dropped_total} 句）"
+        )
@@ -0,0 +1,379 @@
+"""共用 STT worker pool
+
+所有會話的辨識請求進入同一個佇列，由固定數量的 worker 執行緒處理；
+同時抵達（在批次等待時間內）且選項相同的請求合併為一次批次解碼，
+多個會話同時說完話時不必逐一排隊等待整段推論。
+
+WhisperModel 以 num_workers 建立時，多個 worker 可在同一個模型上並行
+推論（CTranslate2 推論期間釋放 GIL）。
+
+STTWorkerPool 提供與 WhisperSTT 相同的辨識介面，可直接交給
+VoicePipeline 與 StreamingTranscriber 使用。
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Any
+
+import numpy as np
+from numpy.typing import NDArray
+from pydantic import BaseModel, Field
+
+from voice_assistant.voice.schemas import TranscribedWord
+from voice_assistant.voice.stt.adaptive import AdaptiveWhisperSTT
+from voice_assistant.voice.stt.sherpa import SherpaOnnxSTT
+from voice_assistant.voice.stt.whisper import WhisperSTT
+
+logger = logging.getLogger(__name__)
+
+
+class STTPoolStats(BaseModel):
+    """佇列與批次統計"""
+
+    queue_depth: int = Field(0, description="等待中的請求數")
+    in_flight: int = Field(0, description="推論中的請求數")
+    requests: int = Field(0, description="已完成的請求數")
+    batches: int = Field(0, description="已完成的批次數")
+    batch_sizes: dict[int, int] = Field(
+        default_factory=dict, description="批次大小 → 次數"
+    )
+    queue_wait_ms: float = Field(0.0, description="所有請求在佇列中等待的總毫秒數")
+
+    @property
+    def mean_batch_size(self) -> float:
+        """平均批次大小"""
+        return self.requests / self.batches if self.batches else 0.0
+
+    @property
+    def max_batch_size(self) -> int:
+        """最大批次大小"""
+        return max(self.batch_sizes, default=0)
+
+    @property
+    def mean_queue_wait_ms(self) -> float:
+        """平均佇列等待毫秒數"""
+        return self.queue_wait_ms / self.requests if self.requests else 0.0
+
+
+class _Request:
+    """單一辨識請求"""
+
+    def __init__(
+        self,
+        samples: NDArray[np.float32],
+        initial_prompt: str | None,
+        words: bool,
+        vad_filter: bool | None = None,
+    ):
+        self.samples = samples
+        self.initial_prompt = initial_prompt
+        self.words = words
+        self.vad_filter = vad_filter
+        self.future: Future = Future()
+        self.enqueued_at = time.perf_counter()
+
+    @property
+    def batch_key(self) -> tuple[bool, str | None, bool | None]:
+        # 前文提示、VAD 設定與輸出形式相同的請求才能合併解碼
+        return self.words, self.initial_prompt, self.vad_filter
+
+
+class STTWorkerPool:
+    """多會話共用的 STT worker pool
+
+    Example:
+        pool = STTWorkerPool(WhisperSTT(num_workers=2), num_workers=2)
+        text = pool.stt((48000, audio))          # 阻塞直到辨識完成
+        future = pool.submit((48000, audio))     # 或取得 Future
+        pool.stats().queue_depth
+    """
+
+    def __init__(
+        self,
+        stt: WhisperSTT | AdaptiveWhisperSTT | SherpaOnnxSTT,
+        num_workers: int = 1,
+        max_batch_size: int = 1,
+        batch_window_ms: int = 10,
+    ):
+        """初始化並啟動 worker 執行緒
+
+        Args:
+            stt: 辨識器（Whisper 建議以相同 num_workers 建立以並行推論；
+                AdaptiveWhisperSTT 會依本 pool 的佇列深度選擇 profile；
+                SherpaOnnxSTT 不提供逐字時間戳，submit_words() 會直接拒絕）
+            num_workers: worker 執行緒數
+            max_batch_size: 單次批次解碼的最大請求數（1 表示不合併）
+            batch_window_ms: 取得第一個請求後等待其他請求加入批次的毫秒數
+        """
+        if num_workers < 1:
+            raise ValueError("num_workers 必須至少為 1")
+        if max_batch_size < 1:
+            raise ValueError("max_batch_size 必須至少為 1")
+
+        self._stt = stt
+        self.num_workers = num_workers
+        self.max_batch_size = max_batch_size
+        self.batch_window_s = batch_window_ms / 1000
+        self._cond = threading.Condition()
+        self._pending: deque[_Request] = deque()
+        self._closed = False
+        self._stats = STTPoolStats()
+        if isinstance(stt, AdaptiveWhisperSTT):
+            stt.load = lambda: self.queue_depth / self.num_workers
+        self._workers = [
+            threading.Thread(target=self._worker, name=f"stt-worker-{i}", daemon=True)
+            for i in range(num_workers)
+        ]
+        for worker in self._workers:
+            worker.start()
+
+    @property
+    def language(self) -> str:
+        """辨識語言"""
+        return self._stt.language
+
+    @property
+    def queue_depth(self) -> int:
+        """等待中的請求數"""
+        with self._cond:
+            return len(self._pending)
+
+    def prepare_audio(
+        self, audio: tuple[int, NDArray[np.int16 | np.float32]]
+    ) -> NDArray[np.float32]:
+        """將音訊轉為 Whisper 輸入格式（在呼叫端執行緒進行）
+
+        Args:
+            audio: (sample_rate, audio_array) tuple
+
+        Returns:
+            16kHz float32 一維陣列
+        """
+        return self._stt.prepare_audio(audio)
+
+    def submit(self, audio: tuple[int, NDArray[np.int16 | np.float32]]) -> Future:
+        """提交辨識請求
+
+        Args:
+            audio: (sample_rate, audio_array) tuple
+
+        Returns:
+            完成時結果為辨識文字的 Future
+        """
+        return self.submit_samples(self.prepare_audio(audio))
+
+    def submit_samples(
+        self,
+        samples: NDArray[np.float32],
+        initial_prompt: str | None = None,
+        vad_filter: bool | None = None,
+    ) -> Future:
+        """提交已轉換格式的辨識請求
+
+        Args:
+            samples: 16kHz float32 一維陣列
+            initial_prompt: 前文提示
+            vad_filter: 覆寫是否啟用 Whisper VAD（None 表示使用辨識器設定）
+
+        Returns:
+            完成時結果為辨識文字的 Future
+        """
+        return self._enqueue(
+            _Request(samples, initial_prompt, words=False, vad_filter=vad_filter)
+        )
+
+    @property
+    def supports_words(self) -> bool:
+        """辨識器是否提供逐字時間戳（StreamingTranscriber 需要）"""
+        return hasattr(self._stt, "transcribe_words")
+
+    def submit_words(
+        self, samples: NDArray[np.float32], initial_prompt: str | None = None
+    ) -> Future:
+        """提交逐字時間戳辨識請求
+
+        Args:
+            samples: 16kHz float32 一維陣列
+            initial_prompt: 前文提示
+
+        Returns:
+            完成時結果為 list[TranscribedWord] 的 Future
+
+        Raises:
+            TypeError: 辨識器不提供逐字時間戳（例如 SherpaOnnxSTT）
+        """
+        if not self.supports_words:
+            raise TypeError(f"{type(self._stt).__name__} 不提供逐字時間戳")
+        return self._enqueue(_Request(samples, initial_prompt, words=True))
+
+    def stt(self, audio: tuple[int, NDArray[np.int16 | np.float32]]) -> str:
+        """將音訊轉換為文字（STTModel Protocol，阻塞直到完成）
+
+        Args:
+            audio: (sample_rate, audio_array) tuple
+
+        Returns:
+            辨識出的文字
+        """
+        samples = self.prepare_audio(audio)
+        if len(samples) == 0:
+            return ""
+        return self.submit_samples(samples).result()
+
+    def transcribe_samples(
+        self,
+        samples: NDArray[np.float32],
+        initial_prompt: str | None = None,
+        vad_filter: bool | None = None,
+    ) -> str:
+        """辨識已轉換格式的音訊（阻塞直到完成）
+
+        Args:
+            samples: 16kHz float32 一維陣列
+            initial_prompt: 前文提示
+            vad_filter: 覆寫是否啟用 Whisper VAD（None 表示使用辨識器設定）
+
+        Returns:
+            辨識出的文字
+        """
+        return self.submit_samples(samples, initial_prompt, vad_filter).result()
+
+    def transcribe_words(
+        self, samples: NDArray[np.float32], initial_prompt: str | None = None
+    ) -> list[TranscribedWord]:
+        """辨識音訊並回傳逐字時間戳（阻塞直到完成）
+
+        Args:
+            samples: 16kHz float32 一維陣列
+            initial_prompt: 前文提示
+
+        Returns:
+            依時間排序的辨識字詞
+        """
+        return self.submit_words(samples, initial_prompt).result()
+
+    def warm_up(self) -> None:
+        """每個 worker 同時執行一次暖身，涵蓋模型的每個推論 worker"""
+        with ThreadPoolExecutor(
+            max_workers=len(self._workers), thread_name_prefix="stt-warmup"
+        ) as executor:
+            futures = [executor.submit(self._stt.warm_up) for _ in self._workers]
+            for future in futures:
+                future.result()
+
+    def stats(self) -> STTPoolStats:
+        """取得佇列與批次統計
+
+        Returns:
+            STTPoolStats（複本）
+        """
+        with self._cond:
+            stats = self._stats.model_copy(deep=True)
+            stats.queue_depth = len(self._pending)
+            return stats
+
+    def close(self) -> None:
+        """停止 worker；尚未處理的請求以 RuntimeError 結束"""
+        with self._cond:
+            self._closed = True
+            pending = list(self._pending)
+            self._pending.clear()
+            self._cond.notify_all()
+        for request in pending:
+            request.future.set_exception(RuntimeError("STT worker pool 已關閉"))
+        for worker in self._workers:
+            worker.join(timeout=5)
+
+    def _enqueue(self, request: _Request) -> Future:
+        with self._cond:
+            if self._closed:
+                raise RuntimeError("STT worker pool 已關閉")
+            self._pending.append(request)
+            # 喚醒所有 worker：等待湊批次的 worker 未必接受此請求
+            self._cond.notify_all()
+        return request.future
+
+    def _worker(self) -> None:
+        while True:
+            batch = self._next_batch()
+            if batch is None:
+                return
+            self._run_batch(batch)
+
+    def _next_batch(self) -> list[_Request] | None:
+        with self._cond:
+            while not self._pending:
+                if self._closed:
+                    return None
+                self._cond.wait()
+
+            first = self._pending.popleft()
+            batch = [first]
+            deadline = time.perf_counter() + self.batch_window_s
+            while len(batch) < self.max_batch_size:
+                self._take_matching(batch, first.batch_key)
+                remaining = deadline - time.perf_counter()
+                if len(batch) >= self.max_batch_size or remaining <= 0:
+                    break
+                self._cond.wait(remaining)
+                if self._closed:
+                    break
+
+            now = time.perf_counter()
+            self._stats.in_flight += len(batch)
+            self._stats.queue_wait_ms += sum(
+                (now - request.enqueued_at) * 1000 for request in batch
+            )
+            return batch
+
+    def _take_matching(self, batch: list[_Request], key: tuple[Any, ...]) -> None:
+        # 選項不同的請求留在佇列中，由下一個批次處理
+        for request in list(self._pending):
+            if len(batch) >= self.max_batch_size:
+                return
+            if request.batch_key == key:
+                self._pending.remove(request)
+                batch.append(request)
+
+    def _run_batch(self, batch: list[_Request]) -> None:
+        first = batch[0]
+        start = time.perf_counter()
+        try:
+            if len(batch) == 1:
+                results: list[Any] = [
+                    self._stt.transcribe_words(first.samples, first.initial_prompt)
+                    if first.words
+                    else self._stt.transcribe_samples(
+                        first.samples, first.initial_prompt, first.vad_filter
+                    )
+                ]
+            else:
+                samples = [request.samples for request in batch]
+                results = (
+                    self._stt.transcribe_words_batch(samples, first.initial_prompt)
+                    if first.words
+                    else self._stt.transcribe_batch(
+                        samples, first.initial_prompt, first.vad_filter
+                    )
+                )
+        except Exception as e:
+            logger.exception(f"[STT] 辨識失敗（批次 {len(batch)} 段）")
+            for request in batch:
+                request.future.set_exception(e)
+        else:
+            logger.debug(
+                f"[STT] 批次 {len(batch)} 段，"
+                f"{(time.perf_counter() - start) * 1000:.0f}ms"
+            )
+            for request, result in zip(batch, results, strict=True):
+                request.future.set_result(result)
+        finally:
+            with self._cond:
+                self._stats.in_flight -= len(batch)
+                self._stats.requests += len(batch)
+                self._stats.batches += 1
+                sizes = self._stats.batch_sizes
+                sizes[len(batch)] = sizes.get(len(batch), 0) + 1
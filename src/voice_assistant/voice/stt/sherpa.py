@@ -0,0 +1,398 @@
+"""sherpa-onnx 串流 STT 實作
+
+以 ONNX Runtime 執行串流 Zipformer transducer（例如
+sherpa-onnx-streaming-zipformer-zh），模型從本地目錄載入。與 Whisper
+不同，模型本身即為串流架構：說話期間每收到一段音訊就遞增解碼，
+停頓後只需處理最後幾個音框，不需要重新辨識整句。
+
+- SherpaOnnxSTT：共用的辨識器，提供與 WhisperSTT 相同的整句辨識介面
+  （STTModel），多段音訊以 decode_streams 一次批次解碼
+- SherpaStreamingSession：單一會話的串流辨識（StreamingSTTModel），
+  由 SherpaOnnxSTT.create_session() 建立
+
+需要安裝 sherpa-onnx（uv sync --extra sherpa）。
+"""
+
+import logging
+import threading
+from concurrent.futures import Executor, ThreadPoolExecutor
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from numpy.typing import NDArray
+
+from voice_assistant.voice.audio import Resampler, prepare_samples, to_mono_float32
+from voice_assistant.voice.schemas import TranscribedText
+from voice_assistant.voice.stt.base import PartialCallback
+
+logger = logging.getLogger(__name__)
+
+# 串流 Zipformer 的輸入取樣率與特徵維度
+SAMPLE_RATE = 16000
+_FEATURE_DIM = 80
+
+# 輸入結束後補上的靜音（秒），讓模型輸出最後幾個音框的結果
+_TAIL_PADDING_S = 0.66
+
+# 比對是否為同一句語音時檢查的開頭樣本數
+_HEAD_SAMPLES = 64
+
+
+def _find_model_file(model_dir: Path, prefix: str) -> str:
+    """在模型目錄中尋找 <prefix>*.onnx（優先使用非量化版本）"""
+    candidates = sorted(model_dir.glob(f"{prefix}*.onnx"))
+    if not candidates:
+        raise FileNotFoundError(
+            f"找不到 sherpa-onnx 模型檔案: {model_dir}/{prefix}*.onnx"
+        )
+    full = [path for path in candidates if ".int8." not in path.name]
+    return str((full or candidates)[0])
+
+
+def _load_recognizer(
+    model_path: str, num_threads: int, decoding_method: str, provider: str
+) -> Any:
+    """載入 sherpa-onnx OnlineRecognizer
+
+    Args:
+        model_path: 模型目錄（含 tokens.txt 與 encoder/decoder/joiner ONNX 檔）
+        num_threads: ONNX Runtime 執行緒數
+        decoding_method: 解碼方式（greedy_search/modified_beam_search）
+        provider: ONNX Runtime execution provider
+
+    Returns:
+        sherpa_onnx.OnlineRecognizer
+    """
+    try:
+        import sherpa_onnx
+    except ImportError as e:
+        raise ImportError(
+            "sherpa-onnx STT 需要安裝 sherpa-onnx：uv sync --extra sherpa"
+        ) from e
+
+    model_dir = Path(model_path)
+    tokens = model_dir / "tokens.txt"
+    if not tokens.exists():
+        raise FileNotFoundError(f"找不到 sherpa-onnx tokens 檔案: {tokens}")
+    return sherpa_onnx.OnlineRecognizer.from_transducer(
+        tokens=str(tokens),
+        encoder=_find_model_file(model_dir, "encoder"),
+        decoder=_find_model_file(model_dir, "decoder"),
+        joiner=_find_model_file(model_dir, "joiner"),
+        num_threads=num_threads,
+        sample_rate=SAMPLE_RATE,
+        feature_dim=_FEATURE_DIM,
+        decoding_method=decoding_method,
+        provider=provider,
+    )
+
+
+class SherpaOnnxSTT:
+    """sherpa-onnx 實作 STTModel Protocol
+
+    Example:
+        stt = SherpaOnnxSTT("models/sherpa-onnx-streaming-zipformer-zh")
+        text = stt.stt((48000, audio))
+        session = stt.create_session()  # 每個會話一個
+    """
+
+    def __init__(
+        self,
+        model_path: str,
+        language: str = "zh",
+        num_threads: int = 1,
+        decoding_method: str = "greedy_search",
+        provider: str = "cpu",
+    ):
+        """載入模型
+
+        Args:
+            model_path: 模型目錄（含 tokens.txt 與 encoder/decoder/joiner ONNX 檔）
+            language: 模型語言（僅用於標示辨識結果）
+            num_threads: ONNX Runtime 執行緒數
+            decoding_method: 解碼方式（greedy_search/modified_beam_search）
+            provider: ONNX Runtime execution provider
+        """
+        self.recognizer = _load_recognizer(
+            model_path, max(num_threads, 1), decoding_method, provider
+        )
+        self.language = language
+
+    def stt(self, audio: tuple[int, NDArray[np.int16 | np.float32]]) -> str:
+        """將音訊轉換為文字
+
+        Args:
+            audio: (sample_rate, audio_array) tuple
+
+        Returns:
+            辨識出的文字
+        """
+        samples = self.prepare_audio(audio)
+        if len(samples) == 0:
+            return ""
+        return self.transcribe_samples(samples)
+
+    def prepare_audio(
+        self, audio: tuple[int, NDArray[np.int16 | np.float32]]
+    ) -> NDArray[np.float32]:
+        """將音訊轉為模型輸入格式（16kHz 單聲道 float32）
+
+        Args:
+            audio: (sample_rate, audio_array) tuple
+
+        Returns:
+            16kHz float32 一維陣列
+        """
+        return prepare_samples(audio, SAMPLE_RATE)
+
+    def transcribe_samples(
+        self,
+        samples: NDArray[np.float32],
+        initial_prompt: str | None = None,
+        vad_filter: bool | None = None,
+    ) -> str:
+        """辨識已轉換格式的音訊
+
+        Args:
+            samples: 16kHz float32 一維陣列
+            initial_prompt: 不支援，忽略
+            vad_filter: 不支援（模型不含 VAD），忽略
+
+        Returns:
+            辨識出的文字
+        """
+        return self.transcribe_batch([samples])[0]
+
+    def transcribe_batch(
+        self,
+        batch: list[NDArray[np.float32]],
+        initial_prompt: str | None = None,
+        vad_filter: bool | None = None,
+    ) -> list[str]:
+        """以一次批次解碼辨識多段音訊
+
+        Args:
+            batch: 多段 16kHz float32 一維陣列（可來自不同會話）
+            initial_prompt: 不支援，忽略
+            vad_filter: 不支援，忽略
+
+        Returns:
+            與 batch 順序相同的辨識文字
+        """
+        streams = []
+        for samples in batch:
+            stream = self.recognizer.create_stream()
+            stream.accept_waveform(SAMPLE_RATE, samples)
+            self.finish_stream(stream)
+            streams.append(stream)
+        self.decode(streams)
+        return [self.recognizer.get_result(stream).strip() for stream in streams]
+
+    def warm_up(self, duration_s: float = 1.0) -> None:
+        """以合成音訊執行一次解碼，預先完成 ONNX Runtime 的延遲初始化
+
+        Args:
+            duration_s: 合成音訊長度（秒）
+        """
+        t = np.arange(int(duration_s * SAMPLE_RATE)) / SAMPLE_RATE
+        self.transcribe_samples((0.1 * np.sin(2 * np.pi * 220 * t)).astype(np.float32))
+
+    def create_session(
+        self,
+        executor: Executor | None = None,
+        on_partial: PartialCallback | None = None,
+    ) -> "SherpaStreamingSession":
+        """建立單一會話的串流辨識器
+
+        Args:
+            executor: 執行解碼的 executor（可選，預設建立單一背景執行緒）
+            on_partial: 部分辨識結果改變時的回呼（可選）
+
+        Returns:
+            SherpaStreamingSession
+        """
+        return SherpaStreamingSession(self, executor=executor, on_partial=on_partial)
+
+    def finish_stream(self, stream: Any) -> None:
+        """標記輸入結束（補上靜音讓模型輸出最後幾個音框）
+
+        Args:
+            stream: sherpa_onnx.OnlineStream
+        """
+        tail = np.zeros(int(_TAIL_PADDING_S * SAMPLE_RATE), dtype=np.float32)
+        stream.accept_waveform(SAMPLE_RATE, tail)
+        stream.input_finished()
+
+    def decode(self, streams: list[Any]) -> None:
+        """解碼所有已累積足夠音框的串流，直到沒有可解碼的音框
+
+        Args:
+            streams: sherpa_onnx.OnlineStream 列表
+        """
+        while ready := [s for s in streams if self.recognizer.is_ready(s)]:
+            self.recognizer.decode_streams(ready)
+
+
+class SherpaStreamingSession:
+    """單一會話的 sherpa-onnx 串流辨識器（StreamingSTTModel）
+
+    FastRTC 在使用者說話期間持續累積同一句語音的音訊；push_frames() 只把
+    新增的部分重採樣後送入模型，並在背景執行緒遞增解碼。
+    """
+
+    def __init__(
+        self,
+        stt: SherpaOnnxSTT,
+        executor: Executor | None = None,
+        on_partial: PartialCallback | None = None,
+    ):
+        """初始化串流辨識器
+
+        Args:
+            stt: 共用的 sherpa-onnx 辨識器
+            executor: 執行解碼的 executor（必須依序執行；預設建立單一背景執行緒）
+            on_partial: 部分辨識結果改變時的回呼（可選）
+        """
+        self.stt = stt
+        self.on_partial = on_partial
+        self._owns_executor = executor is None
+        self._executor = executor or ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="stt-sherpa"
+        )
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._reset_locked()
+
+    def _reset_locked(self) -> None:
+        # 每句語音一個 OnlineStream；generation 讓舊句子的解碼結果不會套用到新句子
+        self._generation += 1
+        self._stream = self.stt.recognizer.create_stream()
+        self._resampler: Resampler | None = None
+        self._sample_rate = 0
+        self._head: NDArray | None = None
+        self._fed = 0
+        self._partial: TranscribedText | None = None
+
+    @property
+    def partial(self) -> TranscribedText | None:
+        """目前語句最新的部分辨識結果"""
+        with self._lock:
+            return self._partial
+
+    def reset(self) -> None:
+        """捨棄目前語句的辨識狀態"""
+        with self._lock:
+            self._reset_locked()
+
+    def push_frames(self, audio: tuple[int, NDArray[np.int16 | np.float32]]) -> None:
+        """收到目前語句累積的音訊（非阻塞）
+
+        Args:
+            audio: (sample_rate, audio_array) 本句開始至今的完整音訊
+        """
+        job = self._take_new_samples(audio)
+        if job is not None:
+            self._executor.submit(self._accept, *job)
+
+    def finalize(
+        self, audio: tuple[int, NDArray[np.int16 | np.float32]] | None = None
+    ) -> TranscribedText:
+        """語句結束：解碼剩餘音框並回傳完整結果
+
+        Args:
+            audio: (sample_rate, audio_array) 完整語句（可選，預設使用最後一次
+                push_frames 的音訊；與先前音訊不一致時重新開始）
+
+        Returns:
+            最終辨識結果（is_partial=False）
+        """
+        if audio is not None:
+            job = self._take_new_samples(audio)
+            if job is not None:
+                self._executor.submit(self._accept, *job)
+        with self._lock:
+            generation = self._generation
+            duration_ms = (
+                int(self._fed / self._sample_rate * 1000) if self._sample_rate else 0
+            )
+        # 排在所有已送出的音訊之後，確保解碼完整
+        text = self._executor.submit(self._finish, generation).result()
+        return TranscribedText(
+            text=text, language=self.stt.language, duration_ms=duration_ms
+        )
+
+    def close(self) -> None:
+        """釋放自行建立的 executor"""
+        if self._owns_executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _take_new_samples(
+        self, audio: tuple[int, NDArray[np.int16 | np.float32]]
+    ) -> tuple[int, NDArray] | None:
+        sample_rate, array = audio
+        array = np.asarray(array).reshape(-1)
+        with self._lock:
+            # 同一句語音的音訊只會往後增長，開頭樣本不變
+            if self._head is not None and (
+                sample_rate != self._sample_rate
+                or len(array) < self._fed
+                or not np.array_equal(array[: len(self._head)], self._head)
+            ):
+                self._reset_locked()
+            if not self._sample_rate:
+                self._sample_rate = sample_rate
+                # 跨區塊保留濾波歷史，逐塊重採樣與整段一次處理結果相同
+                if sample_rate != SAMPLE_RATE:
+                    self._resampler = Resampler(sample_rate, SAMPLE_RATE)
+            if self._head is None or len(self._head) < _HEAD_SAMPLES:
+                self._head = array[:_HEAD_SAMPLES].copy()
+            new = array[self._fed :]
+            self._fed = len(array)
+            if len(new) == 0:
+                return None
+            return self._generation, new
+
+    def _accept(self, generation: int, chunk: NDArray) -> None:
+        with self._lock:
+            if generation != self._generation:
+                return
+            stream, resampler = self._stream, self._resampler
+        samples = to_mono_float32(chunk)
+        if resampler is not None:
+            samples = resampler.process(samples)
+        stream.accept_waveform(SAMPLE_RATE, samples)
+        self.stt.decode([stream])
+        text = self.stt.recognizer.get_result(stream).strip()
+
+        with self._lock:
+            if generation != self._generation:
+                return
+            previous = self._partial.text if self._partial else ""
+            if text == previous:
+                return
+            self._partial = TranscribedText(
+                text=text,
+                language=self.stt.language,
+                duration_ms=int(self._fed / self._sample_rate * 1000),
+                is_partial=True,
+            )
+            partial = self._partial
+
+        if self.on_partial is not None:
+            try:
+                self.on_partial(partial)
+            except Exception as e:
+                logger.warning(f"[STT] 部分辨識回呼失敗: {e}")
+
+    def _finish(self, generation: int) -> str:
+        with self._lock:
+            if generation != self._generation:
+                return ""
+            stream, resampler = self._stream, self._resampler
+            self._reset_locked()
+        if resampler is not None:
+            stream.accept_waveform(SAMPLE_RATE, resampler.flush())
+        self.stt.finish_stream(stream)
+        self.stt.decode([stream])
+        return self.stt.recognizer.get_result(stream).strip()
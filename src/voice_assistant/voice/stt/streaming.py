@@ -0,0 +1,274 @@
+"""串流語音辨識
+
+使用者仍在說話時，於背景反覆辨識尚未確定的音訊視窗；連續多次辨識
+結果一致的前綴（LocalAgreement）即視為確定，並將視窗起點移到該前綴
+結束的時間點。偵測到停頓時只需再辨識最後一小段尚未確定的音訊，
+長句不必在使用者說完後才支付完整的辨識時間。
+"""
+
+import logging
+import threading
+from collections import deque
+from concurrent.futures import Executor, Future, ThreadPoolExecutor
+
+import numpy as np
+from numpy.typing import NDArray
+
+from voice_assistant.voice.schemas import TranscribedText, TranscribedWord
+from voice_assistant.voice.stt.adaptive import AdaptiveWhisperSTT
+from voice_assistant.voice.stt.base import PartialCallback
+from voice_assistant.voice.stt.pool import STTWorkerPool
+from voice_assistant.voice.stt.whisper import SAMPLE_RATE, WhisperSTT
+
+logger = logging.getLogger(__name__)
+
+# 比對是否為同一句語音時檢查的開頭樣本數
+_HEAD_SAMPLES = 64
+
+
+class StreamingTranscriber:
+    """單一會話的串流辨識器（StreamingSTTModel 的 Whisper 實作）
+
+    FastRTC 在使用者說話期間持續累積同一句語音的音訊，push_frames() 每次收到
+    累積後的完整音訊；辨識在背景執行緒進行，不阻塞收音。
+
+    Example:
+        transcriber = StreamingTranscriber(stt)
+        transcriber.push_frames((48000, speech_so_far))  # 說話期間反覆呼叫
+        result = transcriber.finalize((48000, utterance))  # 停頓後
+    """
+
+    def __init__(
+        self,
+        stt: WhisperSTT | AdaptiveWhisperSTT | STTWorkerPool,
+        decode_interval_s: float = 0.5,
+        min_window_s: float = 1.0,
+        max_window_s: float = 15.0,
+        agreement: int = 2,
+        executor: Executor | None = None,
+        on_partial: PartialCallback | None = None,
+    ):
+        """初始化串流辨識器
+
+        Args:
+            stt: Whisper 辨識器或共用 worker pool（可由多個會話共用）
+            decode_interval_s: 兩次部分辨識之間至少新增的音訊秒數
+            min_window_s: 未確定音訊達此長度才開始部分辨識（過短易誤辨）
+            max_window_s: 未確定音訊超過此長度時強制確定（保留最後一個字詞）
+            agreement: 連續幾次辨識結果一致才確定前綴
+            executor: 執行辨識的 executor（可選，預設建立單一背景執行緒）
+            on_partial: 產生部分辨識結果時的回呼（可選）
+        """
+        if agreement < 1:
+            raise ValueError("agreement 必須至少為 1")
+
+        self.stt = stt
+        self.decode_interval_s = decode_interval_s
+        self.min_window_s = min_window_s
+        self.max_window_s = max_window_s
+        self.agreement = agreement
+        self.on_partial = on_partial
+        self._owns_executor = executor is None
+        self._executor = executor or ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="stt-stream"
+        )
+        self._lock = threading.Lock()
+        self._generation = 0
+        self._reset_locked()
+
+    def _reset_locked(self) -> None:
+        # 每句語音重新開始；generation 讓舊句子的辨識結果不會套用到新句子
+        self._generation += 1
+        self._audio: NDArray | None = None
+        self._sample_rate = 0
+        self._committed_text = ""
+        self._commit_s = 0.0
+        self._decoded_s = 0.0
+        self._hypotheses: deque[list[str]] = deque(maxlen=self.agreement)
+        self._pending: Future | None = None
+        self._partial: TranscribedText | None = None
+
+    @property
+    def partial(self) -> TranscribedText | None:
+        """目前語句最新的部分辨識結果"""
+        with self._lock:
+            return self._partial
+
+    def reset(self) -> None:
+        """捨棄目前語句的辨識狀態"""
+        with self._lock:
+            self._reset_locked()
+
+    def push_frames(self, audio: tuple[int, NDArray[np.int16 | np.float32]]) -> None:
+        """收到目前語句累積的音訊（非阻塞）
+
+        Args:
+            audio: (sample_rate, audio_array) 本句開始至今的完整音訊
+        """
+        sample_rate, array = audio
+        array = np.asarray(array).reshape(-1)
+
+        with self._lock:
+            if self._is_new_utterance_locked(sample_rate, array):
+                self._reset_locked()
+            self._audio = array
+            self._sample_rate = sample_rate
+
+            duration_s = len(array) / sample_rate
+            busy = self._pending is not None and not self._pending.done()
+            if (
+                busy
+                or duration_s - self._commit_s < self.min_window_s
+                or duration_s - self._decoded_s < self.decode_interval_s
+            ):
+                return
+            self._decoded_s = duration_s
+            generation = self._generation
+            job = (generation, array, sample_rate, self._commit_s, self._committed_text)
+
+        future = self._executor.submit(self._decode, *job)
+        with self._lock:
+            if self._generation == generation and not future.done():
+                self._pending = future
+
+    def finalize(
+        self, audio: tuple[int, NDArray[np.int16 | np.float32]] | None = None
+    ) -> TranscribedText:
+        """語句結束：辨識剩餘未確定的音訊並回傳完整結果
+
+        Args:
+            audio: (sample_rate, audio_array) 完整語句（可選，預設使用最後一次
+                push_frames 的音訊；與先前音訊不一致時改為完整辨識）
+
+        Returns:
+            最終辨識結果（is_partial=False）
+        """
+        with self._lock:
+            pending = self._pending
+        # 尚未開始的部分辨識直接取消，已在進行的則等待其確定前綴
+        if pending is not None and not pending.cancel():
+            try:
+                pending.result()
+            except Exception as e:
+                logger.warning(f"[STT] 部分辨識失敗: {e}")
+
+        with self._lock:
+            if audio is not None:
+                sample_rate, array = audio
+                array = np.asarray(array).reshape(-1)
+                if self._is_new_utterance_locked(sample_rate, array):
+                    self._reset_locked()
+            else:
+                sample_rate, array = self._sample_rate, self._audio
+            commit_s = self._commit_s
+            committed_text = self._committed_text
+            self._reset_locked()
+
+        if array is None or len(array) == 0:
+            return TranscribedText(text="", language=self.stt.language)
+
+        tail = self.stt.prepare_audio(
+            (sample_rate, array[int(commit_s * sample_rate) :])
+        )
+        tail_text = (
+            self.stt.transcribe_samples(tail, initial_prompt=committed_text or None)
+            if len(tail)
+            else ""
+        )
+        logger.debug(
+            f"[STT] 串流辨識完成：已確定 {commit_s:.2f}s，"
+            f"停頓後辨識 {len(tail) / SAMPLE_RATE:.2f}s"
+        )
+        return TranscribedText(
+            text=(committed_text + tail_text).strip(),
+            language=self.stt.language,
+            duration_ms=int(len(array) / sample_rate * 1000),
+            committed_text=committed_text.strip(),
+        )
+
+    def close(self) -> None:
+        """釋放自行建立的 executor"""
+        if self._owns_executor:
+            self._executor.shutdown(wait=False, cancel_futures=True)
+
+    def _is_new_utterance_locked(self, sample_rate: int, array: NDArray) -> bool:
+        # 同一句語音的音訊只會往後增長，開頭樣本不變
+        previous = self._audio
+        if previous is None:
+            return False
+        return (
+            sample_rate != self._sample_rate
+            or len(array) < len(previous)
+            or not np.array_equal(array[:_HEAD_SAMPLES], previous[:_HEAD_SAMPLES])
+        )
+
+    def _decode(
+        self,
+        generation: int,
+        array: NDArray,
+        sample_rate: int,
+        commit_s: float,
+        committed_text: str,
+    ) -> None:
+        samples = self.stt.prepare_audio(
+            (sample_rate, array[int(commit_s * sample_rate) :])
+        )
+        words = self.stt.transcribe_words(
+            samples, initial_prompt=committed_text or None
+        )
+
+        with self._lock:
+            if generation != self._generation:
+                return
+            partial = self._apply_hypothesis_locked(
+                words, len(samples) / SAMPLE_RATE, len(array) / sample_rate
+            )
+
+        if self.on_partial is not None:
+            try:
+                self.on_partial(partial)
+            except Exception as e:
+                logger.warning(f"[STT] 部分辨識回呼失敗: {e}")
+
+    def _apply_hypothesis_locked(
+        self, words: list[TranscribedWord], window_s: float, duration_s: float
+    ) -> TranscribedText:
+        texts = [word.text.strip() for word in words]
+        self._hypotheses.append(texts)
+
+        commit_count = 0
+        if len(self._hypotheses) == self.agreement:
+            commit_count = _common_prefix_length(self._hypotheses)
+        # 視窗過長仍無共識時強制確定，避免每次辨識的音訊無限增長
+        if commit_count == 0 and window_s >= self.max_window_s and len(words) > 1:
+            commit_count = len(words) - 1
+
+        if commit_count:
+            committed = words[:commit_count]
+            self._committed_text += "".join(word.text for word in committed)
+            self._commit_s += committed[-1].end_s
+            # 其餘假設改以新的視窗起點為基準，繼續比對
+            self._hypotheses = deque(
+                (hypothesis[commit_count:] for hypothesis in self._hypotheses),
+                maxlen=self.agreement,
+            )
+
+        tail_text = "".join(word.text for word in words[commit_count:])
+        self._partial = TranscribedText(
+            text=(self._committed_text + tail_text).strip(),
+            language=self.stt.language,
+            duration_ms=int(duration_s * 1000),
+            is_partial=True,
+            committed_text=self._committed_text.strip(),
+        )
+        return self._partial
+
+
+def _common_prefix_length(hypotheses: deque[list[str]]) -> int:
+    """多次辨識結果共同前綴的字詞數"""
+    length = 0
+    for texts in zip(*hypotheses, strict=False):
+        if len(set(texts)) != 1:
+            break
+        length += 1
+    return length
@@ -3,10 +3,26 @@
 實作 FastRTC STTModel Protocol，使用 faster-whisper 進行中文語音辨識。
 """
 
+import copy
+from bisect import bisect_right
+from collections.abc import Iterable
+from typing import Any
+
 import numpy as np
-from faster_whisper import WhisperModel
+from faster_whisper import BatchedInferencePipeline, WhisperModel
+from faster_whisper.transcribe import Segment
+from faster_whisper.vad import VadOptions, get_speech_timestamps
 from numpy.typing import NDArray
-from scipy import signal
+
+from voice_assistant.voice.audio import prepare_samples
+from voice_assistant.voice.schemas import TranscribedWord
+from voice_assistant.voice.stt.gate import SpeechGate
+
+# Whisper 輸入取樣率
+SAMPLE_RATE = 16000
+
+# Whisper 單次解碼的最長音訊（秒），批次辨識時每個片段不得超過
+_CHUNK_LENGTH_S = 30
 
 
 class WhisperSTT:
@@ -25,6 +41,11 @@ class WhisperSTT:
         vad_filter: bool = True,
         min_silence_duration_ms: int = 500,
         model_path: str | None = None,
+        cpu_threads: int = 0,
+        num_workers: int = 1,
+        temperature: float | list[float] | None = None,
+        without_timestamps: bool = False,
+        gate: SpeechGate | None = None,
     ):
         """初始化 Whisper 模型
 
@@ -37,17 +58,54 @@ class WhisperSTT:
             vad_filter: 是否啟用 VAD 過濾靜音
             min_silence_duration_ms: VAD 靜音閾值（毫秒）
             model_path: 模型快取目錄（預設使用系統快取）
+            cpu_threads: 每個推論 worker 的 CPU 執行緒數（0 表示由 CTranslate2 決定）
+            num_workers: 可同時推論的 worker 數（多個執行緒同時呼叫時並行執行）
+            temperature: 取樣溫度；串列表示解碼失敗時依序提高溫度重試
+                （None 使用 faster-whisper 預設的溫度回退）
+            without_timestamps: 不預測時間戳記 token（較快，逐字時間戳不受影響）
+            gate: 語音閘門（提供時移除 no_speech_prob 過高或 avg_logprob
+                過低的幻覺片段）
         """
         self.model = WhisperModel(
             model_size,
             device=device,
             compute_type=compute_type,
             download_root=model_path,
+            cpu_threads=cpu_threads,
+            num_workers=num_workers,
         )
         self.language = language
         self.beam_size = beam_size
         self.vad_filter = vad_filter
         self.min_silence_duration_ms = min_silence_duration_ms
+        self.temperature = temperature
+        self.without_timestamps = without_timestamps
+        self.gate = gate
+
+    def with_options(
+        self,
+        beam_size: int | None = None,
+        temperature: float | list[float] | None = None,
+        without_timestamps: bool | None = None,
+    ) -> "WhisperSTT":
+        """建立共用同一個模型、解碼選項不同的辨識器
+
+        Args:
+            beam_size: Beam search 大小（None 沿用目前設定）
+            temperature: 取樣溫度（None 沿用目前設定）
+            without_timestamps: 是否略過時間戳記 token（None 沿用目前設定）
+
+        Returns:
+            新的 WhisperSTT（不重新載入模型）
+        """
+        stt = copy.copy(self)
+        if beam_size is not None:
+            stt.beam_size = beam_size
+        if temperature is not None:
+            stt.temperature = temperature
+        if without_timestamps is not None:
+            stt.without_timestamps = without_timestamps
+        return stt
 
     def stt(self, audio: tuple[int, NDArray[np.int16 | np.float32]]) -> str:
         """將音訊轉換為文字
@@ -58,47 +116,244 @@ class WhisperSTT:
         Returns:
             辨識出的中文文字
         """
-        sample_rate, audio_array = audio
+        samples = self.prepare_audio(audio)
 
         # 處理空音訊
-        if len(audio_array) == 0:
+        if len(samples) == 0:
             return ""
 
-        # 確保音訊為 1D (FastRTC 可能傳入多維陣列)
-        if audio_array.ndim > 1:
-            # 處理多維陣列：取第一個聲道避免 interleaving 破壞音訊
-            # shape (samples, channels) -> 取 [:, 0]
-            # shape (channels, samples) -> 取 [0, :]
-            if audio_array.shape[0] > audio_array.shape[1]:
-                # (samples, channels) 格式
-                audio_array = audio_array[:, 0]
-            else:
-                # (channels, samples) 格式
-                audio_array = audio_array[0, :]
-
-        # 正規化為 float32
-        if audio_array.dtype == np.int16:
-            audio_array = audio_array.astype(np.float32) / 32768.0
-        elif audio_array.dtype != np.float32:
-            audio_array = audio_array.astype(np.float32)
-
-        # Whisper 預期 16kHz 輸入，重採樣
-        target_sr = 16000
-        if sample_rate != target_sr:
-            num_samples = int(len(audio_array) * target_sr / sample_rate)
-            audio_array = signal.resample(audio_array, num_samples).astype(np.float32)
-
-        # 執行辨識（條件性建構 kwargs 避免傳遞 None）
-        transcribe_kwargs = {
+        return self.transcribe_samples(samples)
+
+    def prepare_audio(
+        self, audio: tuple[int, NDArray[np.int16 | np.float32]]
+    ) -> NDArray[np.float32]:
+        """將音訊轉為 Whisper 輸入格式（16kHz 單聲道 float32）
+
+        Args:
+            audio: (sample_rate, audio_array) tuple
+
+        Returns:
+            16kHz float32 一維陣列
+        """
+        return prepare_samples(audio, SAMPLE_RATE)
+
+    def transcribe_samples(
+        self,
+        samples: NDArray[np.float32],
+        initial_prompt: str | None = None,
+        vad_filter: bool | None = None,
+    ) -> str:
+        """辨識已轉換格式的音訊
+
+        Args:
+            samples: 16kHz float32 一維陣列
+            initial_prompt: 前文提示（串流辨識時傳入已確定的文字以維持連貫）
+            vad_filter: 覆寫是否啟用 Whisper VAD（None 表示使用初始化設定；
+                音訊已由上游 VAD 切段時傳入 False）
+
+        Returns:
+            辨識出的文字
+        """
+        segments, _info = self.model.transcribe(
+            samples, **self._transcribe_kwargs(initial_prompt, vad_filter)
+        )
+        segments = self._filter(segments)
+
+        # 合併所有片段
+        return "".join(segment.text for segment in segments).strip()
+
+    def transcribe_words(
+        self, samples: NDArray[np.float32], initial_prompt: str | None = None
+    ) -> list[TranscribedWord]:
+        """辨識音訊並回傳逐字時間戳（串流辨識用）
+
+        Args:
+            samples: 16kHz float32 一維陣列
+            initial_prompt: 前文提示
+
+        Returns:
+            依時間排序的辨識字詞
+        """
+        kwargs = self._transcribe_kwargs(initial_prompt)
+        # 逐字時間戳需要時間戳記 token 的片段邊界
+        kwargs.pop("without_timestamps", None)
+        segments, _info = self.model.transcribe(samples, word_timestamps=True, **kwargs)
+        # 串流辨識會反覆解碼同一句，中間結果不計入閘門統計
+        segments = self._filter(segments, count=False)
+        return [
+            TranscribedWord(text=word.word, start_s=word.start, end_s=word.end)
+            for segment in segments
+            for word in segment.words or []
+        ]
+
+    def warm_up(self, duration_s: float = 1.0) -> None:
+        """以合成音訊執行一次 VAD 與解碼，預先完成延遲初始化
+
+        Args:
+            duration_s: 合成音訊長度（秒）
+        """
+        t = np.arange(int(duration_s * SAMPLE_RATE)) / SAMPLE_RATE
+        noise = np.random.default_rng(0).standard_normal(len(t))
+        samples = (0.1 * np.sin(2 * np.pi * 220 * t) + 0.01 * noise).astype(np.float32)
+
+        if self.vad_filter:
+            self._speech_spans(samples)
+        # 合成音訊可能被 VAD 判定為非語音而略過解碼，此處直接解碼
+        segments, _info = self.model.transcribe(
+            samples, language=self.language, beam_size=self.beam_size
+        )
+        for _segment in segments:
+            pass
+
+    def transcribe_batch(
+        self,
+        batch: list[NDArray[np.float32]],
+        initial_prompt: str | None = None,
+        vad_filter: bool | None = None,
+    ) -> list[str]:
+        """以一次批次解碼辨識多段音訊
+
+        Args:
+            batch: 多段 16kHz float32 一維陣列（可來自不同會話）
+            initial_prompt: 所有音訊共用的前文提示
+            vad_filter: 覆寫是否啟用 Whisper VAD（None 表示使用初始化設定）
+
+        Returns:
+            與 batch 順序相同的辨識文字
+        """
+        return [
+            "".join(segment.text for segment in segments).strip()
+            for segments in self._transcribe_batch_segments(
+                batch, initial_prompt, word_timestamps=False, vad_filter=vad_filter
+            )
+        ]
+
+    def _filter(
+        self, segments: Iterable[Segment], count: bool = True
+    ) -> Iterable[Segment]:
+        # 未設定閘門時保留 faster-whisper 的惰性片段產生器
+        if self.gate is None:
+            return segments
+        return self.gate.filter_segments(segments, count=count)
+
+    def transcribe_words_batch(
+        self, batch: list[NDArray[np.float32]], initial_prompt: str | None = None
+    ) -> list[list[TranscribedWord]]:
+        """以一次批次解碼辨識多段音訊並回傳逐字時間戳
+
+        Args:
+            batch: 多段 16kHz float32 一維陣列
+            initial_prompt: 所有音訊共用的前文提示
+
+        Returns:
+            與 batch 順序相同的辨識字詞（時間相對於各自的音訊）
+        """
+        offsets = np.cumsum([0] + [len(samples) for samples in batch]) / SAMPLE_RATE
+        return [
+            [
+                TranscribedWord(
+                    text=word.word,
+                    start_s=word.start - offset,
+                    end_s=word.end - offset,
+                )
+                for segment in segments
+                for word in segment.words or []
+            ]
+            for offset, segments in zip(
+                offsets,
+                self._transcribe_batch_segments(
+                    batch, initial_prompt, word_timestamps=True
+                ),
+                strict=False,
+            )
+        ]
+
+    def _transcribe_batch_segments(
+        self,
+        batch: list[NDArray[np.float32]],
+        initial_prompt: str | None,
+        word_timestamps: bool,
+        vad_filter: bool | None = None,
+    ) -> list[list[Segment]]:
+        # 將各段音訊接在一起，以 clip_timestamps 標出每段的語音片段，
+        # 所有片段的編碼與解碼在同一次批次推論完成
+        clip_starts: list[float] = []
+        clips: list[dict[str, float]] = []
+        owners: list[int] = []
+        offset = 0
+        for index, samples in enumerate(batch):
+            for start, end in self._speech_spans(samples, vad_filter):
+                clip_starts.append((offset + start) / SAMPLE_RATE)
+                clips.append(
+                    {"start": clip_starts[-1], "end": (offset + end) / SAMPLE_RATE}
+                )
+                owners.append(index)
+            offset += len(samples)
+
+        results: list[list[Segment]] = [[] for _ in batch]
+        if not clips:
+            return results
+
+        # BatchedInferencePipeline 保存逐字時間戳的狀態，每次呼叫各自建立
+        options: dict[str, Any] = {}
+        if self.temperature is not None:
+            options["temperature"] = self.temperature
+        segments, _info = BatchedInferencePipeline(self.model).transcribe(
+            np.concatenate(batch),
+            language=self.language,
+            beam_size=self.beam_size,
+            initial_prompt=initial_prompt,
+            word_timestamps=word_timestamps,
+            clip_timestamps=clips,
+            batch_size=len(clips),
+            **options,
+        )
+        for segment in segments:
+            clip = bisect_right(clip_starts, segment.start + 1e-3) - 1
+            results[owners[max(clip, 0)]].append(segment)
+        return [
+            list(self._filter(segments, count=not word_timestamps))
+            for segments in results
+        ]
+
+    def _speech_spans(
+        self, samples: NDArray[np.float32], vad_filter: bool | None = None
+    ) -> list[tuple[int, int]]:
+        # 與 transcribe 的 vad_filter 相同，只送出語音片段；每段不超過單次解碼長度
+        if self.vad_filter if vad_filter is None else vad_filter:
+            timestamps = get_speech_timestamps(
+                samples,
+                VadOptions(
+                    min_silence_duration_ms=self.min_silence_duration_ms,
+                    max_speech_duration_s=_CHUNK_LENGTH_S,
+                ),
+            )
+            return [(ts["start"], ts["end"]) for ts in timestamps]
+        chunk = _CHUNK_LENGTH_S * SAMPLE_RATE
+        return [
+            (start, min(start + chunk, len(samples)))
+            for start in range(0, len(samples), chunk)
+        ]
+
+    def _transcribe_kwargs(
+        self, initial_prompt: str | None, vad_filter: bool | None = None
+    ) -> dict[str, Any]:
+        if vad_filter is None:
+            vad_filter = self.vad_filter
+        # 條件性建構 kwargs 避免傳遞 None
+        transcribe_kwargs: dict[str, Any] = {
             "language": self.language,
             "beam_size": self.beam_size,
-            "vad_filter": self.vad_filter,
+            "vad_filter": vad_filter,
         }
-        if self.vad_filter:
+        if vad_filter:
             transcribe_kwargs["vad_parameters"] = {
                 "min_silence_duration_ms": self.min_silence_duration_ms
             }
-        segments, _info = self.model.transcribe(audio_array, **transcribe_kwargs)
-
-        # 合併所有片段
-        return "".join(segment.text for segment in segments).strip()
+        if self.temperature is not None:
+            transcribe_kwargs["temperature"] = self.temperature
+        if self.without_timestamps:
+            transcribe_kwargs["without_timestamps"] = True
+        if initial_prompt:
+            transcribe_kwargs["initial_prompt"] = initial_prompt
+        return transcribe_kwargs
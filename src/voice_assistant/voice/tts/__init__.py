@@ -1,6 +1,47 @@
-"""文字轉語音（TTS）模組"""
+"""文字轉語音（TTS）模組
+
+KokoroTTS 會載入 kokoro 與 PyTorch，僅在第一次存取時匯入；使用 ONNX
+後端時不需要 PyTorch。
+"""
+
+from typing import Any
 
 from voice_assistant.voice.tts.base import TTSModel
-from voice_assistant.voice.tts.kokoro import KokoroTTS
+from voice_assistant.voice.tts.cache import TTSCache, TTSCacheStats
+from voice_assistant.voice.tts.kokoro_base import KokoroBaseTTS
+from voice_assistant.voice.tts.kokoro_onnx import KokoroOnnxTTS
+from voice_assistant.voice.tts.lookahead import (
+    PlaybackMonitor,
+    PlaybackStats,
+    lookahead_stream,
+)
+from voice_assistant.voice.tts.segmenter import (
+    LatencySegmenter,
+    SentenceSegmenter,
+    TextSegmenter,
+    create_segmenter,
+)
+
+__all__ = [
+    "TTSModel",
+    "KokoroBaseTTS",
+    "KokoroTTS",
+    "KokoroOnnxTTS",
+    "TTSCache",
+    "TTSCacheStats",
+    "PlaybackMonitor",
+    "PlaybackStats",
+    "lookahead_stream",
+    "TextSegmenter",
+    "SentenceSegmenter",
+    "LatencySegmenter",
+    "create_segmenter",
+]
+
+
+def __getattr__(name: str) -> Any:
+    if name == "KokoroTTS":
+        from voice_assistant.voice.tts.kokoro import KokoroTTS
 
-__all__ = ["TTSModel", "KokoroTTS"]
+        return KokoroTTS
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
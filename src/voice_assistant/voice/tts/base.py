@@ -9,6 +9,8 @@ from typing import Protocol, runtime_checkable
 import numpy as np
 from numpy.typing import NDArray
 
+from voice_assistant.cancellation import CancelToken
+
 
 @runtime_checkable
 class TTSModel(Protocol):
@@ -28,11 +30,14 @@ class TTSModel(Protocol):
         """
         ...
 
-    def stream_tts_sync(self, text: str) -> Iterator[tuple[int, NDArray[np.float32]]]:
+    def stream_tts_sync(
+        self, text: str, cancel_token: CancelToken | None = None
+    ) -> Iterator[tuple[int, NDArray[np.float32]]]:
         """同步串流生成語音
 
         Args:
             text: 要轉換的文字
+            cancel_token: 本輪取消權杖（可選，取消後應儘快停止產出）
 
         Yields:
             Tuple of (sample_rate, audio_chunk)
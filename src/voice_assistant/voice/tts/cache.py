@@ -0,0 +1,285 @@
+"""語句層級的 TTS 音訊快取
+
+助理反覆說出相同的句子：角色歡迎詞、「已切換為『X』模式」、錯誤提示與
+固定格式的回答，每次都重新經過 Kokoro 合成。TTSCache 以
+（正規化語句、音色、語速、模型版本）為鍵保存合成結果：
+
+- 記憶體：依位元組容量淘汰的 LRU，命中時直接輸出已合成的片段
+- 磁碟（可選）：每句一個原始 float32/int16 樣本檔與記錄片段長度的
+  JSON，讀取時以 memory-map 開啟，重新啟動後仍可命中；超過容量時
+  刪除最久未使用的檔案
+
+同一個快取由所有會話共用，統計命中與未命中次數。
+"""
+
+import hashlib
+import json
+import logging
+import os
+import re
+import threading
+import unicodedata
+from collections import OrderedDict
+from pathlib import Path
+
+import numpy as np
+from numpy.typing import NDArray
+from pydantic import BaseModel, Field
+
+from voice_assistant.voice.schemas import TTSCacheConfig
+
+logger = logging.getLogger(__name__)
+
+# 一句的合成結果：[(sample_rate, audio_chunk), ...]
+Chunks = list[tuple[int, NDArray[np.float32]]]
+
+_SAMPLES_SUFFIX = ".pcm"
+_META_SUFFIX = ".json"
+_INT16_SCALE = 32767.0
+
+
+def normalize_phrase(text: str) -> str:
+    """快取鍵用：統一全半形並合併空白（保留標點，標點會影響語調）"""
+    return re.sub(r"\s+", " ", unicodedata.normalize("NFKC", text)).strip()
+
+
+class TTSCacheStats(BaseModel):
+    """快取統計"""
+
+    memory_hits: int = Field(0, description="記憶體命中次數")
+    disk_hits: int = Field(0, description="磁碟命中次數")
+    misses: int = Field(0, description="未命中次數（需要合成）")
+    stores: int = Field(0, description="寫入的語句數")
+    evictions: int = Field(0, description="記憶體淘汰的語句數")
+    memory_entries: int = Field(0, description="記憶體中的語句數")
+    memory_bytes: int = Field(0, description="記憶體中的音訊位元組數")
+    disk_entries: int = Field(0, description="磁碟中的語句數")
+    disk_bytes: int = Field(0, description="磁碟中的音訊位元組數")
+
+    @property
+    def hits(self) -> int:
+        """命中總數"""
+        return self.memory_hits + self.disk_hits
+
+    @property
+    def hit_rate(self) -> float:
+        """命中率（尚無查詢時為 0）"""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class TTSCache:
+    """語句層級的 TTS 音訊快取（執行緒安全，可由多個會話共用）
+
+    Example:
+        cache = TTSCache(TTSCacheConfig(enabled=True, disk_path="models/tts_cache"))
+        key = cache.key("已切換為『教練』模式", voice="zf_001", speed=1.0)
+        chunks = cache.get(key)
+        if chunks is None:
+            chunks = list(synthesize(...))
+            cache.put(key, chunks)
+        cache.stats().hit_rate
+    """
+
+    def __init__(self, config: TTSCacheConfig | None = None):
+        """初始化快取
+
+        Args:
+            config: 快取配置（預設使用 TTSCacheConfig()）
+        """
+        self.config = config or TTSCacheConfig()
+        self._memory_budget = int(self.config.memory_mb * 2**20)
+        self._disk_budget = int(self.config.disk_mb * 2**20)
+        self._lock = threading.Lock()
+        self._memory: OrderedDict[str, Chunks] = OrderedDict()
+        self._stats = TTSCacheStats()
+
+        self._disk_dir: Path | None = None
+        if self.config.disk_path:
+            self._disk_dir = Path(self.config.disk_path)
+            self._disk_dir.mkdir(parents=True, exist_ok=True)
+            files = list(self._disk_dir.glob(f"*{_SAMPLES_SUFFIX}"))
+            self._stats.disk_entries = len(files)
+            self._stats.disk_bytes = sum(path.stat().st_size for path in files)
+
+    def cacheable(self, text: str) -> bool:
+        """語句是否值得快取（過長的句子多半不會重複）"""
+        return 0 < len(normalize_phrase(text)) <= self.config.max_chars
+
+    def key(self, text: str, voice: str, speed: float, model: str = "") -> str:
+        """快取鍵
+
+        Args:
+            text: 語句
+            voice: 音色 ID
+            speed: 語速倍率
+            model: 模型識別（後端與模型 revision，見 KokoroBaseTTS.model_id；
+                配置中的 revision 另作為額外的版本標記）
+
+        Returns:
+            十六進位雜湊（同時作為磁碟檔名）
+        """
+        parts = (
+            normalize_phrase(text),
+            voice,
+            f"{speed:.3f}",
+            model,
+            self.config.revision,
+        )
+        return hashlib.sha256("\x1f".join(parts).encode()).hexdigest()[:32]
+
+    def get(self, key: str) -> Chunks | None:
+        """查詢快取（記憶體優先，其次磁碟；磁碟命中會放入記憶體）
+
+        Args:
+            key: key() 產生的快取鍵
+
+        Returns:
+            合成結果的片段；未命中時為 None
+        """
+        with self._lock:
+            chunks = self._memory.get(key)
+            if chunks is not None:
+                self._memory.move_to_end(key)
+                self._stats.memory_hits += 1
+                return chunks
+
+        chunks = self._read_disk(key)
+        with self._lock:
+            if chunks is None:
+                self._stats.misses += 1
+                return None
+            self._stats.disk_hits += 1
+            self._remember(key, [(rate, np.array(chunk)) for rate, chunk in chunks])
+        return chunks
+
+    def put(self, key: str, chunks: Chunks) -> None:
+        """寫入一句完整的合成結果
+
+        Args:
+            key: key() 產生的快取鍵
+            chunks: [(sample_rate, audio_chunk), ...]
+        """
+        chunks = [
+            (rate, np.asarray(chunk, dtype=np.float32).reshape(-1))
+            for rate, chunk in chunks
+        ]
+        with self._lock:
+            self._stats.stores += 1
+            self._remember(key, chunks)
+        if self._disk_dir is not None and chunks:
+            self._write_disk(key, chunks)
+
+    def clear(self) -> None:
+        """清除記憶體中的快取（磁碟檔案保留）"""
+        with self._lock:
+            self._memory.clear()
+            self._stats.memory_entries = 0
+            self._stats.memory_bytes = 0
+
+    def stats(self) -> TTSCacheStats:
+        """取得統計快照"""
+        with self._lock:
+            return self._stats.model_copy()
+
+    def _remember(self, key: str, chunks: Chunks) -> None:
+        # 需持有 self._lock
+        size = sum(chunk.nbytes for _rate, chunk in chunks)
+        if size > self._memory_budget:
+            return
+        previous = self._memory.pop(key, None)
+        if previous is not None:
+            self._stats.memory_bytes -= sum(chunk.nbytes for _r, chunk in previous)
+        self._memory[key] = chunks
+        self._stats.memory_bytes += size
+        while self._stats.memory_bytes > self._memory_budget:
+            _key, evicted = self._memory.popitem(last=False)
+            self._stats.memory_bytes -= sum(chunk.nbytes for _r, chunk in evicted)
+            self._stats.evictions += 1
+        self._stats.memory_entries = len(self._memory)
+
+    def _paths(self, key: str) -> tuple[Path, Path]:
+        assert self._disk_dir is not None
+        return (
+            self._disk_dir / f"{key}{_SAMPLES_SUFFIX}",
+            self._disk_dir / f"{key}{_META_SUFFIX}",
+        )
+
+    def _read_disk(self, key: str) -> Chunks | None:
+        if self._disk_dir is None:
+            return None
+        samples_path, meta_path = self._paths(key)
+        try:
+            meta = json.loads(meta_path.read_text())
+            samples = np.memmap(samples_path, dtype=meta["dtype"], mode="r")
+            # 更新存取時間，容量不足時最後才被刪除
+            os.utime(samples_path)
+        except (OSError, ValueError, KeyError) as e:
+            if not isinstance(e, FileNotFoundError):
+                logger.warning(f"[TTSCache] 無法讀取快取 {key}: {e}")
+            return None
+
+        chunks: Chunks = []
+        offset = 0
+        for length in meta["chunks"]:
+            chunk = samples[offset : offset + length]
+            if samples.dtype == np.int16:
+                chunk = chunk.astype(np.float32) / _INT16_SCALE
+            chunks.append((meta["sample_rate"], chunk))
+            offset += length
+        return chunks
+
+    def _write_disk(self, key: str, chunks: Chunks) -> None:
+        samples_path, meta_path = self._paths(key)
+        samples = np.concatenate([chunk for _rate, chunk in chunks])
+        if self.config.disk_dtype == "int16":
+            samples = (np.clip(samples, -1.0, 1.0) * _INT16_SCALE).astype(np.int16)
+        if samples.nbytes == 0 or samples.nbytes > self._disk_budget:
+            return
+        meta = {
+            "sample_rate": chunks[0][0],
+            "dtype": self.config.disk_dtype,
+            "chunks": [len(chunk) for _rate, chunk in chunks],
+        }
+        try:
+            existed = samples_path.exists()
+            # 先寫暫存檔再改名；樣本檔先就位，JSON 存在即代表完整
+            tmp = samples_path.with_suffix(f".{threading.get_ident()}.tmp")
+            samples.tofile(tmp)
+            os.replace(tmp, samples_path)
+            tmp.write_text(json.dumps(meta))
+            os.replace(tmp, meta_path)
+        except OSError as e:
+            logger.warning(f"[TTSCache] 無法寫入快取 {key}: {e}")
+            return
+        with self._lock:
+            if not existed:
+                self._stats.disk_entries += 1
+                self._stats.disk_bytes += samples.nbytes
+            over = self._stats.disk_bytes > self._disk_budget
+        if over:
+            self._evict_disk()
+
+    def _evict_disk(self) -> None:
+        assert self._disk_dir is not None
+        files = []
+        for path in self._disk_dir.glob(f"*{_SAMPLES_SUFFIX}"):
+            try:
+                stat = path.stat()
+            except OSError:
+                # 其他執行緒已刪除
+                continue
+            files.append((stat.st_mtime, stat.st_size, path))
+        files.sort()
+        total = sum(size for _mtime, size, _path in files)
+        removed = 0
+        for _mtime, size, path in files:
+            if total <= self._disk_budget:
+                break
+            path.with_suffix(_META_SUFFIX).unlink(missing_ok=True)
+            path.unlink(missing_ok=True)
+            total -= size
+            removed += 1
+        with self._lock:
+            self._stats.disk_entries = len(files) - removed
+            self._stats.disk_bytes = total
@@ -10,31 +10,32 @@
 
 預先下載模型：
     uv run python scripts/download_models.py
+
+quantization="int8" 時載入動態量化的模型（見 quantization.py），
+第一次啟動轉換後快取到 HF_HOME/quantized。
 """
 
 import os
-import re
 from collections.abc import Iterator
 from pathlib import Path
 
 import numpy as np
-from kokoro import KPipeline
+from kokoro import KModel, KPipeline
 from numpy.typing import NDArray
 
+from voice_assistant.cancellation import CancelToken
+from voice_assistant.voice.tts.cache import TTSCache
+from voice_assistant.voice.tts.kokoro_base import KokoroBaseTTS
+from voice_assistant.voice.tts.quantization import load_quantized_model
+from voice_assistant.voice.tts.revision import model_revision
+
 
-class KokoroTTS:
+class KokoroTTS(KokoroBaseTTS):
     """Kokoro TTS 中文實作
 
     使用 Kokoro-82M-v1.1-zh 模型進行中文語音合成。
     """
 
-    # 預設中文音色 (可用: zf_001~zf_085 女聲, zm_010~zm_100 男聲)
-    # 完整列表: https://huggingface.co/hexgrad/Kokoro-82M-v1.1-zh/tree/main/voices
-    DEFAULT_VOICE = "zf_001"
-
-    # 中文模型 repo
-    CHINESE_REPO = "hexgrad/Kokoro-82M-v1.1-zh"
-
     def __init__(
         self,
         model_path: str | None = None,  # HuggingFace 快取目錄
@@ -42,6 +43,9 @@ class KokoroTTS:
         voice: str | None = None,
         speed: float = 1.0,
         language: str = "z",  # Kokoro 使用 'z' 代表中文
+        cache: TTSCache | None = None,
+        lookahead: int = 0,
+        quantization: str = "none",
     ):
         """初始化 Kokoro TTS
 
@@ -53,21 +57,41 @@ class KokoroTTS:
             voice: 音色 ID (zf_* 女聲, zm_* 男聲)
             speed: 語速倍率 (0.5-2.0)
             language: 語言代碼 ('z' = 中文)
+            cache: 語句層級的音訊快取（可選，命中的句子不經過合成）
+            lookahead: 多句文字時背景預先合成的音訊片段數（0 表示依序合成）
+            quantization: 權重量化（"none" 或 "int8"：Linear/LSTM 動態量化）
         """
+        if quantization not in ("none", "int8"):
+            raise ValueError(f"不支援的量化模式: {quantization}")
+
         # 設定模型快取目錄
         if model_path:
             cache_dir = Path(model_path).resolve()
             cache_dir.mkdir(parents=True, exist_ok=True)
             os.environ["HF_HOME"] = str(cache_dir)
 
+        model: KModel | bool = True
+        if quantization == "int8":
+            cache_dir = os.environ.get("HF_HOME", Path.home() / ".cache/huggingface")
+            model = load_quantized_model(self.CHINESE_REPO, cache_dir)
+            # 量化後的合成結果與 fp32 不同，語句快取鍵分開
+            self.MODEL_ID = f"{self.CHINESE_REPO}@int8"
+
         # 使用 KPipeline 載入中文模型
         self.pipeline = KPipeline(
             lang_code=language,
             repo_id=self.CHINESE_REPO,
+            model=model,
+        )
+        self.quantization = quantization
+        super().__init__(
+            voice=voice,
+            speed=speed,
+            cache=cache,
+            lookahead=lookahead,
+            # 模型已由 KPipeline 下載，只需讀取本地快取的 snapshot
+            revision=model_revision(self.CHINESE_REPO) if cache is not None else "",
         )
-        self.voice = voice or self.DEFAULT_VOICE
-        self.speed = speed
-        self.sample_rate = 24000  # Kokoro 預設輸出 24kHz
 
     def tts(self, text: str) -> tuple[int, NDArray[np.float32]]:
         """同步生成語音
@@ -103,60 +127,19 @@ class KokoroTTS:
         combined = np.concatenate(audio_chunks)
         return (self.sample_rate, combined.astype(np.float32))
 
-    def stream_tts_sync(self, text: str) -> Iterator[tuple[int, NDArray[np.float32]]]:
-        """同步串流生成語音
-
-        分段生成音訊，適合即時播放。
-
-        Args:
-            text: 中文文字
-
-        Yields:
-            (sample_rate, audio_chunk) tuples
-        """
-        if not text.strip():
-            return
-
-        # 按標點符號分段
-        sentences = re.split(r"([。！？，；：])", text)
-
-        buffer = ""
-        for part in sentences:
-            buffer += part
-            # 遇到結束標點就生成音訊
-            if part in "。！？":
-                if buffer.strip():
-                    generator = self.pipeline(
-                        buffer.strip(),
-                        voice=self.voice,
-                        speed=self.speed,
-                    )
-                    for _gs, _ps, audio in generator:
-                        # Kokoro 回傳 PyTorch Tensor，需轉換為 numpy
-                        if hasattr(audio, "numpy"):
-                            audio = audio.numpy()
-                        yield (self.sample_rate, audio.astype(np.float32))
-                buffer = ""
-
-        # 處理剩餘文字
-        if buffer.strip():
-            generator = self.pipeline(
-                buffer.strip(),
-                voice=self.voice,
-                speed=self.speed,
-            )
-            for _gs, _ps, audio in generator:
-                # Kokoro 回傳 PyTorch Tensor，需轉換為 numpy
-                if hasattr(audio, "numpy"):
-                    audio = audio.numpy()
-                yield (self.sample_rate, audio.astype(np.float32))
-
-    def set_voice(self, voice: str) -> None:
-        """設定音色"""
-        self.voice = voice
-
-    def set_speed(self, speed: float) -> None:
-        """設定語速"""
-        if not 0.5 <= speed <= 2.0:
-            raise ValueError("Speed must be between 0.5 and 2.0")
-        self.speed = speed
+    def _synthesize(
+        self, segment: str, cancel_token: CancelToken | None = None
+    ) -> Iterator[tuple[int, NDArray[np.float32]]]:
+        """合成一段文字（取消後不再產出）"""
+        generator = self.pipeline(
+            segment,
+            voice=self.voice,
+            speed=self.speed,
+        )
+        for _gs, _ps, audio in generator:
+            # Kokoro 回傳 PyTorch Tensor，需轉換為 numpy
+            if hasattr(audio, "numpy"):
+                audio = audio.numpy()
+            yield (self.sample_rate, audio.astype(np.float32))
+            if cancel_token is not None and cancel_token.cancelled:
+                return
@@ -0,0 +1,203 @@
+"""Kokoro TTS 共用基底
+
+PyTorch（KokoroTTS）與 ONNX Runtime（KokoroOnnxTTS）兩種後端共用的
+斷句、語句快取、預先合成、暖身與音色／語速設定。本模組不匯入 kokoro
+與 torch，ONNX 後端因此不需載入 PyTorch；create_kokoro_tts() 只在選用
+PyTorch 後端時才匯入 KokoroTTS。
+"""
+
+import re
+from abc import ABC, abstractmethod
+from collections.abc import Iterator
+
+import numpy as np
+from numpy.typing import NDArray
+
+from voice_assistant.cancellation import CancelToken
+from voice_assistant.voice.schemas import TTSConfig
+from voice_assistant.voice.tts.cache import TTSCache
+from voice_assistant.voice.tts.lookahead import lookahead_stream
+
+
+class KokoroBaseTTS(ABC):
+    """Kokoro TTS 基底類別（子類別實作 _synthesize）"""
+
+    # 預設中文音色 (可用: zf_001~zf_085 女聲, zm_010~zm_100 男聲)
+    # 完整列表: https://huggingface.co/hexgrad/Kokoro-82M-v1.1-zh/tree/main/voices
+    DEFAULT_VOICE = "zf_001"
+
+    # 中文模型 repo
+    CHINESE_REPO = "hexgrad/Kokoro-82M-v1.1-zh"
+
+    # 語句快取鍵中的模型識別（不同後端的合成結果不共用）
+    MODEL_ID = CHINESE_REPO
+
+    def __init__(
+        self,
+        voice: str | None = None,
+        speed: float = 1.0,
+        cache: TTSCache | None = None,
+        lookahead: int = 0,
+        revision: str = "",
+    ):
+        """設定共用參數
+
+        Args:
+            voice: 音色 ID (zf_* 女聲, zm_* 男聲)
+            speed: 語速倍率 (0.5-2.0)
+            cache: 語句層級的音訊快取（可選，命中的句子不經過合成）
+            lookahead: 多句文字時背景預先合成的音訊片段數（0 表示依序合成）
+            revision: 模型版本（見 revision.py；併入語句快取鍵，更新模型後不再
+                命中舊音訊）
+        """
+        self.voice = voice or self.DEFAULT_VOICE
+        self.speed = speed
+        self.sample_rate = 24000  # Kokoro 預設輸出 24kHz
+        self.cache = cache
+        self.lookahead = lookahead
+        self.revision = revision
+
+    @property
+    def model_id(self) -> str:
+        """語句快取鍵中的模型識別（後端與模型版本）"""
+        return f"{self.MODEL_ID}@{self.revision}" if self.revision else self.MODEL_ID
+
+    @abstractmethod
+    def _synthesize(
+        self, segment: str, cancel_token: CancelToken | None = None
+    ) -> Iterator[tuple[int, NDArray[np.float32]]]:
+        """合成一段文字（取消後不再產出）"""
+
+    def tts(self, text: str) -> tuple[int, NDArray[np.float32]]:
+        """同步生成語音
+
+        Args:
+            text: 中文文字
+
+        Returns:
+            (sample_rate, audio_array) tuple
+        """
+        chunks = [chunk for _rate, chunk in self._synthesize(text)]
+        if not chunks:
+            return (self.sample_rate, np.zeros(0, dtype=np.float32))
+        return (self.sample_rate, np.concatenate(chunks))
+
+    def stream_tts_sync(
+        self, text: str, cancel_token: CancelToken | None = None
+    ) -> Iterator[tuple[int, NDArray[np.float32]]]:
+        """同步串流生成語音
+
+        分段生成音訊，適合即時播放。啟用 lookahead 時，送出前一段音訊的
+        同時在背景合成後續段落。
+
+        Args:
+            text: 中文文字
+            cancel_token: 本輪取消權杖（可選，取消後不再合成後續片段）
+
+        Yields:
+            (sample_rate, audio_chunk) tuples
+        """
+        if not text.strip():
+            return
+
+        segments = self._split_segments(text)
+        # 只有一段時沒有可預先合成的內容
+        depth = self.lookahead if len(segments) > 1 else 0
+        yield from lookahead_stream(segments, self._stream_segment, depth, cancel_token)
+
+    def _stream_segment(
+        self, segment: str, cancel_token: CancelToken | None = None
+    ) -> Iterator[tuple[int, NDArray[np.float32]]]:
+        """輸出一段文字的音訊（快取命中時不經過合成）"""
+        cache = self.cache
+        if cache is None or not cache.cacheable(segment):
+            yield from self._synthesize(segment, cancel_token)
+            return
+
+        # 完整合成的句子才寫入快取
+        key = cache.key(segment, self.voice, self.speed, self.model_id)
+        cached = cache.get(key)
+        if cached is not None:
+            yield from cached
+            return
+        chunks = []
+        for chunk in self._synthesize(segment, cancel_token):
+            chunks.append(chunk)
+            yield chunk
+        if cancel_token is None or not cancel_token.cancelled:
+            cache.put(key, chunks)
+
+    def warm_up(self, text: str = "你好，很高興為你服務。") -> None:
+        """合成一句短句，預先載入 G2P 字典並完成模型首次推論
+
+        Args:
+            text: 暖身用文字
+        """
+        for _chunk in self.stream_tts_sync(text):
+            pass
+
+    @staticmethod
+    def _split_segments(text: str) -> list[str]:
+        """按句尾標點分段（逗號等不斷句，保留在句中）"""
+        segments = []
+        buffer = ""
+        for part in re.split(r"([。！？，；：])", text):
+            buffer += part
+            # 遇到結束標點就輸出一段
+            if part in "。！？":
+                if buffer.strip():
+                    segments.append(buffer.strip())
+                buffer = ""
+
+        # 處理剩餘文字
+        if buffer.strip():
+            segments.append(buffer.strip())
+        return segments
+
+    def set_voice(self, voice: str) -> None:
+        """設定音色"""
+        self.voice = voice
+
+    def set_speed(self, speed: float) -> None:
+        """設定語速"""
+        if not 0.5 <= speed <= 2.0:
+            raise ValueError("Speed must be between 0.5 and 2.0")
+        self.speed = speed
+
+
+def create_kokoro_tts(config: TTSConfig, lookahead: int = 0) -> KokoroBaseTTS:
+    """依設定建立 Kokoro TTS
+
+    VoicePipeline 以 config.lookahead 跨句預先合成，因此預設不在句內
+    重複預先合成。
+
+    Args:
+        config: TTS 配置
+        lookahead: 多句文字時背景預先合成的音訊片段數（0 表示依序合成）
+
+    Returns:
+        KokoroOnnxTTS（backend="kokoro-onnx"）或 KokoroTTS
+    """
+    kwargs = {
+        "voice": config.voice,
+        "speed": config.speed,
+        "cache": TTSCache(config.cache) if config.cache.enabled else None,
+        "lookahead": lookahead,
+    }
+    if config.backend == "kokoro-onnx":
+        from voice_assistant.voice.tts.kokoro_onnx import KokoroOnnxTTS
+
+        return KokoroOnnxTTS(
+            model_path=config.onnx_model_path,
+            cpu_threads=config.cpu_threads,
+            **kwargs,
+        )
+
+    # PyTorch 後端：匯入 kokoro 會一併載入 torch
+    from voice_assistant.voice.tts.kokoro import KokoroTTS
+
+    return KokoroTTS(
+        model_path=config.model_path,
+        quantization=config.quantization,
+        **kwargs,
+    )
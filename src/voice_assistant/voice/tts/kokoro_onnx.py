@@ -0,0 +1,276 @@
+"""Kokoro ONNX Runtime 實作
+
+以 ONNX Runtime 執行匯出的 Kokoro-82M-v1.1-zh，G2P 沿用 misaki[zh]，
+音色、斷句、語句快取與預先合成的行為與 KokoroTTS 相同（共用
+KokoroBaseTTS）。匯入與推論都不經過 PyTorch，執行緒數由 ONNX Runtime
+session 設定（依 CPU 執行緒預算）。
+兩者的 RTF 與記憶體可用 scripts/benchmark_rtf.py --tts-backends 比較。
+
+模型目錄由 scripts/export_kokoro_onnx.py 從本地快取的 PyTorch 模型匯出：
+
+- kokoro.onnx：input_ids [1, T]、ref_s [1, 256]、speed [1] →
+  waveform [samples]、duration [T]
+- config.json：模型配置（音素詞彙表）
+- voices.npz：音色向量（每個音色 [510, 1, 256]）
+
+匯出模型：
+    uv run --extra onnx python scripts/export_kokoro_onnx.py --output models/kokoro-onnx
+"""
+
+import json
+import logging
+import re
+from collections.abc import Callable, Iterable, Iterator
+from pathlib import Path
+from typing import Any
+
+import numpy as np
+from numpy.typing import NDArray
+
+from voice_assistant.cancellation import CancelToken
+from voice_assistant.voice.tts.cache import TTSCache
+from voice_assistant.voice.tts.kokoro_base import KokoroBaseTTS
+from voice_assistant.voice.tts.revision import file_revision
+
+logger = logging.getLogger(__name__)
+
+MODEL_FILE = "kokoro.onnx"
+CONFIG_FILE = "config.json"
+VOICES_FILE = "voices.npz"
+
+# 模型可處理的音素數上限（加上前後兩個邊界 token 為 context 長度 512）
+MAX_PHONEMES = 510
+
+# ONNX 模型的輸入與輸出名稱
+INPUT_NAMES = ["input_ids", "ref_s", "speed"]
+OUTPUT_NAMES = ["waveform", "duration"]
+
+
+def _load_session(model_file: str, num_threads: int, provider: str) -> Any:
+    """建立 ONNX Runtime InferenceSession
+
+    Args:
+        model_file: kokoro.onnx 路徑
+        num_threads: intra-op 執行緒數（0 由 ONNX Runtime 決定）
+        provider: ONNX Runtime execution provider
+
+    Returns:
+        onnxruntime.InferenceSession
+    """
+    try:
+        import onnxruntime as ort
+    except ImportError as e:
+        raise ImportError("Kokoro ONNX 需要安裝 onnxruntime") from e
+
+    options = ort.SessionOptions()
+    options.graph_optimization_level = ort.GraphOptimizationLevel.ORT_ENABLE_ALL
+    # 單句推論沒有可平行的分支，inter-op 執行緒只會佔用 CPU
+    options.execution_mode = ort.ExecutionMode.ORT_SEQUENTIAL
+    options.inter_op_num_threads = 1
+    if num_threads > 0:
+        options.intra_op_num_threads = num_threads
+    return ort.InferenceSession(model_file, sess_options=options, providers=[provider])
+
+
+def _load_g2p(repo_id: str) -> Callable[[str], str]:
+    """建立 misaki 中文 G2P（與 KPipeline 相同的版本選擇）
+
+    Args:
+        repo_id: 匯出來源的 HuggingFace repo ID
+
+    Returns:
+        文字 → 音素字串
+    """
+    from misaki import zh
+
+    g2p = zh.ZHG2P(version=None if repo_id.endswith("/Kokoro-82M") else "1.1")
+    return lambda text: g2p(text)[0] or ""
+
+
+class KokoroOnnxTTS(KokoroBaseTTS):
+    """Kokoro ONNX Runtime 實作 TTSModel Protocol
+
+    Example:
+        tts = KokoroOnnxTTS("models/kokoro-onnx", voice="zf_001", cpu_threads=4)
+        for sample_rate, chunk in tts.stream_tts_sync("你好，很高興為你服務。"):
+            play(chunk)
+    """
+
+    # 合成結果與 PyTorch 版有些微差異，快取鍵分開
+    MODEL_ID = f"{KokoroBaseTTS.CHINESE_REPO}@onnx"
+
+    def __init__(
+        self,
+        model_path: str,
+        voice: str | None = None,
+        speed: float = 1.0,
+        language: str = "z",
+        cache: TTSCache | None = None,
+        lookahead: int = 0,
+        cpu_threads: int = 0,
+        provider: str = "CPUExecutionProvider",
+    ):
+        """載入模型
+
+        Args:
+            model_path: 匯出的模型目錄（kokoro.onnx、config.json、voices.npz）
+            voice: 音色 ID (zf_* 女聲, zm_* 男聲)
+            speed: 語速倍率 (0.5-2.0)
+            language: 語言代碼（僅支援 'z' = 中文）
+            cache: 語句層級的音訊快取（可選，命中的句子不經過合成）
+            lookahead: 多句文字時背景預先合成的音訊片段數（0 表示依序合成）
+            cpu_threads: ONNX Runtime intra-op 執行緒數（0 由 ONNX Runtime 決定）
+            provider: ONNX Runtime execution provider
+        """
+        if language != "z":
+            raise ValueError(
+                f"KokoroOnnxTTS 僅支援中文 (language='z')，收到 {language}"
+            )
+        model_dir = Path(model_path)
+        for name in (MODEL_FILE, CONFIG_FILE, VOICES_FILE):
+            if not (model_dir / name).exists():
+                raise FileNotFoundError(
+                    f"找不到 Kokoro ONNX 模型檔案: {model_dir / name}"
+                    "（請先執行 scripts/export_kokoro_onnx.py）"
+                )
+
+        config = json.loads((model_dir / CONFIG_FILE).read_text(encoding="utf-8"))
+        self.vocab: dict[str, int] = config["vocab"]
+        self.session = _load_session(
+            str(model_dir / MODEL_FILE), max(cpu_threads, 0), provider
+        )
+        self.g2p = _load_g2p(config.get("repo_id", self.CHINESE_REPO))
+        self._voices_file = model_dir / VOICES_FILE
+        self._voices: dict[str, NDArray[np.float32]] = {}
+        super().__init__(
+            voice=voice,
+            speed=speed,
+            cache=cache,
+            lookahead=lookahead,
+            # 重新匯出模型或音色後不再命中舊音訊
+            revision=(
+                file_revision(model_dir / MODEL_FILE, self._voices_file)[:16]
+                if cache is not None
+                else ""
+            ),
+        )
+
+    def _synthesize(
+        self, segment: str, cancel_token: CancelToken | None = None
+    ) -> Iterator[tuple[int, NDArray[np.float32]]]:
+        """合成一段文字（與 KPipeline 相同，依換行分塊；取消後不再產出）"""
+        for phonemes in self._phonemize(segment):
+            if cancel_token is not None and cancel_token.cancelled:
+                return
+            yield (self.sample_rate, self.infer(phonemes)[0])
+
+    def _phonemize(self, text: str) -> Iterable[str]:
+        for line in re.split(r"\n+", text.strip()):
+            if not line.strip():
+                continue
+            phonemes = self.g2p(line)
+            if not phonemes:
+                continue
+            if len(phonemes) > MAX_PHONEMES:
+                logger.warning(
+                    f"[KokoroOnnxTTS] 音素數 {len(phonemes)} 超過 {MAX_PHONEMES}，截斷"
+                )
+                phonemes = phonemes[:MAX_PHONEMES]
+            yield phonemes
+
+    def infer(
+        self, phonemes: str, voice: str | None = None, speed: float | None = None
+    ) -> tuple[NDArray[np.float32], NDArray[np.int64]]:
+        """以音素字串推論一段音訊
+
+        Args:
+            phonemes: 音素字串（最多 MAX_PHONEMES 個）
+            voice: 音色 ID（預設使用目前音色）
+            speed: 語速倍率（預設使用目前語速）
+
+        Returns:
+            (waveform, 每個 token 的音框數)
+        """
+        ids = [self.vocab[p] for p in phonemes if p in self.vocab]
+        input_ids = np.array([[0, *ids, 0]], dtype=np.int64)
+        # 音色向量依音素數選擇（與 KPipeline.infer 相同）
+        ref_s = self._voice_pack(voice or self.voice)[len(phonemes) - 1]
+        waveform, duration = self.session.run(
+            OUTPUT_NAMES,
+            {
+                "input_ids": input_ids,
+                "ref_s": np.asarray(ref_s, dtype=np.float32).reshape(1, -1),
+                "speed": np.array([speed or self.speed], dtype=np.float32),
+            },
+        )
+        return np.asarray(waveform, dtype=np.float32).reshape(-1), duration
+
+    def _voice_pack(self, voice: str) -> NDArray[np.float32]:
+        pack = self._voices.get(voice)
+        if pack is None:
+            with np.load(self._voices_file) as voices:
+                if voice not in voices:
+                    raise ValueError(
+                        f"{self._voices_file} 沒有音色 {voice}"
+                        "（匯出時以 --voices 加入）"
+                    )
+                pack = voices[voice].astype(np.float32)
+            self._voices[voice] = pack
+        return pack
+
+
+def export_model(model: Any, output_file: str | Path, opset: int = 17) -> None:
+    """將 PyTorch KModel 匯出為 ONNX（需要 torch 與 onnx）
+
+    KModel 需以 disable_complex=True 建立（ONNX 不支援複數 STFT）。
+
+    Args:
+        model: kokoro.model.KModel
+        output_file: 輸出的 .onnx 路徑
+        opset: ONNX opset 版本
+    """
+    import torch
+    from kokoro.model import KModelForONNX
+
+    wrapper = KModelForONNX(model).eval()
+    tokens = min(32, model.context_length)
+    example = (
+        torch.randint(1, 20, (1, tokens), dtype=torch.long),
+        torch.randn((1, 256), dtype=torch.float32),
+        torch.ones(1, dtype=torch.float32),
+    )
+    with torch.no_grad():
+        torch.onnx.export(
+            wrapper,
+            example,
+            str(output_file),
+            input_names=INPUT_NAMES,
+            output_names=OUTPUT_NAMES,
+            dynamic_axes={
+                "input_ids": {1: "tokens"},
+                "waveform": {0: "samples"},
+                "duration": {0: "tokens"},
+            },
+            opset_version=opset,
+            dynamo=False,
+        )
+
+
+def export_voices(voice_files: Iterable[str | Path], output_file: str | Path) -> int:
+    """將 PyTorch 音色檔（voices/*.pt）合併為 voices.npz
+
+    Args:
+        voice_files: 音色檔路徑（檔名即音色 ID）
+        output_file: 輸出的 .npz 路徑
+
+    Returns:
+        匯出的音色數
+    """
+    import torch
+
+    voices = {
+        Path(path).stem: torch.load(path, weights_only=True).numpy().astype(np.float32)
+        for path in voice_files
+    }
+    np.savez(output_file, **voices)
+    return len(voices)
@@ -0,0 +1,196 @@
+"""TTS 預先合成（lookahead）與斷音統計
+
+依序合成時，第 N+1 句要等第 N 句的音訊全部送出後才開始合成；合成時間
+長於播放時間時，句子之間就會出現空白。lookahead_stream() 以背景執行緒
+依序合成後續句子，放入容量有限的緩衝區，產生器只負責送出已完成的
+音訊：
+
+- 緩衝區滿時背景合成暫停，不會超前過多（插話時浪費的合成有上限）
+- 本輪取消或消費端停止迭代（中斷播放）時，背景合成在下一個片段前停止
+- 背景合成的例外（例如回應流程被取消）在消費端原樣拋出
+
+PlaybackMonitor 以即時播放模型統計斷音：片段就緒時前一段若已播放
+完畢，即記為一次斷音（underrun），差距為斷音時間。
+"""
+
+import contextvars
+import queue
+import threading
+import time
+from collections.abc import Callable, Iterable, Iterator
+
+import numpy as np
+from numpy.typing import NDArray
+from pydantic import BaseModel, Field
+
+from voice_assistant.cancellation import CancelToken
+
+# (sample_rate, audio_chunk)
+Chunk = tuple[int, NDArray[np.float32]]
+
+# 合成一段文字：(text, cancel_token) -> 音訊片段
+Synthesize = Callable[[str, CancelToken | None], Iterator[Chunk]]
+
+# 等待緩衝區時檢查取消的間隔（秒）
+_POLL_S = 0.05
+
+# 背景合成結束標記
+_END = object()
+
+
+class _Failure:
+    """背景合成拋出的例外（交由消費端拋出）"""
+
+    def __init__(self, error: BaseException) -> None:
+        self.error = error
+
+
+class PlaybackStats(BaseModel):
+    """播放斷音統計"""
+
+    streams: int = Field(0, description="輸出的音訊串流數")
+    chunks: int = Field(0, description="輸出的音訊片段數")
+    audio_ms: float = Field(0.0, description="輸出的音訊總長（毫秒）")
+    underruns: int = Field(0, description="片段就緒時前一段已播放完畢的次數")
+    gap_ms: float = Field(0.0, description="斷音總時間（毫秒）")
+    max_gap_ms: float = Field(0.0, description="最長一次斷音（毫秒）")
+
+
+class PlaybackMonitor:
+    """以即時播放模型統計音訊串流的斷音（執行緒安全，可由多個會話共用）
+
+    Example:
+        monitor = PlaybackMonitor()
+        for chunk in monitor.track(tts.stream_tts_sync(text)):
+            yield chunk
+        monitor.stats().underruns
+    """
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._stats = PlaybackStats()
+
+    def track(self, chunks: Iterable[Chunk]) -> Iterator[Chunk]:
+        """包裝音訊串流並記錄各片段的就緒時間
+
+        第一個片段之前的等待屬於首段音訊延遲，不計入斷音。
+
+        Args:
+            chunks: 音訊片段
+
+        Yields:
+            原樣輸出的音訊片段
+        """
+        playback_end: float | None = None
+        count = 0
+        audio_s = 0.0
+        gaps: list[float] = []
+        try:
+            for sample_rate, chunk in chunks:
+                now = time.monotonic()
+                if playback_end is not None and now > playback_end:
+                    gaps.append(now - playback_end)
+                duration_s = np.asarray(chunk).size / sample_rate
+                playback_end = max(now, playback_end or now) + duration_s
+                count += 1
+                audio_s += duration_s
+                yield sample_rate, chunk
+        finally:
+            with self._lock:
+                stats = self._stats
+                stats.streams += 1
+                stats.chunks += count
+                stats.audio_ms += audio_s * 1000
+                stats.underruns += len(gaps)
+                stats.gap_ms += sum(gaps) * 1000
+                stats.max_gap_ms = max([stats.max_gap_ms, *(g * 1000 for g in gaps)])
+
+    def reset(self) -> None:
+        """清除統計"""
+        with self._lock:
+            self._stats = PlaybackStats()
+
+    def stats(self) -> PlaybackStats:
+        """取得統計快照"""
+        with self._lock:
+            return self._stats.model_copy()
+
+
+def lookahead_stream(
+    texts: Iterable[str],
+    synthesize: Synthesize,
+    depth: int,
+    cancel_token: CancelToken | None = None,
+) -> Iterator[Chunk]:
+    """依序合成多段文字，背景預先合成後續段落
+
+    Args:
+        texts: 依序合成的文字（可為仍在產生中的句子串流）
+        synthesize: 合成一段文字的函式
+        depth: 緩衝區可預先合成的片段數（0 表示在呼叫端依序合成）
+        cancel_token: 本輪取消權杖（可選）
+
+    Yields:
+        依文字順序的音訊片段
+
+    Raises:
+        Exception: texts 或 synthesize 拋出的例外
+    """
+    if depth <= 0:
+        for text in texts:
+            if cancel_token is not None and cancel_token.cancelled:
+                return
+            yield from synthesize(text, cancel_token)
+        return
+
+    # 本輪取消或消費端停止時一併停止背景合成
+    stop = cancel_token.child() if cancel_token is not None else CancelToken()
+    buffer: queue.Queue = queue.Queue(maxsize=depth)
+
+    def put(item: object) -> bool:
+        while not stop.cancelled:
+            try:
+                buffer.put(item, timeout=_POLL_S)
+                return True
+            except queue.Full:
+                continue
+        return False
+
+    def produce() -> None:
+        try:
+            for text in texts:
+                if stop.cancelled:
+                    return
+                for chunk in synthesize(text, stop):
+                    if not put(chunk):
+                        return
+        except Exception as e:
+            put(_Failure(e))
+        finally:
+            put(_END)
+
+    # 沿用呼叫端的 context（取消權杖等 ContextVar）
+    context = contextvars.copy_context()
+    producer = threading.Thread(
+        target=context.run, args=(produce,), name="tts-lookahead", daemon=True
+    )
+    producer.start()
+    try:
+        while True:
+            try:
+                item = buffer.get(timeout=_POLL_S)
+            except queue.Empty:
+                # 背景執行緒已結束時不會再有新片段
+                if stop.cancelled or (not producer.is_alive() and buffer.empty()):
+                    return
+                continue
+            if item is _END:
+                return
+            if isinstance(item, _Failure):
+                raise item.error
+            # 取消後不再送出已緩衝的片段
+            if stop.cancelled:
+                return
+            yield item
+    finally:
+        stop.cancel()
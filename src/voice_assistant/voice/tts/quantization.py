@@ -0,0 +1,137 @@
+"""Kokoro PyTorch 動態量化
+
+以 torch 動態量化將 KModel 的 Linear 與 LSTM 權重轉為 int8（啟動值於
+推論時動態量化），並將 iSTFTNet 解碼器卷積的 weight norm 併入權重：
+weight norm 同時保存 weight_g/weight_v 與每次前向重新計算的 weight，
+推論時併入後結果相同，卻只需一份權重。
+
+轉換需要先載入 fp32 模型；完成後整個模組存到磁碟，之後啟動直接載入
+量化模型，不再經過 fp32 權重。品質與 RTF 可用
+scripts/benchmark_rtf.py --tts-quantization none,int8 比較。
+
+快取檔以 pickle 保存整個模組（以 state_dict 重建需要先載入 fp32 模型），
+載入時會執行檔案中的任意程式碼：快取目錄（HF_HOME/quantized）必須只有
+本服務可寫入，不可放在共用或可由他人上傳的位置。檔名包含模型 revision、
+kokoro 與 torch 版本，任一變更即重新轉換；無法載入的檔案視同未快取。
+"""
+
+import logging
+from pathlib import Path
+
+import kokoro
+import torch
+import torch.ao.nn.quantized.dynamic as nnqd
+from kokoro.model import KModel
+from torch import nn
+from torch.nn.utils import remove_weight_norm
+from torch.nn.utils.weight_norm import WeightNorm
+
+from voice_assistant.voice.tts.revision import model_revision
+
+logger = logging.getLogger(__name__)
+
+# 量化模型在快取目錄下的子目錄
+QUANTIZED_DIR = "quantized"
+
+
+class _DynamicLSTM(nnqd.LSTM):
+    """提供 flatten_parameters() 的動態量化 LSTM（kokoro 每次前向都會呼叫）"""
+
+    def flatten_parameters(self) -> None:
+        """僅 cuDNN 需要重排權重，CPU 推論不做任何事"""
+
+    @classmethod
+    def from_float(cls, mod, use_precomputed_fake_quant=False):
+        quantized = super().from_float(
+            mod, use_precomputed_fake_quant=use_precomputed_fake_quant
+        )
+        quantized.__class__ = cls
+        return quantized
+
+
+def fold_weight_norm(model: nn.Module) -> int:
+    """將模型中所有 weight norm 併入權重（原地修改）
+
+    Args:
+        model: PyTorch 模型
+
+    Returns:
+        併入的層數
+    """
+    count = 0
+    for module in model.modules():
+        for hook in list(module._forward_pre_hooks.values()):
+            if isinstance(hook, WeightNorm):
+                remove_weight_norm(module, hook.name)
+                count += 1
+    return count
+
+
+def quantize_model(model: nn.Module) -> nn.Module:
+    """併入 weight norm 並將 Linear/LSTM 動態量化為 int8（原地修改）
+
+    Args:
+        model: eval 模式的 KModel
+
+    Returns:
+        量化後的模型（與輸入為同一物件）
+    """
+    fold_weight_norm(model)
+    # weight norm 的權重不支援 deepcopy，一律原地轉換
+    return torch.ao.quantization.quantize_dynamic(
+        model,
+        {nn.Linear, nn.LSTM},
+        dtype=torch.qint8,
+        mapping={nn.Linear: nnqd.Linear, nn.LSTM: _DynamicLSTM},
+        inplace=True,
+    )
+
+
+def quantized_model_file(cache_dir: str | Path, repo_id: str, revision: str) -> Path:
+    """量化模型的快取路徑（含模型 revision、kokoro 與 torch 版本，變更後重新轉換）
+
+    Args:
+        cache_dir: 模型快取目錄
+        repo_id: HuggingFace repo ID
+        revision: 模型 revision（見 model_revision()）
+
+    Returns:
+        .pt 檔案路徑
+    """
+    name = repo_id.replace("/", "--")
+    versions = f"kokoro-{kokoro.__version__}.torch-{torch.__version__}"
+    return (
+        Path(cache_dir) / QUANTIZED_DIR / f"{name}@{revision[:12]}.int8.{versions}.pt"
+    )
+
+
+def load_quantized_model(repo_id: str, cache_dir: str | Path) -> KModel:
+    """載入 int8 量化的 KModel（第一次轉換後存到磁碟）
+
+    快取檔以 pickle 載入，cache_dir 必須是受信任、只有本服務可寫入的目錄。
+
+    Args:
+        repo_id: HuggingFace repo ID
+        cache_dir: 模型快取目錄
+
+    Returns:
+        eval 模式的量化 KModel
+    """
+    path = quantized_model_file(cache_dir, repo_id, model_revision(repo_id))
+    if path.exists():
+        logger.info(f"[Kokoro] 載入量化模型: {path}")
+        try:
+            # 整個模組以 pickle 保存（本服務轉換產生的檔案）
+            return torch.load(path, weights_only=False)
+        except Exception as e:
+            # 寫入中斷或不相容的檔案視同未快取，重新轉換
+            logger.warning(f"[Kokoro] 無法載入量化模型 {path}，重新轉換: {e}")
+            path.unlink(missing_ok=True)
+
+    logger.info(f"[Kokoro] 首次量化 {repo_id}（int8），完成後快取到 {path}")
+    model = quantize_model(KModel(repo_id=repo_id).eval())
+    path.parent.mkdir(parents=True, exist_ok=True)
+    partial = path.with_suffix(".partial")
+    torch.save(model, partial)
+    partial.replace(path)
+    return model
@@ -0,0 +1,48 @@
+"""TTS 模型版本識別
+
+語句快取（磁碟層跨重新啟動保留）與 int8 量化模型都以模型版本為鍵，
+模型或音色檔更新後不再沿用舊的結果：
+
+- HuggingFace 模型：snapshot 的 commit hash（與 KModel／KPipeline 載入的相同）
+- 本地匯出的模型（kokoro-onnx）：模型與音色檔內容的雜湊
+
+本模組不匯入 kokoro 與 torch，兩種後端皆可使用。
+"""
+
+import hashlib
+from pathlib import Path
+
+# 讀取檔案計算雜湊的區塊大小
+_CHUNK_BYTES = 1 << 20
+
+
+def model_revision(repo_id: str) -> str:
+    """模型在 HuggingFace 快取中的 revision（snapshot 的 commit hash）
+
+    Args:
+        repo_id: HuggingFace repo ID
+
+    Returns:
+        commit hash（與 KModel 載入的 snapshot 相同）
+    """
+    from huggingface_hub import hf_hub_download
+
+    # 快取路徑為 .../snapshots/<commit>/config.json（離線時使用本地快取）
+    return Path(hf_hub_download(repo_id=repo_id, filename="config.json")).parent.name
+
+
+def file_revision(*paths: str | Path) -> str:
+    """以檔案內容計算 revision（任一檔案變更即不同）
+
+    Args:
+        paths: 模型與音色檔路徑
+
+    Returns:
+        十六進位 SHA-256 雜湊
+    """
+    digest = hashlib.sha256()
+    for path in paths:
+        with open(path, "rb") as f:
+            while chunk := f.read(_CHUNK_BYTES):
+                digest.update(chunk)
+    return digest.hexdigest()
@@ -0,0 +1,291 @@
+"""串流文字斷句器
+
+將 LLM 串流輸出的文字增量切成可送入 TTS 的段落，讓 TTS 在模型仍在
+生成時就能開始合成第一段。斷句策略可替換（TextSegmenter）：
+
+- SentenceSegmenter：只在句尾標點斷句；第一句很長時，首段音訊要等
+  整句生成並合成完才會出現
+- LatencySegmenter：第一段在第一個子句邊界（，、；）或字數上限提早
+  輸出，之後每段的字數上限逐段加長，兼顧語調與合成效率；不會切開
+  數字、小數、英文單字與 Markdown 標記，並移除 Markdown 符號
+"""
+
+import re
+from typing import Protocol, runtime_checkable
+
+from voice_assistant.voice.schemas import SegmentationConfig
+
+# 句尾標點：遇到即輸出一句（與 KokoroTTS.stream_tts_sync 的斷句規則一致，
+# 另加入換行與半形問號、驚嘆號以處理 LLM 的條列輸出）
+SENTENCE_TERMINATORS = frozenset("。！？!?\n")
+
+# 子句邊界（半形標點後接數字時為數字的一部分，例如 1,000 與 12:30）
+CLAUSE_BOUNDARIES = frozenset("，、；：,;:")
+_HALF_WIDTH_CLAUSE = frozenset(",;:")
+
+# 斷句後仍屬於前一段的收尾符號
+_CLOSERS = frozenset("」』）》】〕)]\"'”’")
+
+# 數字、英文單字內部的連接符號（兩側皆為英數字時不可切開）
+_WORD_JOINERS = frozenset(".,:/-'%")
+
+_MD_LINK = re.compile(r"\[([^\]]*)\]\([^)]*\)")
+_MD_RULE = re.compile(r"(?m)^\s*([-*_])\1{2,}\s*$")
+_MD_LINE_PREFIX = re.compile(r"(?m)^\s*(?:#{1,6}|>|[-*+•])\s+")
+_MD_EMPHASIS = re.compile(r"\*\*|__|~~|`|\*")
+
+
+@runtime_checkable
+class TextSegmenter(Protocol):
+    """串流斷句策略"""
+
+    def push(self, delta: str) -> list[str]:
+        """加入文字增量，回傳本次新完成的段落"""
+        ...
+
+    def flush(self) -> str | None:
+        """輸出緩衝中剩餘的文字（沒有內容時回傳 None）"""
+        ...
+
+
+class SentenceSegmenter:
+    """串流斷句器
+
+    累積文字增量，每遇到句尾標點就輸出一個完整句子。
+
+    Example:
+        segmenter = SentenceSegmenter()
+        for delta in ["台北今天", "晴天。氣溫", "二十五度。"]:
+            for sentence in segmenter.push(delta):
+                speak(sentence)
+        if tail := segmenter.flush():
+            speak(tail)
+    """
+
+    def __init__(self) -> None:
+        """初始化空緩衝"""
+        self._buffer = ""
+
+    def push(self, delta: str) -> list[str]:
+        """加入文字增量
+
+        Args:
+            delta: LLM 串流輸出的文字增量
+
+        Returns:
+            本次新完成的句子（已去除前後空白，不含空句）
+        """
+        sentences: list[str] = []
+        start = 0
+        text = self._buffer + delta
+        for index, char in enumerate(text):
+            if char in SENTENCE_TERMINATORS:
+                sentence = text[start : index + 1].strip()
+                if sentence:
+                    sentences.append(sentence)
+                start = index + 1
+        self._buffer = text[start:]
+        return sentences
+
+    def flush(self) -> str | None:
+        """輸出緩衝中剩餘的文字
+
+        Returns:
+            剩餘文字，沒有內容時回傳 None
+        """
+        remainder = self._buffer.strip()
+        self._buffer = ""
+        return remainder or None
+
+
+def clean_markdown(text: str) -> str:
+    """移除 Markdown 符號（連結保留文字，標題、引用與項目符號移除前綴）
+
+    Args:
+        text: 可能含有 Markdown 的文字
+
+    Returns:
+        適合朗讀的文字
+    """
+    text = _MD_LINK.sub(r"\1", text)
+    text = _MD_RULE.sub("", text)
+    text = _MD_LINE_PREFIX.sub("", text)
+    return _MD_EMPHASIS.sub("", text)
+
+
+def _is_word_char(char: str) -> bool:
+    return char.isascii() and char.isalnum()
+
+
+class LatencySegmenter:
+    """首段音訊優先的串流斷句器
+
+    - 第一段：累積 first_min_chars 字後遇到子句邊界即輸出；超過
+      first_max_chars 仍沒有邊界時，在上限內最後一個安全位置切開
+    - 之後第 n 段的字數上限為 first_max_chars × growth^n（不超過
+      max_chars），子句邊界需累積上限的一半才輸出
+    - 句尾標點與換行一律輸出
+
+    Example:
+        segmenter = LatencySegmenter(SegmentationConfig(strategy="latency"))
+        segmenter.push("今天台北多雲時晴，氣溫介於二十三到二十九度，")
+        # ["今天台北多雲時晴，"]
+    """
+
+    def __init__(self, config: SegmentationConfig | None = None) -> None:
+        """初始化空緩衝
+
+        Args:
+            config: 斷句配置（預設使用 SegmentationConfig()）
+        """
+        self.config = config or SegmentationConfig()
+        self._buffer = ""
+        self._emitted = 0
+
+    def push(self, delta: str) -> list[str]:
+        """加入文字增量
+
+        Args:
+            delta: LLM 串流輸出的文字增量
+
+        Returns:
+            本次新完成的段落（已移除 Markdown 符號與前後空白）
+        """
+        self._buffer += delta
+        segments: list[str] = []
+        while (cut := self._find_cut(self._buffer)) is not None:
+            piece, self._buffer = self._buffer[:cut], self._buffer[cut:]
+            self._emit(piece, segments)
+        return segments
+
+    def flush(self) -> str | None:
+        """輸出緩衝中剩餘的文字
+
+        Returns:
+            剩餘文字，沒有可朗讀的內容時回傳 None
+        """
+        remainder = clean_markdown(self._buffer).strip()
+        self._buffer = ""
+        self._emitted = 0
+        return remainder if any(char.isalnum() for char in remainder) else None
+
+    def _limits(self) -> tuple[int, int]:
+        """目前這一段的（子句邊界最少字數, 字數上限）"""
+        config = self.config
+        if self._emitted == 0:
+            return config.first_min_chars, config.first_max_chars
+        cap = min(
+            config.max_chars,
+            round(config.first_max_chars * config.growth**self._emitted),
+        )
+        return max(cap // 2, 1), cap
+
+    def _find_cut(self, text: str) -> int | None:
+        """下一段的結束位置；需要更多文字才能決定時回傳 None"""
+        min_chars, cap = self._limits()
+        safe_cut = None
+        length = 0
+        for index, char in enumerate(text):
+            if not char.isspace():
+                length += 1
+            end = index + 1
+            boundary = self._boundary(text, index)
+            if boundary == "pending":
+                return None
+            if boundary == "sentence" or (boundary == "clause" and length >= min_chars):
+                return self._extend_closers(text, end)
+            if end < len(text) and self._is_safe(text, end):
+                if length <= cap:
+                    safe_cut = end
+                elif safe_cut is None:
+                    # 上限內沒有安全位置（例如很長的英文單字），在其後第一個安全位置切開
+                    return end
+            if end == len(text):
+                # 需要下一個字才能判斷目前位置能否切開
+                break
+            if length >= cap and safe_cut is not None:
+                return safe_cut
+        return None
+
+    def _boundary(self, text: str, index: int) -> str | None:
+        """text[index] 是否為斷句位置：sentence、clause、pending（需看下一個字）"""
+        char = text[index]
+        if char in SENTENCE_TERMINATORS:
+            return "sentence" if self._is_safe(text, index + 1) else None
+        if char in CLAUSE_BOUNDARIES or char == ".":
+            if index + 1 == len(text):
+                return "pending" if char in _HALF_WIDTH_CLAUSE | {"."} else "clause"
+            following = text[index + 1]
+            if char == ".":
+                # 英文句點：前為字母、後為空白（排除小數與「1. 」編號）
+                previous = text[index - 1] if index else ""
+                return (
+                    "sentence"
+                    if previous.isascii() and previous.isalpha() and following.isspace()
+                    else None
+                )
+            if char in _HALF_WIDTH_CLAUSE and following.isdigit():
+                return None
+            return "clause" if self._is_safe(text, index + 1) else None
+        return None
+
+    @staticmethod
+    def _is_safe(text: str, position: int) -> bool:
+        """在 position 之前切開是否安全（不切開英數字、程式碼與連結）"""
+        head = text[:position]
+        if head.count("`") % 2 or head.rfind("[") > head.rfind(")"):
+            return False
+        if position == 0 or position >= len(text):
+            return True
+        previous, following = text[position - 1], text[position]
+        previous_word = _is_word_char(previous) or previous in _WORD_JOINERS
+        following_word = _is_word_char(following) or following in _WORD_JOINERS
+        return not (
+            previous_word
+            and following_word
+            and (_is_word_char(previous) or _is_word_char(following))
+        )
+
+    @staticmethod
+    def _extend_closers(text: str, end: int) -> int:
+        while end < len(text) and text[end] in _CLOSERS:
+            end += 1
+        return end
+
+    def _emit(self, piece: str, segments: list[str]) -> None:
+        segment = clean_markdown(piece).strip()
+        # 只有標點或 Markdown 符號（例如分隔線）的段落不送入 TTS
+        if any(char.isalnum() for char in segment):
+            segments.append(segment)
+            self._emitted += 1
+
+
+def create_segmenter(config: SegmentationConfig | None = None) -> TextSegmenter:
+    """依配置建立斷句器（每段回應各自一個，斷句器保有狀態）
+
+    Args:
+        config: 斷句配置（預設使用 SegmentationConfig()）
+
+    Returns:
+        TextSegmenter
+    """
+    config = config or SegmentationConfig()
+    if config.strategy == "latency":
+        return LatencySegmenter(config)
+    return SentenceSegmenter()
+
+
+def split_text(text: str, segmenter: TextSegmenter) -> list[str]:
+    """以斷句器切分一段完整文字
+
+    Args:
+        text: 完整文字
+        segmenter: 斷句器
+
+    Returns:
+        依序的段落
+    """
+    segments = segmenter.push(text)
+    if tail := segmenter.flush():
+        segments.append(tail)
+    return segments
@@ -9,6 +9,8 @@ from typing import TYPE_CHECKING
 import gradio as gr
 import numpy as np
 
+from voice_assistant.voice.audio import resample
+
 if TYPE_CHECKING:
     from numpy.typing import NDArray
 
@@ -87,6 +89,7 @@ def create_audio_input() -> gr.Audio:
 
 def audio_input_handler(
     audio: tuple[int, "NDArray[np.float32]"] | None,
+    target_sample_rate: int | None = None,
 ) -> tuple[int, "NDArray[np.float32]"] | None:
     """處理上傳的音訊檔案
 
@@ -94,6 +97,7 @@ def audio_input_handler(
 
     Args:
         audio: (sample_rate, audio_array) 或 None
+        target_sample_rate: 重採樣的目標取樣率（None 表示維持原取樣率）
 
     Returns:
         轉換後的音訊 tuple 或 None
@@ -123,6 +127,11 @@ def audio_input_handler(
         audio_array = audio_array.mean(axis=1)
         logger.debug(f"[UI] 音訊轉換為單聲道: shape={audio_array.shape}")
 
+    if target_sample_rate and sample_rate != target_sample_rate:
+        audio_array = resample(audio_array, sample_rate, target_sample_rate)
+        logger.debug(f"[UI] 音訊重採樣: {sample_rate} -> {target_sample_rate}Hz")
+        sample_rate = target_sample_rate
+
     return (sample_rate, audio_array)
 
 
@@ -0,0 +1,254 @@
+"""啟動暖身與就緒狀態
+
+第一輪真實對話原本要承擔各元件的延遲初始化：CTranslate2 首次解碼的
+記憶體配置、Whisper VAD 模型載入、Kokoro/misaki 的 G2P 字典載入，
+以及 LangGraph 首次 invoke。啟動時先以合成輸入逐一執行一次，並記錄
+各元件的暖身耗時。
+
+暖身完成前就緒狀態為未就緒，/health/ready 回傳 503；容器健康檢查
+以此判斷服務是否已能以正常速度回應。
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from collections.abc import Callable
+
+from fastapi.responses import JSONResponse
+from fastapi.routing import APIRoute
+from pydantic import BaseModel, Field
+
+from voice_assistant.config import FlowMode
+
+logger = logging.getLogger(__name__)
+
+# 流程暖身的使用者輸入（LLM 與工具皆由本地替身回應）
+WARMUP_USER_INPUT = "台北天氣如何"
+
+READY_PATH = "/health/ready"
+
+
+class ComponentWarmup(BaseModel):
+    """單一元件的暖身結果"""
+
+    name: str = Field(description="元件名稱")
+    duration_ms: float = Field(description="暖身耗時（毫秒）")
+    error: str | None = Field(default=None, description="失敗時的錯誤訊息")
+
+
+class WarmupReport(BaseModel):
+    """暖身結果"""
+
+    components: list[ComponentWarmup] = Field(default_factory=list)
+    total_ms: float = Field(default=0.0, description="總耗時（毫秒）")
+
+    @property
+    def ok(self) -> bool:
+        """所有元件皆暖身成功"""
+        return all(component.error is None for component in self.components)
+
+
+class Readiness:
+    """服務就緒狀態（執行緒安全）
+
+    暖身成功後才視為就緒；暖身失敗時保持未就緒，讓健康檢查反映問題。
+    """
+
+    def __init__(self) -> None:
+        """初始化為未就緒"""
+        self._event = threading.Event()
+        self._report: WarmupReport | None = None
+
+    @property
+    def ready(self) -> bool:
+        """是否已就緒"""
+        return self._event.is_set()
+
+    @property
+    def report(self) -> WarmupReport | None:
+        """暖身結果（尚未完成時為 None）"""
+        return self._report
+
+    def set_report(self, report: WarmupReport) -> None:
+        """記錄暖身結果，全部成功時標記為就緒
+
+        Args:
+            report: 暖身結果
+        """
+        self._report = report
+        if report.ok:
+            self._event.set()
+
+    def wait(self, timeout: float | None = None) -> bool:
+        """等待就緒
+
+        Args:
+            timeout: 等待秒數上限（None 表示不限）
+
+        Returns:
+            是否已就緒
+        """
+        return self._event.wait(timeout)
+
+    def routes(self) -> list[APIRoute]:
+        """就緒檢查路由（傳給 Gradio launch 的 app_kwargs["routes"]）
+
+        Returns:
+            GET /health/ready：就緒時 200，否則 503，內容為暖身結果
+        """
+
+        def ready() -> JSONResponse:
+            report = self._report
+            return JSONResponse(
+                {
+                    "ready": self.ready,
+                    "warmup": report.model_dump() if report else None,
+                },
+                status_code=200 if self.ready else 503,
+            )
+
+        return [APIRoute(READY_PATH, ready, methods=["GET"])]
+
+
+def run_warmup(steps: dict[str, Callable[[], object]]) -> WarmupReport:
+    """依序執行各元件的暖身並記錄耗時
+
+    單一元件失敗不影響其他元件，錯誤記錄在結果中。
+
+    Args:
+        steps: 元件名稱 → 暖身函式
+
+    Returns:
+        WarmupReport
+    """
+    report = WarmupReport()
+    start = time.perf_counter()
+    for name, step in steps.items():
+        step_start = time.perf_counter()
+        error = None
+        try:
+            step()
+        except Exception as e:
+            logger.warning(f"[Warmup] {name} 暖身失敗: {e}", exc_info=True)
+            error = str(e) or type(e).__name__
+        duration_ms = round((time.perf_counter() - step_start) * 1000, 1)
+        report.components.append(
+            ComponentWarmup(name=name, duration_ms=duration_ms, error=error)
+        )
+        logger.info(f"[Warmup] {name}: {duration_ms:.0f}ms")
+    report.total_ms = round((time.perf_counter() - start) * 1000, 1)
+    return report
+
+
+def start_warmup(
+    steps: dict[str, Callable[[], object]], readiness: Readiness
+) -> threading.Thread:
+    """在背景執行緒暖身，完成後更新就緒狀態
+
+    Args:
+        steps: 元件名稱 → 暖身函式
+        readiness: 就緒狀態
+
+    Returns:
+        暖身執行緒（已啟動）
+    """
+
+    def run() -> None:
+        report = run_warmup(steps)
+        readiness.set_report(report)
+        logger.info(
+            f"[Warmup] 完成，共 {report.total_ms:.0f}ms"
+            + ("" if report.ok else "（部分元件失敗，服務維持未就緒）")
+        )
+
+    thread = threading.Thread(target=run, name="warmup", daemon=True)
+    thread.start()
+    return thread
+
+
+def warm_up_flows(flow_mode: FlowMode) -> None:
+    """以本地 LLM 替身與錄製工具執行一次流程圖
+
+    建立與正式環境相同結構的流程圖並 invoke 一次，預先完成 LangGraph、
+    OpenAI SDK 與各節點的延遲初始化；不呼叫任何外部 API。
+
+    Args:
+        flow_mode: 流程模式
+    """
+    from voice_assistant.agents import MultiAgentExecutor
+    from voice_assistant.bench.corpus import (
+        LatencyDistribution,
+        LLMRule,
+        LLMScript,
+        ScriptedToolCall,
+        ToolFixture,
+        ToolRecording,
+    )
+    from voice_assistant.bench.fake_openai import FakeOpenAIServer
+    from voice_assistant.bench.tools import create_recorded_registry
+    from voice_assistant.flows import FlowExecutor
+    from voice_assistant.llm.client import LLMClient
+    from voice_assistant.llm.schemas import ChatMessage
+    from voice_assistant.tools.schemas import ToolResult
+
+    weather = {"city": "台北", "temperature": 23.0, "weather": "多雲"}
+    script = LLMScript(
+        first_token=LatencyDistribution(),
+        token_interval=LatencyDistribution(),
+        default_content="台北今天多雲，氣溫二十三度。",
+        rules=[
+            LLMRule(
+                system_contains="意圖分類器",
+                content='{"intent": "weather", "tool_name": "get_weather", '
+                '"tool_args": {"city": "台北"}}',
+            ),
+            LLMRule(
+                system_contains="任務分析專家",
+                content='{"reasoning": "天氣查詢", "tasks": [{"agent_type": '
+                '"weather", "description": "查詢台北天氣", '
+                '"parameters": {"city": "台北"}}]}',
+            ),
+            LLMRule(
+                with_tools=True,
+                after_tool=False,
+                tool_calls=[
+                    ScriptedToolCall(name="get_weather", arguments={"city": "台北"})
+                ],
+            ),
+        ],
+    )
+    tools = create_recorded_registry(
+        [
+            ToolFixture(
+                name="get_weather",
+                recordings=[ToolRecording(result=ToolResult.ok(weather))],
+            )
+        ]
+    )
+
+    async def run(base_url: str) -> None:
+        llm = LLMClient(api_key="warmup", model="warmup", base_url=base_url)
+        try:
+            if flow_mode == FlowMode.LANGGRAPH:
+                response = await FlowExecutor(llm, tools).execute(
+                    WARMUP_USER_INPUT, on_delta=lambda _: None
+                )
+            elif flow_mode == FlowMode.MULTI_AGENT:
+                response = await MultiAgentExecutor(llm, tools).execute(
+                    WARMUP_USER_INPUT, on_delta=lambda _: None
+                )
+            else:
+                message = await llm.chat_with_stream(
+                    [ChatMessage(role="user", content=WARMUP_USER_INPUT)],
+                    lambda _: None,
+                )
+                response = message.content or ""
+            logger.debug(f"[Warmup] 流程回應: {response}")
+        finally:
+            await llm.aclose()
+
+    with FakeOpenAIServer(script) as server:
+        asyncio.run(run(server.base_url))
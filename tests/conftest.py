@@ -7,3 +7,63 @@ import pytest
 def mock_api_key() -> str:
     """Provide a mock API key for testing."""
     return "sk-test-mock-api-key-for-testing"
+
+
+# Smallest KModel config that still matches the channel counts KModel hardcodes
+# (512 hidden channels, 128 + 128 style dimensions)
+TINY_KOKORO_CONFIG = {
+    "n_token": 32,
+    "hidden_dim": 512,
+    "style_dim": 128,
+    "n_layer": 1,
+    "max_dur": 10,
+    "dropout": 0.0,
+    "text_encoder_kernel_size": 3,
+    "n_mels": 80,
+    "plbert": {
+        "hidden_size": 32,
+        "num_attention_heads": 2,
+        "intermediate_size": 64,
+        "max_position_embeddings": 64,
+        "num_hidden_layers": 1,
+        "dropout": 0.0,
+    },
+    "istftnet": {
+        "upsample_kernel_sizes": [20, 12],
+        "upsample_rates": [10, 6],
+        "gen_istft_hop_size": 5,
+        "gen_istft_n_fft": 20,
+        "resblock_dilation_sizes": [[1, 3, 5]],
+        "resblock_kernel_sizes": [3],
+        "upsample_initial_channel": 512,
+    },
+}
+
+
+@pytest.fixture(scope="session")
+def tiny_kokoro_model(tmp_path_factory):
+    """Provide a factory for small random-weight Kokoro KModels.
+
+    Weights are scaled down so the decoder's exp() before the iSTFT does not
+    overflow when the source noise is zeroed.
+    """
+    torch = pytest.importorskip("torch")
+    from kokoro.model import KModel
+
+    empty = tmp_path_factory.mktemp("kokoro") / "empty.pth"
+    torch.save({}, empty)
+
+    def build(vocab: dict[str, int], **kwargs):
+        torch.manual_seed(0)
+        model = KModel(
+            repo_id="test/kokoro",
+            config={**TINY_KOKORO_CONFIG, "vocab": vocab},
+            model=str(empty),
+            **kwargs,
+        ).eval()
+        with torch.no_grad():
+            for parameter in model.parameters():
+                parameter.mul_(0.2)
+        return model
+
+    return build
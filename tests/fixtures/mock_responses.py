@@ -55,3 +55,44 @@ MOCK_TOOL_CALL_RESPONSE = create_mock_chat_response(
         }
     ],
 )
+
+
+def create_mock_stream_chunk(
+    content: str | None = None,
+    tool_calls: list[dict[str, Any]] | None = None,
+) -> MagicMock:
+    """Create a mock OpenAI chat completion stream chunk."""
+    mock_delta = MagicMock()
+    mock_delta.content = content
+
+    if tool_calls:
+        mock_tool_calls = []
+        for tc in tool_calls:
+            mock_tc = MagicMock()
+            mock_tc.index = tc.get("index", 0)
+            mock_tc.id = tc.get("id")
+            mock_tc.type = tc.get("type")
+            mock_tc.function = MagicMock()
+            mock_tc.function.name = tc.get("name")
+            mock_tc.function.arguments = tc.get("arguments")
+            mock_tool_calls.append(mock_tc)
+        mock_delta.tool_calls = mock_tool_calls
+    else:
+        mock_delta.tool_calls = None
+
+    mock_choice = MagicMock()
+    mock_choice.delta = mock_delta
+
+    mock_chunk = MagicMock()
+    mock_chunk.choices = [mock_choice]
+    return mock_chunk
+
+
+def create_mock_stream(chunks: list[MagicMock]) -> Any:
+    """Create a mock OpenAI AsyncStream yielding the given chunks."""
+
+    async def _stream() -> Any:
+        for chunk in chunks:
+            yield chunk
+
+    return _stream()
@@ -33,7 +33,7 @@ class DummyTTS:
     def __init__(self):
         self.called_text = []
 
-    def stream_tts_sync(self, text):
+    def stream_tts_sync(self, text, cancel_token=None):
         self.called_text.append(text)
         # 回傳模擬音訊
         yield (24000, np.zeros(1000, dtype=np.float32))
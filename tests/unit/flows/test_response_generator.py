@@ -103,6 +103,39 @@ class TestResponseGeneratorNode:
 
         assert "response" in result
 
+    @pytest.mark.asyncio
+    async def test_generate_response_streams_with_callback(self) -> None:
+        """config 帶有 on_delta 時應改用串流輸出。"""
+        from voice_assistant.llm.schemas import ChatMessage
+        from voice_assistant.llm.streaming import DELTA_CALLBACK_KEY
+
+        received: list[str] = []
+
+        async def mock_chat_with_stream(
+            messages, on_delta, tools=None, system_prompt=None
+        ):
+            on_delta("台北")
+            on_delta("晴朗。")
+            return ChatMessage(role="assistant", content="台北晴朗。")
+
+        mock_llm = MagicMock()
+        mock_llm.chat = AsyncMock()
+        mock_llm.chat_with_stream = AsyncMock(side_effect=mock_chat_with_stream)
+
+        generate = create_response_generator_node(mock_llm)
+        state: FlowState = {
+            "user_input": "台北天氣如何",
+            "intent": "weather",
+            "tool_result": {"city": "台北", "temperature": 25.0, "weather": "晴朗"},
+        }
+        config = {"configurable": {DELTA_CALLBACK_KEY: received.append}}
+
+        result = await generate(state, config)
+
+        assert result["response"] == "台北晴朗。"
+        assert received == ["台北", "晴朗。"]
+        mock_llm.chat.assert_not_called()
+
 
 class TestFallbackResponse:
     """降級回應測試。"""
@@ -0,0 +1,84 @@
+"""AsyncLoopThread 單元測試
+
+測試長駐背景 event loop 的提交、重用與關閉行為。
+"""
+
+import asyncio
+
+import pytest
+
+from voice_assistant.voice.async_loop import AsyncLoopThread
+
+
+@pytest.fixture
+def loop():
+    runner = AsyncLoopThread(name="test-async-loop")
+    yield runner
+    runner.shutdown()
+
+
+class TestAsyncLoopThread:
+    """測試背景 event loop"""
+
+    def test_run_returns_result(self, loop):
+        """run 回傳 coroutine 結果"""
+
+        async def add(a, b):
+            await asyncio.sleep(0)
+            return a + b
+
+        assert loop.run(add(1, 2)) == 3
+
+    def test_same_loop_across_calls(self, loop):
+        """多次呼叫使用同一個 event loop（連線池得以重用）"""
+
+        async def current_loop():
+            return asyncio.get_running_loop()
+
+        assert loop.run(current_loop()) is loop.run(current_loop())
+
+    def test_run_propagates_exception(self, loop):
+        """coroutine 例外會傳回呼叫端"""
+
+        async def fail():
+            raise ValueError("boom")
+
+        with pytest.raises(ValueError, match="boom"):
+            loop.run(fail())
+
+    def test_nested_run_from_loop_thread_is_rejected(self, loop):
+        """在 loop 執行緒中同步等待會被拒絕而非死結"""
+
+        async def nested():
+            async def inner():
+                return 1
+
+            loop.run(inner())
+
+        with pytest.raises(RuntimeError):
+            loop.run(nested(), timeout=2)
+
+    def test_shutdown_runs_callbacks_and_cancels_pending(self):
+        """關閉時執行清理函式並取消未完成工作"""
+        runner = AsyncLoopThread()
+        closed = []
+
+        async def cleanup():
+            closed.append(True)
+
+        runner.add_shutdown_callback(cleanup)
+        pending = runner.submit(asyncio.sleep(60))
+
+        runner.shutdown(timeout=2)
+
+        assert closed == [True]
+        assert pending.cancelled()
+        assert runner.is_running is False
+
+    def test_submit_after_shutdown_raises(self):
+        """關閉後提交工作拋出 RuntimeError"""
+        runner = AsyncLoopThread()
+        runner.shutdown()
+
+        with pytest.raises(RuntimeError):
+            runner.submit(asyncio.sleep(0))
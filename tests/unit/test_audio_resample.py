@@ -0,0 +1,75 @@
+"""多相重採樣單元測試
+
+測試與 scipy.signal.resample_poly 的一致性、串流分塊與濾波器快取。
+"""
+
+import numpy as np
+import pytest
+from scipy import signal
+
+from voice_assistant.voice.audio import Resampler, get_filter, resample
+
+
+@pytest.fixture
+def noise() -> np.ndarray:
+    return np.random.default_rng(0).standard_normal(4801).astype(np.float32)
+
+
+class TestResample:
+    """測試整段重採樣"""
+
+    @pytest.mark.parametrize(
+        ("src_rate", "dst_rate"),
+        [(48000, 16000), (44100, 16000), (8000, 16000), (22050, 24000)],
+    )
+    def test_matches_resample_poly(self, noise, src_rate, dst_rate):
+        """結果與 resample_poly 一致，長度為 ceil(n * dst / src)"""
+        result = resample(noise, src_rate, dst_rate)
+
+        divisor = np.gcd(src_rate, dst_rate)
+        expected = signal.resample_poly(noise, dst_rate // divisor, src_rate // divisor)
+        assert result.dtype == np.float32
+        assert len(result) == -(-len(noise) * dst_rate // src_rate)
+        np.testing.assert_allclose(result, expected, atol=1e-5)
+
+    def test_same_rate_returns_input(self, noise):
+        """取樣率相同時不處理"""
+        np.testing.assert_array_equal(resample(noise, 16000, 16000), noise)
+
+    def test_filter_bank_is_cached(self):
+        """相同取樣率對共用同一組濾波器"""
+        assert get_filter(48000, 16000) is get_filter(48000, 16000)
+
+    def test_invalid_rate_raises(self):
+        """取樣率非正數時拋出 ValueError"""
+        with pytest.raises(ValueError):
+            get_filter(0, 16000)
+
+
+class TestResampler:
+    """測試串流重採樣"""
+
+    @pytest.mark.parametrize("chunk_size", [1, 160, 960, 3000])
+    def test_chunked_output_equals_batch(self, noise, chunk_size):
+        """逐塊處理的輸出與一次處理整段相同"""
+        resampler = Resampler(44100, 16000)
+
+        parts = [
+            resampler.process(noise[i : i + chunk_size])
+            for i in range(0, len(noise), chunk_size)
+        ]
+        parts.append(resampler.flush())
+
+        np.testing.assert_allclose(
+            np.concatenate(parts), resample(noise, 44100, 16000), atol=1e-6
+        )
+
+    def test_flush_resets_state(self, noise):
+        """flush 後可重新開始新的串流"""
+        resampler = Resampler(48000, 16000)
+        resampler.process(noise)
+        resampler.flush()
+
+        second = np.concatenate([resampler.process(noise), resampler.flush()])
+
+        np.testing.assert_allclose(second, resample(noise, 48000, 16000), atol=1e-6)
@@ -0,0 +1,41 @@
+"""依 VAD 語音區段裁切靜音單元測試"""
+
+import numpy as np
+
+from voice_assistant.voice.audio import speech_bounds, trim_to_speech
+
+
+class TestSpeechBounds:
+    """測試語音範圍計算"""
+
+    def test_covers_all_spans_with_padding(self):
+        """涵蓋第一個到最後一個語音區段，前後加上保留樣本"""
+        assert speech_bounds([(300, 500), (100, 200)], 1000, pad=50) == (50, 550)
+
+    def test_clipped_to_audio_length(self):
+        """範圍不超出音訊"""
+        assert speech_bounds([(20, 990)], 1000, pad=50) == (0, 1000)
+
+    def test_no_valid_span(self):
+        """沒有語音區段或區段落在音訊之外時為 None"""
+        assert speech_bounds([], 1000) is None
+        assert speech_bounds([(1200, 1500)], 1000) is None
+
+
+class TestTrimToSpeech:
+    """測試裁切"""
+
+    def test_trims_leading_and_trailing_silence(self):
+        """FastRTC 的 (1, N) 陣列裁切為一維 view"""
+        audio = np.arange(1000, dtype=np.int16).reshape(1, -1)
+
+        trimmed = trim_to_speech(audio, [(200, 400), (600, 700)], pad=10)
+
+        assert trimmed.ndim == 1
+        assert trimmed[0] == 190
+        assert trimmed[-1] == 709
+        assert np.shares_memory(trimmed, audio)
+
+    def test_without_spans_returns_none(self):
+        """沒有語音區段時由呼叫端決定後續處理"""
+        assert trim_to_speech(np.zeros(100), []) is None
@@ -0,0 +1,387 @@
+"""離線延遲基準測試單元測試
+
+測試 LLM 替身伺服器、錄製工具回放、基準測試執行與報告比較。
+"""
+
+import json
+import random
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from voice_assistant.bench import (
+    BenchCorpus,
+    FakeOpenAIServer,
+    LatencyDistribution,
+    LLMScript,
+    character_error_rate,
+    compare_reports,
+    create_recorded_registry,
+    log_spectral_distance,
+    response_texts,
+    run_benchmark,
+    run_concurrency_benchmark,
+    run_segmentation_benchmark,
+    run_stt_benchmark,
+    sweep_allocations,
+)
+from voice_assistant.bench.runner import save_wav
+from voice_assistant.config import FlowMode
+from voice_assistant.llm.client import LLMClient
+from voice_assistant.llm.schemas import ChatMessage
+from voice_assistant.voice.schemas import SegmentationConfig, TranscribedText
+
+CORPUS_PATH = Path(__file__).parents[1] / "fixtures" / "bench" / "corpus.json"
+
+
+@pytest.fixture
+def corpus() -> BenchCorpus:
+    """固定語料（移除延遲以加快測試）"""
+    corpus = BenchCorpus.load(CORPUS_PATH)
+    corpus.llm.first_token = LatencyDistribution()
+    corpus.llm.token_interval = LatencyDistribution()
+    for tool in corpus.tools:
+        tool.latency = LatencyDistribution()
+    return corpus
+
+
+class TestLatencyDistribution:
+    """測試延遲分布"""
+
+    def test_same_seed_gives_same_samples(self):
+        """相同種子取樣結果相同"""
+        latency = LatencyDistribution(median_ms=100, sigma=0.5)
+
+        first = [latency.sample(random.Random("a")) for _ in range(3)]
+        second = [latency.sample(random.Random("a")) for _ in range(3)]
+
+        assert first == second
+        assert all(v > 0 for v in first)
+
+    def test_zero_sigma_is_fixed(self):
+        """sigma 為 0 時為固定延遲"""
+        latency = LatencyDistribution(median_ms=80)
+        assert latency.sample(random.Random(1)) == 80
+
+
+class TestFakeOpenAIServer:
+    """測試 LLM 替身伺服器（經由真實 LLMClient 與 HTTP）"""
+
+    @pytest.fixture
+    def server(self, corpus):
+        with FakeOpenAIServer(corpus.llm, seed=corpus.seed) as server:
+            yield server
+
+    @pytest.fixture
+    def llm(self, server):
+        return LLMClient(api_key="bench", model="bench", base_url=server.base_url)
+
+    async def test_tool_call_response(self, llm):
+        """帶 tools 的請求依規則回覆工具呼叫"""
+        tools = [{"type": "function", "function": {"name": "get_weather"}}]
+
+        response = await llm.chat(
+            [ChatMessage(role="user", content="台北天氣如何")], tools=tools
+        )
+        await llm.aclose()
+
+        (call,) = response.tool_calls
+        assert call.function["name"] == "get_weather"
+        assert json.loads(call.function["arguments"]) == {"city": "台北"}
+
+    async def test_streamed_text_response(self, llm, server):
+        """串流請求逐段回傳文字"""
+        deltas = []
+
+        message = await llm.chat_with_stream(
+            [ChatMessage(role="user", content="你好")], deltas.append
+        )
+        await llm.aclose()
+
+        assert len(deltas) > 1
+        assert message.content == "".join(deltas)
+        assert message.content.startswith("你好！")
+        assert server.request_count == 1
+
+    def test_default_content_when_no_rule_matches(self):
+        """沒有符合的規則時回覆預設文字"""
+        script = LLMScript(default_content="預設")
+        assert script.respond([{"role": "user", "content": "x"}], False).content == (
+            "預設"
+        )
+
+
+class TestRecordedTools:
+    """測試錄製工具"""
+
+    async def test_replays_matching_recording(self, corpus):
+        """依參數回放錄製結果，工具定義與真實工具相同"""
+        registry = create_recorded_registry(corpus.tools)
+
+        result = await registry.execute(
+            "get_exchange_rate",
+            {"from_currency": "USD", "to_currency": "TWD", "amount": 100},
+        )
+
+        assert result.success
+        assert result.data["to_amount"] == 3215.0
+        assert (
+            "from_currency"
+            in registry.get("get_exchange_rate").parameters["properties"]
+        )
+
+    async def test_unrecorded_arguments_fail(self, corpus):
+        """沒有符合的錄製結果時回傳失敗"""
+        registry = create_recorded_registry(corpus.tools)
+
+        result = await registry.execute("get_weather", {"city": "高雄"})
+
+        assert not result.success
+        assert "no_recording" in result.error
+
+
+class FakeSTT:
+    """依音訊長度回傳語句文字的假辨識器"""
+
+    language = "zh"
+
+    def __init__(self, texts_by_length: dict[int, str]):
+        self.texts_by_length = texts_by_length
+
+    def stt(self, audio):
+        return self.texts_by_length[np.asarray(audio[1]).size]
+
+
+class FakeTTS:
+    """每句輸出固定長度音訊的假合成器"""
+
+    def stream_tts_sync(self, text, cancel_token=None):
+        yield 24000, np.zeros(2400, dtype=np.float32)
+
+
+class TestRunBenchmark:
+    """測試基準測試執行"""
+
+    @pytest.fixture
+    def stt(self, corpus, tmp_path):
+        texts = {}
+        for i, utterance in enumerate(corpus.utterances):
+            length = 16000 + i * 100
+            save_wav(
+                corpus.audio_path(utterance, tmp_path),
+                (16000, np.zeros(length, dtype=np.int16)),
+            )
+            texts[length] = utterance.text
+        return FakeSTT(texts)
+
+    @pytest.mark.parametrize("flow_mode", list(FlowMode))
+    def test_report_contains_stage_latencies(self, corpus, stt, tmp_path, flow_mode):
+        """每個流程模式都產出摘要、各階段百分位數與每句結果"""
+        report = run_benchmark(
+            corpus,
+            stt=stt,
+            tts=FakeTTS(),
+            flow_mode=flow_mode,
+            repeat=2,
+            root=tmp_path,
+        )
+
+        assert report["turns"] == 2 * len(corpus.utterances)
+        assert report["transcript_mismatches"] == 0
+        summary = report["summary"]
+        assert summary["end_to_end_ms"]["count"] == report["turns"]
+        assert summary["time_to_first_audio_ms"]["p50"] > 0
+        assert summary["tts_rtf"]["count"] == report["turns"]
+        assert "flow" in report["stages"]
+        assert report["llm_requests"] > 0
+        json.dumps(report)
+
+
+class FakeSession:
+    """停頓後回傳最後一次送入音訊所對應文字的假串流辨識器"""
+
+    def __init__(self, stt: FakeSTT):
+        self.stt = stt
+        self.pushes = 0
+
+    def reset(self):
+        pass
+
+    def push_frames(self, audio):
+        self.pushes += 1
+
+    def finalize(self, audio=None):
+        return TranscribedText(text=self.stt.stt(audio), language="zh")
+
+    def close(self):
+        pass
+
+
+class TestSTTBenchmark:
+    """測試 STT 引擎比較"""
+
+    def test_character_error_rate(self):
+        assert character_error_rate("台北天氣如何？", "台北天氣如何") == 0.0
+        assert character_error_rate("台北天氣", "台中天氣") == 0.25
+        assert character_error_rate("", "") == 0.0
+        assert character_error_rate("", "雜訊") == 1.0
+
+    def test_ranks_engines_by_latency(self, corpus, tmp_path):
+        texts = {}
+        for i, utterance in enumerate(corpus.utterances):
+            length = 16000 + i * 100
+            save_wav(
+                corpus.audio_path(utterance, tmp_path),
+                (16000, np.zeros(length, dtype=np.int16)),
+            )
+            texts[length] = utterance.text
+        accurate = FakeSTT(texts)
+        sloppy = FakeSTT(dict.fromkeys(texts, "完全不同"))
+        sessions = []
+
+        def make_session():
+            sessions.append(FakeSession(accurate))
+            return sessions[-1]
+
+        report = run_stt_benchmark(
+            corpus,
+            {"accurate": accurate, "sloppy": sloppy},
+            sessions={"accurate": make_session},
+            repeat=2,
+            root=tmp_path,
+            chunk_ms=250,
+            realtime=False,
+        )
+
+        assert sorted(report["ranking"]) == ["accurate", "sloppy"]
+        engines = report["engines"]
+        assert engines["accurate"]["mean_cer"] == 0.0
+        assert engines["sloppy"]["mean_cer"] > 0.5
+        assert engines["accurate"]["latency_ms"]["count"] == 2 * len(texts)
+        assert engines["accurate"]["mean_streaming_cer"] == 0.0
+        assert "finalize_ms" not in engines["sloppy"]
+        # 每句音訊以 250ms（4000 樣本）區塊累積送入
+        assert sessions[0].pushes == 2 * sum(-(-length // 4000) for length in texts)
+        json.dumps(report)
+
+
+class TestConcurrencyBenchmark:
+    """測試執行緒分配比較"""
+
+    def test_sweep_allocations_are_unique(self):
+        budgets = sweep_allocations(2, stt_workers=(1, 2), stt_shares=(0.25, 0.5))
+
+        # 只有 1 個可用核心時所有分配都相同（各元件至少 1 個執行緒）
+        assert len(budgets) == 2
+        assert {b.stt_workers for b in budgets} == {1, 2}
+        assert len(sweep_allocations(16)) == 6
+
+    def test_runs_sessions_concurrently(self, corpus, tmp_path):
+        texts = {}
+        for i, utterance in enumerate(corpus.utterances):
+            length = 16000 + i * 100
+            save_wav(
+                corpus.audio_path(utterance, tmp_path),
+                (16000, np.zeros(length, dtype=np.int16)),
+            )
+            texts[length] = utterance.text
+
+        result = run_concurrency_benchmark(
+            corpus, FakeSTT(texts), FakeTTS(), sessions=3, turns=2, root=tmp_path
+        )
+
+        assert result["sessions"] == 3
+        assert result["turns"] == 6
+        assert result["throughput_tps"] > 0
+        assert result["first_audio_ms"]["count"] == 6
+        assert result["turn_ms"]["p50"] >= result["stt_ms"]["p50"]
+        json.dumps(result)
+
+
+class TestSegmentationBenchmark:
+    """測試斷句策略比較"""
+
+    def test_response_texts_skip_json(self, corpus):
+        texts = response_texts(corpus)
+
+        assert texts
+        assert not any(text.startswith("{") for text in texts)
+
+    def test_latency_strategy_reaches_first_audio_sooner(self):
+        texts = ["今天台北多雲時晴，氣溫大約二十三度，早晚稍涼。出門記得帶件外套。"]
+        report = run_segmentation_benchmark(
+            texts,
+            FakeTTS(),
+            {
+                "sentence": SegmentationConfig(strategy="sentence"),
+                "latency": SegmentationConfig(strategy="latency"),
+            },
+            chunk_chars=2,
+            token_interval_ms=30.0,
+        )
+
+        sentence = report["strategies"]["sentence"]
+        latency = report["strategies"]["latency"]
+        assert sentence["first_segment_chars"]["p50"] == 23
+        assert latency["first_segment_chars"]["p50"] == 9
+        # 第 5 個片段（120ms 時）即可送出第一段，句尾斷句要等到第 12 個片段
+        assert latency["text_ready_ms"]["p50"] == 120.0
+        assert sentence["text_ready_ms"]["p50"] == 330.0
+        assert latency["first_audio_ms"]["p50"] < sentence["first_audio_ms"]["p50"]
+        assert latency["segments"]["p50"] > sentence["segments"]["p50"]
+        json.dumps(report)
+
+
+class TestLogSpectralDistance:
+    """測試對數頻譜距離"""
+
+    def test_identical_audio_is_zero(self):
+        rng = np.random.default_rng(0)
+        audio = rng.standard_normal(4800).astype(np.float32)
+
+        assert log_spectral_distance(audio, audio) == pytest.approx(0.0)
+
+    def test_distance_grows_with_difference(self):
+        rng = np.random.default_rng(0)
+        audio = rng.standard_normal(4800).astype(np.float32)
+        noise = rng.standard_normal(4800).astype(np.float32)
+
+        near = log_spectral_distance(audio, audio + 0.01 * noise)
+        far = log_spectral_distance(audio, audio + 0.5 * noise)
+
+        assert 0 < near < far
+
+    def test_compares_common_length(self):
+        audio = np.sin(np.arange(4800) * 0.1).astype(np.float32)
+
+        assert log_spectral_distance(audio, audio[:3000]) == pytest.approx(0.0)
+        assert log_spectral_distance(audio, audio[:0]) == float("inf")
+
+
+class TestCompareReports:
+    """測試報告比較"""
+
+    def _report(self, e2e_p95, rtf_p95=0.2):
+        return {
+            "summary": {
+                "end_to_end_ms": {"count": 4, "p50": 900.0, "p95": e2e_p95},
+                "stt_rtf": {"count": 4, "p50": 0.1, "p95": rtf_p95},
+            },
+            "stages": {"flow": {"count": 4, "p50": 500.0, "p95": 600.0}},
+        }
+
+    def test_flags_regression_beyond_tolerance(self):
+        """超過容許幅度的指標列為退步"""
+        rows = compare_reports(self._report(1000.0), self._report(1200.0))
+
+        regressions = [row["metric"] for row in rows if row["regression"]]
+        assert regressions == ["summary.end_to_end_ms.p95"]
+
+    def test_small_absolute_change_is_not_regression(self):
+        """絕對差距過小的變化不算退步"""
+        rows = compare_reports(
+            self._report(1000.0, rtf_p95=0.02), self._report(1000.0, rtf_p95=0.025)
+        )
+
+        assert not any(row["regression"] for row in rows)
@@ -0,0 +1,171 @@
+"""Per-turn cancellation 單元測試
+
+測試 CancelToken、cancellable() 與背景 loop 上進行中工作的取消。
+"""
+
+import asyncio
+import threading
+
+import pytest
+
+from voice_assistant.cancellation import (
+    CancelToken,
+    TurnCancelledError,
+    cancellable,
+    current_cancel_token,
+)
+from voice_assistant.voice.async_loop import AsyncLoopThread
+
+
+@pytest.fixture
+def loop():
+    runner = AsyncLoopThread(name="test-cancel-loop")
+    yield runner
+    runner.shutdown()
+
+
+class TestCancelToken:
+    """測試取消權杖"""
+
+    def test_cancel_runs_callbacks_once(self):
+        """取消時執行回呼，重複取消不再執行"""
+        token = CancelToken()
+        calls = []
+        token.add_callback(lambda: calls.append(1))
+
+        assert token.cancel() is True
+        assert token.cancel() is False
+        assert token.cancelled
+        assert calls == [1]
+
+    def test_callback_added_after_cancel_runs_immediately(self):
+        """已取消時註冊的回呼立即執行"""
+        token = CancelToken()
+        token.cancel()
+        calls = []
+
+        token.add_callback(lambda: calls.append(1))
+
+        assert calls == [1]
+
+    def test_removed_callback_is_not_called(self):
+        """移除的回呼不會被執行"""
+        token = CancelToken()
+        calls = []
+        remove = token.add_callback(lambda: calls.append(1))
+
+        remove()
+        token.cancel()
+
+        assert calls == []
+
+    def test_failing_callback_does_not_block_others(self):
+        """單一回呼失敗不影響其他回呼"""
+        token = CancelToken()
+        calls = []
+
+        def fail():
+            raise RuntimeError("boom")
+
+        token.add_callback(fail)
+        token.add_callback(lambda: calls.append(1))
+        token.cancel()
+
+        assert calls == [1]
+
+    def test_child_follows_parent(self):
+        """父權杖取消時子權杖一併取消，子權杖可單獨取消"""
+        parent = CancelToken()
+        first, second = parent.child(), parent.child()
+
+        first.cancel()
+        assert first.cancelled and not parent.cancelled
+
+        parent.cancel()
+        assert second.cancelled
+
+    def test_raise_if_cancelled(self):
+        """已取消時拋出 TurnCancelledError"""
+        token = CancelToken()
+        token.raise_if_cancelled()
+
+        token.cancel()
+
+        with pytest.raises(TurnCancelledError):
+            token.raise_if_cancelled()
+
+
+class TestCancellable:
+    """測試 cancellable 包裝"""
+
+    @pytest.mark.asyncio
+    async def test_returns_result_and_sets_context(self):
+        """未取消時回傳結果，執行期間可取得目前權杖"""
+        token = CancelToken()
+
+        async def work():
+            return current_cancel_token()
+
+        assert await cancellable(token, work()) is token
+        assert current_cancel_token() is None
+
+    @pytest.mark.asyncio
+    async def test_none_token_runs_directly(self):
+        """未提供權杖時直接執行"""
+
+        async def work():
+            return 42
+
+        assert await cancellable(None, work()) == 42
+
+    @pytest.mark.asyncio
+    async def test_already_cancelled_does_not_start(self):
+        """權杖已取消時不執行 coroutine"""
+        token = CancelToken()
+        token.cancel()
+        started = False
+
+        async def work():
+            nonlocal started
+            started = True
+
+        with pytest.raises(TurnCancelledError):
+            await cancellable(token, work())
+        assert started is False
+
+    def test_cancel_from_other_thread_stops_running_work(self, loop):
+        """從其他執行緒取消時，背景 loop 上等待中的工作立即中止"""
+        token = CancelToken()
+        started = threading.Event()
+        finished = False
+
+        async def slow():
+            nonlocal finished
+            started.set()
+            await asyncio.sleep(10)
+            finished = True
+
+        future = loop.submit(cancellable(token, slow()))
+        assert started.wait(timeout=2)
+        token.cancel()
+
+        with pytest.raises(TurnCancelledError):
+            future.result(timeout=2)
+        assert finished is False
+
+    def test_external_task_cancel_is_not_converted(self, loop):
+        """非權杖造成的取消維持 CancelledError"""
+        token = CancelToken()
+        started = threading.Event()
+
+        async def slow():
+            started.set()
+            await asyncio.sleep(10)
+
+        future = loop.submit(cancellable(token, slow()))
+        assert started.wait(timeout=2)
+        future.cancel()
+
+        with pytest.raises(BaseException) as exc_info:
+            future.result(timeout=2)
+        assert not isinstance(exc_info.value, TurnCancelledError)
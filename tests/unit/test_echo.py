@@ -0,0 +1,113 @@
+"""回音偵測單元測試
+
+測試 n-gram 索引的包含比例、播放期間的時間判斷與回音判定。
+"""
+
+import pytest
+
+from voice_assistant.voice.echo import EchoDetector, NGramIndex, char_ngrams
+from voice_assistant.voice.schemas import EchoConfig
+
+
+@pytest.fixture
+def detector() -> EchoDetector:
+    return EchoDetector(EchoConfig(enabled=True, tail_ms=500))
+
+
+def test_char_ngrams_ignore_punctuation_and_case():
+    assert char_ngrams("Hi, 台北！", 2) == {"hi", "i台", "台北"}
+    assert char_ngrams("好", 2) == {"好"}
+    assert char_ngrams("，。", 2) == set()
+
+
+def test_index_containment_uses_best_sentence():
+    index = NGramIndex(n=2)
+    index.add("台北今天多雲，氣溫二十三度。")
+    index.add("明天會下雨。")
+
+    assert index.containment("台北今天多雲") == 1.0
+    assert index.containment("我想聽音樂") == 0.0
+    assert 0.0 < index.containment("台北明天會下雨嗎") < 1.0
+
+
+def test_index_drops_oldest_sentences():
+    index = NGramIndex(n=2, max_docs=1)
+    index.add("台北今天多雲")
+    index.add("明天會下雨")
+
+    assert index.containment("台北今天多雲") == 0.0
+    assert index.containment("明天會下雨") == 1.0
+
+
+def test_playback_window_extends_with_each_chunk(detector):
+    detector.on_playback(1.0, now=10.0)
+    detector.on_playback(1.0, now=10.1)
+
+    # 預估播放至 12.0，加上 0.5 秒尾端
+    assert detector.overlaps_playback(1.0, now=13.4)
+    assert not detector.overlaps_playback(1.0, now=13.6)
+
+
+def test_echo_requires_overlap_and_similar_text(detector):
+    detector.add_spoken("台北今天多雲，氣溫二十三度。")
+    detector.on_playback(2.0, now=10.0)
+
+    assert detector.is_echo("台北今天多雲", 1.5, now=11.5)
+    assert not detector.is_echo("幫我關燈", 1.5, now=11.5)
+    assert not detector.is_echo("台北今天多雲", 1.5, now=20.0)
+
+    stats = detector.stats()
+    assert (stats.checked, stats.in_playback, stats.echoes) == (3, 2, 1)
+
+
+def test_reference_text_is_matched(detector):
+    detector.on_playback(1.0, now=10.0)
+
+    assert detector.is_echo("好的沒問題", 1.0, reference="好的，沒問題！", now=10.5)
+
+
+def test_no_playback_is_never_echo(detector):
+    detector.add_spoken("台北今天多雲")
+
+    assert not detector.is_echo("台北今天多雲", 1.0)
+
+
+def test_index_best_match_counts_ngrams_and_exact_sentence():
+    index = NGramIndex(n=2)
+    index.add("好的。")
+    index.add("台北今天多雲，氣溫二十三度。")
+
+    assert index.best_match("台北今天多雲") == (5, False)
+    assert index.best_match("好的！") == (1, True)
+    assert index.best_match("我想聽音樂") == (0, False)
+
+
+def test_interrupt_ends_playback_window(detector):
+    detector.on_playback(6.0, now=100.0)
+    detector.stop_playback(now=101.0)
+
+    # 插話結束播放，之後開始的語句只剩 0.5 秒尾端
+    assert detector.overlaps_playback(1.0, now=102.4)
+    assert not detector.overlaps_playback(1.0, now=102.6)
+
+
+def test_short_barge_in_repeating_spoken_words_is_not_echo(detector):
+    """短句只重複助理的部分用詞時不視為回音（需足夠 n-gram 或整句相同）"""
+    detector.add_spoken("台北今天多雲，氣溫二十三度，台北天氣適合出門。")
+    detector.add_spoken("好的。")
+    detector.on_playback(6.0, now=100.0)
+
+    assert not detector.is_echo("台北天氣呢", 1.0, now=102.5)
+    assert detector.is_echo("好的", 0.5, now=102.5)
+    assert detector.is_echo("氣溫二十三度", 1.0, now=102.5)
+
+
+def test_reference_text_is_not_indexed():
+    detector = EchoDetector(EchoConfig(enabled=True, max_sentences=1))
+    detector.add_spoken("台北今天多雲")
+    detector.on_playback(5.0, now=10.0)
+
+    for _ in range(3):
+        assert not detector.is_echo("幫我關燈", 1.0, reference="好的。", now=11.0)
+
+    assert detector.is_echo("台北今天多雲", 1.0, now=11.0)
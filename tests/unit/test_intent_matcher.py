@@ -0,0 +1,119 @@
+"""SwitchRoleMatcher 單元測試
+
+測試角色切換本地規則比對與 LLM 降級判斷。
+"""
+
+from unittest.mock import AsyncMock, MagicMock
+
+import pytest
+
+from voice_assistant.intent.matcher import SwitchRoleMatcher
+from voice_assistant.intent.recognizer import IntentRecognizer
+from voice_assistant.llm.schemas import ChatMessage
+from voice_assistant.roles.predefined.assistant import AssistantRole
+from voice_assistant.roles.predefined.coach import CoachRole
+from voice_assistant.roles.predefined.interviewer import InterviewerRole
+from voice_assistant.roles.registry import RoleRegistry
+
+
+@pytest.fixture
+def registry():
+    reg = RoleRegistry()
+    reg.register(AssistantRole())
+    reg.register(CoachRole())
+    reg.register(InterviewerRole())
+    return reg
+
+
+@pytest.fixture
+def matcher(registry):
+    return SwitchRoleMatcher(registry)
+
+
+class TestSwitchRoleMatcher:
+    """測試本地規則比對"""
+
+    @pytest.mark.parametrize(
+        ("text", "role_id"),
+        [
+            ("切換到面試官", "interviewer"),
+            ("請幫我換成教練模式", "coach"),
+            ("換回助理", "assistant"),
+            ("切换到面试官", "interviewer"),
+            ("改成「教練」角色", "coach"),
+            ("switch 切換 coach", "coach"),
+        ],
+    )
+    def test_obvious_switch(self, matcher, text, role_id):
+        """切換動詞緊接角色名稱時直接判定切換"""
+        intent = matcher.match(text)
+        assert intent is not None
+        assert intent.name == "switch_role"
+        assert intent.params == {"role_id": role_id}
+
+    @pytest.mark.parametrize("text", ["台北天氣如何", "你好", "100 美金換台幣"])
+    def test_obvious_non_switch(self, matcher, text):
+        """未提及任何角色時直接判定非切換"""
+        intent = matcher.match(text)
+        assert intent is not None
+        assert intent.name == "unknown"
+
+    @pytest.mark.parametrize(
+        "text",
+        [
+            "我明天有面試，要準備什麼",
+            "不要切換到面試官",
+            "教練和面試官哪個比較適合我",
+            "我想跟教練聊聊",
+        ],
+    )
+    def test_ambiguous_falls_back(self, matcher, text):
+        """提及角色但語意不明確時交由 LLM"""
+        assert matcher.match(text) is None
+
+    def test_stats(self, matcher):
+        """統計本地判定與 LLM 降級次數"""
+        matcher.match("切換到面試官")
+        matcher.match("台北天氣如何")
+        matcher.match("我想跟教練聊聊")
+
+        stats = matcher.stats
+        assert stats.local_switch == 1
+        assert stats.local_non_switch == 1
+        assert stats.llm_fallback == 1
+        assert stats.llm_calls_saved == 2
+        assert stats.saved_ratio == pytest.approx(2 / 3)
+
+        matcher.reset_stats()
+        assert matcher.stats.total == 0
+
+
+class TestIntentRecognizerWithMatcher:
+    """測試意圖辨識器整合本地比對"""
+
+    @pytest.mark.asyncio
+    async def test_local_match_skips_llm(self, matcher):
+        """本地可判定時不呼叫 LLM"""
+        llm = MagicMock()
+        llm.chat = AsyncMock()
+        recognizer = IntentRecognizer(llm, matcher=matcher)
+
+        intent = await recognizer.recognize_intent_with_llm("切換到教練")
+
+        assert intent.name == "switch_role"
+        assert intent.params["role_id"] == "coach"
+        llm.chat.assert_not_called()
+        assert recognizer.stats.llm_calls_saved == 1
+
+    @pytest.mark.asyncio
+    async def test_ambiguous_calls_llm(self, matcher):
+        """模糊輸入降級呼叫 LLM"""
+        llm = MagicMock()
+        llm.chat = AsyncMock(return_value=ChatMessage(role="assistant", content=""))
+        recognizer = IntentRecognizer(llm, matcher=matcher)
+
+        intent = await recognizer.recognize_intent_with_llm("我想跟教練聊聊")
+
+        assert intent.name == "unknown"
+        llm.chat.assert_awaited_once()
+        assert recognizer.stats.llm_fallback == 1
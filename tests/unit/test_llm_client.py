@@ -9,9 +9,15 @@ import pytest
 from tests.fixtures.mock_responses import (
     MOCK_SIMPLE_RESPONSE,
     MOCK_TOOL_CALL_RESPONSE,
+    create_mock_stream,
+    create_mock_stream_chunk,
 )
 from voice_assistant.llm.client import LLMClient
-from voice_assistant.llm.errors import LLMAuthenticationError, LLMConnectionError
+from voice_assistant.llm.errors import (
+    LLMAuthenticationError,
+    LLMConnectionError,
+    LLMError,
+)
 from voice_assistant.llm.schemas import ChatMessage
 
 
@@ -139,3 +145,121 @@ class TestLLMClient:
 
             with pytest.raises(LLMConnectionError):
                 await client.chat(messages)
+
+
+class TestLLMClientStreaming:
+    """Tests for LLMClient streaming API."""
+
+    @pytest.mark.asyncio
+    async def test_stream_chat_yields_content_deltas(self, mock_api_key: str) -> None:
+        """Test streaming yields text deltas and a final assembled message."""
+        client = LLMClient(api_key=mock_api_key)
+        chunks = [
+            create_mock_stream_chunk(content="台北"),
+            create_mock_stream_chunk(content="今天晴天。"),
+        ]
+
+        with patch.object(
+            client.client.chat.completions,
+            "create",
+            new_callable=AsyncMock,
+            return_value=create_mock_stream(chunks),
+        ) as mock_create:
+            messages = [ChatMessage(role="user", content="台北天氣如何")]
+            deltas = [delta async for delta in client.stream_chat(messages)]
+
+            assert mock_create.call_args.kwargs["stream"] is True
+            assert [d.content for d in deltas[:-1]] == ["台北", "今天晴天。"]
+            final = deltas[-1].message
+            assert final is not None
+            assert final.content == "台北今天晴天。"
+            assert final.tool_calls is None
+
+    @pytest.mark.asyncio
+    async def test_stream_chat_assembles_tool_calls(self, mock_api_key: str) -> None:
+        """Test tool call deltas are assembled by index."""
+        client = LLMClient(api_key=mock_api_key)
+        chunks = [
+            create_mock_stream_chunk(
+                tool_calls=[
+                    {
+                        "index": 0,
+                        "id": "call_abc123",
+                        "type": "function",
+                        "name": "get_weather",
+                        "arguments": '{"ci',
+                    }
+                ]
+            ),
+            create_mock_stream_chunk(
+                tool_calls=[{"index": 0, "arguments": 'ty": "台北"}'}]
+            ),
+        ]
+
+        with patch.object(
+            client.client.chat.completions,
+            "create",
+            new_callable=AsyncMock,
+            return_value=create_mock_stream(chunks),
+        ):
+            messages = [ChatMessage(role="user", content="台北天氣如何")]
+            deltas = [delta async for delta in client.stream_chat(messages)]
+
+            final = deltas[-1].message
+            assert final is not None
+            assert final.content is None
+            assert final.tool_calls is not None
+            assert final.tool_calls[0].id == "call_abc123"
+            assert final.tool_calls[0].function == {
+                "name": "get_weather",
+                "arguments": '{"city": "台北"}',
+            }
+
+    @pytest.mark.asyncio
+    async def test_chat_with_stream_forwards_deltas(self, mock_api_key: str) -> None:
+        """Test chat_with_stream forwards deltas and returns full message."""
+        client = LLMClient(api_key=mock_api_key)
+        chunks = [
+            create_mock_stream_chunk(content="你好"),
+            create_mock_stream_chunk(content="！"),
+        ]
+        received: list[str] = []
+
+        with patch.object(
+            client.client.chat.completions,
+            "create",
+            new_callable=AsyncMock,
+            return_value=create_mock_stream(chunks),
+        ):
+            messages = [ChatMessage(role="user", content="你好")]
+            response = await client.chat_with_stream(messages, received.append)
+
+            assert received == ["你好", "！"]
+            assert response.content == "你好！"
+
+    @pytest.mark.asyncio
+    async def test_stream_chat_error(self, mock_api_key: str) -> None:
+        """Test errors during streaming are converted to LLMError."""
+        client = LLMClient(api_key=mock_api_key)
+
+        with patch.object(
+            client.client.chat.completions,
+            "create",
+            new_callable=AsyncMock,
+            side_effect=RuntimeError("boom"),
+        ):
+            messages = [ChatMessage(role="user", content="test")]
+
+            with pytest.raises(LLMError):
+                async for _delta in client.stream_chat(messages):
+                    pass
+
+    @pytest.mark.asyncio
+    async def test_aclose_closes_http_client(self, mock_api_key: str) -> None:
+        """Test aclose releases the underlying HTTP connection pool."""
+        client = LLMClient(api_key=mock_api_key)
+
+        with patch.object(client.client, "close", new_callable=AsyncMock) as mock_close:
+            await client.aclose()
+
+        mock_close.assert_awaited_once()
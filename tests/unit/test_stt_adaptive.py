@@ -0,0 +1,124 @@
+"""自適應 STT 單元測試
+
+測試依語句長度、佇列深度與延遲預算選擇 profile，以及選擇紀錄。
+"""
+
+import numpy as np
+import pytest
+
+from voice_assistant.voice.schemas import STTConfig, STTProfile
+from voice_assistant.voice.stt.adaptive import (
+    AdaptiveSTTPolicy,
+    AdaptiveWhisperSTT,
+    default_profiles,
+)
+from voice_assistant.voice.stt.pool import STTWorkerPool
+
+
+@pytest.fixture
+def profiles() -> list[STTProfile]:
+    return default_profiles(STTConfig(model_size="small", fast_model_size="base"))
+
+
+class TestAdaptiveSTTPolicy:
+    """測試 profile 選擇"""
+
+    def test_short_utterance_uses_fast_profile(self, profiles):
+        """短指令不使用大模型"""
+        policy = AdaptiveSTTPolicy(profiles, latency_budget_ms=1500)
+
+        profile, _ = policy.select(1.0, load=0)
+
+        assert profile.name == "fast"
+
+    def test_long_utterance_uses_accurate_profile_when_idle(self, profiles):
+        """長問句在預算內時使用 beam search 與溫度回退"""
+        policy = AdaptiveSTTPolicy(profiles, latency_budget_ms=1500)
+
+        profile, estimated_ms = policy.select(4.0, load=0)
+
+        assert profile.name == "accurate"
+        assert estimated_ms == pytest.approx(4.0 * 0.3 * 1000)
+
+    def test_queue_depth_degrades_profile(self, profiles):
+        """排隊請求增加時改用較快的設定以守住預算"""
+        policy = AdaptiveSTTPolicy(profiles, latency_budget_ms=1500)
+
+        assert policy.select(4.0, load=1)[0].name == "balanced"
+        assert policy.select(4.0, load=5)[0].name == "fast"
+
+    def test_falls_back_to_fastest_over_budget(self, profiles):
+        """所有 profile 都超過預算時使用最快的"""
+        policy = AdaptiveSTTPolicy(profiles, latency_budget_ms=10)
+
+        assert policy.select(10.0, load=3)[0].name == "fast"
+
+    def test_observed_decode_time_updates_rtf(self, profiles):
+        """實測解碼時間比預估慢時，之後的選擇隨之調整"""
+        policy = AdaptiveSTTPolicy(profiles, latency_budget_ms=1500)
+        accurate = profiles[-1]
+
+        for _ in range(20):
+            policy.observe(accurate, audio_s=4.0, decode_ms=4000)
+
+        assert policy.rtf()["accurate"] == pytest.approx(1.0, abs=0.02)
+        assert policy.select(4.0, load=0)[0].name == "balanced"
+
+    def test_requires_profiles(self):
+        """沒有 profile 時拒絕建立"""
+        with pytest.raises(ValueError):
+            AdaptiveSTTPolicy([], latency_budget_ms=1000)
+
+
+class TestAdaptiveWhisperSTT:
+    """測試自適應辨識器"""
+
+    @pytest.fixture
+    def whisper_model(self, mocker):
+        model_cls = mocker.patch("voice_assistant.voice.stt.whisper.WhisperModel")
+        model_cls.return_value.transcribe.return_value = (
+            [mocker.MagicMock(text="台北天氣")],
+            None,
+        )
+        return model_cls
+
+    def test_models_are_loaded_once_per_size(self, whisper_model, profiles):
+        """相同大小的模型只載入一次"""
+        AdaptiveWhisperSTT(profiles)
+
+        sizes = [call.args[0] for call in whisper_model.call_args_list]
+        assert sizes == ["base", "small"]
+
+    def test_decodes_with_selected_profile_and_records_it(
+        self, whisper_model, profiles
+    ):
+        """以選擇的 profile 解碼，並記錄每次使用的 profile"""
+        stt = AdaptiveWhisperSTT(profiles)
+        model = whisper_model.return_value
+
+        assert stt.stt((16000, np.zeros(16000, dtype=np.int16))) == "台北天氣"
+        fast_kwargs = model.transcribe.call_args.kwargs
+        stt.transcribe_samples(np.zeros(4 * 16000, dtype=np.float32))
+        accurate_kwargs = model.transcribe.call_args.kwargs
+
+        assert fast_kwargs["beam_size"] == 1
+        assert fast_kwargs["without_timestamps"] is True
+        assert accurate_kwargs["beam_size"] == 5
+        assert accurate_kwargs["temperature"] == [0.0, 0.2, 0.4, 0.6, 0.8, 1.0]
+        assert "without_timestamps" not in accurate_kwargs
+
+        stats = stt.stats()
+        assert stats.requests == {"fast": 1, "accurate": 1}
+        assert [d.profile for d in stats.recent] == ["fast", "accurate"]
+        assert stats.recent[1].audio_s == 4.0
+
+    def test_pool_queue_depth_drives_selection(self, whisper_model, profiles):
+        """交給 worker pool 時依 pool 的佇列深度選擇"""
+        stt = AdaptiveWhisperSTT(profiles)
+        pool = STTWorkerPool(stt, num_workers=2)
+        try:
+            pool._pending.extend([object()] * 4)
+            assert stt.load() == 2.0
+            pool._pending.clear()
+        finally:
+            pool.close()
@@ -0,0 +1,112 @@
+"""STT 語音閘門單元測試
+
+測試解碼前的音量、有聲長度與頻譜平坦度檢查，以及解碼後的幻覺片段過濾。
+"""
+
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+from voice_assistant.voice.schemas import GateConfig
+from voice_assistant.voice.stt.gate import SpeechGate, analyze_audio
+
+SAMPLE_RATE = 16000
+
+
+def _voiced(duration_s: float) -> np.ndarray:
+    # 150Hz 基頻加上遞減的諧波，近似有聲語音的頻譜
+    t = np.arange(int(duration_s * SAMPLE_RATE)) / SAMPLE_RATE
+    wave = sum(np.sin(2 * np.pi * 150 * k * t) / k for k in range(1, 12))
+    return (0.1 * wave).astype(np.float32)
+
+
+def _segment(no_speech_prob: float = 0.1, avg_logprob: float = -0.3):
+    return SimpleNamespace(no_speech_prob=no_speech_prob, avg_logprob=avg_logprob)
+
+
+@pytest.fixture
+def gate() -> SpeechGate:
+    return SpeechGate(GateConfig(enabled=True))
+
+
+class TestAnalyzeAudio:
+    """測試聲學特徵"""
+
+    def test_speech_like_signal_is_not_flat(self):
+        """諧波訊號的頻譜平坦度遠低於白噪音"""
+        speech = analyze_audio(_voiced(1.0), SAMPLE_RATE, -45.0)
+        noise = analyze_audio(
+            np.random.default_rng(0).normal(0, 0.1, SAMPLE_RATE), SAMPLE_RATE, -45.0
+        )
+
+        assert speech.voiced_ms == 1000
+        assert speech.flatness < 0.2
+        assert noise.flatness > 0.5
+
+    def test_int16_input_is_normalized(self):
+        """int16 音訊換算為 dBFS"""
+        audio = (_voiced(0.5) * 32767).astype(np.int16)
+
+        features = analyze_audio(audio.reshape(1, -1), SAMPLE_RATE, -45.0)
+
+        assert -25 < features.rms_dbfs < -5
+
+
+class TestSpeechGate:
+    """測試閘門"""
+
+    def test_admits_speech(self, gate):
+        """有聲語句通過"""
+        assert gate.admit((SAMPLE_RATE, _voiced(1.0)))
+
+    @pytest.mark.parametrize(
+        ("audio", "reason"),
+        [
+            (np.zeros(SAMPLE_RATE, dtype=np.float32), "too_quiet"),
+            (np.concatenate([_voiced(0.1), np.zeros(SAMPLE_RATE)]), "too_short"),
+            (np.random.default_rng(0).normal(0, 0.1, SAMPLE_RATE), "noise"),
+        ],
+    )
+    def test_drops_non_speech(self, gate, audio, reason):
+        """靜音、過短與噪音語句在解碼前捨棄並計數"""
+        assert not gate.admit((SAMPLE_RATE, audio))
+
+        stats = gate.stats()
+        assert stats.checked == 1
+        assert stats.passed == 0
+        assert stats.dropped == {reason: 1}
+
+    def test_filters_hallucinated_segments(self, gate):
+        """移除 no_speech_prob 過高且 avg_logprob 過低的片段"""
+        hallucinated = _segment(no_speech_prob=0.95, avg_logprob=-2.0)
+        kept = gate.filter_segments([_segment(), hallucinated, _segment()])
+
+        assert hallucinated not in kept
+        assert len(kept) == 2
+        stats = gate.stats()
+        assert stats.dropped_segments == 1
+        assert stats.dropped_total == 0
+
+    def test_keeps_confident_segments(self, gate):
+        """logprob 夠高的片段即使 no_speech_prob 高也保留（與 Whisper 相同）"""
+        confident = _segment(no_speech_prob=0.95, avg_logprob=-0.2)
+        uncertain_speech = _segment(no_speech_prob=0.1, avg_logprob=-2.0)
+
+        kept = gate.filter_segments([confident, uncertain_speech])
+
+        assert kept == [confident, uncertain_speech]
+        assert gate.stats().dropped_segments == 0
+
+    def test_fully_hallucinated_transcript_counts_as_dropped_turn(self, gate):
+        """整句都是幻覺時記為一次捨棄的語句；串流中間結果不計數"""
+        assert (
+            gate.filter_segments([_segment(no_speech_prob=0.9, avg_logprob=-2.0)]) == []
+        )
+        gate.filter_segments(
+            [_segment(no_speech_prob=0.9, avg_logprob=-2.0)], count=False
+        )
+
+        stats = gate.stats()
+        assert stats.dropped == {"no_speech": 1}
+        assert stats.dropped_segments == 1
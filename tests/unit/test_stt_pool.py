@@ -0,0 +1,211 @@
+"""STT worker pool 單元測試
+
+測試跨會話請求的批次合併、Future 結果、錯誤傳遞與統計。
+"""
+
+import threading
+
+import numpy as np
+import pytest
+
+from voice_assistant.voice.schemas import TranscribedWord
+from voice_assistant.voice.stt.pool import STTWorkerPool
+
+
+class FakeWhisperSTT:
+    """以音訊長度作為辨識結果的假辨識器；第一次推論可被阻塞"""
+
+    language = "zh"
+
+    def __init__(self):
+        self.calls: list[tuple[str, int]] = []
+        self.vad_filters: list[bool | None] = []
+        self.started = threading.Event()
+        self.release = threading.Event()
+        self.release.set()
+
+    def prepare_audio(self, audio):
+        return np.asarray(audio[1], dtype=np.float32).reshape(-1)
+
+    def _run(self, kind, batch):
+        self.calls.append((kind, len(batch)))
+        self.started.set()
+        self.release.wait(timeout=5)
+
+    def transcribe_samples(self, samples, initial_prompt=None, vad_filter=None):
+        self.vad_filters.append(vad_filter)
+        self._run("single", [samples])
+        return f"{initial_prompt or ''}{len(samples)}"
+
+    def transcribe_words(self, samples, initial_prompt=None):
+        self._run("single_words", [samples])
+        return [TranscribedWord(text=str(len(samples)), start_s=0.0, end_s=1.0)]
+
+    def transcribe_batch(self, batch, initial_prompt=None, vad_filter=None):
+        self.vad_filters.append(vad_filter)
+        self._run("batch", batch)
+        if any(len(samples) == 0 for samples in batch):
+            raise RuntimeError("decode failed")
+        return [f"{initial_prompt or ''}{len(samples)}" for samples in batch]
+
+    def transcribe_words_batch(self, batch, initial_prompt=None):
+        self._run("batch_words", batch)
+        return [
+            [TranscribedWord(text=str(len(s)), start_s=0.0, end_s=1.0)] for s in batch
+        ]
+
+
+@pytest.fixture
+def fake_stt() -> FakeWhisperSTT:
+    return FakeWhisperSTT()
+
+
+def _samples(n: int) -> np.ndarray:
+    return np.zeros(n, dtype=np.float32)
+
+
+class TestSTTWorkerPool:
+    """測試 STTWorkerPool"""
+
+    def test_stt_returns_text(self, fake_stt):
+        """stt() 阻塞直到辨識完成，空音訊不送出請求"""
+        pool = STTWorkerPool(fake_stt)
+        try:
+            assert pool.stt((16000, _samples(320))) == "320"
+            assert pool.stt((16000, _samples(0))) == ""
+        finally:
+            pool.close()
+
+        assert fake_stt.calls == [("single", 1)]
+
+    def test_queued_requests_are_batched(self, fake_stt):
+        """worker 忙碌期間排隊的請求合併為一次批次解碼"""
+        fake_stt.release.clear()
+        pool = STTWorkerPool(fake_stt, max_batch_size=4, batch_window_ms=0)
+        try:
+            first = pool.submit_samples(_samples(1))
+            assert fake_stt.started.wait(timeout=5)
+            queued = [pool.submit_samples(_samples(n)) for n in (2, 3, 4)]
+            assert pool.stats().queue_depth == 3
+
+            fake_stt.release.set()
+
+            assert first.result(timeout=5) == "1"
+            assert [f.result(timeout=5) for f in queued] == ["2", "3", "4"]
+        finally:
+            pool.close()
+
+        assert fake_stt.calls == [("single", 1), ("batch", 3)]
+        stats = pool.stats()
+        assert stats.requests == 4
+        assert stats.batches == 2
+        assert stats.batch_sizes == {1: 1, 3: 1}
+        assert stats.mean_batch_size == 2.0
+        assert stats.max_batch_size == 3
+        assert stats.queue_depth == 0
+        assert stats.in_flight == 0
+
+    def test_only_matching_requests_share_a_batch(self, fake_stt):
+        """前文提示或輸出形式不同的請求分開解碼"""
+        fake_stt.release.clear()
+        pool = STTWorkerPool(fake_stt, max_batch_size=8, batch_window_ms=0)
+        try:
+            pool.submit_samples(_samples(1))
+            assert fake_stt.started.wait(timeout=5)
+            a = pool.submit_samples(_samples(2), initial_prompt="台北")
+            b = pool.submit_words(_samples(3))
+            c = pool.submit_samples(_samples(4), initial_prompt="台北")
+
+            fake_stt.release.set()
+
+            assert a.result(timeout=5) == "台北2"
+            assert c.result(timeout=5) == "台北4"
+            assert [w.text for w in b.result(timeout=5)] == ["3"]
+        finally:
+            pool.close()
+
+        assert fake_stt.calls == [("single", 1), ("batch", 2), ("single_words", 1)]
+
+    def test_vad_override_is_forwarded_and_not_mixed(self, fake_stt):
+        """Whisper VAD 覆寫設定不同的請求分開解碼，設定傳給辨識器"""
+        fake_stt.release.clear()
+        pool = STTWorkerPool(fake_stt, max_batch_size=8, batch_window_ms=0)
+        try:
+            pool.submit_samples(_samples(1))
+            assert fake_stt.started.wait(timeout=5)
+            futures = [
+                pool.submit_samples(_samples(2), vad_filter=False),
+                pool.submit_samples(_samples(3)),
+                pool.submit_samples(_samples(4), vad_filter=False),
+            ]
+            fake_stt.release.set()
+            for future in futures:
+                future.result(timeout=5)
+        finally:
+            pool.close()
+
+        assert fake_stt.calls == [("single", 1), ("batch", 2), ("single", 1)]
+        assert fake_stt.vad_filters == [None, False, None]
+
+    def test_max_batch_size_is_respected(self, fake_stt):
+        """批次不超過 max_batch_size"""
+        fake_stt.release.clear()
+        pool = STTWorkerPool(fake_stt, max_batch_size=2, batch_window_ms=0)
+        try:
+            pool.submit_samples(_samples(1))
+            assert fake_stt.started.wait(timeout=5)
+            futures = [pool.submit_samples(_samples(n)) for n in (2, 3, 4)]
+            fake_stt.release.set()
+            for future in futures:
+                future.result(timeout=5)
+        finally:
+            pool.close()
+
+        assert max(size for _kind, size in fake_stt.calls) == 2
+
+    def test_batch_error_fails_every_request(self, fake_stt):
+        """批次解碼失敗時，批次內所有請求都收到例外"""
+        fake_stt.release.clear()
+        pool = STTWorkerPool(fake_stt, max_batch_size=4, batch_window_ms=0)
+        try:
+            pool.submit_samples(_samples(1))
+            assert fake_stt.started.wait(timeout=5)
+            futures = [pool.submit_samples(_samples(n)) for n in (0, 5)]
+            fake_stt.release.set()
+
+            for future in futures:
+                with pytest.raises(RuntimeError, match="decode failed"):
+                    future.result(timeout=5)
+        finally:
+            pool.close()
+
+    def test_submit_after_close_raises(self, fake_stt):
+        """關閉後不再接受請求"""
+        pool = STTWorkerPool(fake_stt)
+        pool.close()
+
+        with pytest.raises(RuntimeError):
+            pool.submit_samples(_samples(1))
+
+    def test_submit_words_rejects_engine_without_words(self):
+        """辨識器沒有逐字時間戳時在提交前直接拒絕，不送進佇列"""
+
+        class NoWordsSTT:
+            def prepare_audio(self, audio):
+                return np.asarray(audio[1], dtype=np.float32)
+
+        pool = STTWorkerPool(NoWordsSTT())
+        try:
+            assert not pool.supports_words
+            with pytest.raises(TypeError):
+                pool.submit_words(_samples(1))
+            assert pool.stats().queue_depth == 0
+        finally:
+            pool.close()
+
+    def test_invalid_arguments_raise(self, fake_stt):
+        """worker 數與批次大小至少為 1"""
+        with pytest.raises(ValueError):
+            STTWorkerPool(fake_stt, num_workers=0)
+        with pytest.raises(ValueError):
+            STTWorkerPool(fake_stt, max_batch_size=0)
@@ -0,0 +1,152 @@
+"""SherpaOnnxSTT 單元測試
+
+以假的 OnlineRecognizer 測試整句批次解碼、串流會話只送入新增音訊、
+部分辨識回呼與新語句重置（不需要 sherpa-onnx 與模型檔）。
+"""
+
+import sys
+from concurrent.futures import Executor, Future
+
+import numpy as np
+import pytest
+
+from voice_assistant.voice.stt.base import StreamingSTTModel, STTModel
+from voice_assistant.voice.stt.sherpa import SAMPLE_RATE, SherpaOnnxSTT
+
+# 假辨識器每 0.25 秒有聲音訊輸出一個字
+CHAR_SAMPLES = 4000
+
+
+class FakeStream:
+    def __init__(self):
+        self.pending = 0
+        self.voiced = 0
+        self.accepted = 0
+        self.finished = False
+
+    def accept_waveform(self, sample_rate, samples):
+        assert sample_rate == SAMPLE_RATE
+        self.accepted += len(samples)
+        self.pending += int(np.count_nonzero(np.abs(samples) > 0.05))
+
+    def input_finished(self):
+        self.finished = True
+
+
+class FakeRecognizer:
+    def __init__(self):
+        self.batches: list[int] = []
+
+    def create_stream(self):
+        return FakeStream()
+
+    def is_ready(self, stream):
+        return stream.pending > 0
+
+    def decode_streams(self, streams):
+        self.batches.append(len(streams))
+        for stream in streams:
+            stream.voiced += stream.pending
+            stream.pending = 0
+
+    def get_result(self, stream):
+        return "字" * (stream.voiced // CHAR_SAMPLES)
+
+
+class InlineExecutor(Executor):
+    """同步執行的 executor（測試用）"""
+
+    def submit(self, fn, /, *args, **kwargs):
+        future: Future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+
+def speech(duration_s: float, sample_rate: int = SAMPLE_RATE) -> np.ndarray:
+    return np.full(int(duration_s * sample_rate), 0.5, dtype=np.float32)
+
+
+@pytest.fixture
+def stt(mocker) -> SherpaOnnxSTT:
+    mocker.patch(
+        "voice_assistant.voice.stt.sherpa._load_recognizer",
+        return_value=FakeRecognizer(),
+    )
+    return SherpaOnnxSTT("models/sherpa")
+
+
+class TestSherpaOnnxSTT:
+    """測試整句辨識"""
+
+    def test_implements_protocols(self, stt):
+        assert isinstance(stt, STTModel)
+        assert isinstance(stt.create_session(), StreamingSTTModel)
+
+    def test_stt_decodes_whole_utterance(self, stt):
+        assert stt.stt((SAMPLE_RATE, speech(1.0))) == "字" * 4
+        assert stt.stt((SAMPLE_RATE, np.zeros(0, dtype=np.float32))) == ""
+
+    def test_batch_decodes_streams_together(self, stt):
+        texts = stt.transcribe_batch([speech(0.5), speech(1.0)])
+
+        assert texts == ["字" * 2, "字" * 4]
+        assert stt.recognizer.batches == [2]
+
+    def test_missing_package_raises_import_error(self, monkeypatch):
+        monkeypatch.setitem(sys.modules, "sherpa_onnx", None)
+
+        with pytest.raises(ImportError, match="sherpa-onnx"):
+            SherpaOnnxSTT("models/sherpa")
+
+
+class TestSherpaStreamingSession:
+    """測試串流會話"""
+
+    def test_push_frames_feeds_only_new_samples(self, stt):
+        partials = []
+        session = stt.create_session(
+            executor=InlineExecutor(), on_partial=partials.append
+        )
+        audio = speech(1.0)
+
+        session.push_frames((SAMPLE_RATE, audio[:8000]))
+        session.push_frames((SAMPLE_RATE, audio[:16000]))
+        stream = session._stream
+
+        assert stream.accepted == 16000
+        assert [p.text for p in partials] == ["字" * 2, "字" * 4]
+        assert session.partial.is_partial
+
+        result = session.finalize((SAMPLE_RATE, audio))
+        assert result.text == "字" * 4
+        assert not result.is_partial
+        assert result.duration_ms == 1000
+        assert stream.finished
+        assert session.partial is None
+
+    def test_resamples_fastrtc_input(self, stt):
+        session = stt.create_session(executor=InlineExecutor())
+        audio = speech(1.0, sample_rate=48000).reshape(1, -1)
+
+        session.push_frames((48000, audio[:, :24000]))
+        session.push_frames((48000, audio))
+        stream = session._stream
+        result = session.finalize()
+
+        # 串流重採樣的輸出加上 flush 的尾端等於整段的 16kHz 長度
+        assert stream.accepted - int(0.66 * SAMPLE_RATE) == 16000
+        assert result.text == "字" * 4
+
+    def test_new_utterance_resets_stream(self, stt):
+        session = stt.create_session(executor=InlineExecutor())
+        session.push_frames((SAMPLE_RATE, speech(1.0)))
+        first = session._stream
+
+        other = np.full(SAMPLE_RATE // 2, -0.5, dtype=np.float32)
+        session.push_frames((SAMPLE_RATE, other))
+
+        assert session._stream is not first
+        assert session.finalize().text == "字" * 2
@@ -0,0 +1,160 @@
+"""StreamingTranscriber 單元測試
+
+測試說話期間的部分辨識、穩定前綴確定與停頓後只辨識剩餘音訊。
+"""
+
+from concurrent.futures import Executor, Future
+
+import numpy as np
+import pytest
+
+from voice_assistant.voice.schemas import TranscribedWord
+from voice_assistant.voice.stt.streaming import StreamingTranscriber
+
+SAMPLE_RATE = 16000
+# 每個字佔 0.25 秒；樣本值為字的索引，假辨識器據此還原文字
+CHAR_SAMPLES = 4000
+TEXT = "請問台北今天的天氣如何"
+
+
+def speech(chars: int, extra_samples: int = 0) -> tuple[int, np.ndarray]:
+    """產生前 chars 個字（外加不完整的下一個字）的語音"""
+    samples = np.repeat(np.arange(len(TEXT), dtype=np.float32), CHAR_SAMPLES)
+    return SAMPLE_RATE, samples[: chars * CHAR_SAMPLES + extra_samples]
+
+
+class FakeSTT:
+    """以樣本值還原文字的假辨識器（最後不完整的字不輸出）"""
+
+    language = "zh"
+
+    def __init__(self):
+        self.window_lengths: list[int] = []
+        self.tail_lengths: list[int] = []
+        self.prompts: list[str | None] = []
+
+    def prepare_audio(self, audio):
+        return np.asarray(audio[1], dtype=np.float32)
+
+    def transcribe_words(self, samples, initial_prompt=None):
+        self.window_lengths.append(len(samples))
+        self.prompts.append(initial_prompt)
+        return [
+            TranscribedWord(
+                text=TEXT[int(samples[i])],
+                start_s=i / SAMPLE_RATE,
+                end_s=(i + CHAR_SAMPLES) / SAMPLE_RATE,
+            )
+            for i in range(0, len(samples) - CHAR_SAMPLES + 1, CHAR_SAMPLES)
+        ]
+
+    def transcribe_samples(self, samples, initial_prompt=None):
+        self.tail_lengths.append(len(samples))
+        return "".join(TEXT[int(v)] for v in samples[::CHAR_SAMPLES])
+
+
+class InlineExecutor(Executor):
+    """同步執行的 executor（測試用）"""
+
+    def submit(self, fn, /, *args, **kwargs):
+        future: Future = Future()
+        try:
+            future.set_result(fn(*args, **kwargs))
+        except Exception as e:
+            future.set_exception(e)
+        return future
+
+
+@pytest.fixture
+def stt():
+    return FakeSTT()
+
+
+@pytest.fixture
+def transcriber(stt):
+    return StreamingTranscriber(
+        stt, decode_interval_s=0.5, min_window_s=1.0, executor=InlineExecutor()
+    )
+
+
+class TestStreamingTranscriber:
+    """測試串流辨識"""
+
+    def test_partial_results_commit_stable_prefix(self, transcriber):
+        """連續兩次辨識一致的前綴會被確定"""
+        transcriber.push_frames(speech(4, 1000))
+        first = transcriber.partial
+        assert first.is_partial
+        assert first.text == "請問台北"
+        assert first.committed_text == ""
+
+        transcriber.push_frames(speech(6, 1000))
+        second = transcriber.partial
+        assert second.text == "請問台北今天"
+        assert second.committed_text == "請問台北"
+
+    def test_finalize_only_decodes_uncommitted_tail(self, transcriber, stt):
+        """停頓後只辨識尚未確定的音訊，結果與完整辨識相同"""
+        for chars in (4, 6, 8):
+            transcriber.push_frames(speech(chars, 1000))
+
+        result = transcriber.finalize(speech(len(TEXT)))
+
+        assert result.text == TEXT
+        assert result.is_partial is False
+        assert result.committed_text == "請問台北今天"
+        assert stt.tail_lengths == [(len(TEXT) - 6) * CHAR_SAMPLES]
+        assert stt.prompts[-1] == "請問台北"
+
+    def test_finalize_without_updates_decodes_everything(self, transcriber, stt):
+        """沒有串流過的語句完整辨識"""
+        result = transcriber.finalize(speech(len(TEXT)))
+
+        assert result.text == TEXT
+        assert stt.tail_lengths == [len(TEXT) * CHAR_SAMPLES]
+
+    def test_new_utterance_resets_committed_prefix(self, transcriber, stt):
+        """不是同一句的音訊會捨棄已確定的前綴"""
+        transcriber.push_frames(speech(4, 1000))
+        transcriber.push_frames(speech(6, 1000))
+
+        other = (SAMPLE_RATE, np.full(3 * CHAR_SAMPLES, 9, dtype=np.float32))
+        result = transcriber.finalize(other)
+
+        assert result.text == "如如如"
+        assert result.committed_text == ""
+
+    def test_short_window_is_not_decoded(self, transcriber, stt):
+        """未確定音訊不足 min_window_s 時不辨識"""
+        transcriber.push_frames(speech(2))
+
+        assert transcriber.partial is None
+        assert stt.window_lengths == []
+
+    def test_decode_interval_limits_decodes(self, transcriber, stt):
+        """新增音訊不足 decode_interval_s 時不重複辨識"""
+        transcriber.push_frames(speech(4))
+        transcriber.push_frames(speech(4, 1000))
+
+        assert len(stt.window_lengths) == 1
+
+    def test_on_partial_callback(self, stt):
+        """部分辨識結果透過回呼通知"""
+        partials = []
+        transcriber = StreamingTranscriber(
+            stt, executor=InlineExecutor(), on_partial=partials.append
+        )
+
+        transcriber.push_frames(speech(4))
+
+        assert [p.text for p in partials] == ["請問台北"]
+
+    def test_max_window_forces_commit(self, stt):
+        """視窗過長時不等共識即確定（保留最後一個字）"""
+        transcriber = StreamingTranscriber(
+            stt, max_window_s=1.0, agreement=3, executor=InlineExecutor()
+        )
+
+        transcriber.push_frames(speech(5))
+
+        assert transcriber.partial.committed_text == "請問台北"
@@ -76,3 +76,114 @@ class TestWhisperSTTFunctionality:
         audio = (16000, np.zeros(16000, dtype=np.float32))
         result = mock_whisper_stt.stt(audio)
         assert result == "測試文字"
+
+    def test_transcribe_words_returns_timestamps(self, mock_whisper_stt, mocker):
+        """逐字辨識回傳時間戳（串流辨識用）"""
+        word = mocker.MagicMock(word="台北", start=0.2, end=0.6)
+        segment = mocker.MagicMock(words=[word])
+        mock_whisper_stt.model.transcribe.return_value = ([segment], None)
+
+        words = mock_whisper_stt.transcribe_words(
+            np.zeros(16000, dtype=np.float32), initial_prompt="請問"
+        )
+
+        assert [(w.text, w.start_s, w.end_s) for w in words] == [("台北", 0.2, 0.6)]
+        kwargs = mock_whisper_stt.model.transcribe.call_args.kwargs
+        assert kwargs["word_timestamps"] is True
+        assert kwargs["initial_prompt"] == "請問"
+
+    def test_prepare_audio_resamples_to_16k(self, mock_whisper_stt):
+        """重採樣為 16kHz float32"""
+        samples = mock_whisper_stt.prepare_audio(
+            (48000, np.zeros(48000, dtype=np.int16))
+        )
+        assert samples.dtype == np.float32
+        assert len(samples) == 16000
+
+    def test_transcribe_batch_maps_segments_to_inputs(self, mock_whisper_stt, mocker):
+        """批次辨識以一次推論處理多段音訊，並依片段位置分回各段"""
+        mock_whisper_stt.vad_filter = False
+        batched = mocker.patch(
+            "voice_assistant.voice.stt.whisper.BatchedInferencePipeline"
+        ).return_value
+        batched.transcribe.return_value = (
+            [
+                mocker.MagicMock(start=0.0, text="第一句"),
+                mocker.MagicMock(start=1.0, text="第二句"),
+                mocker.MagicMock(start=3.0, text="第三句"),
+            ],
+            None,
+        )
+
+        texts = mock_whisper_stt.transcribe_batch(
+            [np.zeros(16000, np.float32), np.zeros(32000, np.float32)]
+            + [np.zeros(8000, np.float32)]
+        )
+
+        assert texts == ["第一句", "第二句", "第三句"]
+        kwargs = batched.transcribe.call_args.kwargs
+        assert kwargs["clip_timestamps"] == [
+            {"start": 0.0, "end": 1.0},
+            {"start": 1.0, "end": 3.0},
+            {"start": 3.0, "end": 3.5},
+        ]
+        assert kwargs["batch_size"] == 3
+
+    def test_vad_filter_can_be_overridden_per_call(self, mock_whisper_stt):
+        """音訊已由上游 VAD 切段時可略過 Whisper VAD"""
+        mock_whisper_stt.transcribe_samples(np.zeros(16000, np.float32))
+        assert mock_whisper_stt.model.transcribe.call_args.kwargs["vad_filter"]
+
+        mock_whisper_stt.transcribe_samples(
+            np.zeros(16000, np.float32), vad_filter=False
+        )
+        kwargs = mock_whisper_stt.model.transcribe.call_args.kwargs
+        assert kwargs["vad_filter"] is False
+        assert "vad_parameters" not in kwargs
+
+    def test_with_options_shares_model(self, mock_whisper_stt):
+        """不同解碼設定的辨識器共用同一個模型"""
+        fast = mock_whisper_stt.with_options(
+            beam_size=1, temperature=0.0, without_timestamps=True
+        )
+
+        fast.transcribe_samples(np.zeros(16000, np.float32))
+
+        assert fast.model is mock_whisper_stt.model
+        assert mock_whisper_stt.beam_size == 5
+        kwargs = fast.model.transcribe.call_args.kwargs
+        assert kwargs["beam_size"] == 1
+        assert kwargs["temperature"] == 0.0
+        assert kwargs["without_timestamps"] is True
+
+    def test_gate_removes_hallucinated_segments(self, mock_whisper_stt, mocker):
+        """設定語音閘門時移除幻覺片段"""
+        from voice_assistant.voice.schemas import GateConfig
+        from voice_assistant.voice.stt.gate import SpeechGate
+
+        mock_whisper_stt.gate = SpeechGate(GateConfig(enabled=True))
+        mock_whisper_stt.model.transcribe.return_value = (
+            [
+                mocker.MagicMock(text="台北天氣", no_speech_prob=0.1, avg_logprob=-0.2),
+                mocker.MagicMock(text="謝謝觀看", no_speech_prob=0.9, avg_logprob=-1.8),
+            ],
+            None,
+        )
+
+        assert mock_whisper_stt.transcribe_samples(np.zeros(16000, np.float32)) == (
+            "台北天氣"
+        )
+        assert mock_whisper_stt.gate.stats().dropped_segments == 1
+
+    def test_warm_up_decodes_synthetic_audio(self, mock_whisper_stt, mocker):
+        """暖身直接解碼合成音訊（不經 VAD 略過）"""
+        vad = mocker.patch(
+            "voice_assistant.voice.stt.whisper.get_speech_timestamps", return_value=[]
+        )
+
+        mock_whisper_stt.warm_up()
+
+        vad.assert_called_once()
+        samples = mock_whisper_stt.model.transcribe.call_args.args[0]
+        assert samples.dtype == np.float32
+        assert "vad_filter" not in mock_whisper_stt.model.transcribe.call_args.kwargs
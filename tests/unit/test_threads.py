@@ -0,0 +1,108 @@
+"""CPU 執行緒預算單元測試
+
+測試可用 CPU 偵測（cgroup 配額）、執行緒分配與套用 PyTorch 設定。
+"""
+
+import sys
+
+import pytest
+import torch
+
+from voice_assistant.threads import (
+    ThreadBudget,
+    apply_thread_budget,
+    available_cpus,
+    plan_thread_budget,
+)
+
+
+class TestAvailableCpus:
+    """測試可用 CPU 偵測"""
+
+    def test_cgroup_quota_limits_cpus(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("os.sched_getaffinity", lambda pid: set(range(8)))
+        cpu_max = tmp_path / "cpu.max"
+
+        cpu_max.write_text("250000 100000\n")
+        assert available_cpus(cpu_max) == 3
+
+        cpu_max.write_text("max 100000\n")
+        assert available_cpus(cpu_max) == 8
+
+        assert available_cpus(tmp_path / "missing") == 8
+
+    def test_at_least_one_cpu(self, tmp_path, monkeypatch):
+        monkeypatch.setattr("os.sched_getaffinity", lambda pid: {0})
+        cpu_max = tmp_path / "cpu.max"
+        cpu_max.write_text("10000 100000\n")
+
+        assert available_cpus(cpu_max) == 1
+
+
+class TestPlanThreadBudget:
+    """測試執行緒分配"""
+
+    def test_splits_cores_after_vad(self):
+        budget = plan_thread_budget(8, stt_workers=1, stt_share=0.5)
+
+        assert (budget.stt_threads, budget.tts_threads) == (3, 4)
+        assert budget.allocated == 8
+        assert not budget.oversubscribed
+
+    def test_divides_stt_share_between_workers(self):
+        budget = plan_thread_budget(16, stt_workers=2, stt_share=0.5)
+
+        assert (budget.stt_threads, budget.tts_threads) == (3, 9)
+        assert budget.allocated == 16
+
+    def test_explicit_threads_take_precedence(self):
+        budget = plan_thread_budget(8, stt_threads=2, tts_threads=2)
+
+        assert (budget.stt_threads, budget.tts_threads) == (2, 2)
+
+    def test_small_machine_is_oversubscribed(self):
+        budget = plan_thread_budget(1, stt_workers=2)
+
+        assert budget.stt_threads == budget.tts_threads == 1
+        assert budget.allocated == 4
+        assert budget.oversubscribed
+
+
+class TestApplyThreadBudget:
+    """測試套用 PyTorch 設定"""
+
+    @pytest.fixture(autouse=True)
+    def restore_threads(self):
+        threads = torch.get_num_threads()
+        yield
+        torch.set_num_threads(threads)
+
+    def test_sets_torch_intra_op_threads(self, caplog):
+        budget = ThreadBudget(
+            total=1,
+            stt_workers=1,
+            stt_threads=1,
+            tts_threads=2,
+            tts_interop_threads=torch.get_num_interop_threads(),
+        )
+
+        apply_thread_budget(budget)
+
+        assert torch.get_num_threads() == 2
+        assert "超過可用" in caplog.text
+
+    def test_skips_torch_when_not_needed(self, monkeypatch):
+        """TTS 不使用 PyTorch 時不匯入 torch"""
+        threads = torch.get_num_threads()
+        budget = ThreadBudget(
+            total=4,
+            stt_workers=1,
+            stt_threads=1,
+            tts_threads=threads + 1,
+            tts_interop_threads=1,
+        )
+        monkeypatch.setitem(sys.modules, "torch", None)
+
+        apply_thread_budget(budget, torch_threads=False)
+
+        assert torch.get_num_threads() == threads
@@ -2,6 +2,9 @@
 
 from __future__ import annotations
 
+import asyncio
+from unittest.mock import AsyncMock, patch
+
 import pytest
 
 from tests.fixtures.mock_tool import (
@@ -9,6 +12,7 @@ from tests.fixtures.mock_tool import (
     FailingMockTool,
     MockTool,
 )
+from voice_assistant.cancellation import CancelToken, TurnCancelledError, cancellable
 from voice_assistant.tools.registry import ToolRegistry
 
 
@@ -132,3 +136,50 @@ class TestToolRegistry:
 
         assert result.success is False
         assert "always fails" in result.error
+
+    @pytest.mark.asyncio
+    async def test_execute_cancelled_turn_raises(self) -> None:
+        """Test a cancelled turn is not turned into a failed ToolResult."""
+        registry = ToolRegistry()
+        registry.register(MockTool())
+        token = CancelToken()
+        token.cancel()
+
+        with pytest.raises(TurnCancelledError):
+            await registry.execute("mock_tool", {"message": "x"}, cancel_token=token)
+
+    @pytest.mark.asyncio
+    async def test_execute_uses_context_cancel_token(self) -> None:
+        """Test cancelling the turn token aborts a tool running in a graph node."""
+        registry = ToolRegistry()
+        registry.register(MockTool())
+        token = CancelToken()
+        started = asyncio.Event()
+
+        async def slow_execute(message: str = "default") -> None:
+            started.set()
+            await asyncio.sleep(10)
+
+        async def node() -> None:
+            # 節點未傳入權杖，應由 context 取得
+            with patch.object(MockTool, "execute", side_effect=slow_execute):
+                await registry.execute("mock_tool", {"message": "x"})
+
+        task = asyncio.create_task(cancellable(token, node()))
+        await started.wait()
+        token.cancel()
+
+        with pytest.raises(TurnCancelledError):
+            await task
+
+    @pytest.mark.asyncio
+    async def test_aclose_closes_all_tools(self) -> None:
+        """Test aclose releases resources of every registered tool."""
+        registry = ToolRegistry()
+        tool = MockTool()
+        registry.register(tool)
+
+        with patch.object(tool, "aclose", new_callable=AsyncMock) as mock_aclose:
+            await registry.aclose()
+
+        mock_aclose.assert_awaited_once()
@@ -0,0 +1,168 @@
+"""延遲追蹤單元測試
+
+測試 TurnTrace 標記／區段、context 傳遞、LangGraph 節點追蹤與 TraceRecorder。
+"""
+
+import json
+
+import pytest
+from langgraph.graph import END, START, StateGraph
+from typing_extensions import TypedDict
+
+from tests.fixtures.mock_tool import MockTool
+from voice_assistant import tracing
+from voice_assistant.agents.state import AgentResult, AgentType
+from voice_assistant.tools.registry import ToolRegistry
+
+
+class TestTurnTrace:
+    """測試單輪追蹤紀錄"""
+
+    def test_mark_keeps_first_unless_overwrite(self):
+        """標記預設只保留第一次，overwrite 時覆寫"""
+        trace = tracing.TurnTrace()
+        trace.mark("stage")
+        first = trace.marks["stage"]
+        trace.mark("stage")
+        assert trace.marks["stage"] == first
+
+        trace.mark("stage", overwrite=True)
+        assert trace.marks["stage"] >= first
+
+    def test_record_is_json_serializable(self):
+        """紀錄可序列化且包含音訊接收標記與區段"""
+        trace = tracing.TurnTrace(session_id="s1")
+        with trace.span("tool.x", "tool", turn_id=trace.turn_id):
+            pass
+
+        record = json.loads(json.dumps(trace.to_record()))
+
+        assert record["session_id"] == "s1"
+        assert record["marks"][tracing.MARK_AUDIO_RECEIVED] == 0.0
+        assert record["spans"][0]["name"] == "tool.x"
+        assert record["spans"][0]["attrs"]["turn_id"] == trace.turn_id
+
+    def test_helpers_noop_without_trace(self):
+        """沒有目前追蹤時輔助函式不做任何事"""
+        assert tracing.current_trace() is None
+        tracing.mark("stage")
+        with tracing.span("x", "tool"):
+            pass
+
+
+class TestContextPropagation:
+    """測試追蹤紀錄在 coroutine 間傳遞"""
+
+    @pytest.mark.asyncio
+    async def test_agent_result_gets_turn_id(self):
+        """traced 範圍內建立的 AgentResult 自動帶有 turn id"""
+        trace = tracing.TurnTrace()
+
+        async def run_agent():
+            return AgentResult(
+                task_id="t1",
+                agent_type=AgentType.GENERAL,
+                success=True,
+                data={},
+                execution_time=0.1,
+            )
+
+        result = await tracing.traced(trace, run_agent())
+
+        assert result.turn_id == trace.turn_id
+        assert tracing.current_trace() is None
+
+    @pytest.mark.asyncio
+    async def test_tool_call_span(self):
+        """Tool 執行記錄為帶有 turn id 的區段"""
+        registry = ToolRegistry()
+        registry.register(MockTool())
+        trace = tracing.TurnTrace()
+
+        await tracing.traced(
+            trace, registry.execute("mock_tool", {"message": "hi"}), name="flow"
+        )
+
+        names = [span["name"] for span in trace.spans]
+        assert names == ["tool.mock_tool", "flow"]
+        assert trace.spans[0]["attrs"]["turn_id"] == trace.turn_id
+
+    @pytest.mark.asyncio
+    async def test_graph_node_spans(self):
+        """LangGraph 節點透過 callback 記錄為區段"""
+
+        class State(TypedDict, total=False):
+            value: int
+
+        async def first(state: State) -> dict:
+            return {"value": 1}
+
+        async def second(state: State) -> dict:
+            return {"value": state["value"] + 1}
+
+        graph = StateGraph(State)
+        graph.add_node("first", first)
+        graph.add_node("second", second)
+        graph.add_edge(START, "first")
+        graph.add_edge("first", "second")
+        graph.add_edge("second", END)
+        compiled = graph.compile()
+
+        trace = tracing.TurnTrace()
+
+        async def run():
+            return await compiled.ainvoke(
+                {}, config={"callbacks": tracing.graph_callbacks()}
+            )
+
+        result = await tracing.traced(trace, run())
+
+        assert result["value"] == 2
+        assert [span["name"] for span in trace.spans] == ["node.first", "node.second"]
+
+
+class TestTraceRecorder:
+    """測試追蹤紀錄收集器"""
+
+    def test_ring_buffer(self):
+        """環形緩衝只保留最近 N 輪"""
+        recorder = tracing.TraceRecorder(buffer_size=2)
+        traces = [tracing.TurnTrace() for _ in range(3)]
+        for trace in traces:
+            recorder.record(trace)
+
+        assert [r["turn_id"] for r in recorder.recent()] == [
+            traces[1].turn_id,
+            traces[2].turn_id,
+        ]
+        assert len(recorder.recent(limit=1)) == 1
+
+    def test_jsonl_sink(self, tmp_path):
+        """每輪寫入一行 JSON"""
+        path = tmp_path / "traces" / "turns.jsonl"
+        recorder = tracing.TraceRecorder(jsonl_path=path)
+        trace = tracing.TurnTrace()
+        trace.mark(tracing.MARK_STT_DONE)
+        recorder.record(trace)
+        recorder.record(tracing.TurnTrace())
+
+        lines = path.read_text(encoding="utf-8").splitlines()
+        assert len(lines) == 2
+        assert json.loads(lines[0])["turn_id"] == trace.turn_id
+
+    def test_percentiles(self, mocker):
+        """依階段計算 p50/p95/p99"""
+        recorder = tracing.TraceRecorder()
+        for value in range(1, 101):
+            trace = tracing.TurnTrace()
+            mocker.patch.object(trace, "elapsed_ms", return_value=float(value))
+            trace.mark(tracing.MARK_STT_DONE)
+            trace.add_span("tool.x", "tool", 0.0, float(value))
+            recorder.record(trace)
+
+        stats = recorder.percentiles()
+
+        assert stats[tracing.MARK_STT_DONE]["count"] == 100
+        assert stats[tracing.MARK_STT_DONE]["p50"] == pytest.approx(50.5)
+        assert stats["tool.x"]["p99"] == pytest.approx(99.01)
+        assert "total" in stats
@@ -0,0 +1,151 @@
+"""TTSCache 單元測試
+
+測試快取鍵正規化、記憶體 LRU 的位元組容量淘汰、磁碟層的 memory-map
+讀取與重新啟動後命中，以及磁碟容量淘汰。
+"""
+
+import os
+
+import numpy as np
+import pytest
+
+from voice_assistant.voice.schemas import TTSCacheConfig
+from voice_assistant.voice.tts.cache import TTSCache, normalize_phrase
+
+RATE = 24000
+
+
+def chunks(value: float, lengths=(2400, 1200)):
+    return [(RATE, np.full(length, value, dtype=np.float32)) for length in lengths]
+
+
+def nbytes(items) -> int:
+    return sum(chunk.nbytes for _rate, chunk in items)
+
+
+class TestKey:
+    """測試快取鍵"""
+
+    def test_normalizes_width_and_whitespace(self):
+        assert normalize_phrase("  你好 ，  ABC ") == "你好 , ABC"
+
+        cache = TTSCache()
+        assert cache.key("你好，世界", "zf_001", 1.0) == cache.key(
+            " 你好,世界 ", "zf_001", 1.0
+        )
+
+    def test_voice_speed_and_revision_change_key(self):
+        cache = TTSCache()
+        key = cache.key("你好", "zf_001", 1.0, model="kokoro")
+
+        assert key != cache.key("你好", "zm_010", 1.0, model="kokoro")
+        assert key != cache.key("你好", "zf_001", 1.2, model="kokoro")
+        assert key != cache.key("你好", "zf_001", 1.0, model="other")
+        assert key != TTSCache(TTSCacheConfig(revision="v2")).key(
+            "你好", "zf_001", 1.0, model="kokoro"
+        )
+
+    def test_cacheable_limits_length(self):
+        cache = TTSCache(TTSCacheConfig(max_chars=4))
+
+        assert cache.cacheable("你好。")
+        assert not cache.cacheable("這句話太長了。")
+        assert not cache.cacheable("  ")
+
+
+class TestMemoryTier:
+    """測試記憶體 LRU"""
+
+    def test_miss_then_hit(self):
+        cache = TTSCache()
+        assert cache.get("a") is None
+
+        cache.put("a", chunks(0.1))
+        result = cache.get("a")
+
+        assert [len(chunk) for _rate, chunk in result] == [2400, 1200]
+        stats = cache.stats()
+        assert (stats.memory_hits, stats.misses, stats.stores) == (1, 1, 1)
+        assert stats.hit_rate == 0.5
+        assert stats.memory_bytes == nbytes(chunks(0.1))
+
+    def test_evicts_least_recently_used_within_byte_budget(self):
+        size = nbytes(chunks(0.1))
+        cache = TTSCache(TTSCacheConfig(memory_mb=2.5 * size / 2**20))
+        cache.put("a", chunks(0.1))
+        cache.put("b", chunks(0.2))
+        cache.get("a")
+        cache.put("c", chunks(0.3))
+
+        assert cache.get("b") is None
+        assert cache.get("a") is not None
+        stats = cache.stats()
+        assert stats.evictions == 1
+        assert stats.memory_entries == 2
+        assert stats.memory_bytes == 2 * size
+
+    def test_entry_larger_than_budget_is_not_kept(self):
+        cache = TTSCache(TTSCacheConfig(memory_mb=1000 / 2**20))
+        cache.put("a", chunks(0.1))
+
+        assert cache.get("a") is None
+        assert cache.stats().memory_bytes == 0
+
+
+class TestDiskTier:
+    """測試磁碟層"""
+
+    @pytest.mark.parametrize("dtype", ["float32", "int16"])
+    def test_survives_restart(self, tmp_path, dtype):
+        config = TTSCacheConfig(disk_path=str(tmp_path), disk_dtype=dtype)
+        TTSCache(config).put("a", chunks(0.25))
+
+        cache = TTSCache(config)
+        result = cache.get("a")
+
+        assert [len(chunk) for _rate, chunk in result] == [2400, 1200]
+        assert all(rate == RATE for rate, _chunk in result)
+        np.testing.assert_allclose(result[0][1], 0.25, atol=1e-4)
+        stats = cache.stats()
+        assert (stats.disk_hits, stats.disk_entries) == (1, 1)
+        # 磁碟命中後放入記憶體
+        cache.get("a")
+        assert cache.stats().memory_hits == 1
+
+    def test_float32_reads_are_memory_mapped(self, tmp_path):
+        config = TTSCacheConfig(disk_path=str(tmp_path))
+        TTSCache(config).put("a", chunks(0.25))
+
+        result = TTSCache(config).get("a")
+
+        assert isinstance(result[0][1], np.memmap)
+
+    def test_int16_halves_disk_usage(self, tmp_path):
+        TTSCache(TTSCacheConfig(disk_path=str(tmp_path / "f"))).put("a", chunks(0.1))
+        TTSCache(TTSCacheConfig(disk_path=str(tmp_path / "i"), disk_dtype="int16")).put(
+            "a", chunks(0.1)
+        )
+
+        assert (tmp_path / "i" / "a.pcm").stat().st_size * 2 == (
+            tmp_path / "f" / "a.pcm"
+        ).stat().st_size
+
+    def test_evicts_oldest_files_over_budget(self, tmp_path):
+        size = nbytes(chunks(0.1))
+        cache = TTSCache(
+            TTSCacheConfig(disk_path=str(tmp_path), disk_mb=2.5 * size / 2**20)
+        )
+        cache.put("a", chunks(0.1))
+        cache.put("b", chunks(0.1))
+        os.utime(tmp_path / "a.pcm", (1000, 1000))
+        os.utime(tmp_path / "b.pcm", (2000, 2000))
+        # 讀取會更新存取時間，a 成為最近使用
+        cache.clear()
+        cache.get("a")
+
+        cache.put("c", chunks(0.1))
+
+        assert sorted(p.stem for p in tmp_path.glob("*.pcm")) == ["a", "c"]
+        assert not (tmp_path / "b.json").exists()
+        stats = cache.stats()
+        assert (stats.disk_entries, stats.disk_bytes) == (2, 2 * size)
@@ -33,28 +33,29 @@ class TestKokoroTTSProtocol:
         assert isinstance(tts, TTSModel)
 
 
-class TestKokoroTTSFunctionality:
-    """測試 KokoroTTS 功能（需要模型，使用 mock）"""
+@pytest.fixture
+def mock_kokoro_tts(mocker):
+    """建立 mock KokoroTTS"""
+    from voice_assistant.voice.tts.kokoro import KokoroTTS
 
-    @pytest.fixture
-    def mock_kokoro_tts(self, mocker):
-        """建立 mock KokoroTTS"""
-        from voice_assistant.voice.tts.kokoro import KokoroTTS
+    # Mock KPipeline（原生 kokoro 使用的類別）
+    mock_pipeline = mocker.MagicMock()
+    # pipeline() 回傳 generator of (graphemes, phonemes, audio)
+    mock_audio = np.zeros(24000, dtype=np.float32)
+    mock_pipeline.return_value = iter([("g", "p", mock_audio)])
 
-        # Mock KPipeline（原生 kokoro 使用的類別）
-        mock_pipeline = mocker.MagicMock()
-        # pipeline() 回傳 generator of (graphemes, phonemes, audio)
-        mock_audio = np.zeros(24000, dtype=np.float32)
-        mock_pipeline.return_value = iter([("g", "p", mock_audio)])
+    mocker.patch(
+        "voice_assistant.voice.tts.kokoro.KPipeline",
+        return_value=mock_pipeline,
+    )
 
-        mocker.patch(
-            "voice_assistant.voice.tts.kokoro.KPipeline",
-            return_value=mock_pipeline,
-        )
+    tts = KokoroTTS(voice="zf_001")
+    tts.pipeline = mock_pipeline
+    return tts
 
-        tts = KokoroTTS(voice="zf_001")
-        tts.pipeline = mock_pipeline
-        return tts
+
+class TestKokoroTTSFunctionality:
+    """測試 KokoroTTS 功能（需要模型，使用 mock）"""
 
     def test_tts_returns_audio_tuple(self, mock_kokoro_tts):
         """驗證 tts 回傳 (sample_rate, audio_array) tuple"""
@@ -88,6 +89,26 @@ class TestKokoroTTSFunctionality:
             assert isinstance(sample_rate, int)
             assert isinstance(chunk, np.ndarray)
 
+    def test_stream_tts_stops_when_cancelled(self, mock_kokoro_tts):
+        """取消後不再合成後續片段"""
+        from voice_assistant.cancellation import CancelToken
+
+        mock_audio = np.zeros(12000, dtype=np.float32)
+        mock_kokoro_tts.pipeline.side_effect = lambda *args, **kwargs: iter(
+            [("g", "p", mock_audio)]
+        )
+        token = CancelToken()
+
+        chunks = []
+        for chunk in mock_kokoro_tts.stream_tts_sync(
+            "第一句。第二句。第三句。", cancel_token=token
+        ):
+            chunks.append(chunk)
+            token.cancel()
+
+        assert len(chunks) == 1
+        assert mock_kokoro_tts.pipeline.call_count == 1
+
     def test_set_speed_validation(self, mock_kokoro_tts):
         """語速範圍驗證"""
         with pytest.raises(ValueError):
@@ -97,3 +118,99 @@ class TestKokoroTTSFunctionality:
         """設定有效語速"""
         mock_kokoro_tts.set_speed(1.5)
         assert mock_kokoro_tts.speed == 1.5
+
+
+class TestKokoroTTSCache:
+    """測試語句快取"""
+
+    @pytest.fixture
+    def cached_tts(self, mock_kokoro_tts):
+        from voice_assistant.voice.schemas import TTSCacheConfig
+        from voice_assistant.voice.tts.cache import TTSCache
+
+        mock_kokoro_tts.pipeline.side_effect = lambda *args, **kwargs: iter(
+            [("g", "p", np.full(2400, 0.1, dtype=np.float32))]
+        )
+        mock_kokoro_tts.cache = TTSCache(TTSCacheConfig(enabled=True))
+        return mock_kokoro_tts
+
+    def test_repeated_sentence_skips_synthesis(self, cached_tts):
+        """重複的句子直接輸出快取的片段"""
+        first = list(cached_tts.stream_tts_sync("抱歉，請再試一次。"))
+        second = list(cached_tts.stream_tts_sync("抱歉，請再試一次。"))
+
+        assert cached_tts.pipeline.call_count == 1
+        assert np.array_equal(first[0][1], second[0][1])
+        stats = cached_tts.cache.stats()
+        assert (stats.memory_hits, stats.misses) == (1, 1)
+
+    def test_voice_change_misses(self, cached_tts):
+        """不同音色不共用快取"""
+        list(cached_tts.stream_tts_sync("你好。"))
+        cached_tts.set_voice("zm_010")
+        list(cached_tts.stream_tts_sync("你好。"))
+
+        assert cached_tts.pipeline.call_count == 2
+
+    def test_revision_change_misses(self, cached_tts):
+        """模型 revision 不同時不沿用舊音訊"""
+        list(cached_tts.stream_tts_sync("你好。"))
+        cached_tts.revision = "0123456789abcdef"
+        list(cached_tts.stream_tts_sync("你好。"))
+
+        assert cached_tts.pipeline.call_count == 2
+
+    def test_revision_from_hub_snapshot(self, mocker):
+        """啟用快取時以 HuggingFace snapshot 的 commit hash 作為模型版本"""
+        from voice_assistant.voice.tts.cache import TTSCache
+        from voice_assistant.voice.tts.kokoro import KokoroTTS
+
+        mocker.patch("voice_assistant.voice.tts.kokoro.KPipeline")
+        revision = mocker.patch(
+            "voice_assistant.voice.tts.kokoro.model_revision", return_value="abc123"
+        )
+
+        tts = KokoroTTS(cache=TTSCache())
+
+        revision.assert_called_once_with(KokoroTTS.CHINESE_REPO)
+        assert tts.model_id == f"{KokoroTTS.CHINESE_REPO}@abc123"
+
+    def test_cancelled_sentence_is_not_cached(self, cached_tts):
+        """取消時只合成一部分的句子不寫入快取"""
+        from voice_assistant.cancellation import CancelToken
+
+        token = CancelToken()
+        for _chunk in cached_tts.stream_tts_sync("你好。", cancel_token=token):
+            token.cancel()
+
+        assert cached_tts.cache.stats().stores == 0
+
+
+class TestKokoroTTSQuantization:
+    """測試 int8 量化模式的載入"""
+
+    def test_int8_loads_quantized_model(self, mocker, monkeypatch, tmp_path):
+        from voice_assistant.voice.tts.kokoro import KokoroTTS
+
+        monkeypatch.setenv("HF_HOME", str(tmp_path))
+        quantized = mocker.MagicMock()
+        load = mocker.patch(
+            "voice_assistant.voice.tts.kokoro.load_quantized_model",
+            return_value=quantized,
+        )
+        pipeline = mocker.patch("voice_assistant.voice.tts.kokoro.KPipeline")
+
+        tts = KokoroTTS(model_path=str(tmp_path), quantization="int8")
+
+        load.assert_called_once_with(KokoroTTS.CHINESE_REPO, str(tmp_path.resolve()))
+        assert pipeline.call_args.kwargs["model"] is quantized
+        # 量化的合成結果不與 fp32 共用語句快取
+        assert tts.MODEL_ID != KokoroTTS.MODEL_ID
+
+    def test_rejects_unknown_quantization(self, mocker):
+        from voice_assistant.voice.tts.kokoro import KokoroTTS
+
+        mocker.patch("voice_assistant.voice.tts.kokoro.KPipeline")
+
+        with pytest.raises(ValueError, match="int4"):
+            KokoroTTS(quantization="int4")
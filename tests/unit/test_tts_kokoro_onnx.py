@@ -0,0 +1,263 @@
+"""KokoroOnnxTTS 單元測試
+
+以假的 InferenceSession 與 G2P 測試模型輸入（音素 → token、依音素數
+選擇音色向量、語速）、斷句與取消；另以隨機權重的小型 KModel 實際
+匯出 ONNX，比對 ONNX Runtime 與 PyTorch 的輸出（parity）。
+"""
+
+import json
+import os
+import subprocess
+import sys
+
+import numpy as np
+import pytest
+
+from voice_assistant.cancellation import CancelToken
+from voice_assistant.voice.schemas import TTSConfig
+from voice_assistant.voice.tts.base import TTSModel
+from voice_assistant.voice.tts.cache import TTSCache
+from voice_assistant.voice.tts.kokoro_base import KokoroBaseTTS, create_kokoro_tts
+from voice_assistant.voice.tts.kokoro_onnx import (
+    CONFIG_FILE,
+    MAX_PHONEMES,
+    MODEL_FILE,
+    VOICES_FILE,
+    KokoroOnnxTTS,
+)
+
+VOCAB = {p: i + 1 for i, p in enumerate("abcdefghij ,.")}
+
+
+class FakeSession:
+    """記錄輸入，每個 token 輸出 100 個樣本"""
+
+    def __init__(self):
+        self.feeds: list[dict] = []
+
+    def run(self, output_names, feeds):
+        self.feeds.append(feeds)
+        tokens = feeds["input_ids"].shape[1]
+        waveform = np.full(tokens * 100, feeds["speed"][0], dtype=np.float32)
+        return [waveform, np.full(tokens, 5, dtype=np.int64)]
+
+
+def write_model_dir(path, voices):
+    path.mkdir(parents=True, exist_ok=True)
+    (path / MODEL_FILE).write_bytes(b"")
+    (path / CONFIG_FILE).write_text(json.dumps({"vocab": VOCAB}))
+    np.savez(path / VOICES_FILE, **voices)
+    return path
+
+
+@pytest.fixture
+def session(mocker):
+    session = FakeSession()
+    mocker.patch(
+        "voice_assistant.voice.tts.kokoro_onnx._load_session", return_value=session
+    )
+    # 以文字本身作為音素（中文標點換成半形）
+    mocker.patch(
+        "voice_assistant.voice.tts.kokoro_onnx._load_g2p",
+        return_value=lambda text: text.replace("，", ",").replace("。", "."),
+    )
+    return session
+
+
+@pytest.fixture
+def model_dir(tmp_path):
+    # 音色向量的每一列以列號填值，方便檢查選到哪一列
+    pack = np.arange(MAX_PHONEMES, dtype=np.float32)[:, None, None] * np.ones(
+        (1, 1, 256), dtype=np.float32
+    )
+    return write_model_dir(
+        tmp_path / "kokoro-onnx", {"zf_001": pack, "zm_010": pack + 1000}
+    )
+
+
+class TestKokoroOnnxTTS:
+    """測試 ONNX 後端的輸入與輸出"""
+
+    def test_implements_protocol(self, session, model_dir):
+        tts = KokoroOnnxTTS(str(model_dir))
+
+        assert isinstance(tts, TTSModel)
+        assert tts.voice == KokoroBaseTTS.DEFAULT_VOICE
+
+    def test_reexported_model_misses(self, session, model_dir):
+        """重新匯出的模型（檔案內容不同）不沿用舊音訊"""
+        cache = TTSCache()
+        list(KokoroOnnxTTS(str(model_dir), cache=cache).stream_tts_sync("ab。"))
+        list(KokoroOnnxTTS(str(model_dir), cache=cache).stream_tts_sync("ab。"))
+        assert len(session.feeds) == 1
+
+        (model_dir / MODEL_FILE).write_bytes(b"re-exported")
+        tts = KokoroOnnxTTS(str(model_dir), cache=cache)
+        list(tts.stream_tts_sync("ab。"))
+
+        assert len(session.feeds) == 2
+        assert tts.model_id.startswith(f"{KokoroOnnxTTS.MODEL_ID}@")
+
+    def test_create_from_config(self, session, model_dir):
+        """backend="kokoro-onnx" 建立 ONNX 後端，句內不重複預先合成"""
+        tts = create_kokoro_tts(
+            TTSConfig(
+                backend="kokoro-onnx", onnx_model_path=str(model_dir), lookahead=2
+            )
+        )
+
+        assert isinstance(tts, KokoroOnnxTTS)
+        assert tts.lookahead == 0
+
+    def test_onnx_path_does_not_import_torch(self):
+        """ONNX 後端、管線與 handler 的匯入都不載入 kokoro 與 PyTorch"""
+        code = (
+            "import sys\n"
+            "import voice_assistant.voice.handlers.reply_on_pause\n"
+            "from voice_assistant.voice.tts import KokoroOnnxTTS\n"
+            "print(sorted({'torch', 'kokoro'} & set(sys.modules)))"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            capture_output=True,
+            text=True,
+            env={**os.environ, "PYTHONPATH": os.pathsep.join(sys.path)},
+            check=True,
+        )
+
+        assert result.stdout.strip() == "[]"
+
+    def test_missing_model_files(self, session, tmp_path):
+        with pytest.raises(FileNotFoundError, match="export_kokoro_onnx"):
+            KokoroOnnxTTS(str(tmp_path))
+
+    def test_infer_feeds(self, session, model_dir):
+        """音素轉為 token（前後補 0、略過詞彙表外的音素），音色依音素數選列"""
+        tts = KokoroOnnxTTS(str(model_dir), speed=1.2)
+
+        waveform, duration = tts.infer("ab?c")
+
+        feeds = session.feeds[-1]
+        assert feeds["input_ids"].tolist() == [[0, 1, 2, 3, 0]]
+        assert feeds["input_ids"].dtype == np.int64
+        assert feeds["ref_s"].shape == (1, 256)
+        assert feeds["ref_s"][0, 0] == 3.0
+        np.testing.assert_allclose(feeds["speed"], [1.2])
+        assert feeds["speed"].dtype == np.float32
+        assert waveform.dtype == np.float32
+        assert len(waveform) == 500
+        assert len(duration) == 5
+
+    def test_voice_selection(self, session, model_dir):
+        tts = KokoroOnnxTTS(str(model_dir), voice="zm_010")
+        tts.infer("ab")
+        assert session.feeds[-1]["ref_s"][0, 0] == 1001.0
+
+        tts.set_voice("zf_999")
+        with pytest.raises(ValueError, match="zf_999"):
+            tts.infer("ab")
+
+    def test_long_phonemes_are_truncated(self, session, model_dir):
+        tts = KokoroOnnxTTS(str(model_dir))
+        tts.g2p = lambda text: "a" * 600
+
+        list(tts.stream_tts_sync("很長的一句話。"))
+
+        assert session.feeds[-1]["input_ids"].shape == (1, MAX_PHONEMES + 2)
+
+    def test_stream_splits_sentences_and_lines(self, session, model_dir):
+        tts = KokoroOnnxTTS(str(model_dir))
+
+        chunks = list(tts.stream_tts_sync("abc，de。ij\nfg"))
+
+        assert [len(chunk) for _rate, chunk in chunks] == [900, 400, 400]
+        assert all(rate == 24000 for rate, _chunk in chunks)
+        assert len(tts.tts("abc。")[1]) == 600
+        assert len(tts.tts("  ")[1]) == 0
+
+    def test_stream_stops_when_cancelled(self, session, model_dir):
+        tts = KokoroOnnxTTS(str(model_dir))
+        token = CancelToken()
+
+        stream = tts.stream_tts_sync("ab。cd。ef。", cancel_token=token)
+        next(stream)
+        token.cancel()
+
+        assert list(stream) == []
+        assert len(session.feeds) == 1
+
+    def test_cache_is_separate_from_pytorch_backend(self, session, model_dir):
+        cache = TTSCache()
+        tts = KokoroOnnxTTS(str(model_dir), cache=cache)
+
+        list(tts.stream_tts_sync("ab。"))
+        list(tts.stream_tts_sync("ab。"))
+
+        assert len(session.feeds) == 1
+        assert cache.key("ab。", "zf_001", 1.0, KokoroOnnxTTS.MODEL_ID) != cache.key(
+            "ab。", "zf_001", 1.0, KokoroBaseTTS.MODEL_ID
+        )
+
+
+@pytest.fixture(scope="module")
+def exported(tmp_path_factory, tiny_kokoro_model):
+    """匯出隨機權重的小型 KModel（聲源的隨機相位與雜訊固定為 0，輸出可重現）"""
+    pytest.importorskip("onnx")
+    torch = pytest.importorskip("torch")
+    from unittest import mock
+
+    from voice_assistant.voice.tts.kokoro_onnx import export_model, export_voices
+
+    path = tmp_path_factory.mktemp("kokoro-onnx")
+    model = tiny_kokoro_model(VOCAB, disable_complex=True)
+    torch.save(torch.randn(MAX_PHONEMES, 1, 256), path / "zf_001.pt")
+    # 比對時 PyTorch 端也需要固定聲源，patch 維持到本模組結束
+    with (
+        mock.patch.object(torch, "rand", lambda *a, **k: torch.zeros(*a, **k)),
+        mock.patch.object(torch, "randn_like", torch.zeros_like),
+    ):
+        export_model(model, path / MODEL_FILE)
+        export_voices([path / "zf_001.pt"], path / VOICES_FILE)
+        (path / CONFIG_FILE).write_text(json.dumps({"vocab": VOCAB}))
+        yield model, path
+
+
+class TestOnnxParity:
+    """測試匯出的 ONNX 模型與 PyTorch 模型輸出一致"""
+
+    @pytest.mark.parametrize(("phonemes", "speed"), [("abc de,fgh.", 1.0), ("ij", 1.3)])
+    def test_matches_pytorch(self, exported, mocker, phonemes, speed):
+        import torch
+
+        model, path = exported
+        mocker.patch(
+            "voice_assistant.voice.tts.kokoro_onnx._load_g2p",
+            return_value=lambda text: text,
+        )
+        tts = KokoroOnnxTTS(str(path), speed=speed, cpu_threads=1)
+
+        waveform, duration = tts.infer(phonemes)
+
+        ids = [VOCAB[p] for p in phonemes]
+        pack = torch.from_numpy(np.load(path / VOICES_FILE)["zf_001"])
+        expected, expected_duration = model.forward_with_tokens(
+            torch.LongTensor([[0, *ids, 0]]), pack[len(phonemes) - 1], speed
+        )
+        expected = expected.numpy()
+        np.testing.assert_array_equal(duration, expected_duration.numpy())
+        assert waveform.shape == expected.shape
+        error = np.sqrt(np.mean((waveform - expected) ** 2))
+        assert error < 1e-3 * np.sqrt(np.mean(expected**2))
+
+    def test_session_uses_thread_budget(self, exported, mocker):
+        _model, path = exported
+        mocker.patch(
+            "voice_assistant.voice.tts.kokoro_onnx._load_g2p",
+            return_value=lambda text: text,
+        )
+
+        tts = KokoroOnnxTTS(str(path), cpu_threads=2)
+
+        options = tts.session.get_session_options()
+        assert options.intra_op_num_threads == 2
+        assert options.inter_op_num_threads == 1
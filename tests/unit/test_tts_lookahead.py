@@ -0,0 +1,146 @@
+"""TTS 預先合成單元測試
+
+測試背景合成維持順序並超前播放、緩衝區上限、取消與消費端停止時
+停止合成、例外傳遞，以及斷音統計。
+"""
+
+import threading
+import time
+
+import numpy as np
+import pytest
+
+from voice_assistant.cancellation import CancelToken, TurnCancelledError
+from voice_assistant.voice.tts.lookahead import PlaybackMonitor, lookahead_stream
+
+RATE = 24000
+
+
+def chunk(value: float = 0.0, samples: int = 2400):
+    return RATE, np.full(samples, value, dtype=np.float32)
+
+
+class FakeSynth:
+    """每段文字輸出 chunks 個片段，記錄合成的片段"""
+
+    def __init__(self, chunks: int = 1):
+        self.chunks = chunks
+        self.synthesized: list[str] = []
+        self.threads: set[str] = set()
+
+    def __call__(self, text, cancel_token=None):
+        for i in range(self.chunks):
+            if cancel_token is not None and cancel_token.cancelled:
+                return
+            self.threads.add(threading.current_thread().name)
+            self.synthesized.append(f"{text}{i}")
+            yield chunk(float(len(self.synthesized)))
+
+
+def wait_until(predicate, timeout: float = 1.0) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.005)
+    return predicate()
+
+
+class TestLookaheadStream:
+    """測試背景預先合成"""
+
+    def test_sequential_without_depth(self):
+        synth = FakeSynth(chunks=2)
+
+        chunks = list(lookahead_stream(["a", "b"], synth, depth=0))
+
+        assert [c[1][0] for c in chunks] == [1.0, 2.0, 3.0, 4.0]
+        assert synth.threads == {threading.current_thread().name}
+
+    def test_synthesizes_ahead_in_order(self):
+        synth = FakeSynth()
+        stream = lookahead_stream(["a", "b", "c", "d"], synth, depth=2)
+
+        first = next(stream)
+
+        # 送出第一段後，背景繼續合成直到緩衝區滿（2 段）加上等待放入的 1 段
+        assert wait_until(lambda: len(synth.synthesized) == 4)
+        assert synth.threads == {"tts-lookahead"}
+        rest = list(stream)
+        assert [c[1][0] for c in [first, *rest]] == [1.0, 2.0, 3.0, 4.0]
+
+    def test_buffer_is_bounded(self):
+        synth = FakeSynth(chunks=10)
+        stream = lookahead_stream(["a"], synth, depth=3)
+
+        next(stream)
+        time.sleep(0.1)
+
+        assert len(synth.synthesized) <= 5
+        stream.close()
+
+    def test_cancel_stops_synthesis(self):
+        synth = FakeSynth(chunks=50)
+        token = CancelToken()
+        stream = lookahead_stream(["a"], synth, depth=2, cancel_token=token)
+
+        next(stream)
+        token.cancel()
+
+        assert list(stream) == []
+        time.sleep(0.1)
+        assert len(synth.synthesized) <= 4
+
+    def test_close_stops_synthesis(self):
+        synth = FakeSynth(chunks=50)
+        stream = lookahead_stream(["a", "b"], synth, depth=2)
+
+        next(stream)
+        stream.close()
+        time.sleep(0.1)
+        count = len(synth.synthesized)
+        time.sleep(0.1)
+
+        assert count <= 4
+        assert len(synth.synthesized) == count
+
+    def test_text_errors_are_raised_to_consumer(self):
+        def texts():
+            yield "a"
+            raise TurnCancelledError("本輪工作已取消")
+
+        synth = FakeSynth()
+        stream = lookahead_stream(texts(), synth, depth=2)
+
+        assert next(stream)[1][0] == 1.0
+        with pytest.raises(TurnCancelledError):
+            next(stream)
+
+
+class TestPlaybackMonitor:
+    """測試斷音統計"""
+
+    def test_counts_chunks_ready_after_playback_ends(self, monkeypatch):
+        # 每段 0.1 秒；第二段在播放結束前就緒，第三段晚了 0.15 秒
+        times = iter([0.0, 0.05, 0.35])
+        monkeypatch.setattr(
+            "voice_assistant.voice.tts.lookahead.time.monotonic", lambda: next(times)
+        )
+        monitor = PlaybackMonitor()
+
+        list(monitor.track([chunk(), chunk(), chunk()]))
+
+        stats = monitor.stats()
+        assert (stats.streams, stats.chunks, stats.underruns) == (1, 3, 1)
+        assert stats.audio_ms == pytest.approx(300)
+        assert stats.gap_ms == pytest.approx(150)
+        assert stats.max_gap_ms == pytest.approx(150)
+
+    def test_records_interrupted_stream(self):
+        monitor = PlaybackMonitor()
+        stream = monitor.track(iter([chunk(), chunk()]))
+
+        next(stream)
+        stream.close()
+
+        assert (monitor.stats().streams, monitor.stats().chunks) == (1, 1)
@@ -0,0 +1,124 @@
+"""Kokoro 動態量化單元測試
+
+以隨機權重的小型 KModel 測試 weight norm 併入、int8 動態量化與磁碟快取；
+合成前固定亂數種子，讓聲源的隨機相位與雜訊在比較的兩次推論間相同。
+"""
+
+import numpy as np
+import pytest
+
+torch = pytest.importorskip("torch")
+
+import kokoro  # noqa: E402
+from torch import nn  # noqa: E402
+
+from voice_assistant.bench.tts import log_spectral_distance  # noqa: E402
+from voice_assistant.voice.tts.quantization import (  # noqa: E402
+    fold_weight_norm,
+    load_quantized_model,
+    quantize_model,
+    quantized_model_file,
+)
+
+VOCAB = {p: i + 1 for i, p in enumerate("abcdefghij ,.")}
+INPUT_IDS = [[0, 1, 2, 3, 11, 4, 5, 6, 13, 0]]
+
+
+def synthesize(model, seed: int = 0):
+    torch.manual_seed(seed)
+    ref_s = torch.linspace(-0.5, 0.5, 256).reshape(1, 256)
+    with torch.no_grad():
+        audio, duration = model.forward_with_tokens(
+            torch.LongTensor(INPUT_IDS), ref_s, 1.0
+        )
+    return audio.numpy(), duration.numpy()
+
+
+class TestQuantizeModel:
+    """測試 weight norm 併入與 int8 動態量化"""
+
+    def test_fold_weight_norm_keeps_output(self, tiny_kokoro_model):
+        model = tiny_kokoro_model(VOCAB)
+        expected, expected_duration = synthesize(model)
+
+        assert fold_weight_norm(model) > 0
+
+        audio, duration = synthesize(model)
+        assert not any(
+            name.endswith("weight_v") for name, _ in model.named_parameters()
+        )
+        np.testing.assert_allclose(audio, expected, atol=1e-6)
+        np.testing.assert_array_equal(duration, expected_duration)
+
+    def test_quantizes_linear_and_lstm(self, tiny_kokoro_model):
+        model = quantize_model(tiny_kokoro_model(VOCAB))
+
+        modules = list(model.modules())
+        assert not any(type(module) in (nn.Linear, nn.LSTM) for module in modules)
+        assert any(
+            isinstance(module, torch.ao.nn.quantized.dynamic.LSTM) for module in modules
+        )
+
+    def test_quantization_error_below_noise(self, tiny_kokoro_model):
+        """量化造成的頻譜差異小於 fp32 模型換一組聲源亂數的差異"""
+        model = tiny_kokoro_model(VOCAB)
+        expected, expected_duration = synthesize(model)
+        noise_floor = log_spectral_distance(expected, synthesize(model, seed=1)[0])
+
+        audio, duration = synthesize(quantize_model(model))
+
+        np.testing.assert_array_equal(duration, expected_duration)
+        assert log_spectral_distance(expected, audio) < noise_floor
+
+
+REVISION = "0123456789abcdef"
+
+
+class TestLoadQuantizedModel:
+    """測試量化模型的磁碟快取"""
+
+    @pytest.fixture
+    def factory(self, tiny_kokoro_model, mocker):
+        mocker.patch(
+            "voice_assistant.voice.tts.quantization.model_revision",
+            return_value=REVISION,
+        )
+        return mocker.patch(
+            "voice_assistant.voice.tts.quantization.KModel",
+            side_effect=lambda repo_id: tiny_kokoro_model(VOCAB),
+        )
+
+    def test_converts_once_then_loads_from_disk(self, factory, tmp_path):
+        converted = load_quantized_model("test/kokoro", tmp_path)
+        loaded = load_quantized_model("test/kokoro", tmp_path)
+
+        factory.assert_called_once_with(repo_id="test/kokoro")
+        path = quantized_model_file(tmp_path, "test/kokoro", REVISION)
+        assert path.exists()
+        assert path.parent == tmp_path / "quantized"
+        assert loaded is not converted
+        np.testing.assert_array_equal(synthesize(loaded)[0], synthesize(converted)[0])
+
+    def test_file_name_tracks_revision_and_versions(self, tmp_path):
+        """模型 revision、kokoro 或 torch 版本變更時使用不同的快取檔"""
+        name = quantized_model_file(tmp_path, "test/kokoro", REVISION).name
+
+        assert REVISION[:12] in name
+        assert f"kokoro-{kokoro.__version__}" in name
+        assert f"torch-{torch.__version__}" in name
+        assert (
+            quantized_model_file(tmp_path, "test/kokoro", "fedcba987654").name != name
+        )
+
+    def test_unreadable_cache_is_reconverted(self, factory, tmp_path):
+        """無法載入的快取檔視同未快取，重新轉換並覆寫"""
+        path = quantized_model_file(tmp_path, "test/kokoro", REVISION)
+        path.parent.mkdir(parents=True)
+        path.write_bytes(b"truncated")
+
+        model = load_quantized_model("test/kokoro", tmp_path)
+
+        factory.assert_called_once_with(repo_id="test/kokoro")
+        assert synthesize(model)[0].size > 0
+        # 覆寫後的快取檔可正常載入
+        assert isinstance(torch.load(path, weights_only=False), nn.Module)
@@ -0,0 +1,28 @@
+"""TTS 模型版本識別單元測試"""
+
+from voice_assistant.voice.tts.revision import file_revision, model_revision
+
+
+class TestModelRevision:
+    """測試模型 revision"""
+
+    def test_hub_revision_is_snapshot_commit(self, mocker, tmp_path):
+        snapshot = tmp_path / "snapshots" / "0123456789abcdef"
+        download = mocker.patch(
+            "huggingface_hub.hf_hub_download",
+            return_value=str(snapshot / "config.json"),
+        )
+
+        assert model_revision("test/kokoro") == "0123456789abcdef"
+        download.assert_called_once_with(repo_id="test/kokoro", filename="config.json")
+
+    def test_file_revision_tracks_every_file(self, tmp_path):
+        model = tmp_path / "kokoro.onnx"
+        voices = tmp_path / "voices.npz"
+        model.write_bytes(b"model")
+        voices.write_bytes(b"voices")
+        revision = file_revision(model, voices)
+
+        assert file_revision(model, voices) == revision
+        voices.write_bytes(b"new voices")
+        assert file_revision(model, voices) != revision
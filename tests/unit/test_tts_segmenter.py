@@ -0,0 +1,209 @@
+"""斷句器單元測試
+
+測試 SentenceSegmenter 的句子切分，以及 LatencySegmenter 的首段提早
+輸出、逐段加長、數字與英文單字保護和 Markdown 清除。
+"""
+
+import pytest
+
+from voice_assistant.voice.schemas import SegmentationConfig
+from voice_assistant.voice.tts.segmenter import (
+    LatencySegmenter,
+    SentenceSegmenter,
+    clean_markdown,
+    create_segmenter,
+    split_text,
+)
+
+LATENCY = SegmentationConfig(strategy="latency")
+
+
+def stream(text: str, segmenter, step: int = 2) -> list[str]:
+    """以固定字數的增量送入斷句器"""
+    segments = []
+    for i in range(0, len(text), step):
+        segments += segmenter.push(text[i : i + step])
+    if tail := segmenter.flush():
+        segments.append(tail)
+    return segments
+
+
+class TestSentenceSegmenter:
+    """測試串流斷句"""
+
+    def test_emits_sentence_on_terminator(self):
+        """遇到句尾標點即輸出句子"""
+        segmenter = SentenceSegmenter()
+        assert segmenter.push("台北今天") == []
+        assert segmenter.push("晴天。氣溫") == ["台北今天晴天。"]
+        assert segmenter.push("二十五度！") == ["氣溫二十五度！"]
+
+    def test_multiple_sentences_in_one_delta(self):
+        """單一增量包含多句時全部輸出"""
+        segmenter = SentenceSegmenter()
+        assert segmenter.push("第一句。第二句？第三") == ["第一句。", "第二句？"]
+        assert segmenter.flush() == "第三"
+
+    def test_comma_does_not_flush(self):
+        """逗號不觸發輸出"""
+        segmenter = SentenceSegmenter()
+        assert segmenter.push("台北，高雄，") == []
+        assert segmenter.flush() == "台北，高雄，"
+
+    def test_newline_is_boundary(self):
+        """換行視為句子邊界（條列輸出）"""
+        segmenter = SentenceSegmenter()
+        assert segmenter.push("1. 帶傘\n2. 穿外套") == ["1. 帶傘"]
+        assert segmenter.flush() == "2. 穿外套"
+
+    def test_flush_empty(self):
+        """沒有剩餘文字時 flush 回傳 None"""
+        segmenter = SentenceSegmenter()
+        segmenter.push("完成。")
+        assert segmenter.flush() is None
+
+
+class TestLatencySegmenter:
+    """測試首段優先的斷句"""
+
+    def test_first_segment_at_clause_boundary(self):
+        """第一段在第一個逗號輸出，之後的逗號需累積到一定長度"""
+        segmenter = LatencySegmenter(LATENCY)
+
+        assert segmenter.push("今天台北多雲時晴，") == ["今天台北多雲時晴，"]
+        assert segmenter.push("氣溫二十三度，午後") == []
+        assert segmenter.push("有雨。") == ["氣溫二十三度，午後有雨。"]
+
+    def test_short_clause_waits_for_min_chars(self):
+        """第一段不足 first_min_chars 時不在逗號輸出"""
+        segmenter = LatencySegmenter(LATENCY)
+
+        assert segmenter.push("好，") == []
+        assert segmenter.push("我幫你查一下。") == ["好，我幫你查一下。"]
+
+    def test_cap_splits_long_clause_and_grows(self):
+        """沒有邊界時在字數上限切開，之後的上限逐段加長"""
+        config = SegmentationConfig(strategy="latency", first_max_chars=4, growth=2.0)
+        segments = stream(
+            "一二三四五六七八九十甲乙丙丁戊己庚辛壬癸", LatencySegmenter(config)
+        )
+
+        assert [len(s) for s in segments] == [4, 8, 8]
+
+    def test_max_chars_limits_growth(self):
+        config = SegmentationConfig(
+            strategy="latency", first_max_chars=2, growth=10.0, max_chars=5
+        )
+        segments = stream("一" * 14, LatencySegmenter(config))
+
+        assert [len(s) for s in segments] == [2, 5, 5, 2]
+
+    @pytest.mark.parametrize("step", [1, 2, 100])
+    @pytest.mark.parametrize(
+        "text",
+        [
+            "股價為1,085.5元，",
+            "漲幅3.14%，",
+            "會議在12:30開始，",
+            "請輸入 Kokoro-82M 的版本，",
+        ],
+    )
+    def test_numbers_and_words_are_not_split(self, text, step):
+        """數字、小數、時間與英文單字不會被切開（與增量切分位置無關）"""
+        config = SegmentationConfig(strategy="latency", first_max_chars=3)
+        segments = [
+            segment.replace(" ", "")
+            for segment in stream(text + "之後還有。", LatencySegmenter(config), step)
+        ]
+
+        assert "".join(segments) == (text + "之後還有。").replace(" ", "")
+        for token in ("1,085.5", "3.14%", "12:30", "Kokoro-82M"):
+            if token in text:
+                assert any(token in segment for segment in segments)
+
+    def test_english_sentence_end(self):
+        """英文句點後接空白視為句尾"""
+        segments = stream(
+            "The weather is fine today. 明天會下雨。", LatencySegmenter(LATENCY)
+        )
+
+        assert segments[-1] == "明天會下雨。"
+        assert segments[-2].endswith("fine today.")
+        assert " ".join(segments[:-1]) == "The weather is fine today."
+
+    def test_long_english_word_is_kept_whole(self):
+        config = SegmentationConfig(strategy="latency", first_max_chars=4)
+        segments = stream("Supercalifragilistic 很長", LatencySegmenter(config))
+
+        assert segments[0] == "Supercalifragilistic"
+
+    def test_pending_half_width_comma(self):
+        """增量結尾的半形逗號需看到下一個字才能決定是否斷句"""
+        segmenter = LatencySegmenter(LATENCY)
+
+        assert segmenter.push("總共是 1,") == []
+        assert segmenter.push("000 元, 謝謝") == ["總共是 1,000 元,"]
+
+    def test_closing_quote_stays_with_segment(self):
+        segments = stream(
+            "他說：「今天天氣很好。」我們出門吧", LatencySegmenter(LATENCY)
+        )
+
+        assert segments == ["他說：「今天天氣很好。」", "我們出門吧"]
+
+    def test_markdown_is_removed(self):
+        text = "**重點整理**：\n- 帶傘\n- 穿外套\n---\n詳見[氣象局](https://cwa.gov.tw)網站。"
+        segments = stream(text, LatencySegmenter(LATENCY), step=3)
+
+        assert segments == ["重點整理：", "帶傘", "穿外套", "詳見氣象局網站。"]
+
+    def test_link_is_not_split(self):
+        config = SegmentationConfig(strategy="latency", first_max_chars=3)
+        segments = stream(
+            "請看[中央氣象署網站](https://x.tw/a,b)，謝謝", LatencySegmenter(config)
+        )
+
+        assert "中央氣象署網站" in "".join(segments)
+        assert not any("http" in segment for segment in segments)
+
+    def test_flush_resets_state(self):
+        """flush 後重新從第一段的上限開始"""
+        config = SegmentationConfig(strategy="latency", first_max_chars=4)
+        segmenter = LatencySegmenter(config)
+        stream("一二三四五六七八九十", segmenter)
+
+        assert segmenter.push("甲乙丙丁戊") == ["甲乙丙丁"]
+
+
+class TestCleanMarkdown:
+    """測試 Markdown 清除"""
+
+    def test_strips_symbols(self):
+        assert (
+            clean_markdown("## 標題\n> 引用 `code` 與 *強調*")
+            == "標題\n引用 code 與 強調"
+        )
+
+    def test_keeps_plain_text(self):
+        assert clean_markdown("溫度 -3 到 5 度") == "溫度 -3 到 5 度"
+
+
+class TestCreateSegmenter:
+    """測試策略選擇與整段切分"""
+
+    def test_strategy_selection(self):
+        assert isinstance(create_segmenter(), SentenceSegmenter)
+        assert isinstance(create_segmenter(LATENCY), LatencySegmenter)
+
+    def test_split_text(self):
+        text = "今天台北多雲時晴，氣溫二十三度。明天下雨"
+
+        assert split_text(text, SentenceSegmenter()) == [
+            "今天台北多雲時晴，氣溫二十三度。",
+            "明天下雨",
+        ]
+        assert split_text(text, create_segmenter(LATENCY)) == [
+            "今天台北多雲時晴，",
+            "氣溫二十三度。",
+            "明天下雨",
+        ]
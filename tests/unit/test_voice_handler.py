@@ -0,0 +1,120 @@
+"""FastRTC 處理器單元測試
+
+測試插話時通知會話取消本輪工作的 ReplyOnPause 子類別。
+"""
+
+from unittest.mock import MagicMock, patch
+
+import numpy as np
+import pytest
+
+from voice_assistant.voice.handlers import InterruptibleReplyOnPause
+
+
+@pytest.fixture(autouse=True)
+def no_vad_download():
+    # 建構 ReplyOnPause 會下載 Silero VAD 模型
+    with patch("fastrtc.reply_on_pause.get_silero_model"):
+        yield
+
+
+def _reply(audio):
+    yield audio
+
+
+class TestInterruptibleReplyOnPause:
+    """測試插話取消處理器"""
+
+    def test_copy_keeps_on_interrupt(self):
+        """每個連線的複本保留 on_interrupt 與設定"""
+        on_interrupt = MagicMock()
+        handler = InterruptibleReplyOnPause(
+            _reply, can_interrupt=True, on_interrupt=on_interrupt
+        )
+
+        copied = handler.copy()
+
+        assert isinstance(copied, InterruptibleReplyOnPause)
+        assert copied.on_interrupt is on_interrupt
+        assert copied.can_interrupt is True
+
+    def test_close_generator_notifies_session(self):
+        """關閉回覆 generator 前以連線 ID 通知取消"""
+        on_interrupt = MagicMock()
+        handler = InterruptibleReplyOnPause(_reply, on_interrupt=on_interrupt)
+        handler._webrtc_id = "conn-1"
+        handler.generator = _reply(None)
+
+        handler._close_generator()
+
+        on_interrupt.assert_called_once_with("conn-1")
+
+    def test_close_without_generator_does_nothing(self):
+        """沒有進行中的回覆時不通知"""
+        on_interrupt = MagicMock()
+        handler = InterruptibleReplyOnPause(_reply, on_interrupt=on_interrupt)
+        handler._webrtc_id = "conn-1"
+
+        handler._close_generator()
+
+        on_interrupt.assert_not_called()
+
+    def test_receive_forwards_growing_speech_once(self):
+        """說話期間累積的語音有變動時才轉送"""
+        on_speech = MagicMock()
+        handler = InterruptibleReplyOnPause(_reply, on_speech=on_speech)
+        handler._webrtc_id = "conn-1"
+        handler.state.started_talking = True
+        handler.state.sampling_rate = 48000
+        handler.state.stream = np.zeros(4800, dtype=np.int16)
+
+        with patch("fastrtc.ReplyOnPause.receive"):
+            handler.receive((48000, np.zeros(480, dtype=np.int16)))
+            handler.receive((48000, np.zeros(480, dtype=np.int16)))
+
+        on_speech.assert_called_once()
+        webrtc_id, (sample_rate, stream) = on_speech.call_args.args
+        assert webrtc_id == "conn-1"
+        assert sample_rate == 48000
+        assert stream is handler.state.stream
+
+    def test_speech_spans_are_forwarded_before_reply(self):
+        """停頓偵測時 VAD 找到的語音區段換算為本句樣本索引後轉送"""
+        on_speech_spans = MagicMock()
+        model = MagicMock()
+        handler = InterruptibleReplyOnPause(
+            _reply, model=model, on_speech_spans=on_speech_spans
+        )
+        handler._webrtc_id = "conn-1"
+        handler.state.sampling_rate = 48000
+        # 0.6 秒區塊（FastRTC 預設的停頓偵測區塊長度）
+        chunk = np.zeros(28800, dtype=np.int16)
+
+        # 第一個區塊：開始說話；第二個區塊：語音在前段、之後停頓
+        model.vad.side_effect = [
+            (0.5, [{"start": 1600, "end": 8000}]),
+            (0.05, [{"start": 0, "end": 1600}]),
+        ]
+        assert not handler.determine_pause(chunk, 48000, handler.state)
+        assert handler.determine_pause(chunk, 48000, handler.state)
+
+        handler.event.set()
+        with patch("fastrtc.ReplyOnPause.emit"):
+            handler.emit()
+
+        on_speech_spans.assert_called_once_with(
+            "conn-1", 48000, [(4800, 24000), (28800, 33600)]
+        )
+        assert handler._speech_spans == []
+
+    def test_copy_records_spans_with_own_vad_wrapper(self):
+        """每個連線的複本各自記錄語音區段，共用底層 VAD 模型"""
+        model = MagicMock()
+        handler = InterruptibleReplyOnPause(
+            _reply, model=model, on_speech_spans=MagicMock()
+        )
+
+        copied = handler.copy()
+
+        assert copied.model is not handler.model
+        assert copied.model.model is model
@@ -193,6 +193,237 @@ class TestVoicePipeline:
         assert pipeline.state.state == VoiceState.IDLE
         assert pipeline.state.turn_count == 1
 
+    @pytest.mark.parametrize(
+        ("lookahead", "strategy", "expected"),
+        [
+            (0, "sentence", ["台北今天晴天，氣溫二十五度。", "早晚稍涼。"]),
+            (2, "sentence", ["台北今天晴天，氣溫二十五度。", "早晚稍涼。"]),
+            (2, "latency", ["台北今天晴天，", "氣溫二十五度。", "早晚稍涼。"]),
+        ],
+    )
+    def test_streamed_response_is_spoken_per_sentence(
+        self, mocker, mock_stt, mock_tts, mock_settings, lookahead, strategy, expected
+    ):
+        """串流回應依斷句策略逐段送入 TTS（可背景預先合成），完整回應寫入歷史"""
+        from voice_assistant.llm.schemas import ToolCall
+        from voice_assistant.voice.pipeline import VoicePipeline
+        from voice_assistant.voice.schemas import (
+            SegmentationConfig,
+            TTSConfig,
+            VoicePipelineConfig,
+        )
+
+        mocker.patch(
+            "voice_assistant.voice.pipeline.get_settings", return_value=mock_settings
+        )
+        mock_tts.stream_tts_sync.side_effect = lambda text, cancel_token=None: iter(
+            [(24000, np.zeros(100, dtype=np.float32))]
+        )
+
+        async def mock_chat(messages, tools=None, system_prompt=None):
+            return ChatMessage(
+                role="assistant",
+                content=None,
+                tool_calls=[
+                    ToolCall(
+                        id="call_1",
+                        type="function",
+                        function={"name": "get_weather", "arguments": "{}"},
+                    )
+                ],
+            )
+
+        async def mock_chat_with_stream(
+            messages, on_delta, tools=None, system_prompt=None
+        ):
+            for delta in ["台北今天", "晴天，", "氣溫二十五度。", "早晚稍涼。"]:
+                on_delta(delta)
+            return ChatMessage(
+                role="assistant", content="台北今天晴天，氣溫二十五度。早晚稍涼。"
+            )
+
+        mock_llm = mocker.MagicMock()
+        mock_llm.chat = mocker.MagicMock(side_effect=mock_chat)
+        mock_llm.chat_with_stream = mocker.MagicMock(side_effect=mock_chat_with_stream)
+
+        mock_registry = mocker.MagicMock()
+        mock_registry.get_openai_tools.return_value = [{"type": "function"}]
+        mock_registry.execute = mocker.AsyncMock(
+            return_value=mocker.MagicMock(to_content=lambda: "{}")
+        )
+
+        pipeline = VoicePipeline(
+            state=ConversationState(),
+            config=VoicePipelineConfig(
+                stream_response=True,
+                tts=TTSConfig(
+                    lookahead=lookahead,
+                    segmentation=SegmentationConfig(strategy=strategy),
+                ),
+            ),
+            llm_client=mock_llm,
+            stt=mock_stt,
+            tts=mock_tts,
+            tool_registry=mock_registry,
+        )
+        audio = (16000, np.zeros(16000, dtype=np.float32))
+        list(pipeline.process_audio_with_outputs(audio))
+
+        spoken = [call.args[0] for call in mock_tts.stream_tts_sync.call_args_list]
+        assert spoken == expected
+        assert pipeline.playback.stats().chunks == len(expected)
+        assert (
+            pipeline.state.history.messages[-1].content
+            == "台北今天晴天，氣溫二十五度。早晚稍涼。"
+        )
+        assert pipeline.state.state == VoiceState.IDLE
+
+    def test_streaming_stt_finalizes_instead_of_full_decode(
+        self, mock_llm, mock_stt, mock_tts, mocker
+    ):
+        """啟用串流辨識時，停頓後以 finalize 取得辨識結果"""
+        from voice_assistant.voice.pipeline import VoicePipeline
+        from voice_assistant.voice.schemas import TranscribedText, VoicePipelineConfig
+
+        streaming_stt = mocker.MagicMock()
+        streaming_stt.finalize.return_value = TranscribedText(text="台北天氣如何")
+        pipeline = VoicePipeline(
+            config=VoicePipelineConfig(),
+            llm_client=mock_llm,
+            stt=mock_stt,
+            tts=mock_tts,
+            streaming_stt=streaming_stt,
+        )
+        audio = (16000, np.zeros(16000, dtype=np.float32))
+
+        pipeline.feed_audio(audio)
+        list(pipeline.process_audio_with_outputs(audio))
+
+        streaming_stt.push_frames.assert_called_once_with(audio)
+        streaming_stt.finalize.assert_called_once_with(audio)
+        mock_stt.stt.assert_not_called()
+        assert pipeline.state.last_user_text == "台北天氣如何"
+
+    def test_single_vad_trims_with_upstream_spans(
+        self, mock_llm, mock_stt, mock_tts, mocker
+    ):
+        """已有上游 VAD 區段時裁切靜音，並略過 Whisper VAD"""
+        from voice_assistant.voice.pipeline import VoicePipeline
+        from voice_assistant.voice.schemas import STTConfig, VoicePipelineConfig
+
+        mock_stt.prepare_audio.side_effect = lambda audio: audio[1]
+        mock_stt.transcribe_samples.return_value = "台北天氣如何"
+        pipeline = VoicePipeline(
+            config=VoicePipelineConfig(stt=STTConfig(single_vad=True)),
+            llm_client=mock_llm,
+            stt=mock_stt,
+            tts=mock_tts,
+        )
+        audio = (16000, np.zeros((1, 32000), dtype=np.int16))
+
+        pipeline.set_speech_spans(16000, [(8000, 16000)])
+        list(pipeline.process_audio_with_outputs(audio))
+
+        mock_stt.stt.assert_not_called()
+        samples = mock_stt.transcribe_samples.call_args.args[0]
+        # 前後各保留 200ms
+        assert len(samples) == 8000 + 2 * 3200
+        assert mock_stt.transcribe_samples.call_args.kwargs == {"vad_filter": False}
+        assert pipeline.state.last_user_text == "台北天氣如何"
+
+        # 區段只用於下一句
+        list(pipeline.process_audio_with_outputs(audio))
+        mock_stt.stt.assert_called_once_with(audio)
+
+    def test_speech_gate_drops_noise_before_stt(self, mock_llm, mock_stt, mock_tts):
+        """語音閘門捨棄的語句不解碼也不呼叫 LLM"""
+        from voice_assistant.voice.pipeline import VoicePipeline
+        from voice_assistant.voice.schemas import GateConfig, VoicePipelineConfig
+
+        pipeline = VoicePipeline(
+            config=VoicePipelineConfig(gate=GateConfig(enabled=True)),
+            llm_client=mock_llm,
+            stt=mock_stt,
+            tts=mock_tts,
+        )
+
+        list(pipeline.process_audio_with_outputs((16000, np.zeros(16000, np.int16))))
+
+        mock_stt.stt.assert_not_called()
+        mock_llm.chat.assert_not_called()
+        assert pipeline.state.state == VoiceState.IDLE
+        assert pipeline.speech_gate.stats().dropped == {"too_quiet": 1}
+
+    def test_echo_of_own_response_is_discarded(self, mock_llm, mock_stt, mock_tts):
+        """播放期間收到與剛播放內容相同的辨識結果時不呼叫 LLM"""
+        from voice_assistant.voice.pipeline import VoicePipeline
+        from voice_assistant.voice.schemas import EchoConfig, VoicePipelineConfig
+
+        mock_tts.stream_tts_sync.side_effect = lambda *args, **kwargs: iter(
+            [(24000, np.zeros(24000, dtype=np.float32))]
+        )
+        pipeline = VoicePipeline(
+            config=VoicePipelineConfig(echo=EchoConfig(enabled=True)),
+            llm_client=mock_llm,
+            stt=mock_stt,
+            tts=mock_tts,
+        )
+        audio = (16000, np.zeros(8000, np.int16))
+        list(pipeline.process_audio_with_outputs(audio))
+        calls = mock_llm.chat.call_count
+        assert calls > 0
+
+        mock_stt.stt.return_value = "這是測試回應"
+        list(pipeline.process_audio_with_outputs(audio))
+
+        assert mock_llm.chat.call_count == calls
+        assert pipeline.state.state == VoiceState.IDLE
+        assert pipeline.echo_detector.stats().echoes == 1
+
+    def test_interrupt_ends_echo_playback_window(self, mock_llm, mock_stt, mock_tts):
+        """使用者插話後播放停止，之後的語句不再與播放期間重疊"""
+        import time
+
+        from voice_assistant.voice.pipeline import VoicePipeline
+        from voice_assistant.voice.schemas import EchoConfig, VoicePipelineConfig
+
+        pipeline = VoicePipeline(
+            config=VoicePipelineConfig(echo=EchoConfig(enabled=True, tail_ms=500)),
+            llm_client=mock_llm,
+            stt=mock_stt,
+            tts=mock_tts,
+        )
+        pipeline.echo_detector.on_playback(10.0)
+
+        pipeline.on_interrupt()
+
+        later = time.monotonic() + 2.0
+        assert not pipeline.echo_detector.overlaps_playback(1.0, now=later)
+
+    def test_turn_trace_is_recorded(self, mock_llm, mock_stt, mock_tts):
+        """每輪輸出含 STT、流程與 TTS 時間點的追蹤紀錄"""
+        from voice_assistant import tracing
+        from voice_assistant.voice.pipeline import VoicePipeline
+        from voice_assistant.voice.schemas import VoicePipelineConfig
+
+        recorder = tracing.TraceRecorder()
+        pipeline = VoicePipeline(
+            state=ConversationState(),
+            config=VoicePipelineConfig(),
+            llm_client=mock_llm,
+            stt=mock_stt,
+            tts=mock_tts,
+            tracer=recorder,
+        )
+        audio = (16000, np.zeros(16000, dtype=np.float32))
+        list(pipeline.process_audio_with_outputs(audio))
+
+        (record,) = recorder.recent()
+        marks = record["marks"]
+        assert marks[tracing.MARK_STT_DONE] <= marks[tracing.MARK_FIRST_TTS_CHUNK]
+        assert marks[tracing.MARK_FIRST_TTS_CHUNK] <= marks[tracing.MARK_LAST_TTS_CHUNK]
+        assert "flow" in [span["name"] for span in record["spans"]]
+
     def test_empty_input_stays_idle(self, pipeline, mock_stt):
         """空輸入時保持 IDLE"""
         mock_stt.stt.return_value = ""  # 空字串
@@ -269,6 +500,474 @@ class TestVoicePipeline:
         assert pipeline.state.current_role_id == old_id
 
 
+class TestSpeculativeIntent:
+    """測試意圖辨識與主流程並行執行"""
+
+    @pytest.fixture
+    def mock_stt(self, mocker):
+        stt = mocker.MagicMock()
+        stt.stt.return_value = "台北天氣如何"
+        return stt
+
+    @pytest.fixture
+    def mock_tts(self, mocker):
+        tts = mocker.MagicMock()
+        tts.stream_tts_sync.side_effect = lambda text, cancel_token=None: iter(
+            [(24000, np.zeros(100, dtype=np.float32))]
+        )
+        return tts
+
+    @pytest.fixture(autouse=True)
+    def tools_mode(self, mocker):
+        settings = mocker.MagicMock()
+        settings.flow_mode = FlowMode.TOOLS
+        mocker.patch(
+            "voice_assistant.voice.pipeline.get_settings", return_value=settings
+        )
+
+    def _create_pipeline(self, mocker, llm, stt, tts, recognize):
+        from voice_assistant.roles.predefined.assistant import AssistantRole
+        from voice_assistant.roles.predefined.interviewer import InterviewerRole
+        from voice_assistant.roles.registry import RoleRegistry
+        from voice_assistant.voice.pipeline import VoicePipeline
+        from voice_assistant.voice.schemas import VoicePipelineConfig
+
+        registry = RoleRegistry()
+        registry.register(AssistantRole())
+        registry.register(InterviewerRole())
+        recognizer = mocker.MagicMock()
+        recognizer.recognize_intent_with_llm.side_effect = recognize
+
+        return VoicePipeline(
+            state=ConversationState(),
+            config=VoicePipelineConfig(speculative_intent=True),
+            llm_client=llm,
+            stt=stt,
+            tts=tts,
+            intent_recognizer=recognizer,
+            role_registry=registry,
+        )
+
+    def test_flow_runs_concurrently_with_intent(self, mocker, mock_stt, mock_tts):
+        """一般對話：主流程與意圖辨識同時進行"""
+        import asyncio
+
+        from voice_assistant.intent.schemas import Intent
+
+        flow_started = asyncio.Event()
+
+        async def mock_chat(messages, tools=None, system_prompt=None):
+            flow_started.set()
+            return ChatMessage(role="assistant", content="台北晴天。")
+
+        async def recognize(text):
+            # 若為串行執行，主流程不會在意圖辨識期間啟動而逾時
+            await asyncio.wait_for(flow_started.wait(), timeout=2)
+            return Intent(name="unknown", description="", params={}, score=None)
+
+        llm = mocker.MagicMock()
+        llm.chat = mocker.MagicMock(side_effect=mock_chat)
+        pipeline = self._create_pipeline(mocker, llm, mock_stt, mock_tts, recognize)
+
+        audio = (16000, np.zeros(16000, dtype=np.float32))
+        list(pipeline.process_audio_with_outputs(audio))
+
+        assert pipeline.state.history.messages[-1].content == "台北晴天。"
+        assert pipeline.state.turn_count == 1
+
+    def test_switch_role_cancels_flow(self, mocker, mock_stt, mock_tts):
+        """角色切換：取消預先啟動的主流程且不寫入其回應"""
+        import asyncio
+        import threading
+
+        from voice_assistant.intent.schemas import Intent
+
+        flow_cancelled = threading.Event()
+
+        async def mock_chat(messages, tools=None, system_prompt=None):
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                flow_cancelled.set()
+                raise
+            return ChatMessage(role="assistant", content="不應出現")
+
+        async def recognize(text):
+            return Intent(
+                name="switch_role",
+                params={"role_id": "interviewer"},
+                description="",
+                score=0.9,
+            )
+
+        llm = mocker.MagicMock()
+        llm.chat = mocker.MagicMock(side_effect=mock_chat)
+        pipeline = self._create_pipeline(mocker, llm, mock_stt, mock_tts, recognize)
+
+        audio = (16000, np.zeros(16000, dtype=np.float32))
+        list(pipeline.process_audio_with_outputs(audio))
+
+        assert flow_cancelled.wait(timeout=2)
+        assert pipeline.state.current_role_id == "interviewer"
+        assert all(
+            message.content != "不應出現" for message in pipeline.state.history.messages
+        )
+
+
+class TestSpeculativePartial:
+    """測試部分辨識結果穩定時預先啟動回應流程"""
+
+    @pytest.fixture(autouse=True)
+    def tools_mode(self, mocker):
+        settings = mocker.MagicMock()
+        settings.flow_mode = FlowMode.TOOLS
+        mocker.patch(
+            "voice_assistant.voice.pipeline.get_settings", return_value=settings
+        )
+
+    @pytest.fixture
+    def mock_tts(self, mocker):
+        tts = mocker.MagicMock()
+        tts.stream_tts_sync.side_effect = lambda text, cancel_token=None: iter(
+            [(24000, np.zeros(100, dtype=np.float32))]
+        )
+        return tts
+
+    @pytest.fixture
+    def llm(self, mocker):
+        async def mock_chat(messages, tools=None, system_prompt=None):
+            return ChatMessage(role="assistant", content=f"回覆：{messages[0].content}")
+
+        llm = mocker.MagicMock()
+        llm.chat = mocker.MagicMock(side_effect=mock_chat)
+        return llm
+
+    def _create_pipeline(self, mocker, llm, tts, final_text, **kwargs):
+        from voice_assistant.voice.pipeline import VoicePipeline
+        from voice_assistant.voice.schemas import TranscribedText, VoicePipelineConfig
+
+        streaming_stt = mocker.MagicMock()
+        streaming_stt.finalize.return_value = TranscribedText(text=final_text)
+        return VoicePipeline(
+            state=ConversationState(),
+            config=VoicePipelineConfig(speculative_partial_frames=2),
+            llm_client=llm,
+            stt=mocker.MagicMock(),
+            tts=tts,
+            streaming_stt=streaming_stt,
+            **kwargs,
+        )
+
+    def _partial(self, text, duration_ms=1000):
+        from voice_assistant.voice.schemas import TranscribedText
+
+        return TranscribedText(text=text, is_partial=True, duration_ms=duration_ms)
+
+    def test_stable_partial_result_is_reused(self, mocker, llm, mock_tts):
+        """部分辨識連續穩定且與最終結果相同時，沿用預先執行的結果"""
+        pipeline = self._create_pipeline(mocker, llm, mock_tts, "台北天氣如何？")
+        assert pipeline.streaming_stt.on_partial == pipeline._on_partial
+
+        pipeline._on_partial(self._partial("台北天氣"))
+        pipeline._on_partial(self._partial("台北天氣如何"))
+        assert pipeline._speculation is None
+        pipeline._on_partial(self._partial("台北天氣如何"))
+        assert pipeline._speculation is not None
+
+        audio = (16000, np.zeros(16000, dtype=np.float32))
+        list(pipeline.process_audio_with_outputs(audio))
+
+        llm.chat.assert_called_once()
+        assert pipeline.state.last_user_text == "台北天氣如何？"
+        assert pipeline.state.last_assistant_text == "回覆：台北天氣如何"
+        assert pipeline._speculation is None
+
+    def test_mismatched_final_result_restarts_flow(self, mocker, llm, mock_tts):
+        """最終辨識結果不同時捨棄預測並以最終結果重新執行"""
+        pipeline = self._create_pipeline(mocker, llm, mock_tts, "台北天氣如何明天呢")
+
+        pipeline._on_partial(self._partial("台北天氣如何"))
+        pipeline._on_partial(self._partial("台北天氣如何"))
+        _, _, speculation_token = pipeline._speculation
+
+        audio = (16000, np.zeros(16000, dtype=np.float32))
+        list(pipeline.process_audio_with_outputs(audio))
+
+        assert speculation_token.cancelled
+        assert pipeline.state.last_assistant_text == "回覆：台北天氣如何明天呢"
+
+    def test_changed_partial_discards_speculation(self, mocker, llm, mock_tts):
+        """使用者繼續說話使部分結果改變時，取消先前的預測"""
+        pipeline = self._create_pipeline(mocker, llm, mock_tts, "不重要")
+
+        pipeline._on_partial(self._partial("台北天氣"))
+        pipeline._on_partial(self._partial("台北天氣"))
+        _, _, speculation_token = pipeline._speculation
+
+        pipeline._on_partial(self._partial("台北天氣如何"))
+
+        assert speculation_token.cancelled
+        assert pipeline._speculation is None
+        pipeline.close()
+
+    def test_no_speculation_during_playback(self, mocker, llm, mock_tts):
+        """播放期間收音的語句可能是回音，不預先啟動流程"""
+        from voice_assistant.voice.echo import EchoDetector
+
+        echo = EchoDetector()
+        pipeline = self._create_pipeline(
+            mocker, llm, mock_tts, "不重要", echo_detector=echo
+        )
+        echo.on_playback(5.0)
+
+        pipeline._on_partial(self._partial("台北天氣"))
+        pipeline._on_partial(self._partial("台北天氣"))
+
+        assert pipeline._speculation is None
+        llm.chat.assert_not_called()
+        pipeline.close()
+
+    def test_no_speculation_for_gated_audio(self, mocker, llm, mock_tts):
+        """語音閘門會捨棄的語句（雜音、過短）不預先啟動流程"""
+        from voice_assistant.voice.stt.gate import SpeechGate
+
+        pipeline = self._create_pipeline(
+            mocker, llm, mock_tts, "不重要", speech_gate=SpeechGate()
+        )
+        pipeline.feed_audio((16000, np.zeros(16000, dtype=np.float32)))
+
+        pipeline._on_partial(self._partial("謝謝觀看"))
+        pipeline._on_partial(self._partial("謝謝觀看"))
+
+        assert pipeline._speculation is None
+        assert pipeline.speech_gate.stats().checked == 0
+        pipeline.close()
+
+
+class TestTurnCancellation:
+    """測試使用者插話時取消本輪進行中的工作"""
+
+    @pytest.fixture
+    def mock_stt(self, mocker):
+        stt = mocker.MagicMock()
+        stt.stt.return_value = "台北天氣如何"
+        return stt
+
+    @pytest.fixture(autouse=True)
+    def tools_mode(self, mocker):
+        settings = mocker.MagicMock()
+        settings.flow_mode = FlowMode.TOOLS
+        mocker.patch(
+            "voice_assistant.voice.pipeline.get_settings", return_value=settings
+        )
+
+    def _create_pipeline(self, mocker, llm, stt, tts, config=None):
+        from voice_assistant.voice.pipeline import VoicePipeline
+        from voice_assistant.voice.schemas import VoicePipelineConfig
+
+        return VoicePipeline(
+            state=ConversationState(),
+            config=config or VoicePipelineConfig(),
+            llm_client=llm,
+            stt=stt,
+            tts=tts,
+        )
+
+    def test_interrupt_cancels_inflight_llm_call(self, mocker, mock_stt):
+        """插話時取消等待中的 LLM 呼叫，不播放任何回應"""
+        import asyncio
+        import threading
+
+        llm_started = threading.Event()
+        llm_cancelled = threading.Event()
+
+        async def mock_chat(messages, tools=None, system_prompt=None):
+            llm_started.set()
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                llm_cancelled.set()
+                raise
+            return ChatMessage(role="assistant", content="不應出現")
+
+        llm = mocker.MagicMock()
+        llm.chat = mocker.MagicMock(side_effect=mock_chat)
+        tts = mocker.MagicMock()
+        pipeline = self._create_pipeline(mocker, llm, mock_stt, tts)
+
+        outputs = []
+        audio = (16000, np.zeros(16000, dtype=np.float32))
+        worker = threading.Thread(
+            target=lambda: outputs.extend(pipeline.process_audio_with_outputs(audio))
+        )
+        worker.start()
+        assert llm_started.wait(timeout=2)
+
+        pipeline.on_interrupt()
+        worker.join(timeout=2)
+
+        assert not worker.is_alive()
+        assert llm_cancelled.is_set()
+        tts.stream_tts_sync.assert_not_called()
+        assert outputs[-2].args[1] == "⏸️ 已中斷"
+        assert pipeline.state.state == VoiceState.IDLE
+
+    def test_new_turn_cancels_previous_turn(self, mocker, mock_stt):
+        """新一輪開始時取消上一輪的權杖"""
+        tts = mocker.MagicMock()
+        tts.stream_tts_sync.side_effect = lambda text, cancel_token=None: iter(
+            [(24000, np.zeros(100, dtype=np.float32))]
+        )
+        llm = mocker.MagicMock()
+
+        async def mock_chat(messages, tools=None, system_prompt=None):
+            return ChatMessage(role="assistant", content="台北晴天。")
+
+        llm.chat = mocker.MagicMock(side_effect=mock_chat)
+        pipeline = self._create_pipeline(mocker, llm, mock_stt, tts)
+        audio = (16000, np.zeros(16000, dtype=np.float32))
+
+        first = pipeline.process_audio_with_outputs(audio)
+        next(first)
+        first_token = pipeline._turn_token
+
+        list(pipeline.process_audio_with_outputs(audio))
+
+        assert first_token.cancelled
+        assert pipeline._turn_token is not first_token
+
+    def test_cancel_stops_tts_between_chunks(self, mocker, mock_stt):
+        """取消後不再輸出後續音訊片段，已串流的內容寫入歷史"""
+        tts = mocker.MagicMock()
+        tts.stream_tts_sync.side_effect = lambda text, cancel_token=None: iter(
+            [(24000, np.zeros(100, dtype=np.float32)) for _ in range(5)]
+        )
+        llm = mocker.MagicMock()
+
+        async def mock_chat(messages, tools=None, system_prompt=None):
+            return ChatMessage(role="assistant", content="台北晴天。")
+
+        llm.chat = mocker.MagicMock(side_effect=mock_chat)
+        pipeline = self._create_pipeline(mocker, llm, mock_stt, tts)
+        audio = (16000, np.zeros(16000, dtype=np.float32))
+
+        chunks = 0
+        for output in pipeline.process_audio_with_outputs(audio):
+            if isinstance(output, tuple):
+                chunks += 1
+                pipeline.cancel_turn()
+
+        assert chunks == 1
+        assert pipeline.state.history.messages[-1].content == "台北晴天。"
+        assert pipeline.state.state == VoiceState.IDLE
+
+    def test_interrupt_stops_error_prompt(self, mocker, mock_stt):
+        """插話時錯誤提示也停止輸出，並取消其合成"""
+        tts = mocker.MagicMock()
+        tts.stream_tts_sync.side_effect = lambda text, cancel_token=None: iter(
+            [(24000, np.zeros(100, dtype=np.float32)) for _ in range(5)]
+        )
+        llm = mocker.MagicMock()
+
+        async def mock_chat(messages, tools=None, system_prompt=None):
+            raise RuntimeError("LLM 連線失敗")
+
+        llm.chat = mocker.MagicMock(side_effect=mock_chat)
+        pipeline = self._create_pipeline(mocker, llm, mock_stt, tts)
+        audio = (16000, np.zeros(16000, dtype=np.float32))
+
+        chunks = 0
+        for output in pipeline.process_audio_with_outputs(audio):
+            if isinstance(output, tuple):
+                chunks += 1
+                pipeline.on_interrupt()
+
+        assert chunks == 1
+        token = tts.stream_tts_sync.call_args.kwargs["cancel_token"]
+        assert token is not None and token.cancelled
+        assert pipeline.state.state == VoiceState.IDLE
+
+    def test_interrupt_stops_lookahead_synthesis(self, mocker, mock_stt):
+        """插話時停止背景預先合成，已緩衝的片段不再輸出"""
+        import time
+
+        from voice_assistant.voice.schemas import TTSConfig, VoicePipelineConfig
+
+        synthesized = []
+
+        def stream(text, cancel_token=None):
+            for i in range(20):
+                if cancel_token is not None and cancel_token.cancelled:
+                    return
+                synthesized.append(i)
+                yield (24000, np.zeros(100, dtype=np.float32))
+
+        tts = mocker.MagicMock()
+        tts.stream_tts_sync.side_effect = stream
+        llm = mocker.MagicMock()
+
+        async def mock_chat(messages, tools=None, system_prompt=None):
+            return ChatMessage(role="assistant", content="台北晴天。")
+
+        llm.chat = mocker.MagicMock(side_effect=mock_chat)
+        config = VoicePipelineConfig(tts=TTSConfig(lookahead=2))
+        pipeline = self._create_pipeline(mocker, llm, mock_stt, tts, config)
+        audio = (16000, np.zeros(16000, dtype=np.float32))
+
+        outputs = []
+        for output in pipeline.process_audio_with_outputs(audio):
+            outputs.append(output)
+            if isinstance(output, tuple):
+                # 等背景合成填滿緩衝區後插話
+                time.sleep(0.1)
+                pipeline.on_interrupt()
+
+        time.sleep(0.1)
+        assert sum(isinstance(output, tuple) for output in outputs) == 1
+        # 已送出 1 段、緩衝區 2 段，加上等待放入緩衝區的 1 段
+        assert len(synthesized) <= 4
+        assert outputs[-2].args[1] == "⏸️ 已中斷"
+        assert pipeline.state.state == VoiceState.IDLE
+
+    def test_echo_records_only_played_sentences(self, mocker, mock_stt):
+        """句子在第一段音訊送出時才記錄，預先合成但未播放的句子不列入"""
+        import time
+
+        from voice_assistant.voice.schemas import (
+            EchoConfig,
+            TTSConfig,
+            VoicePipelineConfig,
+        )
+
+        def stream(text, cancel_token=None):
+            for _ in range(2):
+                yield (24000, np.zeros(100, dtype=np.float32))
+
+        tts = mocker.MagicMock()
+        tts.stream_tts_sync.side_effect = stream
+        llm = mocker.MagicMock()
+
+        async def mock_chat(messages, tools=None, system_prompt=None):
+            return ChatMessage(role="assistant", content="台北晴天。明天會下雨。")
+
+        llm.chat = mocker.MagicMock(side_effect=mock_chat)
+        config = VoicePipelineConfig(
+            tts=TTSConfig(lookahead=4), echo=EchoConfig(enabled=True)
+        )
+        pipeline = self._create_pipeline(mocker, llm, mock_stt, tts, config)
+        add_spoken = mocker.spy(pipeline.echo_detector, "add_spoken")
+        audio = (16000, np.zeros(16000, dtype=np.float32))
+
+        for output in pipeline.process_audio_with_outputs(audio):
+            if isinstance(output, tuple):
+                # 等背景合成完第二句後插話
+                time.sleep(0.1)
+                assert tts.stream_tts_sync.call_count == 2
+                pipeline.on_interrupt()
+
+        assert [call.args[0] for call in add_spoken.call_args_list] == ["台北晴天。"]
+
+
 class TestVoicePipelineEmptyInput:
     """測試 VoicePipeline 空輸入處理（US3）"""
 
@@ -0,0 +1,107 @@
+"""SessionManager 單元測試
+
+測試每個 WebRTC 連線擁有獨立對話狀態，以及閒置／上限回收。
+"""
+
+import pytest
+
+from voice_assistant.voice.schemas import ConversationState, VoiceState
+from voice_assistant.voice.session import SessionManager
+
+
+class FakeClock:
+    """可手動推進的時間來源"""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+@pytest.fixture
+def clock():
+    return FakeClock()
+
+
+@pytest.fixture
+def factory(mocker):
+    """每次建立擁有獨立 ConversationState 的 mock pipeline"""
+
+    def _create():
+        pipeline = mocker.MagicMock()
+        pipeline.state = ConversationState()
+        return pipeline
+
+    return mocker.MagicMock(side_effect=_create)
+
+
+class TestSessionManager:
+    """測試會話管理"""
+
+    def test_same_id_returns_same_pipeline(self, factory, clock):
+        """同一連線 ID 取得同一管線"""
+        sessions = SessionManager(factory, clock=clock)
+        assert sessions.get("a") is sessions.get("a")
+        assert factory.call_count == 1
+
+    def test_sessions_are_isolated(self, factory, clock):
+        """不同連線的對話狀態互不影響"""
+        sessions = SessionManager(factory, clock=clock)
+        first = sessions.get("a")
+        second = sessions.get("b")
+
+        first.state.current_role_id = "coach"
+        first.state.history.add_user_message("你好")
+
+        assert second.state.current_role_id is None
+        assert second.state.history.messages == []
+        assert len(sessions) == 2
+
+    def test_idle_sessions_are_evicted(self, factory, clock):
+        """閒置逾時的會話會被回收"""
+        sessions = SessionManager(factory, idle_timeout_s=10, clock=clock)
+        sessions.get("a")
+        clock.now = 5
+        sessions.get("b")
+
+        clock.now = 12
+        assert sessions.evict_idle() == 1
+        assert "a" not in sessions
+        assert "b" in sessions
+
+    def test_access_refreshes_idle_timer(self, factory, clock):
+        """存取會話會重置閒置計時"""
+        sessions = SessionManager(factory, idle_timeout_s=10, clock=clock)
+        first = sessions.get("a")
+        clock.now = 8
+        sessions.get("a")
+        clock.now = 15
+
+        assert sessions.get("a") is first
+
+    def test_max_sessions_evicts_idle_first(self, factory, clock):
+        """達上限時優先回收非對話中的會話"""
+        sessions = SessionManager(factory, max_sessions=2, clock=clock)
+        busy = sessions.get("a")
+        busy.state.transition_to(VoiceState.LISTENING)
+        sessions.get("b")
+
+        sessions.get("c")
+
+        assert "a" in sessions
+        assert "b" not in sessions
+        assert "c" in sessions
+
+    def test_remove(self, factory, clock):
+        """移除會話"""
+        sessions = SessionManager(factory, clock=clock)
+        sessions.get("a")
+        assert sessions.remove("a") is True
+        assert sessions.remove("a") is False
+        assert len(sessions) == 0
+
+    def test_invalid_max_sessions(self, factory):
+        """max_sessions 小於 1 應拋出錯誤"""
+        with pytest.raises(ValueError):
+            SessionManager(factory, max_sessions=0)
@@ -0,0 +1,84 @@
+"""啟動暖身與就緒狀態單元測試"""
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from voice_assistant.config import FlowMode
+from voice_assistant.warmup import (
+    READY_PATH,
+    Readiness,
+    run_warmup,
+    start_warmup,
+    warm_up_flows,
+)
+
+
+class TestRunWarmup:
+    """測試暖身執行"""
+
+    def test_records_each_component(self):
+        """依序執行並記錄各元件耗時"""
+        calls = []
+
+        report = run_warmup({"stt": lambda: calls.append("stt"), "tts": lambda: None})
+
+        assert calls == ["stt"]
+        assert [c.name for c in report.components] == ["stt", "tts"]
+        assert all(c.duration_ms >= 0 for c in report.components)
+        assert report.ok
+
+    def test_failure_is_recorded_and_others_still_run(self):
+        """單一元件失敗時記錄錯誤，其他元件照常暖身"""
+
+        def fail():
+            raise RuntimeError("model missing")
+
+        ran = []
+        report = run_warmup({"stt": fail, "tts": lambda: ran.append("tts")})
+
+        assert ran == ["tts"]
+        assert report.components[0].error == "model missing"
+        assert not report.ok
+
+
+class TestReadiness:
+    """測試就緒狀態與路由"""
+
+    def _client(self, readiness: Readiness) -> TestClient:
+        return TestClient(FastAPI(routes=readiness.routes()))
+
+    def test_not_ready_until_warmup_succeeds(self):
+        """暖身完成前回傳 503，成功後回傳 200 與各元件耗時"""
+        readiness = Readiness()
+        client = self._client(readiness)
+
+        assert client.get(READY_PATH).status_code == 503
+
+        start_warmup({"stt": lambda: None}, readiness).join(timeout=5)
+
+        response = client.get(READY_PATH)
+        assert response.status_code == 200
+        body = response.json()
+        assert body["ready"] is True
+        assert body["warmup"]["components"][0]["name"] == "stt"
+
+    def test_failed_warmup_stays_not_ready(self):
+        """暖身失敗時維持未就緒"""
+        readiness = Readiness()
+
+        readiness.set_report(run_warmup({"stt": lambda: 1 / 0}))
+
+        assert not readiness.ready
+        assert self._client(readiness).get(READY_PATH).status_code == 503
+
+
+class TestWarmUpFlows:
+    """測試流程暖身（本地 LLM 替身，不呼叫外部 API）"""
+
+    def test_multi_agent_flow_runs_against_stub(self, caplog):
+        """多代理流程以替身回應完整執行一次"""
+        caplog.set_level("DEBUG", logger="voice_assistant.warmup")
+
+        warm_up_flows(FlowMode.MULTI_AGENT)
+
+        assert "台北今天多雲" in caplog.text
@@ -289,3 +289,21 @@ class TestErrorHandling:
             assert result.success is False
             assert result.error is not None
             assert "api_error" in result.error
+
+
+class TestHttpClientReuse:
+    """測試 HTTP 連線池跨查詢重用。"""
+
+    @pytest.mark.asyncio
+    async def test_client_is_reused_until_closed(self) -> None:
+        """同一工具實例重用 HTTP client，aclose 後重新建立。"""
+        weather_tool = WeatherTool()
+        client = weather_tool._get_client()
+
+        assert weather_tool._get_client() is client
+
+        await weather_tool.aclose()
+
+        assert client.is_closed
+        assert weather_tool._get_client() is not client
+        await weather_tool.aclose()